@@ -1,12 +1,22 @@
+import asyncio
+import json
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
 from sqlalchemy import and_, desc, func
 from sqlalchemy.orm import Session, joinedload
 
 from app.api.auth import get_current_admin_user
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.sampling_profiler import (
+    ProfilerBusy,
+    SampleFilter,
+    SamplingProfiler,
+    endpoint_routes,
+)
 from app.core.security import get_password_hash
 from app.models.assessment import AdminAuditLog, Assessment, AssessmentResponse, Report
 from app.models.user import User
@@ -18,7 +28,10 @@ from app.schemas.user import (
     CurrentUserResponse,
     UserResponse,
 )
+from app.services.ai_cache_maintenance import AICacheMaintenanceService
 from app.services.cache import cache_service
+from app.services.identity_cache import identity_cache
+from app.services.report_timing import ReportTimingService
 from app.utils.datetime_utils import to_utc_aware
 from app.utils.pagination import PaginatedResponse
 
@@ -529,8 +542,10 @@ async def delete_user(
             db.query(Report).filter(Report.assessment_id == assessment.id).delete()
         db.query(Assessment).filter(Assessment.user_id == user_id).delete()
 
+        deleted_identity = (user.id, user.email)
         db.delete(user)
         db.commit()
+        identity_cache.invalidate_users([deleted_identity])
 
         await log_admin_action(
             admin_email=current_admin.email,
@@ -578,6 +593,7 @@ async def reset_user_password(
 
         user.password_hash = get_password_hash(new_password)  # type: ignore[assignment]
         db.commit()
+        identity_cache.invalidate_users([(user.id, user.email)])
 
         await log_admin_action(
             admin_email=current_admin.email,
@@ -656,12 +672,19 @@ async def bulk_update_user_status(
     """Bulk activate/deactivate users"""
 
     try:
+        identities = [
+            (str(user_id), str(email))
+            for user_id, email in db.query(User.id, User.email)
+            .filter(User.id.in_(request_data.user_ids))
+            .all()
+        ]
         updated_count = (
             db.query(User)
             .filter(User.id.in_(request_data.user_ids))
             .update({"is_active": request_data.is_active}, synchronize_session=False)
         )
         db.commit()
+        identity_cache.invalidate_users(identities)
 
         await log_admin_action(
             admin_email=current_admin.email,
@@ -742,6 +765,11 @@ async def bulk_delete_users(
             .delete(synchronize_session=False)
         )
         db.commit()
+        identity_cache.invalidate_users(
+            (user.id, user.email)
+            for user in existing_users
+            if user.id in deletable_user_ids
+        )
 
         await log_admin_action(
             admin_email=current_admin.email,
@@ -779,6 +807,168 @@ async def bulk_delete_users(
         )
 
 
+@router.get("/ai-cache/stats")
+async def get_ai_cache_stats(
+    request: Request,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Get AI cache size, hit ratio and eviction counters"""
+
+    try:
+        return AICacheMaintenanceService.get_stats(db)
+    except Exception as e:
+        print(f"Error in get_ai_cache_stats: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch AI cache stats",
+        )
+
+
+@router.post("/ai-cache/compact")
+async def compact_ai_cache(
+    request: Request,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Run AI cache eviction policies immediately"""
+
+    try:
+        result = AICacheMaintenanceService.compact(db)
+
+        await log_admin_action(
+            admin_email=current_admin.email,
+            action="compact_ai_cache",
+            details=result,
+            db=db,
+        )
+
+        return {"message": "AI cache compacted", **result}
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error in compact_ai_cache: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compact AI cache",
+        )
+
+
+@router.get("/report-timings")
+async def get_report_timings(
+    request: Request,
+    days: int = Query(7, ge=1, le=365),
+    report_type: str | None = Query(None, pattern="^(standard|ai_enhanced)$"),
+    by_release: bool = False,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Per-stage report generation percentiles by report type (and release)"""
+
+    try:
+        return ReportTimingService.summarize(db, days, report_type, by_release)
+    except Exception as e:
+        print(f"Error in get_report_timings: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch report timings",
+        )
+
+
+@router.get("/report-memory")
+async def get_report_memory_outliers(
+    request: Request,
+    days: int = Query(7, ge=1, le=365),
+    limit: int = Query(20, ge=1, le=200),
+    report_type: str | None = Query(None, pattern="^(standard|ai_enhanced)$"),
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Report runs with the highest peak memory, for sizing machines"""
+
+    try:
+        outliers = ReportTimingService.memory_outliers(db, days, limit, report_type)
+        return {
+            "days": days,
+            "memory_ceiling_mb": settings.REPORT_MEMORY_CEILING_MB,
+            "outliers": outliers,
+        }
+    except Exception as e:
+        print(f"Error in get_report_memory_outliers: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch report memory outliers",
+        )
+
+
+@router.post("/profile")
+async def run_profiler(
+    request: Request,
+    seconds: int = Query(10, ge=1),
+    interval_ms: int = Query(10, ge=5, le=1000),
+    route: str | None = Query(None, max_length=200),
+    report_id: str | None = Query(None, max_length=36),
+    output: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    include_idle: bool = False,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Sample this worker's stacks for a while and return a speedscope profile
+    (or collapsed stacks), optionally limited to a route pattern or report"""
+
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Profiles are limited to {settings.PROFILER_MAX_SECONDS} seconds",
+        )
+
+    await log_admin_action(
+        admin_email=current_admin.email,
+        action="run_profiler",
+        details={
+            "seconds": seconds,
+            "interval_ms": interval_ms,
+            "route": route,
+            "report_id": report_id,
+            "output": output,
+        },
+        db=db,
+    )
+
+    try:
+        profiler = SamplingProfiler(
+            SampleFilter(
+                endpoint_routes(request.app.routes), route, report_id, include_idle
+            ),
+            interval_ms,
+        )
+        await asyncio.to_thread(profiler.run, seconds)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except Exception as e:
+        print(f"Error in run_profiler: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to run profiler",
+        )
+
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+    headers = {"X-Profile-Samples": str(profiler.sample_count)}
+    if output == "collapsed":
+        headers["Content-Disposition"] = f'attachment; filename="profile-{stamp}.txt"'
+        return Response(profiler.collapsed(), media_type="text/plain", headers=headers)
+
+    name = " ".join(filter(None, ["profile", route, report_id, stamp]))
+    headers["Content-Disposition"] = (
+        f'attachment; filename="profile-{stamp}.speedscope.json"'
+    )
+    return Response(
+        json.dumps(profiler.speedscope(name)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 async def log_admin_action(
     admin_email: str,
     action: str,
@@ -1,6 +1,7 @@
 from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from sqlalchemy import and_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -9,6 +10,7 @@ from app.api.auth import get_current_user
 from app.core.assessment_tiers import ASSESSMENT_TIERS, get_tier_sections
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import PrecompressedPayload, PrecompressedResponse
 from app.middleware.rate_limit import limiter
 from app.models.assessment import Assessment, Report
 from app.models.assessment import AssessmentResponse as AssessmentResponseModel
@@ -22,28 +24,58 @@ from app.schemas.assessment import (
     SaveProgressRequest,
 )
 from app.schemas.user import CurrentUserResponse
-from app.services.question_parser import (
-    filter_structure_by_sections,
-    load_assessment_structure_cached,
-)
 from app.services.report_generator import generate_standard_report
+from app.services.speculative_generation import record_progress_in_background
+from app.services.static_payloads import (
+    filtered_structure,
+    section_explanations_payload,
+    section_ids_in_questionnaire,
+    static_payloads,
+    structure_payload,
+)
 
 router = APIRouter()
 
 
+def public_cache_control() -> str:
+    return f"public, max-age={settings.STRUCTURE_CACHE_MAX_AGE}"
+
+
+# Per-user responses: browsers may keep them but must revalidate with the ETag
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
 @router.get("/structure", response_model=AssessmentStructure)
-async def get_assessment_structure(request: Request) -> AssessmentStructure:
-    """Get the complete assessment structure with all questions"""
-    return load_assessment_structure_cached()
+async def get_assessment_structure(request: Request, sparse: bool = False) -> Response:
+    """Get the complete assessment structure with all questions
+
+    sparse=true leaves out the options' detailed explanations; fetch them per
+    section from /sections/{section_id}/explanations.
+    """
+    return PrecompressedResponse(
+        structure_payload(sparse), request, cache_control=public_cache_control()
+    )
+
+
+@router.get("/sections/{section_id}/explanations")
+async def get_section_explanations(request: Request, section_id: str) -> Response:
+    """Get the detailed option explanations for one section"""
+    payload = section_explanations_payload(section_id)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Section not found"
+        )
+    return PrecompressedResponse(payload, request, cache_control=public_cache_control())
 
 
 @router.get("/{assessment_id}/filtered-structure", response_model=AssessmentStructure)
 async def get_filtered_assessment_structure(
     request: Request,
     assessment_id: str,
+    sparse: bool = False,
     current_user: CurrentUserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> AssessmentStructure:
+) -> Response:
     """Get the assessment structure filtered by selected sections for this assessment"""
     assessment = (
         db.query(Assessment)
@@ -58,15 +90,10 @@ async def get_filtered_assessment_structure(
             status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found"
         )
 
-    structure = load_assessment_structure_cached()
-
-    if assessment.selected_section_ids:
-        structure = filter_structure_by_sections(
-            structure,
-            list(assessment.selected_section_ids),  # type: ignore[arg-type]
-        )
-
-    return structure
+    payload = filtered_structure(
+        assessment.selected_section_ids or []  # type: ignore[arg-type]
+    ).payload(sparse)
+    return PrecompressedResponse(payload, request, cache_control=PRIVATE_CACHE_CONTROL)
 
 
 @router.post("/start", response_model=AssessmentResponse)
@@ -125,9 +152,7 @@ async def start_assessment(
     selected_section_ids = None
     if assessment_data and assessment_data.selected_section_ids:
         selected_section_ids = assessment_data.selected_section_ids
-        structure = load_assessment_structure_cached()
-        valid_section_ids = {section.id for section in structure.sections}
-        invalid_ids = set(selected_section_ids) - valid_section_ids
+        invalid_ids = set(selected_section_ids) - section_ids_in_questionnaire()
         if invalid_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -334,6 +359,7 @@ async def save_assessment_progress(
     request: Request,
     assessment_id: str,
     progress_data: SaveProgressRequest,
+    background_tasks: BackgroundTasks,
     current_user: CurrentUserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> dict[str, str | float]:
@@ -408,21 +434,22 @@ async def save_assessment_progress(
         .count()
     )
 
-    structure = load_assessment_structure_cached()
-
-    if assessment.selected_section_ids:
-        structure = filter_structure_by_sections(
-            structure,
-            list(assessment.selected_section_ids),  # type: ignore[arg-type]
-        )
-
-    total_questions = structure.total_questions
+    total_questions = filtered_structure(
+        assessment.selected_section_ids or []  # type: ignore[arg-type]
+    ).total_questions
 
     if total_questions > 0:
         assessment.progress_percentage = (total_responses / total_questions) * 100  # type: ignore[assignment]
 
     db.commit()
 
+    if settings.AI_SPECULATIVE_GENERATION_ENABLED:
+        background_tasks.add_task(
+            record_progress_in_background,
+            assessment_id,
+            {r.section_id for r in progress_data.responses},
+        )
+
     return {
         "message": "Progress saved successfully",
         "progress_percentage": float(assessment.progress_percentage),
@@ -538,9 +565,7 @@ async def save_consultation_interest(
     return {"message": "Consultation preferences saved"}
 
 
-@router.get("/tiers")
-async def get_assessment_tiers() -> dict[str, dict[str, dict[str, str | int]]]:
-    """Get available assessment tiers"""
+def tier_summaries() -> dict[str, dict[str, dict[str, str | int]]]:
     return {
         "tiers": {
             tier_id: {
@@ -554,6 +579,15 @@ async def get_assessment_tiers() -> dict[str, dict[str, dict[str, str | int]]]:
     }
 
 
+@router.get("/tiers")
+async def get_assessment_tiers(request: Request) -> Response:
+    """Get available assessment tiers"""
+    payload = static_payloads.get(
+        "tiers", lambda: PrecompressedPayload.from_content(tier_summaries())
+    )
+    return PrecompressedResponse(payload, request, cache_control=public_cache_control())
+
+
 @router.post("/start-with-tier")
 async def start_assessment_with_tier(
     request: Request,
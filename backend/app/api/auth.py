@@ -22,6 +22,7 @@ from app.schemas.user import (
     UserLogin,
     UserResponse,
 )
+from app.services.identity_cache import identity_cache
 from app.services.security_metrics import security_metrics
 
 router = APIRouter()
@@ -147,15 +148,26 @@ async def login(
     )
 
 
+def load_current_user(
+    db: Session, lookup: str, value: str
+) -> CurrentUserResponse | None:
+    column = User.id if lookup == "id" else User.email
+    user = db.query(User).filter(column == value).first()
+    return CurrentUserResponse.model_validate(user) if user else None
+
+
 async def get_current_user_from_token(token: str, db: Session) -> CurrentUserResponse:
     """Extract user from JWT token"""
-    token_data = verify_token(token)
+    token_data = identity_cache.verified_claims(token, verify_token)
 
     if token_data.get("is_admin"):
         if token_data.get("user_id"):
-            user = db.query(User).filter(User.id == token_data["user_id"]).first()
+            user_id = str(token_data["user_id"])
+            user = identity_cache.get_user(
+                "id", user_id, lambda: load_current_user(db, "id", user_id)
+            )
             if user:
-                return CurrentUserResponse.model_validate(user)
+                return user
 
         return CurrentUserResponse(
             id="admin",
@@ -173,13 +185,15 @@ async def get_current_user_from_token(token: str, db: Session) -> CurrentUserRes
             detail="Could not validate credentials",
         )
 
-    user = db.query(User).filter(User.email == email).first()
+    user = identity_cache.get_user(
+        "email", email, lambda: load_current_user(db, "email", email)
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    return CurrentUserResponse.model_validate(user)
+    return user
 
 
 async def get_current_user(
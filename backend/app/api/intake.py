@@ -3,10 +3,12 @@ Intake API endpoints for AI-guided section recommendations.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
 from app.core.database import get_db
+from app.core.responses import PrecompressedPayload, PrecompressedResponse
 from app.schemas.intake import (
     DiscoveryQuestion,
     DiscoveryQuestionnaire,
@@ -15,14 +17,24 @@ from app.schemas.intake import (
 )
 from app.schemas.user import CurrentUserResponse
 from app.services.intake_service import generate_recommendations
+from app.services.static_payloads import static_payloads
 
 router = APIRouter()
 
 
 @router.get("/questions", response_model=DiscoveryQuestionnaire)
-async def get_discovery_questions(request: Request) -> DiscoveryQuestionnaire:
+async def get_discovery_questions(request: Request) -> Response:
     """Get the discovery questionnaire for intake"""
+    payload = static_payloads.get(
+        "intake_questions",
+        lambda: PrecompressedPayload.from_content(
+            build_discovery_questionnaire().model_dump(mode="json")
+        ),
+    )
+    return PrecompressedResponse(payload, request)
+
 
+def build_discovery_questionnaire() -> DiscoveryQuestionnaire:
     questions = [
         DiscoveryQuestion(
             id="role",
@@ -0,0 +1,128 @@
+"""Prometheus scrape endpoint"""
+
+import asyncio
+import ipaddress
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.api.auth import get_current_user_from_token, security_optional
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.prometheus import queue_depth, registry
+from app.models.ai_batch_job import AIBatchJob
+from app.models.ai_bulk_run import AIBulkGenerationRun
+from app.models.ai_speculative_job import AISpeculativeJob
+from app.models.assessment import Report
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+QUEUES = {
+    "reports_standard": ["pending", "generating"],
+    "reports_ai_enhanced": ["pending", "generating"],
+    "speculative_jobs": ["pending", "running"],
+    "batch_jobs": ["submitted"],
+    "bulk_runs": ["queued", "running"],
+}
+
+
+def count_by_status(db: Session, column: object, statuses: list[str]) -> dict:
+    return dict(
+        db.query(column, func.count())  # type: ignore[call-overload]
+        .filter(column.in_(statuses))  # type: ignore[attr-defined]
+        .group_by(column)
+        .all()
+    )
+
+
+def collect_queue_depths() -> None:
+    """Refresh queue depth gauges from the database at scrape time"""
+    db = SessionLocal()
+    try:
+        report_rows = (
+            db.query(Report.report_type, Report.status, func.count())
+            .filter(Report.status.in_(["pending", "generating"]))
+            .group_by(Report.report_type, Report.status)
+            .all()
+        )
+        counts: dict[str, dict] = {
+            f"reports_{report_type}": {} for report_type in ("standard", "ai_enhanced")
+        }
+        for report_type, report_status, count in report_rows:
+            counts.setdefault(f"reports_{report_type}", {})[report_status] = count
+        counts |= {
+            "speculative_jobs": count_by_status(
+                db, AISpeculativeJob.status, QUEUES["speculative_jobs"]
+            ),
+            "batch_jobs": count_by_status(db, AIBatchJob.status, QUEUES["batch_jobs"]),
+            "bulk_runs": count_by_status(
+                db, AIBulkGenerationRun.status, QUEUES["bulk_runs"]
+            ),
+        }
+    finally:
+        db.close()
+
+    for queue, statuses in QUEUES.items():
+        for queue_status in statuses:
+            queue_depth.set(
+                counts[queue].get(queue_status, 0), queue=queue, status=queue_status
+            )
+
+
+registry.add_collector(collect_queue_depths)
+
+
+def is_allowed_network(host: str | None) -> bool:
+    if not host:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    for network in settings.METRICS_ALLOWED_NETWORKS:
+        try:
+            if address in ipaddress.ip_network(network, strict=False):
+                return True
+        except ValueError:
+            logger.warning(f"Ignoring invalid METRICS_ALLOWED_NETWORKS entry {network}")
+    return False
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
+    db: Session = Depends(get_db),
+) -> PlainTextResponse:
+    """
+    Prometheus metrics for every worker.
+    Open to METRICS_ALLOWED_NETWORKS, otherwise requires an admin token.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if not is_allowed_network(request.client.host if request.client else None):
+        if not credentials:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated"
+            )
+        user = await get_current_user_from_token(credentials.credentials, db)
+        if not user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+            )
+
+    # Collectors query the database and snapshots are read from disk
+    body = await asyncio.to_thread(registry.render, settings.METRICS_MULTIPROC_DIR)
+    return PlainTextResponse(
+        body,
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
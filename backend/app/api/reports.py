@@ -23,9 +23,21 @@ from weasyprint import HTML
 from app.api.auth import get_current_admin_user, get_current_user
 from app.core.config import settings
 from app.core.database import get_db
+from app.models.ai_bulk_run import AIBulkGenerationRun
 from app.models.assessment import Assessment, AssessmentResponse, Report
-from app.schemas.report import AdminReportResponse, AIReportRequest, UserReportResponse
+from app.schemas.report import (
+    AdminReportResponse,
+    AIBulkGenerateRequest,
+    AIBulkRunResponse,
+    AIReportRequest,
+    UserReportResponse,
+)
 from app.schemas.user import CurrentUserResponse
+from app.services.bulk_generation import (
+    BulkGenerationService,
+    generate_ai_reports_bulk,
+)
+from app.services.deferred_generation import submit_deferred_reports_in_background
 from app.services.question_parser import (
     filter_structure_by_sections,
     load_assessment_structure,
@@ -43,6 +55,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 @router.post("/{assessment_id}/generate", response_model=UserReportResponse)
 async def generate_report(
@@ -273,6 +287,7 @@ async def admin_retry_standard_report(
         )
 
     report.status = "generating"  # type: ignore[assignment]
+    report.error_message = None  # type: ignore[assignment]
     report.file_path = None  # type: ignore[assignment]
     report.completed_at = None  # type: ignore[assignment]
     db.commit()
@@ -370,6 +385,128 @@ async def admin_bulk_release_ai_reports(
     }
 
 
+@router.post("/admin/generate-ai-deferred", response_model=None)
+async def admin_generate_ai_reports_deferred(
+    request: Request,
+    report_ids: list[str],
+    background_tasks: BackgroundTasks,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict[str, str | int | list[str]] | Response:
+    """Admin endpoint to generate pending AI reports through the batch API
+
+    Results arrive within AI_BATCH_COMPLETION_WINDOW and are picked up by the
+    deferred batch worker.
+    """
+
+    region = os.getenv("FLY_REGION")
+    primary = os.getenv("FLY_PRIMARY_REGION", "iad")
+    if region and primary and region != primary:
+        return Response(status_code=409, headers={"fly-replay": f"region={primary}"})
+
+    if not report_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No report IDs provided",
+        )
+
+    reports = (
+        db.query(Report)
+        .filter(
+            and_(
+                Report.id.in_(report_ids),
+                Report.report_type == "ai_enhanced",
+                Report.status == "pending",
+            )
+        )
+        .all()
+    )
+
+    if not reports:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pending AI reports found",
+        )
+
+    queued_ids = []
+    for report in reports:
+        report.status = "generating"  # type: ignore[assignment]
+        queued_ids.append(str(report.id))
+    db.commit()
+
+    background_tasks.add_task(submit_deferred_reports_in_background, queued_ids)
+
+    return {
+        "message": f"Queued {len(queued_ids)} AI reports for batch generation",
+        "queued_count": len(queued_ids),
+        "queued_ids": queued_ids,
+        "skipped_ids": [rid for rid in report_ids if rid not in queued_ids],
+    }
+
+
+@router.post("/admin/generate-ai-bulk", response_model=AIBulkRunResponse)
+async def admin_generate_ai_reports_bulk(
+    request: Request,
+    bulk_request: AIBulkGenerateRequest,
+    background_tasks: BackgroundTasks,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> AIBulkRunResponse | Response:
+    """Admin endpoint to generate pending AI reports as one scheduled run
+
+    Reports are selected by ID and/or request time (oldest first, capped at
+    AI_BULK_MAX_REPORTS) and share one request budget and section cache.
+    """
+
+    region = os.getenv("FLY_REGION")
+    primary = os.getenv("FLY_PRIMARY_REGION", "iad")
+    if region and primary and region != primary:
+        return Response(status_code=409, headers={"fly-replay": f"region={primary}"})
+
+    reports = BulkGenerationService.select_pending_reports(
+        db,
+        report_ids=bulk_request.report_ids,
+        requested_after=bulk_request.requested_after,
+        requested_before=bulk_request.requested_before,
+        limit=bulk_request.limit,
+    )
+
+    if not reports:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pending AI reports match the request",
+        )
+
+    run = BulkGenerationService.create_run(
+        db,
+        reports,
+        requested_by=str(current_admin.id),
+        filters=bulk_request.model_dump(mode="json", exclude_none=True),
+    )
+
+    background_tasks.add_task(generate_ai_reports_bulk, str(run.id))
+
+    return AIBulkRunResponse(**BulkGenerationService.get_progress(db, run))
+
+
+@router.get("/admin/generate-ai-bulk/{run_id}", response_model=AIBulkRunResponse)
+async def admin_get_ai_bulk_run(
+    run_id: str,
+    current_admin: CurrentUserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> AIBulkRunResponse:
+    """Admin endpoint to check the progress of a bulk AI generation run"""
+
+    run = db.query(AIBulkGenerationRun).filter(AIBulkGenerationRun.id == run_id).first()
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bulk generation run not found",
+        )
+
+    return AIBulkRunResponse(**BulkGenerationService.get_progress(db, run))
+
+
 @router.post("/admin/{report_id}/retry-ai", response_model=AdminReportResponse)
 async def admin_retry_ai_report(
     request: Request,
@@ -404,6 +541,7 @@ async def admin_retry_ai_report(
         )
 
     report.status = "generating"  # type: ignore[assignment]
+    report.error_message = None  # type: ignore[assignment]
     report.file_path = None  # type: ignore[assignment]
     report.completed_at = None  # type: ignore[assignment]
     db.commit()
@@ -446,6 +584,7 @@ async def admin_regenerate_pdf_from_artifacts(
 
     from app.models.ai_artifacts import AISectionArtifact as AISectionArtifactModel
     from app.schemas.ai_artifacts import SectionAIArtifact
+    from app.services.artifact_blobs import ArtifactBlobService
 
     section_artifacts_db = (
         db.query(AISectionArtifactModel)
@@ -487,7 +626,7 @@ async def admin_regenerate_pdf_from_artifacts(
     ai_insights = {}
     for artifact_db in section_artifacts_db:
         ai_insights[str(artifact_db.section_id)] = SectionAIArtifact.model_validate(
-            artifact_db.artifact_json
+            ArtifactBlobService.resolve_payload(artifact_db)
         )
 
     html_content = generate_ai_report_html(
@@ -511,6 +650,7 @@ async def admin_regenerate_pdf_from_artifacts(
     report.completed_at = datetime.now(UTC)  # type: ignore[assignment]
     if report.status == "failed":
         report.status = "completed"  # type: ignore[assignment]
+        report.error_message = None  # type: ignore[assignment]
     db.commit()
 
     return {
@@ -682,7 +822,7 @@ async def download_report(
         background = BackgroundTask(file_handle.close)
 
     return StreamingResponse(
-        file_handle,
+        iter(lambda: file_handle.read(DOWNLOAD_CHUNK_SIZE), b""),
         media_type="application/pdf",
         headers=headers,
         background=background,
@@ -19,10 +19,11 @@ class Settings(BaseSettings):
     OPENAI_MAX_TOKENS: int = 10000
     OPENAI_TEMPERATURE: float = 0.5
     OPENAI_TIMEOUT: int = 60
+    OPENAI_BASE_URL: str | None = None  # OpenAI-compatible server, e.g. the local stub
     OPENAI_KEYS_ENCRYPTION_KEY: str | None = None
 
     AI_PROMPT_VERSION: str = (
-        "v2.3"  # Added support for user comments and enhanced option context
+        "v2.4"  # Static instructions moved into a cacheable system message prefix
     )
     AI_SCHEMA_VERSION: str = "1.1"  # Increased gap field max_length to 1000 chars
 
@@ -40,6 +41,18 @@ class Settings(BaseSettings):
     MAX_COMMENT_CHARS: int = 500
     MAX_CONTEXT_CHARS: int = 400
 
+    AI_SECTION_PROMPT_TOKEN_BUDGET: int = 6000  # Compact section prompts above this
+    AI_COMPLETION_BASE_TOKENS: int = 1800  # ~1000 words of JSON output
+    AI_COMPLETION_TOKENS_PER_SIGNAL: int = 40
+    TIKTOKEN_CACHE_DIR: str = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "tiktoken_cache")
+    )  # Seeded at image build; encodings are never downloaded at runtime
+
+    AI_SECTION_BATCHING_ENABLED: bool = True
+    AI_BATCH_MAX_SIGNALS_PER_SECTION: int = 8  # Larger sections always go alone
+    AI_BATCH_MAX_SECTIONS: int = 4
+    AI_BATCH_PROMPT_TOKEN_BUDGET: int = 8000
+
     AI_MAX_CONCURRENT_SECTIONS: int = 5
     AI_PER_KEY_QPS_LIMIT: float = 10.0  # 10 QPS per key
 
@@ -47,6 +60,40 @@ class Settings(BaseSettings):
     AI_RETRY_DELAY_SECONDS: int = 2
     AI_FALLBACK_MODEL: str = "gpt-3.5-turbo"
 
+    AI_CACHE_MAX_ROWS: int = 5000
+    AI_CACHE_MAX_AGE_DAYS: int = 90  # Evict entries unused for this long
+    AI_CACHE_RETIRE_OLD_VERSIONS: bool = True
+    AI_CACHE_HIT_FLUSH_THRESHOLD: int = 50
+    AI_CACHE_COMPACTION_INTERVAL_MINUTES: int = 60  # 0 disables the scheduled job
+
+    AI_SPECULATIVE_GENERATION_ENABLED: bool = False
+    AI_SPECULATIVE_STABLE_MINUTES: int = 10  # Answers must be unchanged this long
+    AI_SPECULATIVE_DAILY_BUDGET: int = 200  # Max speculative OpenAI calls per day
+    AI_SPECULATIVE_POLL_SECONDS: int = 60
+
+    AI_BULK_MAX_CONCURRENT_REQUESTS: int = 12  # Across all reports in a bulk run
+    AI_BULK_REQUESTS_PER_KEY: int = 4  # In-flight requests allowed per usable key
+    AI_BULK_MAX_CONCURRENT_REPORTS: int = 4
+    AI_BULK_MAX_REPORTS: int = 200
+
+    AI_DEFERRED_BATCH_ENABLED: bool = False  # Poll submitted batch jobs
+    AI_BATCH_BACKEND: str = "openai"  # openai or local
+    AI_BATCH_LOCAL_DIR: str = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "batches")
+    )
+    AI_BATCH_COMPLETION_WINDOW: str = "24h"
+    AI_BATCH_POLL_SECONDS: int = 300
+    AI_BATCH_MAX_POLL_FAILURES: int = 5  # Then the job and its reports fail
+
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_CALL_SITES: list[str] = [
+        "synthesis",
+        "section_fallback",
+        "intake_recommendations",
+    ]  # section_analysis is already covered by AISectionCache
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MEMORY_MAX_ENTRIES: int = 256
+
     ADMIN_EMAIL: str = "aadish.bahati@echostor.com"
     ADMIN_PASSWORD_HASH: str | None = None
 
@@ -78,6 +125,43 @@ class Settings(BaseSettings):
     SENTRY_TRACES_SAMPLE_RATE: float = 1.0
     SENTRY_PROFILES_SAMPLE_RATE: float = 1.0
 
+    DB_QUERY_HEADERS_ENABLED: bool = (
+        True  # Never sent when SENTRY_ENVIRONMENT=production
+    )
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # Warn when one statement repeats this often
+
+    RELEASE_VERSION: str = os.getenv("FLY_IMAGE_REF", "dev")  # Tags report timings
+
+    REPORT_MEMORY_PROFILING_ENABLED: bool = False  # tracemalloc slows every allocation
+    REPORT_MEMORY_SNAPSHOTS_KEPT: int = 5  # Top-allocation snapshots, worst reports
+    REPORT_MEMORY_CEILING_MB: int = 0  # Render bigger PDFs out of process; 0 disables
+    REPORT_PDF_MEMORY_FACTOR: int = 30  # Estimated render bytes per byte of HTML
+
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_MS: int = 100  # Report callbacks blocking longer than this
+    LOOP_WATCHDOG_INTERVAL_MS: int = 50
+
+    IDENTITY_CACHE_TTL_SECONDS: int = 30  # Staleness bound for user changes; 0 disables
+    IDENTITY_CACHE_MAX_ENTRIES: int = 2048
+    IDENTITY_CACHE_REDIS_ENABLED: bool = False  # Share identities between workers
+
+    STRUCTURE_CACHE_MAX_AGE: int = 300  # Seconds clients reuse public questionnaires
+    FILTERED_STRUCTURE_CACHE_SIZE: int = 32  # Distinct section selections kept
+
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses go uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Per-response; precompressed payloads use 11
+
+    PROFILER_MAX_SECONDS: int = 60  # Longest admin sampling profile
+
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str | None = None  # Shared by workers; empty it on deploy
+    METRICS_FLUSH_SECONDS: int = 5
+    METRICS_ALLOWED_NETWORKS: list[str] = [
+        "127.0.0.1/32",
+        "::1/128",
+    ]  # Scrapers from these networks skip admin auth
+
     SCORING_V2_ENABLED: bool = False
     QUESTION_LIBRARY_VERSION: str = "v1.0"
     ENHANCED_REPORT_EXPLANATIONS: bool = False
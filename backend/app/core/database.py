@@ -1,5 +1,7 @@
 import logging
+import re
 import time
+from functools import lru_cache
 
 import sentry_sdk
 from sqlalchemy import create_engine, event
@@ -7,6 +9,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.prometheus import db_query_duration
+from app.core.query_stats import record_query
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,21 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+STATEMENT_TABLE_PATTERN = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|JOIN)\s+\"?([A-Za-z_][\w.]*)", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(statement: str) -> str:
+    """Reduce a statement to its operation and main table, e.g. 'select reports'"""
+    words = statement.split(None, 1)
+    if not words:
+        return "unknown"
+    operation = words[0].lower()
+    match = STATEMENT_TABLE_PATTERN.search(statement)
+    return f"{operation} {match.group(1).lower()}" if match else operation
+
 
 @event.listens_for(engine, "before_cursor_execute")
 def before_cursor_execute(
@@ -47,6 +66,10 @@ def after_cursor_execute(
 ) -> None:
     total_time = time.time() - conn.info["query_start_time"].pop()  # type: ignore[attr-defined]
     duration_ms = total_time * 1000
+    db_query_duration.observe(
+        total_time, fingerprint=statement_fingerprint(str(statement))
+    )
+    record_query(str(statement), total_time)
 
     if duration_ms > SLOW_QUERY_THRESHOLD:
         logger.warning(f"Slow query ({duration_ms:.2f}ms): {str(statement)[:200]}")  # type: ignore[index]
@@ -0,0 +1,147 @@
+"""Event loop lag watchdog
+
+A heartbeat task sleeps for a fixed interval and measures how late it wakes
+up. A helper thread watches the heartbeat; once it is overdue by more than the
+threshold the loop is stuck in a callback, so the helper samples the loop
+thread's stack while the blocking code is still running. When the heartbeat
+resumes, the block is reported with its full duration, the sampled stack and
+the route being served: a log line, Prometheus counters and a Sentry event
+tagged with the route and blocking location.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from types import FrameType
+
+import sentry_sdk
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.prometheus import (
+    event_loop_blocked,
+    event_loop_blocked_seconds,
+    event_loop_lag,
+)
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_LOG_DEPTH = 12
+
+
+@dataclass
+class BlockSample:
+    beat: float
+    route: str
+    location: str
+    stack: list[traceback.FrameSummary]
+
+
+def route_of(frame: FrameType | None) -> str:
+    """The route a stack is serving, from the Starlette Route.handle frame"""
+    while frame is not None:
+        if frame.f_code.co_name == "handle":
+            route = frame.f_locals.get("self")
+            if isinstance(route, Route):
+                scope = frame.f_locals.get("scope") or {}
+                return f"{scope.get('method', '')} {route.path}".strip()
+        frame = frame.f_back
+    return "background"
+
+
+def blocking_location(stack: list[traceback.FrameSummary]) -> str:
+    """Innermost frame in application code, else the innermost frame"""
+    for entry in reversed(stack):
+        if entry.filename.startswith(APP_ROOT):
+            path = os.path.relpath(entry.filename, os.path.dirname(APP_ROOT))
+            return f"{path}:{entry.lineno} {entry.name}"
+    if not stack:
+        return "unknown"
+    entry = stack[-1]
+    return f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+
+
+class LoopWatchdog:
+    def __init__(self, threshold_ms: int, interval_ms: int):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._sample: BlockSample | None = None
+        self._stop = threading.Event()
+
+    def sample_loop_stack(self, beat: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id or 0)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        self._sample = BlockSample(
+            beat=beat,
+            route=route_of(frame),
+            location=blocking_location(stack),
+            stack=stack,
+        )
+
+    def watch(self) -> None:
+        """Helper thread: sample the loop's stack once per overdue heartbeat"""
+        sampled_beat = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval
+            if beat != sampled_beat and overdue > self.threshold:
+                sampled_beat = beat
+                try:
+                    self.sample_loop_stack(beat)
+                except Exception as e:
+                    logger.debug(f"Failed to sample event loop stack: {e}")
+
+    def report(self, blocked_seconds: float, sample: BlockSample) -> None:
+        blocked_ms = blocked_seconds * 1000
+        event_loop_blocked.inc(route=sample.route, location=sample.location)
+        event_loop_blocked_seconds.inc(
+            blocked_seconds, route=sample.route, location=sample.location
+        )
+        stack = "".join(traceback.format_list(sample.stack[-STACK_LOG_DEPTH:]))
+        logger.warning(
+            f"Event loop blocked for {blocked_ms:.0f}ms in {sample.route} "
+            f"at {sample.location}\n{stack}"
+        )
+        # Reported from the watchdog task, whose scope is not the blocked
+        # request's, so the event carries the route and location itself
+        if settings.SENTRY_DSN:
+            sentry_sdk.capture_message(
+                f"Event loop blocked for {blocked_ms:.0f}ms",
+                level="warning",
+                tags={"route": sample.route, "location": sample.location},
+                extras={"blocked_ms": blocked_ms, "stack": stack},
+                fingerprint=["event-loop-blocked", sample.route, sample.location],
+            )
+
+    async def run(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        thread.start()
+        try:
+            while True:
+                beat = time.monotonic()
+                self._last_beat = beat
+                await asyncio.sleep(self.interval)
+                lag = max(time.monotonic() - beat - self.interval, 0.0)
+                event_loop_lag.observe(lag)
+
+                sample, self._sample = self._sample, None
+                if lag >= self.threshold and sample and sample.beat == beat:
+                    self.report(lag, sample)
+        finally:
+            self._stop.set()
+
+
+async def run_loop_watchdog(threshold_ms: int, interval_ms: int) -> None:
+    """Measure event loop lag until cancelled"""
+    await LoopWatchdog(threshold_ms, interval_ms).run()
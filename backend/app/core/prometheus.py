@@ -0,0 +1,453 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Each uvicorn worker keeps its own counters, gauges and histograms. When
+``METRICS_MULTIPROC_DIR`` is set every worker periodically writes a snapshot
+to ``metrics_<pid>.json`` in that directory and a scrape merges all of them,
+so any worker can answer for the whole process group.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+SNAPSHOT_PREFIX = "metrics_"
+
+Labels = tuple[str, ...]
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> dict[Labels, Any]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Metric):
+    """A value that goes up and down.
+
+    ``multiprocess_mode="livesum"`` adds up the values of all running workers.
+    ``"local"`` gauges are refreshed by a collector in whichever worker serves
+    the scrape (e.g. queue depths read from the database), so they are never
+    written to snapshot files and are not summed.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        multiprocess_mode: str = "livesum",
+    ):
+        super().__init__(name, documentation, labelnames)
+        if multiprocess_mode not in ("livesum", "local"):
+            raise ValueError(f"Unknown multiprocess_mode {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def snapshot(self) -> dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), sum
+        self._values: dict[Labels, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> dict[Labels, dict[str, Any]]:
+        with self._lock:
+            return {
+                key: {"buckets": list(counts), "sum": total}
+                for key, (counts, total) in self._values.items()
+            }
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{n}="{escape_label(v)}"' for n, v in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def pid_is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """Holds the metrics of one process and merges snapshots across workers"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before a scrape"""
+        self._collectors.append(collector)
+
+    def run_collectors(self) -> None:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+
+    def snapshot(self, include_local: bool = True) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "metrics": {
+                name: {
+                    "kind": metric.kind,
+                    "values": [
+                        [list(key), value] for key, value in metric.snapshot().items()
+                    ],
+                }
+                for name, metric in self._metrics.items()
+                if include_local or getattr(metric, "multiprocess_mode", "") != "local"
+            },
+        }
+
+    def write_snapshot(self, directory: str) -> Path:
+        """Atomically write this process's metrics for other workers to read"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        target = path / f"{SNAPSHOT_PREFIX}{os.getpid()}.json"
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot(include_local=False)), encoding="utf-8")
+        os.replace(tmp, target)
+        return target
+
+    def _load_snapshots(self, directory: str | None) -> list[dict[str, Any]]:
+        own = self.snapshot()
+        if not directory:
+            return [own]
+
+        snapshots = [own]
+        for path in sorted(Path(directory).glob(f"{SNAPSHOT_PREFIX}*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+                continue
+            if data.get("pid") == own["pid"]:
+                continue
+            snapshots.append(data)
+        return snapshots
+
+    def collect(self, multiprocess_dir: str | None = None) -> dict[str, dict]:
+        """Merge snapshots: counters and histograms sum across every worker that
+        ever wrote one, gauges only across workers that are still running"""
+        self.run_collectors()
+        merged: dict[str, dict[Labels, Any]] = {name: {} for name in self._metrics}
+
+        for snapshot in self._load_snapshots(multiprocess_dir):
+            live = snapshot["pid"] == os.getpid() or pid_is_alive(snapshot["pid"])
+            for name, data in snapshot["metrics"].items():
+                metric = self._metrics.get(name)
+                if metric is None or metric.kind != data["kind"]:
+                    continue
+                if metric.kind == "gauge" and not live:
+                    continue
+                values = merged[name]
+                for raw_key, value in data["values"]:
+                    key = tuple(raw_key)
+                    if metric.kind == "histogram":
+                        current = values.get(
+                            key, {"buckets": [0] * len(value["buckets"]), "sum": 0.0}
+                        )
+                        if len(current["buckets"]) != len(value["buckets"]):
+                            continue
+                        values[key] = {
+                            "buckets": [
+                                a + b
+                                for a, b in zip(
+                                    current["buckets"], value["buckets"], strict=True
+                                )
+                            ],
+                            "sum": current["sum"] + value["sum"],
+                        }
+                    else:
+                        values[key] = values.get(key, 0.0) + value
+        return merged
+
+    def render(self, multiprocess_dir: str | None = None) -> str:
+        merged = self.collect(multiprocess_dir)
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(merged[name].items()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    bounds = [*metric.buckets, math.inf]
+                    for bound, count in zip(bounds, value["buckets"], strict=True):
+                        cumulative += count
+                        labels = format_labels(
+                            (*metric.labelnames, "le"), (*key, format_value(bound))
+                        )
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = format_labels(metric.labelnames, key)
+                    lines.append(f"{name}_sum{labels} {format_value(value['sum'])}")
+                    lines.append(f"{name}_count{labels} {cumulative}")
+                else:
+                    labels = format_labels(metric.labelnames, key)
+                    lines.append(f"{name}{labels} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+async def run_metrics_flush_loop(directory: str, interval_seconds: int) -> None:
+    """Write this worker's snapshot every interval_seconds until cancelled"""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(registry.write_snapshot, directory)
+            except OSError as e:
+                logger.warning(f"Failed to write metrics snapshot: {e}")
+    finally:
+        # Keep the counters of a worker that is shutting down
+        try:
+            registry.write_snapshot(directory)
+        except OSError as e:
+            logger.warning(f"Failed to write final metrics snapshot: {e}")
+
+
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route", "status"],
+    )
+)
+db_query_duration = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Database statement latency by fingerprint (operation and main table)",
+        ["fingerprint"],
+        buckets=DB_BUCKETS,
+    )
+)
+redis_operation_duration = registry.register(
+    Histogram(
+        "redis_operation_duration_seconds",
+        "Redis command latency",
+        ["operation"],
+        buckets=DB_BUCKETS,
+    )
+)
+cache_requests = registry.register(
+    Counter(
+        "cache_requests_total",
+        "Cache lookups by cache and result (hit or miss)",
+        ["cache", "result"],
+    )
+)
+openai_request_duration = registry.register(
+    Histogram(
+        "openai_request_duration_seconds",
+        "OpenAI request latency",
+        ["key_id", "model", "call_type"],
+    )
+)
+openai_tokens = registry.register(
+    Counter(
+        "openai_tokens_total",
+        "OpenAI tokens used by key, model, call type and kind",
+        ["key_id", "model", "call_type", "kind"],
+    )
+)
+report_stage_duration = registry.register(
+    Histogram(
+        "report_stage_duration_seconds",
+        "Report generation time per stage",
+        ["report_type", "stage"],
+    )
+)
+queue_depth = registry.register(
+    Gauge(
+        "queue_depth",
+        "Work waiting or in progress, by queue and status",
+        ["queue", "status"],
+        multiprocess_mode="local",
+    )
+)
+event_loop_lag = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "How late the loop watchdog heartbeat woke up",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+)
+event_loop_blocked = registry.register(
+    Counter(
+        "event_loop_blocked_total",
+        "Callbacks that blocked the event loop past the watchdog threshold",
+        ["route", "location"],
+    )
+)
+event_loop_blocked_seconds = registry.register(
+    Counter(
+        "event_loop_blocked_seconds_total",
+        "Time the event loop spent blocked, by route and code location",
+        ["route", "location"],
+    )
+)
+
+
+def observe_openai_call(
+    key_id: str | None,
+    model: str,
+    call_type: str,
+    latency_seconds: float,
+    usage: Any,
+) -> None:
+    """Record one completed OpenAI request; usage is the response's usage block"""
+    key = key_id or "env"
+    openai_request_duration.observe(
+        latency_seconds, key_id=key, model=model, call_type=call_type
+    )
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        openai_tokens.inc(
+            tokens if isinstance(tokens, int) else 0,
+            key_id=key,
+            model=model,
+            call_type=call_type,
+            kind=kind,
+        )
@@ -0,0 +1,69 @@
+"""Request-scoped SQL query accounting
+
+The cursor hooks in app.core.database report every statement here. Inside a
+track_queries() block the statements are counted against that block only;
+Starlette copies the request context into the threadpool that runs sync
+dependencies and endpoints, so one block sees a whole request.
+"""
+
+import contextvars
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class QueryStats:
+    """Count, total time and repeats of the statements run in one scope"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += duration_seconds
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements (with bound parameters, so identical text) run at least
+        threshold times, most frequent first"""
+        with self._lock:
+            return [
+                (statement, count)
+                for statement, count in self.statements.most_common()
+                if count >= threshold
+            ]
+
+    def describe(self, limit: int = 5) -> str:
+        with self._lock:
+            lines = [f"{self.count} queries in {self.total_seconds * 1000:.1f}ms"]
+            lines.extend(
+                f"  {count}x {' '.join(statement.split())[:200]}"
+                for statement, count in self.statements.most_common(limit)
+            )
+        return "\n".join(lines)
+
+
+_current_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def record_query(statement: str, duration_seconds: float) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_seconds)
@@ -0,0 +1,153 @@
+"""JSON rendering and response compression
+
+JSON is rendered compactly by orjson. Payloads that only change with the
+questionnaire are serialized and compressed once (PrecompressedPayload) and
+served as raw bytes in whichever encoding the client accepts. Each encoding
+has its own strong ETag ("<hash>", "<hash>-gzip", "<hash>-br"), and any of
+them answers If-None-Match with 304 Not Modified.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+import brotli
+import orjson
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+JSON_MEDIA_TYPE = "application/json"
+ETAG_ENCODINGS = ("br", "gzip")
+
+
+def json_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """The app's default response class: JSONResponse rendered by json_dumps"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """The best encoding the client accepts: br, then gzip"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress with the named encoding; level None means maximum"""
+    if encoding == "br":
+        return bytes(brotli.compress(body, quality=11 if level is None else level))
+    return gzip.compress(body, compresslevel=9 if level is None else level, mtime=0)
+
+
+def content_etag(body: bytes) -> str:
+    # Hash of the content rather than of the questionnaire mtime, so every
+    # replica hands out the same tag for the same questions file
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    """The tag of one representation: a strong tag must differ per encoding"""
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def identity_etag(etag: str) -> str:
+    for encoding in ETAG_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: a W/ prefix is ignored, and the tag
+    of any encoding of the same content matches"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or identity_etag(candidate.removeprefix("W/")) == etag:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class PrecompressedPayload:
+    """A JSON body with its encodings, built once at maximum compression
+
+    compressed=False skips the encodings for one-off payloads; the compression
+    middleware then compresses them at its cheaper per-request level.
+    """
+
+    identity: bytes
+    encodings: dict[str, bytes]
+    etag: str
+
+    @classmethod
+    def from_content(
+        cls, content: Any, compressed: bool = True
+    ) -> "PrecompressedPayload":
+        body = content if isinstance(content, bytes) else json_dumps(content)
+        encodings = {}
+        if compressed:
+            encodings["gzip"] = compress(body, "gzip")
+            encodings["br"] = compress(body, "br")
+        return cls(identity=body, encodings=encodings, etag=content_etag(body))
+
+
+class PrecompressedResponse(Response):
+    """Serve a PrecompressedPayload in the encoding the request accepts
+
+    Answers 304 Not Modified, without a body, when If-None-Match carries the
+    ETag of any of the payload's encodings.
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        payload: PrecompressedPayload,
+        request: Request,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        cache_control: str | None = None,
+    ):
+        encoding = accepted_encoding(request.headers.get("accept-encoding", ""))
+        body = payload.encodings.get(encoding or "")
+        if body is None:
+            encoding = None
+
+        if etag_matches(request.headers.get("if-none-match", ""), payload.etag):
+            super().__init__(status_code=304, headers=headers)
+        else:
+            super().__init__(
+                content=body if body is not None else payload.identity,
+                status_code=status_code,
+                headers=headers,
+            )
+            if encoding:
+                self.headers["Content-Encoding"] = encoding
+        self.headers["Vary"] = "Accept-Encoding"
+        self.headers["ETag"] = encoded_etag(payload.etag, encoding)
+        if cache_control:
+            self.headers["Cache-Control"] = cache_control
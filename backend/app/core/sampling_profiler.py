@@ -0,0 +1,205 @@
+"""On-demand sampling profiler
+
+A helper thread reads every thread's stack through sys._current_frames() at a
+fixed interval; nothing is hooked into the interpreter, so code runs at full
+speed and the overhead is bounded by the interval and the duration. Samples
+can be restricted to the threads serving a route pattern or generating one
+report, and idle threads (waiting on a lock, queue or selector) are skipped.
+Only the worker process serving the request is profiled.
+
+Output is a speedscope file (https://www.speedscope.app) with one sampled
+profile per thread, or collapsed stacks for flamegraph.pl.
+"""
+
+import inspect
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from fnmatch import fnmatchcase
+from types import CodeType, FrameType
+from typing import Any
+
+from starlette.routing import BaseRoute, Route
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_STACK_DEPTH = 128
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another profile is already running in this process"""
+
+
+def endpoint_routes(routes: Iterable[BaseRoute]) -> dict[CodeType, str]:
+    """Map each endpoint's code object to "METHODS /path"; rate limiting and
+    other decorators are unwrapped so the code is the one that runs"""
+    codes = {}
+    for route in routes:
+        if not isinstance(route, Route):
+            continue
+        endpoint = inspect.unwrap(route.endpoint)
+        code = getattr(endpoint, "__code__", None)
+        if code is not None:
+            methods = ",".join(sorted(route.methods or []))
+            codes[code] = f"{methods} {route.path}".strip()
+    return codes
+
+
+def frame_label(frame: FrameType) -> tuple[str, str, int]:
+    code = frame.f_code
+    return (
+        getattr(code, "co_qualname", code.co_name),
+        code.co_filename,
+        frame.f_lineno,
+    )
+
+
+class SampleFilter:
+    def __init__(
+        self,
+        routes: dict[CodeType, str],
+        route_pattern: str | None = None,
+        report_id: str | None = None,
+        include_idle: bool = False,
+    ):
+        self.routes = routes
+        self.route_pattern = route_pattern
+        self.report_id = report_id
+        self.include_idle = include_idle
+
+    def is_idle(self, frame: FrameType) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+    def accepts(self, stack: list[FrameType]) -> bool:
+        """stack runs root to leaf"""
+        if not self.include_idle and self.is_idle(stack[-1]):
+            return False
+        if self.route_pattern is not None:
+            route = next(
+                (self.routes[f.f_code] for f in stack if f.f_code in self.routes),
+                None,
+            )
+            if route is None or not (
+                fnmatchcase(route, self.route_pattern)
+                or fnmatchcase(route.split(" ", 1)[-1], self.route_pattern)
+            ):
+                return False
+        if self.report_id is not None:
+            return any(
+                f.f_locals.get("report_id") == self.report_id
+                for f in stack
+                if f.f_code.co_filename.startswith(APP_ROOT)
+            )
+        return True
+
+
+class SamplingProfiler:
+    """Collects stacks for one profiling run; see module docstring"""
+
+    def __init__(self, sample_filter: SampleFilter, interval_ms: int):
+        self.filter = sample_filter
+        self.interval_ms = interval_ms
+        self.frames: list[tuple[str, str, int]] = []
+        self.frame_index: dict[tuple[str, str, int], int] = {}
+        self.samples: dict[int, list[tuple[list[int], float]]] = {}
+        self.thread_names: dict[int, str] = {}
+        self.sample_count = 0
+        self.duration = 0.0
+
+    def index(self, label: tuple[str, str, int]) -> int:
+        index = self.frame_index.get(label)
+        if index is None:
+            index = self.frame_index[label] = len(self.frames)
+            self.frames.append(label)
+        return index
+
+    def sample(self, weight: float) -> None:
+        own_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack: list[FrameType] = []
+            current: FrameType | None = frame
+            while current is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(current)
+                current = current.f_back
+            stack.reverse()
+            if not self.filter.accepts(stack):
+                continue
+            indexes = [self.index(frame_label(f)) for f in stack]
+            self.samples.setdefault(thread_id, []).append((indexes, weight))
+            self.sample_count += 1
+
+    def run(self, seconds: float) -> None:
+        """Sample for `seconds`; only one run at a time per process"""
+        if not _profile_lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        try:
+            threads = {t.ident: t.name for t in threading.enumerate()}
+            started = time.perf_counter()
+            deadline = started + seconds
+            last = None
+            while (now := time.perf_counter()) < deadline:
+                self.sample((now - last) * 1000 if last else self.interval_ms)
+                last = now
+                time.sleep(self.interval_ms / 1000)
+            self.duration = time.perf_counter() - started
+            self.thread_names = {
+                thread_id: threads.get(thread_id) or f"thread-{thread_id}"
+                for thread_id in self.samples
+            }
+        finally:
+            _profile_lock.release()
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        profiles = []
+        for thread_id, samples in self.samples.items():
+            weights = [round(weight, 3) for _, weight in samples]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": self.thread_names.get(thread_id, str(thread_id)),
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": [stack for stack, _ in samples],
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "assessment-api sampling profiler",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": fn, "file": file, "line": line}
+                    for fn, file, line in self.frames
+                ]
+            },
+            "profiles": profiles,
+        }
+
+    def collapsed(self) -> str:
+        """flamegraph.pl input: "thread;root;...;leaf count" per stack"""
+        counts: dict[str, int] = {}
+        for thread_id, samples in self.samples.items():
+            thread = self.thread_names.get(thread_id, str(thread_id))
+            for stack, _ in samples:
+                names = [thread] + [
+                    f"{self.frames[i][0]} ({os.path.basename(self.frames[i][1])})"
+                    for i in stack
+                ]
+                key = ";".join(names)
+                counts[key] = counts.get(key, 0) + 1
+        return "".join(f"{stack} {count}\n" for stack, count in counts.items())
@@ -0,0 +1 @@
+"""Local development and load-testing tools"""
@@ -0,0 +1,484 @@
+"""Load generator for the assessment lifecycle
+
+Each synthetic user registers, logs in, fetches /structure, starts an
+assessment, answers it over repeated save-progress calls, completes it, polls
+the standard report until it is ready and downloads it. With --ai-reports the
+user also requests an AI report, which an admin session generates (against the
+OpenAI stand-in when the stack is local) and the user then downloads.
+
+The run writes a JSON summary with per-endpoint latency percentiles, error
+rates and DB query counts, so successive runs can be diffed.
+
+Against a running deployment:
+
+    python -m app.devtools.loadgen --target http://127.0.0.1:8000 --users 50
+
+Or start the app and the OpenAI stand-in in-process (SQLite or Postgres):
+
+    python -m app.devtools.loadgen --database-url sqlite:///./loadgen.db \\
+        --users 200 --concurrency 50 --output loadgen.json
+
+DB query counts come from the X-DB-Queries header, which the app sends
+outside production.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import time
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from pydantic import BaseModel
+
+from app.devtools.server import BackgroundServer
+from app.utils.stats import latency_percentiles
+
+QUERY_COUNT_HEADER = "X-DB-Queries"
+USER_PASSWORD = "Loadgen-Passw0rd!"
+ADMIN_EMAIL = "loadgen-admin@example.com"
+READY_STATUSES = {"completed", "released"}
+
+
+class LoadgenConfig(BaseModel):
+    """Shape of one load run"""
+
+    users: int = 20
+    concurrency: int = 10
+    sections: int | None = None  # answer only the first N sections
+    save_batch_size: int = 25
+    think_time: float = 0.0  # seconds between save-progress calls
+    poll_interval: float = 0.5
+    poll_timeout: float = 120.0
+    ai_reports: bool = False
+    admin_email: str | None = None
+    admin_password: str | None = None
+    seed: int = 0
+
+
+class EndpointRecorder:
+    """Latency, status and DB query count of every request, by endpoint"""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[tuple[float, int, int | None]]] = {}
+
+    def record(
+        self, endpoint: str, latency_ms: float, status: int, queries: int | None
+    ) -> None:
+        self.samples.setdefault(endpoint, []).append((latency_ms, status, queries))
+
+    def summary(self) -> dict[str, Any]:
+        endpoints = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            errors = [status for _, status, _ in samples if not 0 < status < 400]
+            queries = [q for _, _, q in samples if q is not None]
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": len(errors),
+                "error_rate": round(len(errors) / len(samples), 4),
+                "status_counts": dict(Counter(str(s) for _, s, _ in samples)),
+                "latency_ms": {
+                    k: round(v, 2)
+                    for k, v in latency_percentiles([s[0] for s in samples]).items()
+                },
+                "db_queries": {
+                    "mean": round(sum(queries) / len(queries), 2),
+                    "max": max(queries),
+                    "total": sum(queries),
+                }
+                if queries
+                else None,
+            }
+        return endpoints
+
+
+class LoadSession:
+    """One authenticated client whose requests are recorded by endpoint"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: EndpointRecorder):
+        self.client = client
+        self.recorder = recorder
+        self.headers: dict[str, str] = {}
+
+    async def call(
+        self, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, url, headers=self.headers, **kwargs
+            )
+        except httpx.HTTPError:
+            self.recorder.record(
+                endpoint, (time.perf_counter() - start) * 1000, 0, None
+            )
+            return None
+
+        queries = response.headers.get(QUERY_COUNT_HEADER)
+        self.recorder.record(
+            endpoint,
+            (time.perf_counter() - start) * 1000,
+            response.status_code,
+            int(queries) if queries is not None else None,
+        )
+        return response
+
+    async def login(self, email: str, password: str) -> bool:
+        response = await self.call(
+            "login",
+            "POST",
+            "/api/auth/login",
+            json={"email": email, "password": password},
+        )
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def wait_for_report(
+        self, report_id: str, config: LoadgenConfig
+    ) -> str | None:
+        """Poll a report's status until it is ready or failed; None on timeout"""
+        deadline = time.monotonic() + config.poll_timeout
+        while time.monotonic() < deadline:
+            response = await self.call(
+                "report_status", "GET", f"/api/reports/{report_id}/status"
+            )
+            if response is not None and response.status_code == 200:
+                report_status = str(response.json()["status"])
+                if report_status in READY_STATUSES | {"failed"}:
+                    return report_status
+            await asyncio.sleep(config.poll_interval)
+        return None
+
+    async def find_report(self, report_type: str, config: LoadgenConfig) -> str | None:
+        """ID of the current user's report of the given type, once it exists"""
+        deadline = time.monotonic() + config.poll_timeout
+        while time.monotonic() < deadline:
+            response = await self.call(
+                "user_reports", "GET", "/api/reports/user/reports"
+            )
+            if response is not None and response.status_code == 200:
+                for report in response.json()["items"]:
+                    if report["report_type"] == report_type:
+                        return str(report["id"])
+            await asyncio.sleep(config.poll_interval)
+        return None
+
+
+def build_answers(
+    structure: dict[str, Any], section_ids: list[str], rng: random.Random
+) -> list[dict[str, Any]]:
+    """One answer per question of the selected sections, drawn from its options"""
+    answers = []
+    for section in structure["sections"]:
+        if section["id"] not in section_ids:
+            continue
+        for question in section["questions"]:
+            options = question.get("options") or []
+            answers.append(
+                {
+                    "section_id": section["id"],
+                    "question_id": question["id"],
+                    "answer_value": rng.choice(options)["value"] if options else "yes",
+                }
+            )
+    return answers
+
+
+async def run_user(
+    client: httpx.AsyncClient,
+    recorder: EndpointRecorder,
+    config: LoadgenConfig,
+    email: str,
+    rng: random.Random,
+    admin: LoadSession | None,
+) -> str | None:
+    """Drive one user through the lifecycle. Returns the failure reason, if any."""
+    session = LoadSession(client, recorder)
+
+    response = await session.call(
+        "register",
+        "POST",
+        "/api/auth/register",
+        json={
+            "email": email,
+            "password": USER_PASSWORD,
+            "full_name": "Load Test",
+            "company_name": "Loadgen Ltd",
+        },
+    )
+    if response is None or response.status_code != 200:
+        return "register"
+    if not await session.login(email, USER_PASSWORD):
+        return "login"
+
+    response = await session.call("structure", "GET", "/api/assessment/structure")
+    if response is None or response.status_code != 200:
+        return "structure"
+    structure = response.json()
+    section_ids = [section["id"] for section in structure["sections"]]
+    if config.sections:
+        section_ids = section_ids[: config.sections]
+
+    response = await session.call(
+        "start",
+        "POST",
+        "/api/assessment/start",
+        json={"selected_section_ids": section_ids} if config.sections else None,
+    )
+    if response is None or response.status_code != 200:
+        return "start"
+    assessment_id = response.json()["id"]
+
+    answers = build_answers(structure, section_ids, rng)
+    for offset in range(0, len(answers), config.save_batch_size):
+        response = await session.call(
+            "save_progress",
+            "POST",
+            f"/api/assessment/{assessment_id}/save-progress",
+            json={"responses": answers[offset : offset + config.save_batch_size]},
+        )
+        if response is None or response.status_code != 200:
+            return "save_progress"
+        if config.think_time:
+            await asyncio.sleep(config.think_time)
+
+    response = await session.call(
+        "complete", "POST", f"/api/assessment/{assessment_id}/complete"
+    )
+    if response is None or response.status_code != 200:
+        return "complete"
+
+    report_types = ["standard"]
+    if admin is not None:
+        response = await session.call(
+            "request_ai_report",
+            "POST",
+            f"/api/reports/{assessment_id}/request-ai-report",
+            json={},
+        )
+        if response is None or response.status_code != 200:
+            return "request_ai_report"
+        report_types.append("ai_enhanced")
+
+    for report_type in report_types:
+        report_id = await session.find_report(report_type, config)
+        if report_id is None:
+            return f"{report_type}_report_missing"
+
+        if report_type == "ai_enhanced" and admin is not None:
+            response = await admin.call(
+                "admin_generate_ai",
+                "POST",
+                f"/api/reports/admin/{report_id}/generate-ai",
+            )
+            if response is None or response.status_code != 200:
+                return "admin_generate_ai"
+
+        report_status = await session.wait_for_report(report_id, config)
+        if report_status is None:
+            return f"{report_type}_report_timeout"
+        if report_status == "failed":
+            return f"{report_type}_report_failed"
+
+        response = await session.call(
+            "download", "GET", f"/api/reports/{report_id}/download"
+        )
+        if response is None or response.status_code != 200:
+            return "download"
+
+    return None
+
+
+async def run_load(
+    config: LoadgenConfig,
+    base_url: str = "http://testserver",
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Any]:
+    """Run config.users users with bounded concurrency and summarise the run"""
+    recorder = EndpointRecorder()
+    run_id = uuid.uuid4().hex[:8]
+    slots = asyncio.Semaphore(config.concurrency)
+    failures: Counter[str] = Counter()
+    user_durations: list[float] = []
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_connections=config.concurrency * 2),
+    ) as client:
+        admin = None
+        if config.ai_reports:
+            admin = LoadSession(client, recorder)
+            if not config.admin_email or not await admin.login(
+                config.admin_email, config.admin_password or ""
+            ):
+                raise RuntimeError("--ai-reports needs working admin credentials")
+
+        async def user(index: int) -> None:
+            async with slots:
+                start = time.perf_counter()
+                failure = await run_user(
+                    client,
+                    recorder,
+                    config,
+                    f"loadgen-{run_id}-{index}@example.com",
+                    random.Random(config.seed + index),
+                    admin,
+                )
+                if failure:
+                    failures[failure] += 1
+                else:
+                    user_durations.append(time.perf_counter() - start)
+
+        started_at = datetime.now(UTC)
+        start = time.perf_counter()
+        await asyncio.gather(*(user(index) for index in range(config.users)))
+        duration = time.perf_counter() - start
+
+    return {
+        "run_id": run_id,
+        "started_at": started_at.isoformat(),
+        "duration_seconds": round(duration, 3),
+        "config": config.model_dump(exclude={"admin_password"}),
+        "users": {
+            "completed": len(user_durations),
+            "failed": sum(failures.values()),
+            "failures": dict(failures),
+            "lifecycle_seconds": {
+                k: round(v, 3) for k, v in latency_percentiles(user_durations).items()
+            },
+            "completed_per_second": round(len(user_durations) / duration, 3)
+            if duration
+            else 0,
+        },
+        "endpoints": recorder.summary(),
+    }
+
+
+class LocalStack:
+    """The app and the OpenAI stand-in on background threads
+
+    Settings are read at import time, so prepare_environment() must run before
+    anything under app.core is imported.
+    """
+
+    def __init__(self, stub_profile: str = "fast"):
+        self.stub_profile = stub_profile
+        self.admin_password = secrets.token_urlsafe(16) + "A1!"
+        self.stub: Any = None
+        self.server: BackgroundServer | None = None
+
+    @staticmethod
+    def prepare_environment(database_url: str) -> None:
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        os.environ.setdefault("JWT_SECRET_KEY", secrets.token_urlsafe(32))
+
+    def start(self) -> str:
+        from cryptography.fernet import Fernet
+
+        from app.core.config import settings
+        from app.core.database import Base, SessionLocal, engine
+        from app.core.security import get_password_hash
+        from app.devtools.openai_stub import OpenAIStubServer, StubConfig
+        from app.main import app
+        from app.services.openai_key_manager import OpenAIKeyManager
+
+        Base.metadata.create_all(bind=engine)
+
+        self.stub = OpenAIStubServer(StubConfig(profile=self.stub_profile))
+        self.stub.start()
+        settings.OPENAI_BASE_URL = self.stub.base_url
+        settings.ADMIN_EMAIL = ADMIN_EMAIL
+        settings.ADMIN_PASSWORD_HASH = get_password_hash(self.admin_password)
+        if not settings.OPENAI_KEYS_ENCRYPTION_KEY:
+            settings.OPENAI_KEYS_ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+        with OpenAIKeyManager(SessionLocal()) as key_manager:
+            if not key_manager.count_available_keys():
+                key_manager.add_key("loadgen", "sk-loadgen-stub", ADMIN_EMAIL)
+
+        self.server = BackgroundServer(app, lifespan="on")
+        self.server.start(timeout=30)
+        return self.server.url
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.stop()
+        if self.stub:
+            self.stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", help="Base URL of a running deployment")
+    target.add_argument(
+        "--database-url", help="Start the app in-process against this database"
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--sections", type=int, help="Answer only the first N sections")
+    parser.add_argument("--save-batch-size", type=int, default=25)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--poll-timeout", type=float, default=120.0)
+    parser.add_argument("--ai-reports", action="store_true")
+    parser.add_argument("--admin-email", help="Admin login for --ai-reports")
+    parser.add_argument("--admin-password")
+    parser.add_argument(
+        "--stub-profile", default="fast", help="OpenAI stand-in latency profile"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON summary here")
+    args = parser.parse_args()
+
+    config = LoadgenConfig(
+        users=args.users,
+        concurrency=args.concurrency,
+        sections=args.sections,
+        save_batch_size=args.save_batch_size,
+        think_time=args.think_time,
+        poll_interval=args.poll_interval,
+        poll_timeout=args.poll_timeout,
+        ai_reports=args.ai_reports,
+        admin_email=args.admin_email,
+        admin_password=args.admin_password,
+        seed=args.seed,
+    )
+
+    stack = None
+    base_url = args.target
+    if args.database_url:
+        LocalStack.prepare_environment(args.database_url)
+        stack = LocalStack(stub_profile=args.stub_profile)
+        base_url = stack.start()
+        config.admin_email = config.admin_email or ADMIN_EMAIL
+        config.admin_password = config.admin_password or stack.admin_password
+
+    try:
+        summary = asyncio.run(run_load(config, base_url=base_url))
+        if stack is not None:
+            summary["openai_stub"] = stack.stub.stats.summary()
+    finally:
+        if stack is not None:
+            stack.stop()
+
+    output = json.dumps(summary, indent=2, default=str)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
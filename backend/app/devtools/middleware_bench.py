@@ -0,0 +1,127 @@
+"""Per-request overhead of the HTTP middleware stack
+
+Calls the app in-process over raw ASGI (no sockets, no HTTP client) and times
+each path through the full middleware stack and through the same app built
+without its user middleware; the difference is what the middleware costs per
+request. Rate limiting is switched off so it does not reject the run.
+
+    python -m app.devtools.middleware_bench --requests 5000
+    python -m app.devtools.middleware_bench --path /health/live --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from app.utils.stats import latency_percentiles
+
+DEFAULT_PATHS = ["/health/live", "/api/assessment/structure"]
+
+
+def request_scope(path: str) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def call(app: Any, path: str) -> int:
+    status = 0
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(request_scope(path), receive, send)
+    return status
+
+
+def without_middleware(app: Any) -> Any:
+    """The app's ASGI stack minus add_middleware() entries (exception
+    handling and routing only)"""
+    user_middleware = app.user_middleware
+    app.user_middleware = []
+    try:
+        return app.build_middleware_stack()
+    finally:
+        app.user_middleware = user_middleware
+
+
+async def time_requests(app: Any, path: str, requests: int) -> list[float]:
+    """Per-request latency in microseconds, after a warm-up"""
+    for _ in range(min(requests, 100)):
+        await call(app, path)
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        status = await call(app, path)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+    return samples
+
+
+async def benchmark(paths: Iterable[str], requests: int) -> dict[str, Any]:
+    from app.main import app
+    from app.middleware.rate_limit import limiter
+
+    stack = app.build_middleware_stack()
+    bare_stack = without_middleware(app)
+    results: dict[str, Any] = {}
+    limiter_enabled, limiter.enabled = limiter.enabled, False
+    try:
+        for path in paths:
+            full = latency_percentiles(await time_requests(stack, path, requests))
+            bare = latency_percentiles(await time_requests(bare_stack, path, requests))
+            results[path] = {
+                "stack_us": {k: round(v, 1) for k, v in full.items()},
+                "bare_us": {k: round(v, 1) for k, v in bare.items()},
+                "overhead_us_p50": round(full["p50"] - bare["p50"], 1),
+            }
+    finally:
+        limiter.enabled = limiter_enabled
+    return {"requests": requests, "paths": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--output", help="Also write the results as JSON here")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args.paths or DEFAULT_PATHS, args.requests))
+
+    print(f"{'path':<32} {'stack p50':>10} {'bare p50':>11} {'overhead':>9}")
+    for path, result in results["paths"].items():
+        print(
+            f"{path:<32} {result['stack_us']['p50']:>8.1f}us "
+            f"{result['bare_us']['p50']:>9.1f}us "
+            f"{result['overhead_us_p50']:>7.1f}us"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""OpenAI-compatible stand-in server for load and failure testing
+
+Serves POST /v1/chat/completions with schema-valid synthetic content (or
+recorded responses) for every call site: section analysis, batched section
+analysis, synthesis and intake recommendations. Latency is drawn from a named
+profile, and 429s, 500s, timeouts and malformed JSON can be injected at fixed
+rates. Per-request stats are kept in memory and served at /_stub/stats.
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1, or use the
+openai_stub pytest fixture. Run standalone with:
+
+    python -m app.devtools.openai_stub --port 8100 --profile realistic
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.devtools.server import BackgroundServer
+from app.services.ai_synthesis import SYNTHESIS_INSTRUCTIONS
+from app.services.intake_prompt_builder import build_system_message
+from app.services.prompt_builder import (
+    SECTION_ANALYSIS_INSTRUCTIONS,
+    SECTION_BATCH_INSTRUCTIONS,
+)
+from app.services.report_generator import (
+    build_fallback_synthesis,
+    create_degraded_artifact,
+)
+from app.services.token_budget import count_message_tokens, count_tokens
+from app.utils.stats import latency_percentiles
+
+logger = logging.getLogger(__name__)
+
+CALL_SECTION = "section"
+CALL_SECTION_BATCH = "section_batch"
+CALL_SYNTHESIS = "synthesis"
+CALL_INTAKE = "intake"
+CALL_OTHER = "other"
+
+# (median seconds, lognormal sigma)
+LATENCY_PROFILES = {
+    "instant": (0.0, 0.0),
+    "fast": (0.2, 0.3),
+    "realistic": (4.0, 0.6),
+    "slow": (15.0, 0.5),
+}
+
+RISK_LEVELS = ("Low", "Medium", "Medium-High", "High", "Critical")
+
+
+class StubConfig(BaseModel):
+    """Behaviour of the stand-in; fault rates are probabilities per request"""
+
+    profile: str = "fast"
+    rate_limit_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    server_error_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    timeout_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    malformed_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    timeout_seconds: float = 120.0  # Longer than the client timeout
+    retry_after_seconds: int = 1
+    seed: int | None = None
+    recordings: dict[str, list[str]] = Field(default_factory=dict)
+
+
+class StubStats:
+    """Per-request records and their summary"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.records: list[dict[str, Any]] = []
+
+    def record(self, **fields: Any) -> None:
+        with self._lock:
+            self.records.append(fields)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            records = list(self.records)
+
+        by_call: dict[str, int] = {}
+        by_outcome: dict[str, int] = {}
+        for record in records:
+            by_call[record["call_type"]] = by_call.get(record["call_type"], 0) + 1
+            by_outcome[record["outcome"]] = by_outcome.get(record["outcome"], 0) + 1
+
+        return {
+            "requests": len(records),
+            "by_call_type": by_call,
+            "by_outcome": by_outcome,
+            "latency_ms": latency_percentiles(
+                [record["latency_ms"] for record in records]
+            ),
+            "prompt_tokens": sum(r.get("prompt_tokens", 0) for r in records),
+            "completion_tokens": sum(r.get("completion_tokens", 0) for r in records),
+        }
+
+
+def classify_request(messages: list[dict[str, Any]]) -> str:
+    """Identify the app call site from the static system prompt"""
+    system = next(
+        (str(m.get("content")) for m in messages if m.get("role") == "system"), ""
+    )
+    if system == SECTION_ANALYSIS_INSTRUCTIONS:
+        return CALL_SECTION
+    if system == SECTION_BATCH_INSTRUCTIONS:
+        return CALL_SECTION_BATCH
+    if system == SYNTHESIS_INSTRUCTIONS:
+        return CALL_SYNTHESIS
+    if system == build_system_message():
+        return CALL_INTAKE
+    return CALL_OTHER
+
+
+def user_content(messages: list[dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content")) for m in messages if m.get("role") == "user")
+
+
+def synthetic_section_artifact(rng: random.Random, section_id: str) -> dict[str, Any]:
+    artifact = create_degraded_artifact(section_id).model_dump()
+    artifact["risk_level"] = rng.choice(RISK_LEVELS)
+    return artifact
+
+
+def synthetic_content(
+    call_type: str, messages: list[dict[str, Any]], rng: random.Random
+) -> str:
+    """Schema-valid JSON for the call site"""
+    content = user_content(messages)
+
+    if call_type == CALL_SECTION:
+        return json.dumps(synthetic_section_artifact(rng, "section"))
+
+    if call_type == CALL_SECTION_BATCH:
+        section_ids = re.findall(r"^Section ID: (\S+)$", content, re.MULTILINE)
+        return json.dumps(
+            {
+                "sections": {
+                    section_id: synthetic_section_artifact(rng, section_id)
+                    for section_id in section_ids
+                }
+            }
+        )
+
+    if call_type == CALL_SYNTHESIS:
+        percentage = rng.uniform(30.0, 90.0)
+        return build_fallback_synthesis(
+            {"overall": {"percentage": round(percentage, 1)}}
+        ).model_dump_json()
+
+    if call_type == CALL_INTAKE:
+        section_ids = list(dict.fromkeys(re.findall(r'"id": "([^"]+)"', content)))
+        return json.dumps(
+            {
+                "recommended_sections": [
+                    {
+                        "id": section_id,
+                        "priority": rng.choice(("must_do", "should_do", "optional")),
+                        "reason": "Synthetic recommendation from the OpenAI stub.",
+                        "confidence": round(rng.uniform(0.5, 1.0), 2),
+                    }
+                    for section_id in section_ids
+                ],
+                "excluded_sections": [],
+            }
+        )
+
+    return json.dumps({"ok": True})
+
+
+def openai_error(status_code: int, message: str, code: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "error": {"message": message, "type": code, "param": None, "code": code}
+        },
+    )
+
+
+def create_stub_app(config: StubConfig, stats: StubStats | None = None) -> FastAPI:
+    """Build the stand-in ASGI app; config may be changed at /_stub/config"""
+    app = FastAPI(title="OpenAI stub")
+    app.state.config = config
+    app.state.stats = stats or StubStats()
+    app.state.rng = random.Random(config.seed)
+    app.state.replay_positions = {}
+
+    def sample_latency() -> float:
+        median, sigma = LATENCY_PROFILES[app.state.config.profile]
+        if median <= 0:
+            return 0.0
+        return float(median * app.state.rng.lognormvariate(0.0, sigma))
+
+    def next_recording(call_type: str) -> str | None:
+        recordings = app.state.config.recordings.get(call_type)
+        if not recordings:
+            return None
+        position = app.state.replay_positions.get(call_type, 0)
+        app.state.replay_positions[call_type] = position + 1
+        return str(recordings[position % len(recordings)])
+
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(request: Request) -> dict[str, Any] | JSONResponse:
+        body = await request.json()
+        messages = body.get("messages") or []
+        model = body.get("model") or settings.OPENAI_MODEL
+        call_type = classify_request(messages)
+        cfg: StubConfig = app.state.config
+        rng: random.Random = app.state.rng
+        stats: StubStats = app.state.stats
+        start = time.perf_counter()
+
+        def record(outcome: str, **fields: Any) -> None:
+            stats.record(
+                call_type=call_type,
+                outcome=outcome,
+                model=model,
+                latency_ms=int((time.perf_counter() - start) * 1000),
+                **fields,
+            )
+
+        await asyncio.sleep(sample_latency())
+
+        roll = rng.random()
+        if roll < cfg.rate_limit_rate:
+            record("rate_limited")
+            response = openai_error(
+                429, "Rate limit reached (stub)", "rate_limit_exceeded"
+            )
+            response.headers["retry-after"] = str(cfg.retry_after_seconds)
+            return response
+        roll -= cfg.rate_limit_rate
+        if roll < cfg.server_error_rate:
+            record("server_error")
+            return openai_error(500, "Internal server error (stub)", "server_error")
+        roll -= cfg.server_error_rate
+        if roll < cfg.timeout_rate:
+            await asyncio.sleep(cfg.timeout_seconds)
+            record("timeout")
+            return openai_error(504, "Timed out (stub)", "timeout")
+        roll -= cfg.timeout_rate
+
+        outcome = "ok"
+        content = next_recording(call_type)
+        if content is not None:
+            outcome = "replayed"
+        else:
+            content = synthetic_content(call_type, messages, rng)
+        if roll < cfg.malformed_rate:
+            outcome = "malformed"
+            content = content[: max(len(content) // 2, 1)]
+
+        prompt_tokens = count_message_tokens(messages, model)
+        completion_tokens = count_tokens(content, model)
+        record(
+            outcome, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return {
+            "id": f"chatcmpl-stub-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/v1/models")
+    async def list_models() -> dict[str, Any]:
+        return {
+            "object": "list",
+            "data": [
+                {"id": settings.OPENAI_MODEL, "object": "model", "owned_by": "stub"}
+            ],
+        }
+
+    @app.get("/_stub/stats")
+    async def get_stats() -> dict[str, Any]:
+        summary: dict[str, Any] = app.state.stats.summary()
+        return summary
+
+    @app.post("/_stub/reset")
+    async def reset_stats() -> dict[str, str]:
+        app.state.stats.reset()
+        app.state.replay_positions = {}
+        return {"status": "reset"}
+
+    @app.put("/_stub/config")
+    async def update_config(new_config: StubConfig) -> StubConfig:
+        if new_config.profile not in LATENCY_PROFILES:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown profile: {new_config.profile}"
+            )
+        app.state.config = new_config
+        if new_config.seed is not None:
+            app.state.rng = random.Random(new_config.seed)
+        return new_config
+
+    return app
+
+
+class OpenAIStubServer:
+    """Runs the stand-in on a background thread (used by the pytest fixture)"""
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1"):
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self.app = create_stub_app(self.config, self.stats)
+        self._server = BackgroundServer(self.app, host=host)
+
+    @property
+    def base_url(self) -> str:
+        return f"{self._server.url}/v1"
+
+    def configure(self, **changes: Any) -> None:
+        """Change behaviour (profile, fault rates, ...) while running"""
+        self.app.state.config = self.app.state.config.model_copy(update=changes)
+
+    def start(self) -> None:
+        self._server.start()
+
+    def stop(self) -> None:
+        self._server.stop()
+
+
+def load_recordings(path: str) -> dict[str, list[str]]:
+    """Load {call_type: [content, ...]} from a JSON file"""
+    with open(path) as f:
+        recordings: dict[str, list[str]] = json.load(f)
+    return recordings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--profile", choices=sorted(LATENCY_PROFILES), default="realistic"
+    )
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--recordings", help="JSON file mapping call type to recorded contents"
+    )
+    parser.add_argument("--stats-file", help="Write the stats summary here on shutdown")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        profile=args.profile,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        timeout_rate=args.timeout_rate,
+        malformed_rate=args.malformed_rate,
+        timeout_seconds=args.timeout_seconds,
+        seed=args.seed,
+        recordings=load_recordings(args.recordings) if args.recordings else {},
+    )
+    stats = StubStats()
+    print(f"OpenAI stub listening on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_stub_app(config, stats), host=args.host, port=args.port)
+
+    summary = stats.summary()
+    print(json.dumps(summary, indent=2))
+    if args.stats_file:
+        with open(args.stats_file, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+"""Deterministic synthetic data for admin and analytics benchmarking
+
+Generates users with 0-3 assessment attempts at every status, responses drawn
+from the real questionnaire's options (tiered section selections), standard
+and AI reports at every status, AI section/synthesis artifacts and generation
+metadata. The same --seed and --anchor always produce the same rows.
+
+Rows are written in batches of users, one transaction per batch: COPY on
+PostgreSQL (psycopg2), executemany everywhere else.
+
+    DATABASE_URL=postgresql://... python -m app.devtools.seed --users 100000
+    DATABASE_URL=sqlite:///./seed.db python -m app.devtools.seed --users 5000 \\
+        --create-tables
+
+Seeded users share one password (SEED_PASSWORD) and emails derived from the
+seed, so reseeding with the same seed conflicts; use another seed to add more.
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel, Field
+from sqlalchemy import JSON, Table, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.assessment_tiers import ASSESSMENT_TIERS
+from app.core.config import settings
+from app.models.ai_artifacts import (
+    AIArtifactBlob,
+    AISectionArtifact,
+    AISynthesisArtifact,
+)
+from app.models.ai_metadata import AIGenerationMetadata
+from app.models.assessment import Assessment, AssessmentResponse, Report
+from app.models.user import User
+
+SEED_PASSWORD = "Seed-Passw0rd!"
+
+TIER_WEIGHTS = {"quick": 0.4, "standard": 0.4, "deep": 0.2}
+ATTEMPT_WEIGHTS = {0: 0.15, 1: 0.6, 2: 0.18, 3: 0.07}
+LAST_ATTEMPT_STATUS_WEIGHTS = {"completed": 0.55, "in_progress": 0.35, "expired": 0.1}
+EARLIER_ATTEMPT_STATUS_WEIGHTS = {"completed": 0.85, "expired": 0.15}
+STANDARD_REPORT_STATUS_WEIGHTS = {"completed": 0.93, "failed": 0.04, "generating": 0.03}
+AI_REPORT_STATUS_WEIGHTS = {
+    "pending": 0.2,
+    "generating": 0.05,
+    "completed": 0.25,
+    "released": 0.45,
+    "failed": 0.05,
+}
+RISK_LEVELS = ["Low", "Medium", "High", "Critical"]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery"]
+LAST_NAMES = ["Nguyen", "Patel", "Garcia", "Smith", "Kim", "Okafor", "Rossi", "Chen"]
+COMPANY_WORDS = ["Northwind", "Contoso", "Globex", "Initech", "Umbrella", "Stark"]
+COMPANY_SUFFIXES = ["Labs", "Health", "Logistics", "Financial", "Systems", "Energy"]
+COMMENTS = [
+    "Owned by the infrastructure team; reviewed annually.",
+    "Partially rolled out, remaining sites scheduled next quarter.",
+    "Handled by our MSP, we have limited visibility.",
+    "Policy exists but enforcement is manual.",
+    "Not sure who owns this today.",
+]
+CONSULTATION_DETAILS = [
+    "Looking for help prioritising the roadmap.",
+    "Board wants an external review before the audit.",
+    "Interested in incident response tabletop exercises.",
+]
+
+# Parent tables first so every batch satisfies foreign keys on insert
+TABLES: list[Table] = [
+    User.__table__,  # type: ignore[list-item]
+    Assessment.__table__,  # type: ignore[list-item]
+    AssessmentResponse.__table__,  # type: ignore[list-item]
+    Report.__table__,  # type: ignore[list-item]
+    AISectionArtifact.__table__,  # type: ignore[list-item]
+    AISynthesisArtifact.__table__,  # type: ignore[list-item]
+    AIGenerationMetadata.__table__,  # type: ignore[list-item]
+]
+
+
+def default_anchor() -> datetime:
+    return datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class SeedConfig(BaseModel):
+    """Size and shape of the seeded data set"""
+
+    users: int = 1000
+    seed: int = 0
+    batch_size: int = 2000  # users per transaction
+    ai_report_rate: float = 0.25
+    comment_rate: float = 0.1
+    consultation_rate: float = 0.15
+    include_responses: bool = True
+    anchor: datetime = Field(default_factory=default_anchor)  # "now" of the data
+
+
+def weighted_choice(rng: random.Random, weights: dict[Any, float]) -> Any:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class SyntheticDataGenerator:
+    """Produces seeded rows for each table, one batch of users at a time"""
+
+    def __init__(self, config: SeedConfig, structure: Any, password_hash: str):
+        from app.services.artifact_blobs import ArtifactBlobService
+        from app.services.report_generator import (
+            build_fallback_synthesis,
+            create_degraded_artifact,
+        )
+
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.password_hash = password_hash
+        self.questions = {
+            section.id: [
+                (question.id, [option.value for option in question.options])
+                for question in section.questions
+            ]
+            for section in structure.sections
+        }
+        self.tier_sections: dict[str, list[str] | None] = {}
+        for tier, info in ASSESSMENT_TIERS.items():
+            sections = info["sections"]
+            self.tier_sections[tier] = (
+                None
+                if sections == "all"
+                else [s for s in sections if s in self.questions]
+            )
+
+        # A few artifact variants per section; rows share them through blobs
+        self.blobs: dict[str, dict[str, Any]] = {}
+        self.section_blob_hashes: dict[str, list[str]] = {}
+        for section_id in self.questions:
+            hashes = []
+            for risk_level in RISK_LEVELS:
+                payload = create_degraded_artifact(section_id).model_dump()
+                payload["risk_level"] = risk_level
+                content_hash = ArtifactBlobService.compute_content_hash(payload)
+                self.blobs[content_hash] = payload
+                hashes.append(content_hash)
+            self.section_blob_hashes[section_id] = hashes
+        self.synthesis_payloads = [
+            build_fallback_synthesis({"overall": {"percentage": pct}}).model_dump()
+            for pct in (35.0, 55.0, 75.0, 90.0)
+        ]
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def blob_rows(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "content_hash": content_hash,
+                "artifact_json": payload,
+                "created_at": self.config.anchor,
+            }
+            for content_hash, payload in self.blobs.items()
+        ]
+
+    def generate_batch(self, start: int, count: int) -> dict[str, list[dict]]:
+        """Rows for users start..start+count, keyed by table name"""
+        rows: dict[str, list[dict]] = {table.name: [] for table in TABLES}
+        for index in range(start, start + count):
+            self._add_user(rows, index)
+        return rows
+
+    def _add_user(self, rows: dict[str, list[dict]], index: int) -> None:
+        rng = self.rng
+        anchor = self.config.anchor
+        user_id = self.new_id()
+        created_at = anchor - timedelta(seconds=rng.uniform(3600, 365 * 86400))
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows["users"].append(
+            {
+                "id": user_id,
+                "email": f"seed{self.config.seed}-{index}@example.com",
+                "full_name": f"{first} {last}",
+                "company_name": f"{rng.choice(COMPANY_WORDS)} "
+                f"{rng.choice(COMPANY_SUFFIXES)} {index % 997}",
+                "password_hash": self.password_hash,
+                "is_active": rng.random() < 0.97,
+                "is_admin": False,
+                "is_protected": False,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+
+        attempts = weighted_choice(rng, ATTEMPT_WEIGHTS)
+        if not attempts:
+            return
+        last_status = weighted_choice(rng, LAST_ATTEMPT_STATUS_WEIGHTS)
+        expiry = timedelta(days=settings.ASSESSMENT_EXPIRY_DAYS)
+        if last_status == "in_progress":
+            last_start = max(created_at, anchor - rng.uniform(0, 0.95) * expiry)
+        else:
+            last_start = created_at + (anchor - created_at) * rng.uniform(0.5, 0.95)
+        earlier = sorted(
+            created_at + (last_start - created_at) * rng.random()
+            for _ in range(attempts - 1)
+        )
+
+        for attempt, started_at in enumerate([*earlier, last_start], start=1):
+            status = (
+                last_status
+                if attempt == attempts
+                else weighted_choice(rng, EARLIER_ATTEMPT_STATUS_WEIGHTS)
+            )
+            self._add_assessment(rows, user_id, attempt, status, started_at, expiry)
+
+    def _add_assessment(
+        self,
+        rows: dict[str, list[dict]],
+        user_id: str,
+        attempt: int,
+        status: str,
+        started_at: datetime,
+        expiry: timedelta,
+    ) -> None:
+        rng = self.rng
+        anchor = self.config.anchor
+        assessment_id = self.new_id()
+        tier = weighted_choice(rng, TIER_WEIGHTS)
+        selected = self.tier_sections[tier]
+        section_ids = selected or list(self.questions)
+        questions = [
+            (section_id, question)
+            for section_id in section_ids
+            for question in self.questions[section_id]
+        ]
+
+        if status == "completed":
+            answered = len(questions)
+            last_saved_at = min(
+                anchor, started_at + timedelta(minutes=rng.uniform(10, 3 * 1440))
+            )
+        else:
+            answered = int(len(questions) * rng.uniform(0.05, 0.95))
+            last_saved_at = min(
+                anchor, started_at + timedelta(minutes=rng.uniform(5, 7 * 1440))
+            )
+        completed_at = last_saved_at if status == "completed" else None
+        consultation = status == "completed" and (
+            rng.random() < self.config.consultation_rate
+        )
+
+        rows["assessments"].append(
+            {
+                "id": assessment_id,
+                "user_id": user_id,
+                "attempt_number": attempt,
+                "status": status,
+                "started_at": started_at,
+                "completed_at": completed_at,
+                "expires_at": started_at + expiry,
+                "last_saved_at": last_saved_at,
+                "progress_percentage": Decimal(
+                    round(answered / len(questions) * 100, 2) if questions else 0
+                ),
+                "selected_section_ids": selected,
+                "consultation_interest": consultation,
+                "consultation_details": rng.choice(CONSULTATION_DETAILS)
+                if consultation
+                else None,
+                "created_at": started_at,
+                "updated_at": last_saved_at,
+            }
+        )
+
+        if self.config.include_responses:
+            for section_id, (question_id, options) in questions[:answered]:
+                rows["assessment_responses"].append(
+                    {
+                        "id": self.new_id(),
+                        "assessment_id": assessment_id,
+                        "section_id": section_id,
+                        "question_id": question_id,
+                        "answer_value": rng.choice(options) if options else "yes",
+                        "comment": rng.choice(COMMENTS)
+                        if rng.random() < self.config.comment_rate
+                        else None,
+                        "created_at": last_saved_at,
+                        "updated_at": last_saved_at,
+                    }
+                )
+
+        if completed_at is not None:
+            self._add_report(
+                rows,
+                assessment_id,
+                "standard",
+                weighted_choice(rng, STANDARD_REPORT_STATUS_WEIGHTS),
+                completed_at,
+                section_ids,
+            )
+            if rng.random() < self.config.ai_report_rate:
+                self._add_report(
+                    rows,
+                    assessment_id,
+                    "ai_enhanced",
+                    weighted_choice(rng, AI_REPORT_STATUS_WEIGHTS),
+                    min(anchor, completed_at + timedelta(hours=rng.uniform(0, 48))),
+                    section_ids,
+                )
+
+    def _add_report(
+        self,
+        rows: dict[str, list[dict]],
+        assessment_id: str,
+        report_type: str,
+        status: str,
+        requested_at: datetime,
+        section_ids: list[str],
+    ) -> None:
+        rng = self.rng
+        report_id = self.new_id()
+        ready = status in ("completed", "released")
+        prefix = "ai_report" if report_type == "ai_enhanced" else "report"
+        completed_at = (
+            min(
+                self.config.anchor, requested_at + timedelta(minutes=rng.uniform(1, 90))
+            )
+            if ready
+            else None
+        )
+        rows["reports"].append(
+            {
+                "id": report_id,
+                "assessment_id": assessment_id,
+                "report_type": report_type,
+                "file_path": f"{settings.REPORTS_DIR}/{prefix}_{report_id}.pdf"
+                if ready
+                else None,
+                "status": status,
+                "requested_at": requested_at,
+                "completed_at": completed_at,
+            }
+        )
+        if report_type != "ai_enhanced" or not ready:
+            return
+
+        generated_at = completed_at or requested_at
+        for section_id in [*section_ids, None]:
+            if section_id is not None:
+                rows["ai_section_artifacts"].append(
+                    {
+                        "id": self.new_id(),
+                        "report_id": report_id,
+                        "section_id": section_id,
+                        "artifact_json": None,
+                        "blob_hash": rng.choice(self.section_blob_hashes[section_id]),
+                        "storage_uri": None,
+                        "created_at": generated_at,
+                    }
+                )
+            tokens_prompt = rng.randint(1200, 4200)
+            tokens_completion = rng.randint(400, 1600)
+            cached = rng.random() < 0.3
+            rows["ai_generation_metadata"].append(
+                {
+                    "id": self.new_id(),
+                    "report_id": report_id,
+                    "section_id": section_id,
+                    "prompt_version": settings.AI_PROMPT_VERSION,
+                    "schema_version": settings.AI_SCHEMA_VERSION,
+                    "model": settings.OPENAI_MODEL,
+                    "temperature": settings.OPENAI_TEMPERATURE,
+                    "max_tokens": settings.OPENAI_MAX_TOKENS,
+                    "tokens_prompt": 0 if cached else tokens_prompt,
+                    "tokens_prompt_predicted": tokens_prompt,
+                    "tokens_prompt_cached": 0,
+                    "tokens_completion": 0 if cached else tokens_completion,
+                    "finish_reason": "stop",
+                    "total_cost_usd": Decimal("0")
+                    if cached
+                    else Decimal(
+                        f"{(tokens_prompt * 2.5 + tokens_completion * 10) / 1e6:.6f}"
+                    ),
+                    "latency_ms": 0 if cached else rng.randint(2500, 40000),
+                    "attempt_count": 1,
+                    "error_code": None,
+                    "error_message": None,
+                    "fallback_model": None,
+                    "is_degraded": 0,
+                    "last_retry_at": None,
+                    "created_at": generated_at,
+                }
+            )
+
+        rows["ai_synthesis_artifacts"].append(
+            {
+                "id": self.new_id(),
+                "report_id": report_id,
+                "artifact_json": rng.choice(self.synthesis_payloads),
+                "storage_uri": None,
+                "prompt_version": settings.AI_PROMPT_VERSION,
+                "schema_version": settings.AI_SCHEMA_VERSION,
+                "model": settings.OPENAI_MODEL,
+                "created_at": generated_at,
+            }
+        )
+
+
+def copy_value(value: Any, is_json: bool = False) -> Any:
+    """Render a value for PostgreSQL COPY in CSV format; None stays NULL"""
+    if value is None:
+        return None
+    if is_json:
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def is_json_column(column: Any) -> bool:
+    return isinstance(column.type, JSON) or isinstance(
+        getattr(column.type, "impl", None), JSON
+    )
+
+
+def copy_csv(
+    table: Table, columns: list[str], rows: list[dict[str, Any]]
+) -> io.StringIO:
+    """Rows as COPY CSV input
+
+    COPY reads an unquoted empty field as NULL, so every non-NULL value is
+    quoted and empty strings survive as "".
+    """
+    json_columns = [is_json_column(table.c[column]) for column in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for row in rows:
+        writer.writerow(
+            [
+                copy_value(row[column], is_json)
+                for column, is_json in zip(columns, json_columns, strict=True)
+            ]
+        )
+    buffer.seek(0)
+    return buffer
+
+
+class BulkWriter:
+    """Writes batches of rows with COPY on psycopg2, executemany elsewhere"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.use_copy = (
+            engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+        )
+
+    def write_blobs(self, rows: list[dict[str, Any]]) -> None:
+        table: Table = AIArtifactBlob.__table__  # type: ignore[assignment]
+        with self.engine.begin() as conn:
+            existing = set(conn.execute(select(table.c.content_hash)).scalars())
+            missing = [row for row in rows if row["content_hash"] not in existing]
+            if missing:
+                conn.execute(table.insert(), missing)
+
+    def write_batch(self, rows_by_table: dict[str, list[dict[str, Any]]]) -> None:
+        with self.engine.begin() as conn:
+            for table in TABLES:
+                rows = rows_by_table.get(table.name)
+                if not rows:
+                    continue
+                if self.use_copy:
+                    self._copy(conn, table, rows)
+                else:
+                    conn.execute(table.insert(), rows)
+
+    @staticmethod
+    def _copy(conn: Connection, table: Table, rows: list[dict[str, Any]]) -> None:
+        columns = list(rows[0])
+        buffer = copy_csv(table, columns, rows)
+
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(  # type: ignore[attr-defined]
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+
+def seed_database(engine: Engine, config: SeedConfig) -> dict[str, int]:
+    """Seed config.users users and everything hanging off them. Returns row counts."""
+    from app.core.security import get_password_hash
+    from app.services.question_parser import load_assessment_structure
+
+    generator = SyntheticDataGenerator(
+        config, load_assessment_structure(), get_password_hash(SEED_PASSWORD)
+    )
+    writer = BulkWriter(engine)
+    writer.write_blobs(generator.blob_rows())
+
+    counts = {table.name: 0 for table in TABLES}
+    for start in range(0, config.users, config.batch_size):
+        rows = generator.generate_batch(
+            start, min(config.batch_size, config.users - start)
+        )
+        writer.write_batch(rows)
+        for name, table_rows in rows.items():
+            counts[name] += len(table_rows)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--ai-report-rate", type=float, default=0.25)
+    parser.add_argument("--comment-rate", type=float, default=0.1)
+    parser.add_argument(
+        "--no-responses",
+        action="store_true",
+        help="Skip assessment responses (much faster for user/report benchmarks)",
+    )
+    parser.add_argument(
+        "--anchor",
+        type=datetime.fromisoformat,
+        help="ISO timestamp treated as 'now' (default: today 00:00 UTC)",
+    )
+    parser.add_argument(
+        "--create-tables", action="store_true", help="Create missing tables first"
+    )
+    args = parser.parse_args()
+
+    from app.core.database import Base, engine
+
+    if args.create_tables:
+        import app.models  # noqa: F401  (register every table)
+
+        Base.metadata.create_all(bind=engine)
+
+    anchor = default_anchor()
+    if args.anchor:
+        anchor = args.anchor.replace(tzinfo=args.anchor.tzinfo or UTC)
+
+    config = SeedConfig(
+        users=args.users,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        ai_report_rate=args.ai_report_rate,
+        comment_rate=args.comment_rate,
+        include_responses=not args.no_responses,
+        anchor=anchor,
+    )
+    start = time.perf_counter()
+    counts = seed_database(engine, config)
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    print(json.dumps(counts, indent=2))
+    print(f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Run an ASGI app with uvicorn on a background thread"""
+
+import socket
+import threading
+import time
+from typing import Any, Literal
+
+import uvicorn
+
+
+class BackgroundServer:
+    """Serves an ASGI app from a daemon thread until stop() is called"""
+
+    def __init__(
+        self,
+        app: Any,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        lifespan: Literal["auto", "on", "off"] = "off",
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.lifespan = lifespan
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10) -> None:
+        # Bind first so an ephemeral port is known before uvicorn starts
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, log_level="warning", lifespan=self.lifespan)
+        )
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Server on {self.url} did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=10)
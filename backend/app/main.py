@@ -10,10 +10,22 @@ from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from app.api import admin, assessment, auth, health, intake, openai_keys, reports
+from app.api import (
+    admin,
+    assessment,
+    auth,
+    health,
+    intake,
+    metrics,
+    openai_keys,
+    reports,
+)
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.csrf import CSRFMiddleware
 from app.middleware.performance import PerformanceMiddleware
+from app.middleware.query_tracking import QueryTrackingMiddleware
 from app.middleware.rate_limit import limiter
 from app.middleware.security_headers import SecurityHeadersMiddleware
 
@@ -103,19 +115,93 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Cache warming failed: {e}")
 
+    import asyncio
+
+    from app.services.ai_cache_maintenance import run_cache_maintenance_loop
+    from app.services.deferred_generation import run_deferred_batch_loop
+    from app.services.speculative_generation import run_speculative_worker_loop
+    from app.services.static_payloads import warm_filtered_structures
+
+    # Precompressing each tier's structure takes a while; keep it off the loop
+    background_tasks = [
+        asyncio.create_task(asyncio.to_thread(warm_filtered_structures))
+    ]
+    if settings.AI_CACHE_COMPACTION_INTERVAL_MINUTES > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                run_cache_maintenance_loop(
+                    settings.AI_CACHE_COMPACTION_INTERVAL_MINUTES
+                )
+            )
+        )
+        logger.info("AI cache maintenance scheduled")
+
+    if settings.AI_SPECULATIVE_GENERATION_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                run_speculative_worker_loop(settings.AI_SPECULATIVE_POLL_SECONDS)
+            )
+        )
+        logger.info("Speculative AI section generation enabled")
+
+    if settings.AI_DEFERRED_BATCH_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(run_deferred_batch_loop(settings.AI_BATCH_POLL_SECONDS))
+        )
+        logger.info("Deferred AI batch polling enabled")
+
+    if settings.LOOP_WATCHDOG_ENABLED:
+        from app.core.loop_watchdog import run_loop_watchdog
+
+        background_tasks.append(
+            asyncio.create_task(
+                run_loop_watchdog(
+                    settings.LOOP_WATCHDOG_THRESHOLD_MS,
+                    settings.LOOP_WATCHDOG_INTERVAL_MS,
+                )
+            )
+        )
+        logger.info("Event loop watchdog enabled")
+
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        from app.core.prometheus import run_metrics_flush_loop
+
+        background_tasks.append(
+            asyncio.create_task(
+                run_metrics_flush_loop(
+                    settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS
+                )
+            )
+        )
+        logger.info(f"Multiprocess metrics enabled in {settings.METRICS_MULTIPROC_DIR}")
+
     yield
 
+    for task in background_tasks:
+        task.cancel()
+
+    from app.services.report_memory import shutdown_pdf_worker
+
+    shutdown_pdf_worker()
+
 
 app = FastAPI(
     title="EchoStor Security Posture Assessment API",
     description="API for comprehensive security posture assessment tool",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -133,6 +219,7 @@ app.add_middleware(
 app.add_middleware(CSRFMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(PerformanceMiddleware)
+app.add_middleware(QueryTrackingMiddleware)
 
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(assessment.router, prefix="/api/assessment", tags=["assessment"])
@@ -141,6 +228,7 @@ app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(openai_keys.router, prefix="/api/admin/openai-keys", tags=["admin"])
 app.include_router(reports.router, prefix="/api/reports", tags=["reports"])
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
 @limiter.exempt
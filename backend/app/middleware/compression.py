@@ -0,0 +1,81 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.responses import accepted_encoding, compress, encoded_etag
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for single-chunk responses over a size threshold
+
+    Streamed bodies (PDF downloads) and responses that already carry a
+    Content-Encoding (precompressed payloads) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        decided = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, decided
+            if decided:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            assert start_message is not None
+            decided = True
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, self.levels[encoding])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], encoding)
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+        if start_message is not None and not decided:
+            await send(start_message)
@@ -1,11 +1,10 @@
 """CSRF protection middleware for Phase 1.3"""
 
 import logging
-from collections.abc import Callable
 
 from fastapi import HTTPException, Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.security import verify_token
@@ -24,32 +23,41 @@ CSRF_EXEMPT_PATHS = {
 SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """CSRF protection using JWT-embedded token validation"""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        if not settings.ENABLE_CSRF or not settings.ENABLE_COOKIE_AUTH:
-            bypass_response: Response = await call_next(request)
-            return bypass_response
-
-        if request.method in SAFE_METHODS:
-            safe_response: Response = await call_next(request)
-            return safe_response
-
-        if request.url.path in CSRF_EXEMPT_PATHS:
-            exempt_response: Response = await call_next(request)
-            return exempt_response
-
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.ENABLE_CSRF
+            or not settings.ENABLE_COOKIE_AUTH
+            or scope["method"] in SAFE_METHODS
+            or scope["path"] in CSRF_EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        rejection = self.validate(Request(scope))
+        if rejection is not None:
+            status_code, detail = rejection
+            response = JSONResponse({"detail": detail}, status_code=status_code)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def validate(self, request: Request) -> tuple[int, str] | None:
+        """None when the request passes, else the status code and detail"""
         csrf_header = request.headers.get("X-CSRF-Token")
         if not csrf_header:
             security_metrics.increment_csrf_failures()
             logger.warning(
                 f"CSRF token missing for {request.method} {request.url.path}"
             )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="CSRF token missing",
-            )
+            return status.HTTP_403_FORBIDDEN, "CSRF token missing"
 
         auth_cookie = request.cookies.get("access_token")
         if not auth_cookie:
@@ -57,33 +65,26 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             logger.warning(
                 f"Auth cookie missing for CSRF validation on {request.url.path}"
             )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required for CSRF validation",
+            return (
+                status.HTTP_401_UNAUTHORIZED,
+                "Authentication required for CSRF validation",
             )
 
         try:
             token_data = verify_token(auth_cookie)
             jwt_csrf = token_data.get("csrf", "")
-
-            if not jwt_csrf or csrf_header != jwt_csrf:
-                security_metrics.increment_csrf_failures()
-                logger.warning(
-                    f"CSRF token mismatch for {request.method} {request.url.path}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="CSRF token invalid",
-                )
-        except HTTPException:
-            raise
+        except HTTPException as e:
+            return e.status_code, str(e.detail)
         except Exception as e:
             security_metrics.increment_csrf_failures()
             logger.error(f"CSRF validation error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="CSRF validation failed",
+            return status.HTTP_403_FORBIDDEN, "CSRF validation failed"
+
+        if not jwt_csrf or csrf_header != jwt_csrf:
+            security_metrics.increment_csrf_failures()
+            logger.warning(
+                f"CSRF token mismatch for {request.method} {request.url.path}"
             )
+            return status.HTTP_403_FORBIDDEN, "CSRF token invalid"
 
-        response: Response = await call_next(request)
-        return response
+        return None
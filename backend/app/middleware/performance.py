@@ -1,11 +1,13 @@
 import logging
 import time
-from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any
 
 import sentry_sdk
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.prometheus import http_request_duration
 
 logger = logging.getLogger(__name__)
 
@@ -13,32 +15,72 @@ SLOW_REQUEST_THRESHOLD = 500
 VERY_SLOW_REQUEST_THRESHOLD = 1000
 
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
+class PerformanceMiddleware:
+    """Time each HTTP request until its last body chunk is sent
+
+    X-Response-Time is the time to the response headers. The logged and
+    exported duration runs to the end of the body, so streamed downloads are
+    timed in full while background tasks that run after the response are not.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        path = request.url.path
-        method = request.method
-        transaction_name = f"{method} {path}"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        with sentry_sdk.start_transaction(op="http.server", name=transaction_name):
-            response: Response = await call_next(request)
+        start_time = time.perf_counter()
+        finished_at: float | None = None
+        status_code = 500
 
-            duration_ms = (time.time() - start_time) * 1000
+        async def send_timed(message: Message) -> None:
+            nonlocal finished_at, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-response-time", f"{duration_ms:.2f}ms".encode("latin-1")),
+                ]
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                finished_at = time.perf_counter()
+            await send(message)
 
-            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+        transaction_name = f"{scope['method']} {scope['path']}"
+        transaction: AbstractContextManager[Any] = (
+            sentry_sdk.start_transaction(op="http.server", name=transaction_name)
+            if settings.SENTRY_DSN
+            else nullcontext()
+        )
+        with transaction:
+            try:
+                await self.app(scope, receive, send_timed)
+            finally:
+                end_time = finished_at or time.perf_counter()
+                self.record(scope, status_code, (end_time - start_time) * 1000)
 
-            if duration_ms > VERY_SLOW_REQUEST_THRESHOLD:
-                logger.warning(
-                    f"Very slow request: {transaction_name} took {duration_ms:.2f}ms"
-                )
-                sentry_sdk.capture_message(
-                    f"Very slow request: {transaction_name} took {duration_ms:.2f}ms",
-                    level="warning",
-                )
-            elif duration_ms > SLOW_REQUEST_THRESHOLD:
-                logger.info(
-                    f"Slow request: {transaction_name} took {duration_ms:.2f}ms"
-                )
+    def record(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        # Label by route template; raw paths would explode label cardinality
+        route = scope.get("route")
+        http_request_duration.observe(
+            duration_ms / 1000,
+            method=scope["method"],
+            route=getattr(route, "path", "unmatched"),
+            status=status_code,
+        )
 
-            return response
+        transaction_name = f"{scope['method']} {scope['path']}"
+        if duration_ms > VERY_SLOW_REQUEST_THRESHOLD:
+            logger.warning(
+                f"Very slow request: {transaction_name} took {duration_ms:.2f}ms"
+            )
+            sentry_sdk.capture_message(
+                f"Very slow request: {transaction_name} took {duration_ms:.2f}ms",
+                level="warning",
+            )
+        elif duration_ms > SLOW_REQUEST_THRESHOLD:
+            logger.info(f"Slow request: {transaction_name} took {duration_ms:.2f}ms")
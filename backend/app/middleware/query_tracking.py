@@ -0,0 +1,61 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Queries"
+QUERY_COUNT_HEADER_RAW = QUERY_COUNT_HEADER.lower().encode("latin-1")
+
+
+class QueryTrackingMiddleware:
+    """Count the SQL statements each request runs and flag likely N+1 loops
+
+    Statements are counted up to the response headers, which is when the
+    endpoint has finished; background tasks run after them.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    self.check_repeats(scope, stats)
+                    if (
+                        settings.DB_QUERY_HEADERS_ENABLED
+                        and settings.SENTRY_ENVIRONMENT != "production"
+                    ):
+                        message["headers"] = [
+                            *message.get("headers", ()),
+                            (QUERY_COUNT_HEADER_RAW, b"%d" % stats.count),
+                            (
+                                b"server-timing",
+                                f"db;dur={stats.total_seconds * 1000:.2f};"
+                                f'desc="{stats.count} queries"'.encode("latin-1"),
+                            ),
+                        ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+    def check_repeats(self, scope: Scope, stats: QueryStats) -> None:
+        repeated = stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            route = scope.get("route")
+            statement, count = repeated[0]
+            logger.warning(
+                f"Possible N+1 in {scope['method']} "
+                f"{getattr(route, 'path', scope['path'])}: statement ran "
+                f"{count} times ({stats.count} queries total): "
+                f"{' '.join(statement.split())[:200]}"
+            )
@@ -1,37 +1,44 @@
-from collections.abc import Awaitable, Callable
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        response: Response = await call_next(request)
-
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self'",
-            "style-src 'self'",
-            "img-src 'self' data:",
-            "font-src 'self'",
-            "connect-src 'self' https://echostor-security-posture-tool.fly.dev",
-            "frame-ancestors 'none'",
-            "base-uri 'self'",
-            "form-action 'self'",
-        ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-
-        response.headers["X-Frame-Options"] = "DENY"
-
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        return response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CSP_DIRECTIVES = [
+    "default-src 'self'",
+    "script-src 'self'",
+    "style-src 'self'",
+    "img-src 'self' data:",
+    "font-src 'self'",
+    "connect-src 'self' https://echostor-security-posture-tool.fly.dev",
+    "frame-ancestors 'none'",
+    "base-uri 'self'",
+    "form-action 'self'",
+]
+
+# Encoded once; appended to each response's raw header list as-is
+SECURITY_HEADERS = [
+    (b"content-security-policy", "; ".join(CSP_DIRECTIVES).encode("latin-1")),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-content-type-options", b"nosniff"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+]
+SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+
+
+class SecurityHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", ())
+                    if header[0] not in SECURITY_HEADER_NAMES
+                ] + SECURITY_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
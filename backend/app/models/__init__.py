@@ -1,11 +1,19 @@
 from sqlalchemy.orm import relationship
 
-from app.models.ai_artifacts import AISectionArtifact, AISynthesisArtifact
-from app.models.ai_cache import AISectionCache
+from app.models.ai_artifacts import (
+    AIArtifactBlob,
+    AISectionArtifact,
+    AISynthesisArtifact,
+)
+from app.models.ai_batch_job import AIBatchJob
+from app.models.ai_bulk_run import AIBulkGenerationRun
+from app.models.ai_cache import AIResponseCache, AISectionCache
 from app.models.ai_daily_metrics import AIDailyMetrics
 from app.models.ai_metadata import AIGenerationMetadata
+from app.models.ai_speculative_job import AISpeculativeJob
 from app.models.assessment import AdminAuditLog, Assessment, AssessmentResponse, Report
 from app.models.openai_key import OpenAIAPIKey
+from app.models.report_timing import ReportGenerationTiming
 from app.models.user import User
 
 User.assessments = relationship(
@@ -20,8 +28,14 @@ __all__ = [
     "AdminAuditLog",
     "OpenAIAPIKey",
     "AIGenerationMetadata",
+    "AIArtifactBlob",
     "AISectionArtifact",
     "AISynthesisArtifact",
     "AISectionCache",
+    "AIResponseCache",
     "AIDailyMetrics",
+    "AISpeculativeJob",
+    "AIBatchJob",
+    "AIBulkGenerationRun",
+    "ReportGenerationTiming",
 ]
@@ -1,12 +1,30 @@
 import uuid
 
 from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 from app.db.types import JSONBCompat
 
 
+class AIArtifactBlob(Base):
+    """Content-addressed artifact payload, stored once and shared by reference"""
+
+    __tablename__ = "ai_artifact_blobs"
+
+    content_hash = Column(String(64), primary_key=True)
+    artifact_json = Column(JSONBCompat, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_artifact_blobs_last_referenced", "last_referenced_at"),
+    )
+
+
 class AISectionArtifact(Base):
     """Stores structured JSON artifacts from AI section analysis"""
 
@@ -17,12 +35,18 @@ class AISectionArtifact(Base):
         String(36), ForeignKey("reports.id", ondelete="CASCADE"), nullable=False
     )
     section_id = Column(String(100), nullable=False)
-    artifact_json = Column(JSONBCompat, nullable=False)
+    artifact_json = Column(JSONBCompat, nullable=True)  # Legacy inline payload
+    blob_hash = Column(
+        String(64), ForeignKey("ai_artifact_blobs.content_hash"), nullable=True
+    )
     storage_uri = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    blob = relationship("AIArtifactBlob", lazy="joined")
+
     __table_args__ = (
         Index("idx_artifacts_report", "report_id"),
+        Index("idx_artifacts_blob_hash", "blob_hash"),
         Index("idx_artifacts_report_section", "report_id", "section_id", unique=True),
     )
 
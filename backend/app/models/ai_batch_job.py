@@ -0,0 +1,34 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.db.types import JSONBCompat
+
+
+class AIBatchJob(Base):
+    """A deferred (batch API) submission covering one phase for many AI reports"""
+
+    __tablename__ = "ai_batch_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    backend = Column(String(20), nullable=False)  # openai, local
+    phase = Column(String(20), nullable=False)  # sections, synthesis
+    status = Column(
+        String(20), default="submitted", nullable=False
+    )  # submitted, synthesis_pending, ingested, failed
+    external_batch_id = Column(String(255), nullable=True)
+    api_key_id = Column(String(36), nullable=True)
+    report_ids = Column(JSONBCompat, nullable=False)
+    requests_json = Column(JSONBCompat, nullable=False)  # custom_id -> targets
+    request_count = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text, nullable=True)
+    poll_failures = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )  # Polls that raised
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("idx_batch_jobs_status", "status", "submitted_at"),)
@@ -0,0 +1,29 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.db.types import JSONBCompat
+
+
+class AIBulkGenerationRun(Base):
+    """A set of pending AI reports generated together through one scheduler"""
+
+    __tablename__ = "ai_bulk_generation_runs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = Column(
+        String(20), default="queued", nullable=False
+    )  # queued, running, completed, failed
+    report_ids = Column(JSONBCompat, nullable=False)
+    filters = Column(JSONBCompat, nullable=True)
+    requested_by = Column(String(36), nullable=True)
+    max_concurrent = Column(Integer, nullable=True)  # Request budget used
+    shared_sections = Column(
+        Integer, default=0, nullable=False
+    )  # Section analyses reused from another report in the run
+    error_message = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,6 +1,16 @@
 import uuid
 
-from sqlalchemy import DECIMAL, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy import (
+    DECIMAL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -18,7 +28,10 @@ class AISectionCache(Base):
     prompt_version = Column(String(20), nullable=False)
     schema_version = Column(String(20), nullable=False)
     model = Column(String(50), nullable=False)
-    artifact_json = Column(JSONBCompat, nullable=False)
+    artifact_json = Column(JSONBCompat, nullable=True)  # Legacy inline payload
+    blob_hash = Column(
+        String(64), ForeignKey("ai_artifact_blobs.content_hash"), nullable=True
+    )
     storage_uri = Column(Text, nullable=True)
     tokens_prompt = Column(Integer, nullable=True)
     tokens_completion = Column(Integer, nullable=True)
@@ -27,6 +40,8 @@ class AISectionCache(Base):
     last_used_at = Column(DateTime(timezone=True), server_default=func.now())
     hit_count = Column(Integer, default=1, nullable=False)
 
+    blob = relationship("AIArtifactBlob", lazy="joined")
+
     __table_args__ = (
         Index(
             "idx_cache_lookup",
@@ -36,4 +51,26 @@ class AISectionCache(Base):
             "model",
             unique=True,
         ),
+        Index("idx_cache_blob_hash", "blob_hash"),
+    )
+
+
+class AIResponseCache(Base):
+    """Content-addressed cache of raw chat-completion responses"""
+
+    __tablename__ = "ai_response_cache"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    request_hash = Column(String(64), nullable=False)
+    call_site = Column(String(50), nullable=False)
+    model = Column(String(50), nullable=False)
+    response_json = Column(JSONBCompat, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+    hit_count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("idx_response_cache_hash", "request_hash", unique=True),
+        Index("idx_response_cache_expires", "expires_at"),
     )
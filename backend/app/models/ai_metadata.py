@@ -31,6 +31,8 @@ class AIGenerationMetadata(Base):
     temperature = Column(Float, nullable=False)
     max_tokens = Column(Integer, nullable=False)
     tokens_prompt = Column(Integer, nullable=True)
+    tokens_prompt_predicted = Column(Integer, nullable=True)  # Local count pre-send
+    tokens_prompt_cached = Column(Integer, nullable=True)  # Provider prefix cache hits
     tokens_completion = Column(Integer, nullable=True)
     finish_reason = Column(
         String(50), nullable=True
@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AISpeculativeJob(Base):
+    """Tracks sections queued for AI analysis before the assessment is submitted"""
+
+    __tablename__ = "ai_speculative_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    assessment_id = Column(
+        String(36), ForeignKey("assessments.id", ondelete="CASCADE"), nullable=False
+    )
+    section_id = Column(String(100), nullable=False)
+    answers_hash = Column(String(64), nullable=False)
+    status = Column(
+        String(20), default="pending", nullable=False
+    )  # pending, running, completed, cached, failed, skipped
+    stable_since = Column(DateTime(timezone=True), nullable=False)
+    attempted_at = Column(DateTime(timezone=True), nullable=True)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "idx_speculative_assessment_section",
+            "assessment_id",
+            "section_id",
+            unique=True,
+        ),
+        Index("idx_speculative_status_stable", "status", "stable_since"),
+        Index("idx_speculative_attempted", "attempted_at"),
+    )
@@ -87,6 +87,7 @@ class Report(Base):
     status = Column(
         String(50), default="pending"
     )  # pending, generating, completed, released, failed
+    error_message = Column(Text, nullable=True)  # Why a failed report failed
     requested_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
 
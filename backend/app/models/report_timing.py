@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.db.types import JSONBCompat
+
+
+class ReportGenerationTiming(Base):
+    """Per-stage wall-clock and memory breakdown of one report generation run"""
+
+    __tablename__ = "report_generation_timings"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    report_id = Column(
+        String(36), ForeignKey("reports.id", ondelete="CASCADE"), nullable=False
+    )
+    report_type = Column(String(50), nullable=False)  # standard, ai_enhanced
+    status = Column(String(20), nullable=False)  # completed, failed, memory_limit
+    release = Column(String(100), nullable=True)  # Deploy that generated it
+    stage_ms = Column(JSONBCompat, nullable=False)  # stage name -> milliseconds
+    total_ms = Column(Integer, nullable=False)
+    stage_rss_kb = Column(JSONBCompat, nullable=True)  # stage name -> RSS after it
+    peak_rss_kb = Column(Integer, nullable=True)  # Highest stage RSS sample
+    traced_peak_kb = Column(Integer, nullable=True)  # tracemalloc peak, if profiling
+    top_allocations = Column(JSONBCompat, nullable=True)  # Worst reports only
+    html_bytes = Column(Integer, nullable=True)
+    pdf_bytes = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_report_timings_type_created", "report_type", "created_at"),
+        Index("idx_report_timings_report", "report_id"),
+        Index("idx_report_timings_peak_rss", "peak_rss_kb"),
+    )
@@ -51,6 +51,7 @@ class ReportBaseOut(BaseModel):
     assessment_id: uuid.UUID
     report_type: str
     status: str
+    error_message: str | None = None
     requested_at: datetime
     completed_at: datetime | None
     assessment: MinimalAssessmentResponse | None = None
@@ -79,3 +80,25 @@ class ReportResponse(AdminReportResponse):
 
 class AIReportRequest(BaseModel):
     message: Annotated[str, Field(max_length=2000)] | None = None
+
+
+class AIBulkGenerateRequest(BaseModel):
+    """Select pending AI reports by ID and/or request time"""
+
+    report_ids: list[str] | None = None
+    requested_after: datetime | None = None
+    requested_before: datetime | None = None
+    limit: Annotated[int, Field(ge=1, le=1000)] | None = None
+
+
+class AIBulkRunResponse(BaseModel):
+    id: str
+    status: str
+    report_count: int
+    report_status_counts: dict[str, int]
+    shared_sections: int
+    max_concurrent: int | None
+    error_message: str | None = None
+    created_at: datetime | None
+    started_at: datetime | None
+    completed_at: datetime | None
@@ -3,16 +3,89 @@
 import hashlib
 import json
 import logging
+import threading
 from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.prometheus import cache_requests
 from app.models.ai_cache import AISectionCache
 from app.schemas.ai_artifacts import SectionAIArtifact
+from app.services.artifact_blobs import ArtifactBlobService
 
 logger = logging.getLogger(__name__)
 
 
+class CacheUsageTracker:
+    """In-process hit/miss/eviction counters and buffered hit counts.
+
+    Hits are accumulated here and written to ``ai_section_cache`` in one batch
+    instead of committing an UPDATE on every cache lookup.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending_hits: dict[str, tuple[int, datetime]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions: dict[str, int] = {}
+        self.last_compaction_at: datetime | None = None
+
+    def record_hit(self, cache_id: str) -> int:
+        """Buffer a hit and return the number of entries awaiting flush"""
+        with self._lock:
+            count, _ = self._pending_hits.get(cache_id, (0, datetime.utcnow()))
+            self._pending_hits[cache_id] = (count + 1, datetime.utcnow())
+            self.hits += 1
+            return len(self._pending_hits)
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def record_evictions(self, policy: str, count: int) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self.evictions[policy] = self.evictions.get(policy, 0) + count
+
+    def drain_pending_hits(self) -> dict[str, tuple[int, datetime]]:
+        with self._lock:
+            pending = self._pending_hits
+            self._pending_hits = {}
+            return pending
+
+    def pending_hit_count(self) -> int:
+        with self._lock:
+            return len(self._pending_hits)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": dict(self.evictions),
+                "pending_hit_flushes": len(self._pending_hits),
+                "last_compaction_at": self.last_compaction_at.isoformat()
+                if self.last_compaction_at
+                else None,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending_hits = {}
+            self.hits = 0
+            self.misses = 0
+            self.evictions = {}
+            self.last_compaction_at = None
+
+
+cache_usage = CacheUsageTracker()
+
+
 class AICacheService:
     """Intelligent caching for AI section analysis"""
 
@@ -57,18 +130,61 @@ class AICacheService:
         )
 
         if cache_entry:
-            cache_entry.last_used_at = datetime.utcnow()  # type: ignore[assignment]
-            cache_entry.hit_count += 1  # type: ignore[assignment]
-            db.commit()
+            pending = cache_usage.record_hit(str(cache_entry.id))
+            cache_requests.inc(cache="ai_section", result="hit")
+            if pending >= settings.AI_CACHE_HIT_FLUSH_THRESHOLD:
+                AICacheService.flush_hit_counts(db)
 
-            logger.info(
-                f"Cache HIT for section {section_id} (hits: {cache_entry.hit_count})"
-            )
-            return SectionAIArtifact(**cache_entry.artifact_json)
+            logger.info(f"Cache HIT for section {section_id}")
+            return SectionAIArtifact(**ArtifactBlobService.resolve_payload(cache_entry))
 
+        cache_usage.record_miss()
+        cache_requests.inc(cache="ai_section", result="miss")
         logger.info(f"Cache MISS for section {section_id}")
         return None
 
+    @staticmethod
+    def has_cached_artifact(
+        db: Session, section_id: str, answers_hash: str, prompt_version: str, model: str
+    ) -> bool:
+        """Check for a cache entry without counting it as a hit or miss"""
+        return (
+            db.query(AISectionCache.id)
+            .filter(
+                AISectionCache.section_id == section_id,
+                AISectionCache.answers_hash == answers_hash,
+                AISectionCache.prompt_version == prompt_version,
+                AISectionCache.model == model,
+            )
+            .first()
+            is not None
+        )
+
+    @staticmethod
+    def flush_hit_counts(db: Session) -> int:
+        """Write buffered hit counts and last-used times in a single commit"""
+        pending = cache_usage.drain_pending_hits()
+        if not pending:
+            return 0
+
+        try:
+            for cache_id, (count, last_used_at) in pending.items():
+                db.query(AISectionCache).filter(AISectionCache.id == cache_id).update(
+                    {
+                        AISectionCache.hit_count: AISectionCache.hit_count + count,
+                        AISectionCache.last_used_at: last_used_at,
+                    },
+                    synchronize_session=False,
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush cache hit counts: {e}")
+            return 0
+
+        logger.info(f"Flushed hit counts for {len(pending)} cache entries")
+        return len(pending)
+
     @staticmethod
     def store_artifact(
         db: Session,
@@ -89,7 +205,7 @@ class AICacheService:
             prompt_version=prompt_version,
             schema_version=schema_version,
             model=model,
-            artifact_json=artifact.model_dump(),
+            blob_hash=ArtifactBlobService.get_or_create_blob(db, artifact.model_dump()),
             tokens_prompt=tokens_prompt,
             tokens_completion=tokens_completion,
             total_cost_usd=cost_usd,
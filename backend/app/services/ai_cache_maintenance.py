@@ -0,0 +1,196 @@
+"""Eviction and compaction policies for the AI caches"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ai_artifacts import AIArtifactBlob
+from app.models.ai_cache import AIResponseCache, AISectionCache
+from app.services.ai_cache import AICacheService, cache_usage
+from app.services.artifact_blobs import ArtifactBlobService
+from app.services.llm_cache import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+DELETE_CHUNK_SIZE = 500
+
+
+class AICacheMaintenanceService:
+    """Keeps ai_section_cache, ai_response_cache and artifact blobs bounded"""
+
+    @staticmethod
+    def _delete_ids(db: Session, model: Any, ids: list[str]) -> int:
+        deleted = 0
+        for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+            chunk = ids[start : start + DELETE_CHUNK_SIZE]
+            deleted += (
+                db.query(model)
+                .filter(model.id.in_(chunk))
+                .delete(synchronize_session=False)
+            )
+        return deleted
+
+    @staticmethod
+    def evict_retired_versions(db: Session) -> int:
+        """Remove entries that can no longer be hit by the current prompt/schema/model"""
+        if not settings.AI_CACHE_RETIRE_OLD_VERSIONS:
+            return 0
+
+        deleted = (
+            db.query(AISectionCache)
+            .filter(
+                or_(
+                    AISectionCache.prompt_version != settings.AI_PROMPT_VERSION,
+                    AISectionCache.schema_version != settings.AI_SCHEMA_VERSION,
+                    AISectionCache.model != settings.OPENAI_MODEL,
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        return int(deleted)
+
+    @staticmethod
+    def evict_stale(db: Session, now: datetime | None = None) -> int:
+        """Remove entries not used within AI_CACHE_MAX_AGE_DAYS"""
+        if settings.AI_CACHE_MAX_AGE_DAYS <= 0:
+            return 0
+
+        cutoff = (now or datetime.now(UTC)) - timedelta(
+            days=settings.AI_CACHE_MAX_AGE_DAYS
+        )
+        deleted = (
+            db.query(AISectionCache)
+            .filter(
+                or_(
+                    AISectionCache.last_used_at < cutoff,
+                    (AISectionCache.last_used_at.is_(None))
+                    & (AISectionCache.created_at < cutoff),
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        return int(deleted)
+
+    @staticmethod
+    def evict_lru_overflow(db: Session) -> int:
+        """Trim the least recently used entries above AI_CACHE_MAX_ROWS"""
+        if settings.AI_CACHE_MAX_ROWS <= 0:
+            return 0
+
+        total = db.query(func.count(AISectionCache.id)).scalar() or 0
+        overflow = total - settings.AI_CACHE_MAX_ROWS
+        if overflow <= 0:
+            return 0
+
+        ids = [
+            row.id
+            for row in db.query(AISectionCache.id)
+            .order_by(
+                AISectionCache.last_used_at.asc(), AISectionCache.created_at.asc()
+            )
+            .limit(overflow)
+            .all()
+        ]
+        return AICacheMaintenanceService._delete_ids(db, AISectionCache, ids)
+
+    @staticmethod
+    def purge_expired_responses(db: Session, now: datetime | None = None) -> int:
+        """Remove expired rows from the generic LLM response cache"""
+        deleted = (
+            db.query(AIResponseCache)
+            .filter(AIResponseCache.expires_at < (now or datetime.now(UTC)))
+            .delete(synchronize_session=False)
+        )
+        return int(deleted)
+
+    @staticmethod
+    def compact(db: Session) -> dict[str, int]:
+        """Flush buffered hits, then apply every eviction policy"""
+        flushed = AICacheService.flush_hit_counts(db)
+        flushed += LLMResponseCache.flush_hit_counts(db)
+
+        try:
+            evicted = {
+                "retired_version": AICacheMaintenanceService.evict_retired_versions(db),
+                "max_age": AICacheMaintenanceService.evict_stale(db),
+                "lru": AICacheMaintenanceService.evict_lru_overflow(db),
+                "expired_response": AICacheMaintenanceService.purge_expired_responses(
+                    db
+                ),
+            }
+            db.flush()
+            evicted["orphaned_blob"] = ArtifactBlobService.collect_garbage(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        for policy, count in evicted.items():
+            cache_usage.record_evictions(policy, count)
+        cache_usage.last_compaction_at = datetime.now(UTC)
+
+        logger.info(f"AI cache compaction complete: evicted={evicted}")
+        return {"flushed_hit_entries": flushed, **evicted}
+
+    @staticmethod
+    def get_stats(db: Session) -> dict[str, Any]:
+        """Get cache size, per-version breakdown and hit/eviction counters"""
+        versions = (
+            db.query(
+                AISectionCache.prompt_version,
+                AISectionCache.model,
+                func.count(AISectionCache.id),
+                func.coalesce(func.sum(AISectionCache.hit_count), 0),
+            )
+            .group_by(AISectionCache.prompt_version, AISectionCache.model)
+            .all()
+        )
+        section_rows = sum(row[2] for row in versions)
+        response_rows = db.query(func.count(AIResponseCache.id)).scalar() or 0
+        blob_rows = db.query(func.count(AIArtifactBlob.content_hash)).scalar() or 0
+
+        return {
+            "section_cache": {
+                "rows": section_rows,
+                "max_rows": settings.AI_CACHE_MAX_ROWS,
+                "stored_hits": sum(int(row[3]) for row in versions),
+                "by_version": [
+                    {
+                        "prompt_version": prompt_version,
+                        "model": model,
+                        "rows": rows,
+                        "hits": int(hits),
+                        "current": prompt_version == settings.AI_PROMPT_VERSION
+                        and model == settings.OPENAI_MODEL,
+                    }
+                    for prompt_version, model, rows, hits in versions
+                ],
+            },
+            "response_cache": {"rows": response_rows},
+            "artifact_blobs": {"rows": blob_rows},
+            "process": cache_usage.get_stats(),
+        }
+
+
+def run_scheduled_compaction() -> dict[str, int] | None:
+    db = SessionLocal()
+    try:
+        return AICacheMaintenanceService.compact(db)
+    except Exception as e:
+        logger.error(f"Scheduled AI cache compaction failed: {e}")
+        return None
+    finally:
+        db.close()
+
+
+async def run_cache_maintenance_loop(interval_minutes: int) -> None:
+    """Run compaction every interval_minutes until cancelled"""
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        await asyncio.to_thread(run_scheduled_compaction)
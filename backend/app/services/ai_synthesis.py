@@ -8,59 +8,37 @@ from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.prometheus import observe_openai_call
 from app.schemas.ai_artifacts import SectionAIArtifact, SynthesisArtifact
 from app.services.benchmark_context import benchmark_context_service
+from app.services.llm_cache import CALL_SITE_SYNTHESIS, llm_response_cache
 from app.services.openai_key_manager import OpenAIKeyManager
+from app.services.token_budget import get_cached_prompt_tokens
 
 logger = logging.getLogger(__name__)
 
 
-def build_synthesis_prompt(
-    section_summaries: list[dict[str, Any]],
-    overall_score: float,
-    curated_context: str = "",
-) -> str:
-    """Build prompt for cross-section synthesis"""
-
-    summaries_text = []
-    for summary in section_summaries:
-        summaries_text.append(
-            f"""
-Section: {summary["title"]} (Score: {summary["score"]}%)
-Risk Level: {summary["risk_level"]}
-Top Gaps: {", ".join(summary["top_gaps"][:3])}
-Top Recommendations: {", ".join(summary["top_recommendations"][:3])}
-"""
-        )
-
-    prompt = f"""You are a cybersecurity executive advisor. Analyze these section summaries from a comprehensive security assessment and provide strategic synthesis.
-
-OVERALL SECURITY SCORE: {overall_score}%
-
-SECTION SUMMARIES:
-{"".join(summaries_text)}
-
-{curated_context}
+SYNTHESIS_INSTRUCTIONS = """You are a cybersecurity executive advisor. Analyze the section summaries from a comprehensive security assessment in the user message and provide strategic synthesis.
 
 Provide your synthesis as JSON matching this schema:
 
-{{
+{
   "executive_summary": "2-3 paragraph overview for C-level executives highlighting current posture, key risks, and strategic recommendations",
   
   "overall_risk_level": "Low|Medium|Medium-High|High|Critical",
   "overall_risk_explanation": "Detailed explanation of overall risk considering all domains",
   
   "cross_cutting_themes": [
-    {{
+    {
       "theme": "Identity and Access Management Gaps",
       "description": "Detailed description of the theme",
       "affected_domains": ["identity", "access_control", "network"],
       "severity": "High"
-    }}
+    }
   ],
   
   "top_10_initiatives": [
-    {{
+    {
       "priority": 1,
       "title": "Implement Enterprise-Wide MFA",
       "description": "Deploy multi-factor authentication across all systems and user accounts",
@@ -71,7 +49,7 @@ Provide your synthesis as JSON matching this schema:
       "dependencies": [],
       "success_metrics": ["100% MFA adoption", "Zero password-only accounts", "MFA enforcement in all critical systems"],
       "owner": "Security Team"
-    }}
+    }
   ],
   
   "quick_wins": [
@@ -83,7 +61,7 @@ Provide your synthesis as JSON matching this schema:
   "long_term_strategy": "Strategic direction for next 6-12 months including maturity progression, team building, and program development",
   
   "confidence_score": 0.85
-}}
+}
 
 REQUIREMENTS:
 1. Executive summary must be business-focused, not technical
@@ -96,32 +74,82 @@ REQUIREMENTS:
 
 Keep response professional and actionable for executive audience.
 """
-    return prompt
 
 
-async def generate_synthesis_artifact(
+def build_synthesis_messages(
+    section_summaries: list[dict[str, Any]],
+    overall_score: float,
+    curated_context: str = "",
+) -> list[dict[str, str]]:
+    """Build chat messages for cross-section synthesis
+
+    The system message is static so the provider can cache it as a prefix;
+    the curated context (same for every report) precedes the report data.
+    """
+
+    summaries_text = []
+    for summary in section_summaries:
+        summaries_text.append(
+            f"""
+Section: {summary["title"]} (Score: {summary["score"]}%)
+Risk Level: {summary["risk_level"]}
+Top Gaps: {", ".join(summary["top_gaps"][:3])}
+Top Recommendations: {", ".join(summary["top_recommendations"][:3])}
+"""
+        )
+
+    user_content = f"""{curated_context}
+
+OVERALL SECURITY SCORE: {overall_score}%
+
+SECTION SUMMARIES:
+{"".join(summaries_text)}
+"""
+    return [
+        {"role": "system", "content": SYNTHESIS_INSTRUCTIONS},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def build_synthesis_prompt(
+    section_summaries: list[dict[str, Any]],
+    overall_score: float,
+    curated_context: str = "",
+) -> str:
+    """Build prompt for cross-section synthesis as a single string"""
+    messages = build_synthesis_messages(
+        section_summaries, overall_score, curated_context
+    )
+    return "\n\n".join(m["content"] for m in messages)
+
+
+def build_section_summary(section: Any, artifact: SectionAIArtifact) -> dict[str, Any]:
+    """Summarise one section artifact for the synthesis prompt (score added later)"""
+    return {
+        "title": section.title,
+        "risk_level": artifact.risk_level,
+        "top_gaps": [g.gap for g in artifact.gaps[:3]],
+        "top_recommendations": [r.action for r in artifact.recommendations[:3]],
+    }
+
+
+def build_synthesis_request_params(
     section_artifacts: dict[str, SectionAIArtifact],
     structure: Any,
     scores: dict[str, Any],
-    key_manager: OpenAIKeyManager,
-    db: Session,
-) -> SynthesisArtifact:
-    """Generate cross-section synthesis"""
-
+    prebuilt_summaries: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Build chat completion parameters for the cross-section synthesis request"""
+    prebuilt_summaries = prebuilt_summaries or {}
     section_summaries = []
     for section in structure.sections:
         artifact = section_artifacts.get(section.id)
         if artifact:
+            summary = prebuilt_summaries.get(section.id) or build_section_summary(
+                section, artifact
+            )
             section_summaries.append(
-                {
-                    "title": section.title,
-                    "score": scores[section.id]["percentage"],
-                    "risk_level": artifact.risk_level,
-                    "top_gaps": [g.gap for g in artifact.gaps[:3]],
-                    "top_recommendations": [
-                        r.action for r in artifact.recommendations[:3]
-                    ],
-                }
+                {**summary, "score": scores[section.id]["percentage"]}
             )
 
     curated_context = benchmark_context_service.get_relevant_context(
@@ -130,23 +158,67 @@ async def generate_synthesis_artifact(
         max_controls=10,
     )
 
-    prompt = build_synthesis_prompt(
+    messages = build_synthesis_messages(
         section_summaries, scores["overall"]["percentage"], curated_context
     )
 
+    return {
+        "model": settings.OPENAI_MODEL,
+        "messages": messages,
+        "response_format": {"type": "json_object"},
+        "max_tokens": 2000,  # Longer for synthesis
+        "temperature": 0.5,  # Lower for consistency
+    }
+
+
+async def generate_synthesis_artifact(
+    section_artifacts: dict[str, SectionAIArtifact],
+    structure: Any,
+    scores: dict[str, Any],
+    key_manager: OpenAIKeyManager,
+    db: Session,
+    prebuilt_summaries: dict[str, dict[str, Any]] | None = None,
+) -> SynthesisArtifact:
+    """Generate cross-section synthesis
+
+    prebuilt_summaries holds summaries already assembled (by section id) while
+    sections were still being generated; missing ones are built here.
+    """
+
+    request_params = build_synthesis_request_params(
+        section_artifacts, structure, scores, prebuilt_summaries
+    )
+
+    cached_response = llm_response_cache.get_cached_completion(
+        CALL_SITE_SYNTHESIS, request_params, db
+    )
+    if cached_response is not None:
+        try:
+            json_str = cached_response.choices[0].message.content
+            if json_str:
+                return SynthesisArtifact.model_validate_json(json_str)
+        except Exception as e:
+            logger.warning(f"Cached synthesis response is invalid: {e}")
+
+    key_id: str | None = None
     try:
         key_id, api_key = key_manager.get_next_key()
-        client = AsyncOpenAI(api_key=api_key, timeout=settings.OPENAI_TIMEOUT)
+        client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT,
+            base_url=settings.OPENAI_BASE_URL,
+        )
 
         start_time = time.time()
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_tokens=2000,  # Longer for synthesis
-            temperature=0.5,  # Lower for consistency
-        )
+        response = await client.chat.completions.create(**request_params)
         latency_ms = int((time.time() - start_time) * 1000)
+        observe_openai_call(
+            key_id,
+            request_params["model"],
+            CALL_SITE_SYNTHESIS,
+            latency_ms / 1000,
+            response.usage,
+        )
 
         json_str = response.choices[0].message.content
         if json_str:
@@ -155,13 +227,19 @@ async def generate_synthesis_artifact(
             raise ValueError("Empty response from OpenAI")
 
         key_manager.record_success(key_id)
+        llm_response_cache.store_completion(
+            CALL_SITE_SYNTHESIS, request_params, response, db
+        )
 
-        logger.info(f"Generated synthesis artifact ({latency_ms}ms)")
+        logger.info(
+            f"Generated synthesis artifact ({latency_ms}ms, "
+            f"cached prompt tokens {get_cached_prompt_tokens(response.usage)})"
+        )
         return synthesis
 
     except Exception as e:
         logger.error(f"Failed to generate synthesis: {e}")
-        if key_manager:
+        if key_manager and key_id:
             key_manager.record_failure(key_id, e)
 
         return create_minimal_synthesis(scores["overall"]["percentage"])
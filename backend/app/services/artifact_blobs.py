@@ -0,0 +1,108 @@
+"""Content-addressed storage for AI section artifact payloads"""
+
+import hashlib
+import json
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models.ai_artifacts import AIArtifactBlob, AISectionArtifact
+from app.models.ai_cache import AISectionCache
+
+logger = logging.getLogger(__name__)
+
+BLOB_GC_GRACE_MINUTES = 60
+
+
+class ArtifactBlobService:
+    """Stores each distinct artifact payload once, keyed by its hash"""
+
+    @staticmethod
+    def compute_content_hash(payload: dict[str, Any]) -> str:
+        canonical_json = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+    @staticmethod
+    def get_or_create_blob(db: Session, payload: dict[str, Any]) -> str:
+        """Insert the payload if it is not stored yet and return its hash
+
+        An existing blob has its last_referenced_at touched, so garbage
+        collection leaves it alone while the new reference is being committed.
+        """
+        content_hash = ArtifactBlobService.compute_content_hash(payload)
+        now = datetime.now(UTC)
+        values = {
+            "content_hash": content_hash,
+            "artifact_json": payload,
+            "last_referenced_at": now,
+        }
+        dialect_name = db.get_bind().dialect.name
+
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+            db.execute(
+                postgresql_insert(AIArtifactBlob)
+                .values(**values)
+                .on_conflict_do_update(
+                    index_elements=["content_hash"], set_={"last_referenced_at": now}
+                )
+            )
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            db.execute(
+                sqlite_insert(AIArtifactBlob)
+                .values(**values)
+                .on_conflict_do_update(
+                    index_elements=["content_hash"], set_={"last_referenced_at": now}
+                )
+            )
+        else:
+            blob = db.get(AIArtifactBlob, content_hash)
+            if blob is None:
+                db.add(AIArtifactBlob(**values))
+            else:
+                blob.last_referenced_at = now  # type: ignore[assignment]
+            db.flush()
+
+        return content_hash
+
+    @staticmethod
+    def resolve_payload(row: AISectionArtifact | AISectionCache) -> dict[str, Any]:
+        """Return the artifact payload for a row, following its blob reference"""
+        if row.blob_hash is not None and row.blob is not None:
+            payload: dict[str, Any] = row.blob.artifact_json  # type: ignore[assignment]
+            return payload
+        legacy: dict[str, Any] = row.artifact_json  # type: ignore[assignment]
+        return legacy
+
+    @staticmethod
+    def collect_garbage(db: Session, now: datetime | None = None) -> int:
+        """Delete blobs no longer referenced by any report artifact or cache entry
+
+        Only blobs not handed out by get_or_create_blob within the grace window
+        are considered, so a reference that is still being committed is safe.
+        """
+        cutoff = (now or datetime.now(UTC)) - timedelta(minutes=BLOB_GC_GRACE_MINUTES)
+
+        artifact_refs = db.query(AISectionArtifact.blob_hash).filter(
+            AISectionArtifact.blob_hash.isnot(None)
+        )
+        cache_refs = db.query(AISectionCache.blob_hash).filter(
+            AISectionCache.blob_hash.isnot(None)
+        )
+        deleted = (
+            db.query(AIArtifactBlob)
+            .filter(
+                AIArtifactBlob.last_referenced_at < cutoff,
+                AIArtifactBlob.content_hash.notin_(artifact_refs.scalar_subquery()),
+                AIArtifactBlob.content_hash.notin_(cache_refs.scalar_subquery()),
+            )
+            .delete(synchronize_session=False)
+        )
+        if deleted:
+            logger.info(f"Removed {deleted} unreferenced artifact blobs")
+        return int(deleted)
@@ -0,0 +1,233 @@
+"""Batch execution backends for deferred AI report generation.
+
+Supports the OpenAI Batch API (default) and a local file-based stand-in used
+in tests and development. Configure via AI_BATCH_BACKEND: 'openai' or 'local'.
+
+Requests are chat completion parameter dicts keyed by a custom_id; results
+map each custom_id back to its chat completion body (None when it failed).
+"""
+
+import io
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Final
+
+from openai import OpenAI
+
+from app.core.config import settings
+
+CHAT_COMPLETIONS_URL: Final = "/v1/chat/completions"
+
+OPENAI_PENDING_STATUSES = ("validating", "in_progress", "finalizing", "cancelling")
+
+
+def build_batch_lines(requests: dict[str, dict[str, Any]]) -> str:
+    """Serialise requests in the Batch API JSONL input format"""
+    return "".join(
+        json.dumps(
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": CHAT_COMPLETIONS_URL,
+                "body": body,
+            }
+        )
+        + "\n"
+        for custom_id, body in requests.items()
+    )
+
+
+def parse_batch_output(text: str) -> dict[str, dict[str, Any] | None]:
+    """Parse Batch API JSONL output into custom_id -> response body"""
+    results: dict[str, dict[str, Any] | None] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            results[record["custom_id"]] = None
+        else:
+            results[record["custom_id"]] = response.get("body")
+    return results
+
+
+class BatchBackend(ABC):
+    """Abstract base class for batch execution backends."""
+
+    name: str
+
+    @abstractmethod
+    def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Submit requests keyed by custom_id and return the batch identifier."""
+        pass
+
+    @abstractmethod
+    def get_status(self, batch_id: str) -> str:
+        """Return 'in_progress', 'completed' or 'failed'."""
+        pass
+
+    @abstractmethod
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any] | None]:
+        """Return custom_id -> chat completion body for a completed batch."""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API implementation."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        self.client = OpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT,
+            base_url=settings.OPENAI_BASE_URL,
+        )
+
+    def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Upload the JSONL input file and create the batch."""
+        input_file = self.client.files.create(
+            file=(
+                f"ai_batch_{uuid.uuid4().hex}.jsonl",
+                io.BytesIO(build_batch_lines(requests).encode()),
+            ),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=CHAT_COMPLETIONS_URL,
+            completion_window=settings.AI_BATCH_COMPLETION_WINDOW,  # type: ignore[arg-type]
+        )
+        return str(batch.id)
+
+    def get_status(self, batch_id: str) -> str:
+        """Map the OpenAI batch status onto the backend status values."""
+        status = self.client.batches.retrieve(batch_id).status
+        if status in OPENAI_PENDING_STATUSES:
+            return "in_progress"
+        if status == "completed":
+            return "completed"
+        return "failed"
+
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any] | None]:
+        """Download and parse the output file; errored requests map to None."""
+        batch = self.client.batches.retrieve(batch_id)
+        results: dict[str, dict[str, Any] | None] = {}
+        if batch.output_file_id:
+            results.update(
+                parse_batch_output(self.client.files.content(batch.output_file_id).text)
+            )
+        if batch.error_file_id:
+            for custom_id in parse_batch_output(
+                self.client.files.content(batch.error_file_id).text
+            ):
+                results.setdefault(custom_id, None)
+        return results
+
+
+class LocalFileBatchBackend(BatchBackend):
+    """Local filesystem stand-in: a batch completes once its output file exists."""
+
+    name = "local"
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        os.makedirs(self.base_path, exist_ok=True)
+
+    def _path(self, batch_id: str, filename: str) -> str:
+        return os.path.join(self.base_path, batch_id, filename)
+
+    def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """Write the JSONL input file into a new batch directory."""
+        batch_id = f"local_{uuid.uuid4().hex}"
+        os.makedirs(os.path.join(self.base_path, batch_id), exist_ok=True)
+        with open(self._path(batch_id, "input.jsonl"), "w") as f:
+            f.write(build_batch_lines(requests))
+        return batch_id
+
+    def get_status(self, batch_id: str) -> str:
+        """Completed when output.jsonl exists, failed when the batch is unknown."""
+        if os.path.exists(self._path(batch_id, "output.jsonl")):
+            return "completed"
+        if os.path.exists(self._path(batch_id, "input.jsonl")):
+            return "in_progress"
+        return "failed"
+
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any] | None]:
+        """Parse the output file written by complete()."""
+        with open(self._path(batch_id, "output.jsonl")) as f:
+            return parse_batch_output(f.read())
+
+    def read_requests(self, batch_id: str) -> dict[str, dict[str, Any]]:
+        """Return the submitted request bodies keyed by custom_id."""
+        with open(self._path(batch_id, "input.jsonl")) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        return {line["custom_id"]: line["body"] for line in lines}
+
+    def complete(
+        self, batch_id: str, responder: Callable[[str, dict[str, Any]], str | None]
+    ) -> None:
+        """Produce output.jsonl by calling responder(custom_id, body) -> content.
+
+        A None content is written as a failed request.
+        """
+        lines: list[dict[str, Any]] = []
+        for custom_id, body in self.read_requests(batch_id).items():
+            content = responder(custom_id, body)
+            if content is None:
+                lines.append(
+                    {
+                        "custom_id": custom_id,
+                        "response": None,
+                        "error": {"message": "request failed"},
+                    }
+                )
+                continue
+            lines.append(
+                {
+                    "custom_id": custom_id,
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "id": f"chatcmpl-{uuid.uuid4().hex}",
+                            "object": "chat.completion",
+                            "created": 0,
+                            "model": body.get("model", settings.OPENAI_MODEL),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {
+                                        "role": "assistant",
+                                        "content": content,
+                                    },
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                            "usage": {
+                                "prompt_tokens": 0,
+                                "completion_tokens": 0,
+                                "total_tokens": 0,
+                            },
+                        },
+                    },
+                    "error": None,
+                }
+            )
+        with open(self._path(batch_id, "output.jsonl"), "w") as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+
+
+def get_batch_backend(api_key: str | None = None) -> BatchBackend:
+    """Get the configured batch backend instance."""
+    backend = settings.AI_BATCH_BACKEND.lower()
+
+    if backend == "local":
+        return LocalFileBatchBackend(base_path=settings.AI_BATCH_LOCAL_DIR)
+
+    if not api_key:
+        raise ValueError("An OpenAI API key is required for the openai batch backend")
+    return OpenAIBatchBackend(api_key=api_key)
@@ -0,0 +1,242 @@
+"""Bulk generation of pending AI reports through one shared scheduler
+
+Each report in a run uses the normal AI pipeline, but all of them share one
+event loop, one OpenAIKeyManager and one SectionScheduler. OpenAI requests are
+therefore bounded across the whole run (by AI_BULK_MAX_CONCURRENT_REQUESTS and
+the number of usable keys), and identical sections are analysed only once.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ai_bulk_run import AIBulkGenerationRun
+from app.models.assessment import Assessment, Report
+from app.services.openai_key_manager import OpenAIKeyManager
+from app.services.report_generator import (
+    SectionScheduler,
+    load_report_inputs,
+    mark_report_failed,
+    publish_ai_report,
+    run_ai_report_pipeline,
+)
+from app.services.report_timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class BulkGenerationService:
+    """Selects pending AI reports and generates them as one bounded run"""
+
+    @staticmethod
+    def select_pending_reports(
+        db: Session,
+        report_ids: list[str] | None = None,
+        requested_after: datetime | None = None,
+        requested_before: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[Report]:
+        """Pending AI reports matching the filters, oldest request first"""
+        query = db.query(Report).filter(
+            Report.report_type == "ai_enhanced", Report.status == "pending"
+        )
+        if report_ids:
+            query = query.filter(Report.id.in_(report_ids))
+        if requested_after:
+            query = query.filter(Report.requested_at >= requested_after)
+        if requested_before:
+            query = query.filter(Report.requested_at <= requested_before)
+
+        return (
+            query.order_by(Report.requested_at.asc())
+            .limit(
+                min(limit or settings.AI_BULK_MAX_REPORTS, settings.AI_BULK_MAX_REPORTS)
+            )
+            .all()
+        )
+
+    @staticmethod
+    def create_run(
+        db: Session,
+        reports: list[Report],
+        requested_by: str | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> AIBulkGenerationRun:
+        """Record the run and mark its reports as generating"""
+        run = AIBulkGenerationRun(
+            status="queued",
+            report_ids=[str(report.id) for report in reports],
+            filters=filters,
+            requested_by=requested_by,
+        )
+        db.add(run)
+        for report in reports:
+            report.status = "generating"  # type: ignore[assignment]
+        db.commit()
+        db.refresh(run)
+        return run
+
+    @staticmethod
+    def get_progress(db: Session, run: AIBulkGenerationRun) -> dict[str, Any]:
+        report_ids: list[str] = list(run.report_ids)  # type: ignore[arg-type]
+        status_counts: dict[str, int] = {
+            str(report_status): count
+            for report_status, count in db.query(Report.status, func.count(Report.id))
+            .filter(Report.id.in_(report_ids))
+            .group_by(Report.status)
+            .all()
+        }
+        return {
+            "id": str(run.id),
+            "status": run.status,
+            "report_count": len(report_ids),
+            "report_status_counts": status_counts,
+            "shared_sections": run.shared_sections,
+            "max_concurrent": run.max_concurrent,
+            "error_message": run.error_message,
+            "created_at": run.created_at,
+            "started_at": run.started_at,
+            "completed_at": run.completed_at,
+        }
+
+    @staticmethod
+    def request_budget(key_manager: OpenAIKeyManager) -> int:
+        """Concurrent OpenAI requests the run may have in flight"""
+        return max(
+            1,
+            min(
+                settings.AI_BULK_MAX_CONCURRENT_REQUESTS,
+                key_manager.count_available_keys() * settings.AI_BULK_REQUESTS_PER_KEY,
+            ),
+        )
+
+    @staticmethod
+    async def generate_report(
+        report_id: str, key_manager: OpenAIKeyManager, scheduler: SectionScheduler
+    ) -> bool:
+        """Generate and publish one report of the run. Returns success."""
+        db = SessionLocal()
+        report = None
+        timer = StageTimer("ai_enhanced")
+        try:
+            report = db.query(Report).filter(Report.id == report_id).first()
+            if not report:
+                logger.error(f"Report not found: {report_id}")
+                return False
+
+            assessment = (
+                db.query(Assessment)
+                .filter(Assessment.id == report.assessment_id)
+                .first()
+            )
+            if not assessment:
+                raise ValueError(f"Assessment not found for report: {report_id}")
+
+            responses, structure = load_report_inputs(db, assessment, timer)
+            _, _, synthesis_artifact, html_content = await run_ai_report_pipeline(
+                db,
+                assessment,
+                responses,
+                structure,
+                key_manager,
+                report_id,
+                scheduler=scheduler,
+                timer=timer,
+            )
+            # PDF rendering is CPU bound; keep the loop free for other reports
+            await asyncio.to_thread(
+                publish_ai_report, db, report, synthesis_artifact, html_content, timer
+            )
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Error generating AI report {report_id} in bulk run: {e}",
+                exc_info=True,
+            )
+            db.rollback()
+            if report:
+                mark_report_failed(db, report, e, timer)
+            return False
+        finally:
+            db.close()
+
+    @staticmethod
+    async def run(run_id: str) -> None:
+        """Generate every report of a run on one event loop"""
+        db = SessionLocal()
+        try:
+            run = (
+                db.query(AIBulkGenerationRun)
+                .filter(AIBulkGenerationRun.id == run_id)
+                .first()
+            )
+            if not run:
+                logger.error(f"Bulk generation run not found: {run_id}")
+                return
+
+            key_manager = OpenAIKeyManager(db)
+            max_concurrent = BulkGenerationService.request_budget(key_manager)
+            scheduler = SectionScheduler(max_concurrent)
+            report_slots = asyncio.Semaphore(settings.AI_BULK_MAX_CONCURRENT_REPORTS)
+
+            run.status = "running"  # type: ignore[assignment]
+            run.max_concurrent = max_concurrent  # type: ignore[assignment]
+            run.started_at = datetime.now(UTC)  # type: ignore[assignment]
+            db.commit()
+
+            report_ids: list[str] = list(run.report_ids)  # type: ignore[arg-type]
+            logger.info(
+                f"Bulk run {run_id}: generating {len(report_ids)} AI reports "
+                f"with {max_concurrent} concurrent requests"
+            )
+
+            async def generate(report_id: str) -> bool:
+                async with report_slots:
+                    return await BulkGenerationService.generate_report(
+                        report_id, key_manager, scheduler
+                    )
+
+            outcomes = await asyncio.gather(
+                *(generate(report_id) for report_id in report_ids)
+            )
+
+            run.status = "completed"  # type: ignore[assignment]
+            run.shared_sections = scheduler.shared_sections  # type: ignore[assignment]
+            run.completed_at = datetime.now(UTC)  # type: ignore[assignment]
+            db.commit()
+            logger.info(
+                f"Bulk run {run_id} finished: {sum(outcomes)}/{len(report_ids)} "
+                f"reports completed, {scheduler.shared_sections} section analyses shared"
+            )
+
+        except Exception as e:
+            logger.error(f"Bulk generation run {run_id} failed: {e}", exc_info=True)
+            db.rollback()
+            run = (
+                db.query(AIBulkGenerationRun)
+                .filter(AIBulkGenerationRun.id == run_id)
+                .first()
+            )
+            if run:
+                run.status = "failed"  # type: ignore[assignment]
+                run.error_message = str(e)[:500]  # type: ignore[assignment]
+                run.completed_at = datetime.now(UTC)  # type: ignore[assignment]
+                report_ids = list(run.report_ids)  # type: ignore[arg-type]
+                db.query(Report).filter(
+                    Report.id.in_(report_ids), Report.status == "generating"
+                ).update({"status": "failed"}, synchronize_session=False)
+                db.commit()
+        finally:
+            db.close()
+
+
+def generate_ai_reports_bulk(run_id: str) -> None:
+    """Background task entry point for a bulk run"""
+    asyncio.run(BulkGenerationService.run(run_id))
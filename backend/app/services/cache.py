@@ -6,6 +6,7 @@ from typing import Any
 import redis
 
 from app.core.config import settings
+from app.core.prometheus import cache_requests, redis_operation_duration
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +50,15 @@ class CacheService:
 
         try:
             assert self._redis_client is not None
-            value = self._redis_client.get(key)
+            with redis_operation_duration.time(operation="get"):
+                value = self._redis_client.get(key)
             if value:
+                cache_requests.inc(cache="redis", result="hit")
                 logger.debug(f"Cache hit: {key}")
                 if isinstance(value, bytes):
                     return json.loads(value.decode("utf-8"))
                 return json.loads(str(value))
+            cache_requests.inc(cache="redis", result="miss")
             logger.debug(f"Cache miss: {key}")
             return None
         except Exception as e:
@@ -68,10 +72,11 @@ class CacheService:
         try:
             assert self._redis_client is not None
             serialized = json.dumps(value)
-            if ttl:
-                self._redis_client.setex(key, ttl, serialized)
-            else:
-                self._redis_client.set(key, serialized)
+            with redis_operation_duration.time(operation="set"):
+                if ttl:
+                    self._redis_client.setex(key, ttl, serialized)
+                else:
+                    self._redis_client.set(key, serialized)
             logger.debug(f"Cache set: {key} (TTL: {ttl})")
             return True
         except Exception as e:
@@ -84,7 +89,8 @@ class CacheService:
 
         try:
             assert self._redis_client is not None
-            self._redis_client.delete(key)
+            with redis_operation_duration.time(operation="delete"):
+                self._redis_client.delete(key)
             logger.debug(f"Cache delete: {key}")
             return True
         except Exception as e:
@@ -0,0 +1,560 @@
+"""Deferred (batch API) execution of AI report generation
+
+AI reports are delivered in days, so they do not need the latency-optimised
+path. Section prompts for many reports are collected into one batch job,
+identical sections (same cache key) are requested once, and when the batch
+completes the results go through the normal artifact, cache and PDF stages.
+A second batch then carries the synthesis prompts.
+
+Jobs are polled by run_deferred_batch_loop when AI_DEFERRED_BATCH_ENABLED.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ai_artifacts import AISectionArtifact as AISectionArtifactModel
+from app.models.ai_batch_job import AIBatchJob
+from app.models.ai_metadata import AIGenerationMetadata
+from app.models.assessment import Assessment, Report
+from app.schemas.ai_artifacts import SectionAIArtifact, SynthesisArtifact
+from app.services.ai_cache import AICacheService
+from app.services.ai_synthesis import build_synthesis_request_params
+from app.services.artifact_blobs import ArtifactBlobService
+from app.services.batch_backend import BatchBackend, get_batch_backend
+from app.services.enhanced_context_extractor import get_enhanced_context_extractor
+from app.services.openai_key_manager import OpenAIKeyManager
+from app.services.pii_redactor import PIIRedactor
+from app.services.report_generator import (
+    build_fallback_synthesis,
+    build_section_request_params,
+    build_section_responses,
+    calculate_assessment_scores,
+    create_degraded_artifact,
+    generate_ai_report_html,
+    load_report_inputs,
+    mark_report_failed,
+    publish_ai_report,
+    safe_validate_section_artifact,
+)
+from app.services.report_timing import StageTimer
+from app.services.token_budget import PromptTooLargeError
+
+logger = logging.getLogger(__name__)
+
+BATCH_COST_DISCOUNT = 0.5  # Batch API requests are billed at half price
+BATCH_FAILED_MESSAGE = "AI analysis could not be completed. Please retry the report."
+
+
+def get_completion_content(body: dict[str, Any] | None) -> str | None:
+    """Return the message content of a chat completion body, if any"""
+    if not body or not body.get("choices"):
+        return None
+    content: str | None = body["choices"][0].get("message", {}).get("content")
+    return content
+
+
+class DeferredGenerationService:
+    """Submits AI report work as batch jobs and ingests the results"""
+
+    @staticmethod
+    def open_backend(
+        db: Session, key_id: str | None = None
+    ) -> tuple[BatchBackend, str | None]:
+        """Return the configured backend and the API key ID it was opened with
+
+        Polling passes the job's key ID, since a batch is only visible to the
+        account that created it.
+        """
+        if settings.AI_BATCH_BACKEND.lower() == "local":
+            return get_batch_backend(), None
+
+        key_manager = OpenAIKeyManager(db)
+        if key_id:
+            return get_batch_backend(key_manager.get_key(key_id)), key_id
+        key_id, api_key = key_manager.get_next_key()
+        return get_batch_backend(api_key), key_id
+
+    @staticmethod
+    def create_job(
+        db: Session,
+        phase: str,
+        report_ids: list[str],
+        requests: dict[str, dict[str, Any]],
+        targets: dict[str, dict[str, Any]],
+    ) -> AIBatchJob:
+        backend, key_id = DeferredGenerationService.open_backend(db)
+        external_batch_id = backend.submit(requests)
+
+        job = AIBatchJob(
+            backend=backend.name,
+            phase=phase,
+            status="submitted",
+            external_batch_id=external_batch_id,
+            api_key_id=key_id,
+            report_ids=report_ids,
+            requests_json=targets,
+            request_count=len(requests),
+            submitted_at=datetime.now(UTC),
+        )
+        db.add(job)
+        db.commit()
+        logger.info(
+            f"Submitted {phase} batch {external_batch_id} with {len(requests)} "
+            f"requests for {len(report_ids)} reports"
+        )
+        return job
+
+    @staticmethod
+    def submit_section_batch(db: Session, report_ids: list[str]) -> AIBatchJob | None:
+        """Collect uncached section prompts for the reports into one batch job
+
+        Cached sections are attached to their reports in the same commit as
+        the job, so a failed submission leaves nothing behind. When every
+        section is cached the synthesis batch is submitted instead.
+        """
+        reports = (
+            db.query(Report)
+            .filter(Report.id.in_(report_ids), Report.report_type == "ai_enhanced")
+            .all()
+        )
+        extractor = get_enhanced_context_extractor()
+        pii_redactor = (
+            PIIRedactor() if settings.ENABLE_PII_REDACTION_BEFORE_AI else None
+        )
+
+        requests: dict[str, dict[str, Any]] = {}
+        targets: dict[str, dict[str, Any]] = {}
+        submitted_ids = []
+        for report in reports:
+            assessment = (
+                db.query(Assessment)
+                .filter(Assessment.id == report.assessment_id)
+                .first()
+            )
+            if not assessment:
+                logger.error(f"Assessment not found for report: {report.id}")
+                report.status = "failed"  # type: ignore[assignment]
+                continue
+
+            responses, structure = load_report_inputs(db, assessment)
+            response_dict = {str(r.question_id): r for r in responses}
+            for section in structure.sections:
+                section_responses, _ = build_section_responses(
+                    section, response_dict, extractor, pii_redactor
+                )
+                if not section_responses:
+                    continue
+
+                answers_hash = AICacheService.compute_answers_hash(section_responses)
+                cached_artifact = AICacheService.get_cached_artifact(
+                    db,
+                    section.id,
+                    answers_hash,
+                    settings.AI_PROMPT_VERSION,
+                    settings.OPENAI_MODEL,
+                )
+                custom_id = f"section:{section.id}:{answers_hash}"
+                if not cached_artifact and custom_id not in requests:
+                    try:
+                        requests[custom_id] = build_section_request_params(
+                            section, section_responses
+                        )
+                    except PromptTooLargeError as e:
+                        logger.error(f"Section {section.id} not batched: {e}")
+                        # Attached like a cache hit, so the report still completes
+                        cached_artifact = create_degraded_artifact(section.id)
+                if cached_artifact:
+                    db.add(
+                        AISectionArtifactModel(
+                            report_id=report.id,
+                            section_id=section.id,
+                            blob_hash=ArtifactBlobService.get_or_create_blob(
+                                db, cached_artifact.model_dump()
+                            ),
+                        )
+                    )
+                    continue
+
+                if custom_id not in targets:
+                    targets[custom_id] = {
+                        "section_id": section.id,
+                        "answers_hash": answers_hash,
+                        "max_tokens": requests[custom_id]["max_tokens"],
+                        "report_ids": [],
+                    }
+                targets[custom_id]["report_ids"].append(str(report.id))
+
+            report.status = "generating"  # type: ignore[assignment]
+            submitted_ids.append(str(report.id))
+
+        if not submitted_ids:
+            db.commit()
+            return None
+        if not requests:
+            logger.info("All sections cached; submitting synthesis batch directly")
+            db.flush()  # Synthesis prompts read the cached artifacts back
+            job = DeferredGenerationService.submit_synthesis_batch(db, submitted_ids)
+        else:
+            logger.info(
+                f"Deduplicated {sum(len(t['report_ids']) for t in targets.values())} "
+                f"section analyses to {len(requests)} batch requests"
+            )
+            job = DeferredGenerationService.create_job(
+                db, "sections", submitted_ids, requests, targets
+            )
+        AICacheService.flush_hit_counts(db)
+        return job
+
+    @staticmethod
+    def load_section_artifacts(
+        db: Session, report_id: str
+    ) -> dict[str, SectionAIArtifact]:
+        rows = (
+            db.query(AISectionArtifactModel)
+            .filter(AISectionArtifactModel.report_id == report_id)
+            .all()
+        )
+        return {
+            str(row.section_id): SectionAIArtifact.model_validate(
+                ArtifactBlobService.resolve_payload(row)
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    def submit_synthesis_batch(db: Session, report_ids: list[str]) -> AIBatchJob | None:
+        """Submit one synthesis request per report
+
+        Pending changes are committed together with the job.
+        """
+        requests: dict[str, dict[str, Any]] = {}
+        targets: dict[str, dict[str, Any]] = {}
+        for report in db.query(Report).filter(Report.id.in_(report_ids)).all():
+            assessment = (
+                db.query(Assessment)
+                .filter(Assessment.id == report.assessment_id)
+                .first()
+            )
+            if not assessment:
+                report.status = "failed"  # type: ignore[assignment]
+                continue
+
+            responses, structure = load_report_inputs(db, assessment)
+            scores = calculate_assessment_scores(responses, structure)
+            section_artifacts = DeferredGenerationService.load_section_artifacts(
+                db, str(report.id)
+            )
+
+            custom_id = f"synthesis:{report.id}"
+            requests[custom_id] = build_synthesis_request_params(
+                section_artifacts, structure, scores
+            )
+            targets[custom_id] = {"report_id": str(report.id)}
+
+        if not requests:
+            db.commit()
+            return None
+        return DeferredGenerationService.create_job(
+            db,
+            "synthesis",
+            [t["report_id"] for t in targets.values()],
+            requests,
+            targets,
+        )
+
+    @staticmethod
+    def ingest_section_results(
+        db: Session, job: AIBatchJob, results: dict[str, dict[str, Any] | None]
+    ) -> None:
+        """Store section artifacts, metadata and cache entries for every report"""
+        targets: dict[str, dict[str, Any]] = job.requests_json  # type: ignore[assignment]
+        # A report may have been generated another way while the batch ran
+        # (e.g. an admin's synchronous generate-ai); keep what it stored
+        existing = {
+            (str(report_id), str(section_id))
+            for report_id, section_id in db.query(
+                AISectionArtifactModel.report_id, AISectionArtifactModel.section_id
+            ).filter(AISectionArtifactModel.report_id.in_(list(job.report_ids)))  # type: ignore[arg-type]
+        }
+        for custom_id, target in targets.items():
+            section_id = target["section_id"]
+            body = results.get(custom_id)
+            content = get_completion_content(body)
+
+            artifact: SectionAIArtifact | None = None
+            if content:
+                try:
+                    artifact = safe_validate_section_artifact(content, section_id)
+                except Exception as e:
+                    logger.error(
+                        f"Batch result for section {section_id} is invalid: {e}"
+                    )
+            if artifact is None:
+                logger.warning(
+                    f"Using degraded artifact for batched section {section_id}"
+                )
+            stored = artifact or create_degraded_artifact(section_id)
+
+            usage = (body or {}).get("usage") or {}
+            tokens_prompt = usage.get("prompt_tokens", 0)
+            tokens_completion = usage.get("completion_tokens", 0)
+            tokens_prompt_cached = (usage.get("prompt_tokens_details") or {}).get(
+                "cached_tokens"
+            )
+            cost_usd = (
+                tokens_prompt * 0.00001 + tokens_completion * 0.00003
+            ) * BATCH_COST_DISCOUNT
+            finish_reason = (
+                body["choices"][0].get("finish_reason") if body and content else None
+            )
+            share = len(target["report_ids"])
+
+            for report_id in target["report_ids"]:
+                if (report_id, section_id) in existing:
+                    logger.info(
+                        f"Report {report_id} already has section {section_id}; "
+                        "keeping the existing artifact"
+                    )
+                    continue
+                db.add(
+                    AISectionArtifactModel(
+                        report_id=report_id,
+                        section_id=section_id,
+                        blob_hash=ArtifactBlobService.get_or_create_blob(
+                            db, stored.model_dump()
+                        ),
+                    )
+                )
+                # One request served every report with this section; split usage
+                db.add(
+                    AIGenerationMetadata(
+                        report_id=report_id,
+                        section_id=section_id,
+                        prompt_version=settings.AI_PROMPT_VERSION,
+                        schema_version=settings.AI_SCHEMA_VERSION,
+                        model=settings.OPENAI_MODEL,
+                        temperature=settings.OPENAI_TEMPERATURE,
+                        max_tokens=target["max_tokens"],
+                        tokens_prompt=tokens_prompt // share,
+                        tokens_prompt_cached=tokens_prompt_cached,
+                        tokens_completion=tokens_completion // share,
+                        finish_reason=finish_reason,
+                        total_cost_usd=cost_usd / share,
+                        is_degraded=int(artifact is None),
+                    )
+                )
+
+            if artifact is not None:
+                AICacheService.store_artifact(
+                    db,
+                    section_id,
+                    target["answers_hash"],
+                    settings.AI_PROMPT_VERSION,
+                    settings.AI_SCHEMA_VERSION,
+                    settings.OPENAI_MODEL,
+                    artifact,
+                    tokens_prompt,
+                    tokens_completion,
+                    cost_usd,
+                )
+        db.commit()
+
+    @staticmethod
+    def ingest_synthesis_results(
+        db: Session, job: AIBatchJob, results: dict[str, dict[str, Any] | None]
+    ) -> None:
+        """Render and publish each report with its synthesis"""
+        targets: dict[str, dict[str, Any]] = job.requests_json  # type: ignore[assignment]
+        for custom_id, target in targets.items():
+            report = db.query(Report).filter(Report.id == target["report_id"]).first()
+            if not report:
+                continue
+            # Sections and synthesis ran in earlier batch jobs; this times publishing
+            timer = StageTimer("ai_enhanced")
+            try:
+                assessment = (
+                    db.query(Assessment)
+                    .filter(Assessment.id == report.assessment_id)
+                    .first()
+                )
+                if not assessment:
+                    raise ValueError(f"Assessment not found for report: {report.id}")
+
+                responses, structure = load_report_inputs(db, assessment, timer)
+                with timer.stage("scores"):
+                    scores = calculate_assessment_scores(responses, structure)
+                ai_insights = DeferredGenerationService.load_section_artifacts(
+                    db, str(report.id)
+                )
+
+                content = get_completion_content(results.get(custom_id))
+                try:
+                    if not content:
+                        raise ValueError("Empty synthesis result")
+                    synthesis = SynthesisArtifact.model_validate_json(content)
+                except Exception as e:
+                    logger.error(
+                        f"Batched synthesis for report {report.id} failed; "
+                        f"using minimal fallback: {e}"
+                    )
+                    synthesis = build_fallback_synthesis(scores)
+
+                with timer.stage("html"):
+                    html_content = generate_ai_report_html(
+                        assessment, responses, scores, structure, ai_insights, synthesis
+                    )
+                publish_ai_report(db, report, synthesis, html_content, timer)
+            except Exception as e:
+                logger.error(
+                    f"Error publishing deferred AI report {report.id}: {e}",
+                    exc_info=True,
+                )
+                db.rollback()
+                mark_report_failed(db, report, e, timer)
+
+    @staticmethod
+    def poll_job(db: Session, job: AIBatchJob) -> str:
+        """Check a submitted job and ingest it once complete. Returns its status.
+
+        An ingested sections job stays synthesis_pending until its synthesis
+        batch has been submitted, so a failed submission is retried on the
+        next poll.
+        """
+        report_ids: list[str] = list(job.report_ids)  # type: ignore[arg-type]
+        if job.status == "synthesis_pending":
+            return DeferredGenerationService.submit_pending_synthesis(
+                db, job, report_ids
+            )
+
+        backend, _ = DeferredGenerationService.open_backend(
+            db, str(job.api_key_id) if job.api_key_id else None
+        )
+        external_batch_id = str(job.external_batch_id)
+        batch_status = backend.get_status(external_batch_id)
+        if batch_status == "in_progress":
+            return "submitted"
+
+        if batch_status == "failed":
+            logger.error(f"Batch {external_batch_id} ({job.phase}) failed")
+            DeferredGenerationService.fail_job(
+                db, job, report_ids, f"Batch {external_batch_id} failed"
+            )
+            return "failed"
+
+        results = backend.get_results(external_batch_id)
+        if job.phase == "sections":
+            DeferredGenerationService.ingest_section_results(db, job, results)
+            job.status = "synthesis_pending"  # type: ignore[assignment]
+        else:
+            DeferredGenerationService.ingest_synthesis_results(db, job, results)
+            job.status = "ingested"  # type: ignore[assignment]
+
+        job.completed_at = datetime.now(UTC)  # type: ignore[assignment]
+        db.commit()
+        logger.info(f"Ingested {job.phase} batch {external_batch_id}")
+
+        if job.phase == "sections":
+            return DeferredGenerationService.submit_pending_synthesis(
+                db, job, report_ids
+            )
+        return "ingested"
+
+    @staticmethod
+    def fail_job(
+        db: Session, job: AIBatchJob, report_ids: list[str], error: str
+    ) -> None:
+        """Mark the job and its unfinished reports failed"""
+        job.status = "failed"  # type: ignore[assignment]
+        job.error_message = error[:500]  # type: ignore[assignment]
+        job.completed_at = datetime.now(UTC)  # type: ignore[assignment]
+        db.query(Report).filter(
+            Report.id.in_(report_ids), Report.status == "generating"
+        ).update(
+            {"status": "failed", "error_message": BATCH_FAILED_MESSAGE},
+            synchronize_session=False,
+        )
+        db.commit()
+
+    @staticmethod
+    def record_poll_failure(db: Session, job: AIBatchJob, error: Exception) -> None:
+        """Count a poll that raised; past AI_BATCH_MAX_POLL_FAILURES the job
+        and its reports fail instead of staying submitted forever"""
+        db.rollback()
+        job.poll_failures = (job.poll_failures or 0) + 1  # type: ignore[assignment]
+        if job.poll_failures >= settings.AI_BATCH_MAX_POLL_FAILURES:
+            logger.error(
+                f"Giving up on batch job {job.id} after {job.poll_failures} "
+                f"failed polls: {error}"
+            )
+            DeferredGenerationService.fail_job(
+                db,
+                job,
+                list(job.report_ids),  # type: ignore[arg-type]
+                f"Polling failed {job.poll_failures} times: {error}",
+            )
+            return
+        db.commit()
+
+    @staticmethod
+    def submit_pending_synthesis(
+        db: Session, job: AIBatchJob, report_ids: list[str]
+    ) -> str:
+        """Submit the synthesis batch for an ingested sections job"""
+        DeferredGenerationService.submit_synthesis_batch(db, report_ids)
+        job.status = "ingested"  # type: ignore[assignment]
+        db.commit()
+        return "ingested"
+
+    @staticmethod
+    def run_once() -> int:
+        """Poll every unfinished job. Returns the number of jobs ingested."""
+        db = SessionLocal()
+        try:
+            jobs = (
+                db.query(AIBatchJob)
+                .filter(AIBatchJob.status.in_(("submitted", "synthesis_pending")))
+                .order_by(AIBatchJob.submitted_at.asc())
+                .all()
+            )
+            ingested = 0
+            for job in jobs:
+                try:
+                    if DeferredGenerationService.poll_job(db, job) == "ingested":
+                        ingested += 1
+                except Exception as e:
+                    logger.error(f"Failed to poll batch job {job.id}: {e}")
+                    DeferredGenerationService.record_poll_failure(db, job, e)
+            return ingested
+        finally:
+            db.close()
+
+
+def submit_deferred_reports_in_background(report_ids: list[str]) -> None:
+    db = SessionLocal()
+    try:
+        DeferredGenerationService.submit_section_batch(db, report_ids)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to submit deferred AI reports {report_ids}: {e}")
+        db.query(Report).filter(Report.id.in_(report_ids)).update(
+            {"status": "failed"}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_deferred_batch_loop(poll_seconds: int) -> None:
+    """Poll submitted batch jobs until cancelled"""
+    while True:
+        await asyncio.sleep(poll_seconds)
+        try:
+            await asyncio.to_thread(DeferredGenerationService.run_once)
+        except Exception as e:
+            logger.error(f"Deferred batch worker error: {e}")
@@ -0,0 +1,126 @@
+"""Short-lived cache of the identities behind verified access tokens
+
+get_current_user runs on nearly every request. The verified claims of a token
+are memoized by token hash, never past the token's expiry, and the user behind
+them is cached in process (and optionally in Redis) for
+IDENTITY_CACHE_TTL_SECONDS. Admin actions that change or delete users
+invalidate their entries here; other workers' in-process entries age out
+within the TTL.
+"""
+
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.core.config import settings
+from app.schemas.user import CurrentUserResponse
+from app.services.cache import cache_service
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "identity:"
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class IdentityCache:
+    """Token claims and current users, keyed by token hash and by user id/email"""
+
+    def __init__(self) -> None:
+        self._claims = TTLCache(
+            max_size=settings.IDENTITY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+        )
+        self._users = TTLCache(
+            max_size=settings.IDENTITY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.IDENTITY_CACHE_TTL_SECONDS > 0
+
+    def verified_claims(
+        self, token: str, verify: Callable[[str], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Verify a token once; repeat requests with it reuse the claims"""
+        if not self.is_enabled():
+            return verify(token)
+
+        key = token_hash(token)
+        claims: dict[str, Any] | None = self._claims.get(key)
+        if claims is not None:
+            return claims
+
+        claims = verify(token)
+        remaining = float(claims.get("exp", 0)) - time.time()
+        if remaining > 0:
+            self._claims.set(
+                key,
+                claims,
+                ttl_seconds=min(remaining, settings.IDENTITY_CACHE_TTL_SECONDS),
+            )
+        return claims
+
+    def get_user(
+        self,
+        lookup: str,
+        value: str,
+        load: Callable[[], CurrentUserResponse | None],
+    ) -> CurrentUserResponse | None:
+        """The user whose `lookup` ("id" or "email") is `value`; misses are not cached"""
+        if not self.is_enabled():
+            return load()
+
+        key = f"{lookup}:{value}"
+        user: CurrentUserResponse | None = self._users.get(key)
+        if user is not None:
+            return user
+
+        if settings.IDENTITY_CACHE_REDIS_ENABLED:
+            cached = cache_service.get(f"{REDIS_KEY_PREFIX}{key}")
+            if cached is not None:
+                try:
+                    user = CurrentUserResponse.model_validate(cached)
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable identity cache entry: {e}")
+
+        if user is None:
+            user = load()
+            if user is None:
+                return None
+            if settings.IDENTITY_CACHE_REDIS_ENABLED:
+                cache_service.set(
+                    f"{REDIS_KEY_PREFIX}{key}",
+                    user.model_dump(mode="json"),
+                    ttl=settings.IDENTITY_CACHE_TTL_SECONDS,
+                )
+
+        self._users.set(key, user)
+        return user
+
+    def invalidate_users(self, users: Iterable[tuple[Any, Any]]) -> None:
+        """Drop the cached identities of (user id, email) pairs"""
+        for user_id, email in users:
+            for key in (f"id:{user_id}", f"email:{email}"):
+                self._users.delete(key)
+                if settings.IDENTITY_CACHE_REDIS_ENABLED:
+                    cache_service.delete(f"{REDIS_KEY_PREFIX}{key}")
+
+    def clear(self) -> None:
+        self._claims.clear()
+        self._users.clear()
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "claims": self._claims.get_stats(),
+            "users": self._users.get_stats(),
+        }
+
+
+identity_cache = IdentityCache()
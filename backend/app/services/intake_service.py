@@ -5,11 +5,14 @@ Handles AI-powered section recommendations with fallback logic and guardrails.
 
 import json
 import logging
+import time
 from typing import Any
 
 import openai
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.prometheus import observe_openai_call
 from app.models.intake import IntakeSession
 from app.schemas.intake import (
     AIRecommendationResponse,
@@ -24,6 +27,7 @@ from app.services.intake_prompt_builder import (
     build_messages,
     get_openai_params,
 )
+from app.services.llm_cache import CALL_SITE_INTAKE, llm_response_cache
 from app.services.openai_key_manager import OpenAIKeyManager
 
 logger = logging.getLogger(__name__)
@@ -74,19 +78,35 @@ def call_openai_for_recommendations(
     key_id: str | None = None
     api_key: str | None = None
 
+    messages = build_messages(user_profile, sections)
+    params = get_openai_params()
+    request_params = {"messages": messages, **params}
+
+    cached_response = llm_response_cache.get_cached_completion(
+        CALL_SITE_INTAKE, request_params
+    )
+    if cached_response is not None:
+        try:
+            raw_dict = json.loads(cached_response.choices[0].message.content or "")
+            return AIRecommendationResponse(**raw_dict), raw_dict
+        except Exception as e:
+            logger.warning(f"Cached intake recommendation is invalid: {e}")
+
     try:
         key_id, api_key = key_manager.get_next_key()
         if not key_id or not api_key:
             logger.error("No available OpenAI API keys")
             return None, None
 
-        messages = build_messages(user_profile, sections)
-        params = get_openai_params()
-
-        client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            messages=messages,  # type: ignore
-            **params,
+        client = openai.OpenAI(api_key=api_key, base_url=settings.OPENAI_BASE_URL)
+        start_time = time.perf_counter()
+        response = client.chat.completions.create(**request_params)
+        observe_openai_call(
+            key_id,
+            request_params["model"],
+            CALL_SITE_INTAKE,
+            time.perf_counter() - start_time,
+            response.usage,
         )
 
         content = response.choices[0].message.content
@@ -110,6 +130,7 @@ def call_openai_for_recommendations(
             return None, None
 
         key_manager.record_success(key_id)
+        llm_response_cache.store_completion(CALL_SITE_INTAKE, request_params, response)
 
         return ai_response, raw_dict
 
@@ -0,0 +1,238 @@
+"""Content-addressed cache for OpenAI chat completion responses"""
+
+import hashlib
+import json
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from openai.types.chat import ChatCompletion
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.prometheus import cache_requests
+from app.models.ai_cache import AIResponseCache
+from app.services.ai_cache import CacheUsageTracker
+from app.services.cache import cache_service
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CALL_SITE_SECTION_ANALYSIS = "section_analysis"
+CALL_SITE_SECTION_FALLBACK = "section_fallback"
+CALL_SITE_SYNTHESIS = "synthesis"
+CALL_SITE_INTAKE = "intake_recommendations"
+
+HASHED_PARAMS = ("model", "messages", "response_format", "temperature")
+REDIS_KEY_PREFIX = "llm_response:"
+
+# Database-tier hits, buffered like ai_section_cache hits
+response_cache_usage = CacheUsageTracker()
+
+
+class LLMResponseCache:
+    """Three-tier (memory -> Redis -> database) cache in front of chat completions.
+
+    Entries are keyed by a canonical hash of the request, so identical prompts
+    reuse the stored response regardless of which report triggered them.
+    """
+
+    def __init__(self) -> None:
+        self._memory = TTLCache(
+            max_size=settings.LLM_CACHE_MEMORY_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def compute_request_hash(params: dict[str, Any]) -> str:
+        """Compute deterministic hash of the request fields that shape the output"""
+        canonical = {key: params.get(key) for key in HASHED_PARAMS}
+        canonical_json = json.dumps(canonical, sort_keys=True, default=str)
+        return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+    @staticmethod
+    def is_enabled_for(call_site: str) -> bool:
+        return settings.LLM_CACHE_ENABLED and call_site in settings.LLM_CACHE_CALL_SITES
+
+    def get_cached_completion(
+        self, call_site: str, params: dict[str, Any], db: Session | None = None
+    ) -> ChatCompletion | None:
+        """Return a cached completion for these request params, if any"""
+        if not self.is_enabled_for(call_site):
+            return None
+
+        request_hash = self.compute_request_hash(params)
+
+        payload = self._memory.get(request_hash)
+        if payload is None:
+            payload = cache_service.get(f"{REDIS_KEY_PREFIX}{request_hash}")
+            if payload is None:
+                payload = self._get_from_db(request_hash, db)
+                if payload is not None:
+                    cache_service.set(
+                        f"{REDIS_KEY_PREFIX}{request_hash}",
+                        payload,
+                        ttl=settings.LLM_CACHE_TTL_SECONDS,
+                    )
+            if payload is not None:
+                self._memory.set(request_hash, payload)
+
+        if payload is None:
+            cache_requests.inc(cache="llm_response", result="miss")
+            logger.info(f"LLM cache MISS for {call_site}")
+            return None
+
+        try:
+            completion = ChatCompletion.model_validate(payload)
+        except Exception as e:
+            logger.warning(
+                f"Discarding unreadable LLM cache entry for {call_site}: {e}"
+            )
+            self._memory.delete(request_hash)
+            return None
+
+        cache_requests.inc(cache="llm_response", result="hit")
+        logger.info(f"LLM cache HIT for {call_site}")
+        return completion
+
+    def store_completion(
+        self,
+        call_site: str,
+        params: dict[str, Any],
+        response: Any,
+        db: Session | None = None,
+    ) -> None:
+        """Store a validated completion. Only complete (finish_reason=stop) responses are kept."""
+        if not self.is_enabled_for(call_site):
+            return
+
+        try:
+            payload = response.model_dump(mode="json")
+        except Exception:
+            return
+        if not isinstance(payload, dict):
+            return
+
+        choices = payload.get("choices") or []
+        if not choices or choices[0].get("finish_reason") != "stop":
+            return
+
+        request_hash = self.compute_request_hash(params)
+        self._memory.set(request_hash, payload)
+        cache_service.set(
+            f"{REDIS_KEY_PREFIX}{request_hash}",
+            payload,
+            ttl=settings.LLM_CACHE_TTL_SECONDS,
+        )
+        self._store_in_db(
+            request_hash, call_site, str(params.get("model", "")), payload, db
+        )
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        return self._memory.get_stats()
+
+    def _get_from_db(self, request_hash: str, db: Session | None) -> dict | None:
+        session = db or SessionLocal()
+        try:
+            entry = (
+                session.query(AIResponseCache)
+                .filter(AIResponseCache.request_hash == request_hash)
+                .first()
+            )
+            if not entry:
+                return None
+
+            now = datetime.now(UTC)
+            expires_at = entry.expires_at
+            if expires_at is not None:
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=UTC)
+                if expires_at <= now:
+                    return None
+
+            payload: dict = entry.response_json  # type: ignore[assignment]
+            pending = response_cache_usage.record_hit(str(entry.id))
+            if pending >= settings.AI_CACHE_HIT_FLUSH_THRESHOLD:
+                self.flush_hit_counts(session)
+            return payload
+        except Exception as e:
+            logger.warning(f"LLM cache database lookup failed: {e}")
+            session.rollback()
+            return None
+        finally:
+            if db is None:
+                session.close()
+
+    @staticmethod
+    def flush_hit_counts(db: Session) -> int:
+        """Write buffered database-tier hits and last-used times in a single commit"""
+        pending = response_cache_usage.drain_pending_hits()
+        if not pending:
+            return 0
+
+        try:
+            for cache_id, (count, last_used_at) in pending.items():
+                db.query(AIResponseCache).filter(AIResponseCache.id == cache_id).update(
+                    {
+                        AIResponseCache.hit_count: AIResponseCache.hit_count + count,
+                        AIResponseCache.last_used_at: last_used_at,
+                    },
+                    synchronize_session=False,
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush LLM cache hit counts: {e}")
+            return 0
+
+        return len(pending)
+
+    def _store_in_db(
+        self,
+        request_hash: str,
+        call_site: str,
+        model: str,
+        payload: dict,
+        db: Session | None,
+    ) -> None:
+        session = db or SessionLocal()
+        expires_at = datetime.now(UTC) + timedelta(
+            seconds=settings.LLM_CACHE_TTL_SECONDS
+        )
+        try:
+            entry = (
+                session.query(AIResponseCache)
+                .filter(AIResponseCache.request_hash == request_hash)
+                .first()
+            )
+            if entry:
+                entry.response_json = payload  # type: ignore[assignment]
+                entry.expires_at = expires_at  # type: ignore[assignment]
+            else:
+                session.add(
+                    AIResponseCache(
+                        request_hash=request_hash,
+                        call_site=call_site,
+                        model=model,
+                        response_json=payload,
+                        expires_at=expires_at,
+                    )
+                )
+            session.commit()
+            logger.info(f"Cached LLM response for {call_site}")
+        except IntegrityError:
+            session.rollback()
+        except Exception as e:
+            logger.warning(f"LLM cache database store failed: {e}")
+            session.rollback()
+        finally:
+            if db is None:
+                session.close()
+
+
+llm_response_cache = LLMResponseCache()
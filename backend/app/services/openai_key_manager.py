@@ -158,6 +158,37 @@ class OpenAIKeyManager:
 
         return (str(key.id), decrypted_key)
 
+    def count_available_keys(self) -> int:
+        """Count active keys that are not cooling down."""
+        assert self.db is not None
+        now = datetime.now(UTC)
+        return (
+            self.db.query(OpenAIAPIKey)
+            .filter(
+                and_(
+                    OpenAIAPIKey.is_active,
+                    (OpenAIAPIKey.cooldown_until.is_(None))
+                    | (OpenAIAPIKey.cooldown_until <= now),
+                )
+            )
+            .count()
+        )
+
+    def get_key(self, key_id: str) -> str:
+        """Get the decrypted API key for a specific key ID.
+
+        Used when a request must go back to the same account, e.g. polling an
+        OpenAI batch created with that key.
+
+        Raises:
+            ValueError: If the key does not exist
+        """
+        assert self.db is not None
+        key = self.db.query(OpenAIAPIKey).filter(OpenAIAPIKey.id == key_id).first()
+        if not key:
+            raise ValueError(f"OpenAI API key not found: {key_id}")
+        return decrypt_api_key(str(key.encrypted_key))
+
     def record_success(self, key_id: str) -> None:
         """Record a successful API call for a key.
 
@@ -265,7 +296,9 @@ class OpenAIKeyManager:
             Tuple of (is_valid, message)
         """
         try:
-            client = OpenAI(api_key=api_key, timeout=10.0)
+            client = OpenAI(
+                api_key=api_key, timeout=10.0, base_url=settings.OPENAI_BASE_URL
+            )
 
             response = client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
@@ -308,6 +341,10 @@ def get_openai_client_with_rotation(db: Session | None = None) -> tuple[OpenAI,
     with OpenAIKeyManager(db) as manager:
         key_id, api_key = manager.get_next_key()
 
-        client = OpenAI(api_key=api_key, timeout=settings.OPENAI_TIMEOUT)
+        client = OpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT,
+            base_url=settings.OPENAI_BASE_URL,
+        )
 
         return (client, key_id)
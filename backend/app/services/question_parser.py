@@ -397,13 +397,15 @@ def filter_structure_by_sections(
     if not section_ids:
         return structure
 
+    selected = set(section_ids)
     filtered_sections = [
-        section for section in structure.sections if section.id in section_ids
+        section for section in structure.sections if section.id in selected
     ]
 
     total_questions = sum(len(section.questions) for section in filtered_sections)
 
-    return AssessmentStructure(
+    # The sections were validated with the full structure
+    return AssessmentStructure.model_construct(
         sections=filtered_sections, total_questions=total_questions
     )
 
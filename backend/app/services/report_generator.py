@@ -3,11 +3,14 @@ import logging
 import random
 import time
 import uuid
+from collections.abc import Callable
+from contextlib import AsyncExitStack, nullcontext
 from datetime import UTC, datetime
 from typing import Any
 
 import markdown2  # type: ignore[import-untyped]
 from jinja2 import Environment
+from markupsafe import Markup
 from openai import (
     APIConnectionError,
     APIError,
@@ -18,6 +21,7 @@ from openai import (
     RateLimitError,
 )
 from pydantic import ValidationError
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.exc import SQLAlchemyError
 from tenacity import (
     retry,
@@ -29,6 +33,7 @@ from weasyprint import HTML
 
 from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.prometheus import observe_openai_call
 from app.core.scoring_scales import (
     get_option_weight,
     map_numeric_to_slug,
@@ -48,20 +53,47 @@ from app.schemas.ai_artifacts import (
 from app.schemas.assessment import Question
 from app.services.ai_cache import AICacheService
 from app.services.ai_synthesis import (
+    build_section_summary,
     create_minimal_synthesis,
     generate_synthesis_artifact,
 )
+from app.services.artifact_blobs import ArtifactBlobService
 from app.services.benchmark_context import benchmark_context_service
 from app.services.enhanced_context_extractor import get_enhanced_context_extractor
+from app.services.llm_cache import (
+    CALL_SITE_SECTION_ANALYSIS,
+    CALL_SITE_SECTION_FALLBACK,
+    llm_response_cache,
+)
 from app.services.openai_key_manager import OpenAIKeyManager
 from app.services.pii_redactor import PIIRedactor
-from app.services.prompt_builder import build_section_prompt_v2
-from app.services.question_parser import (
-    filter_structure_by_sections,
-    load_assessment_structure,
+from app.services.prompt_builder import (
+    build_section_messages,
+    build_section_prompt_v2,
+)
+from app.services.report_memory import (
+    REPORT_TOO_LARGE_MESSAGE,
+    ReportMemoryLimitExceeded,
+    needs_isolated_render,
+    render_pdf_isolated,
+)
+from app.services.report_timing import StageTimer, timed_stage
+from app.services.section_batching import (
+    build_batch_request_params,
+    plan_section_batches,
 )
 from app.services.security_metrics import security_metrics
+from app.services.static_payloads import filtered_structure
 from app.services.storage import get_storage_service
+from app.services.token_budget import (
+    SECTION_COMPACTION_LEVELS,
+    PromptTooLargeError,
+    count_message_tokens,
+    estimate_completion_tokens,
+    fit_max_tokens,
+    get_cached_prompt_tokens,
+    section_prompt_budget,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +119,7 @@ def generate_standard_report(report_id: str) -> None:
 
     db = SessionLocal()
     report = None
+    timer = StageTimer("standard")
     try:
         logger.info(f"Starting standard report generation for report_id: {report_id}")
 
@@ -104,31 +137,17 @@ def generate_standard_report(report_id: str) -> None:
             db.commit()
             return
 
-        logger.info(f"Loading responses for assessment: {assessment.id}")
-        responses = (
-            db.query(AssessmentResponse)
-            .filter(AssessmentResponse.assessment_id == assessment.id)
-            .all()
-        )
-        logger.info(f"Found {len(responses)} responses")
-
-        logger.info("Loading assessment structure")
-        structure = load_assessment_structure()
-
-        if assessment.selected_section_ids:
-            logger.info(
-                f"Filtering structure to {len(assessment.selected_section_ids)} selected sections"
-            )
-            structure = filter_structure_by_sections(
-                structure,
-                list(assessment.selected_section_ids),  # type: ignore[arg-type]
-            )
+        responses, structure = load_report_inputs(db, assessment, timer)
 
         logger.info("Calculating scores")
-        scores = calculate_assessment_scores(responses, structure)
+        with timer.stage("scores"):
+            scores = calculate_assessment_scores(responses, structure)
 
         logger.info("Generating HTML content")
-        html_content = generate_report_html(assessment, responses, scores, structure)
+        with timer.stage("html"):
+            html_content = generate_report_html(
+                assessment, responses, scores, structure
+            )
         logger.info(f"HTML content generated successfully ({len(html_content)} bytes)")
 
         filename = f"report_{report_id}_{uuid.uuid4().hex[:8]}.pdf"
@@ -137,7 +156,8 @@ def generate_standard_report(report_id: str) -> None:
         logger.info("REPORTS_DIR configured as: %s", settings.REPORTS_DIR)
         logger.info("Generating PDF bytes for storage")
         try:
-            pdf_bytes = HTML(string=html_content, url_fetcher=None).write_pdf()
+            pdf_bytes = render_pdf(html_content, timer)
+            timer.pdf_bytes = len(pdf_bytes)
             logger.info("WeasyPrint PDF byte generation completed")
         except Exception as pdf_error:
             logger.error(
@@ -146,7 +166,8 @@ def generate_standard_report(report_id: str) -> None:
             raise
 
         logger.info("Saving report to configured storage backend")
-        storage_location = storage_service.save(pdf_bytes, filename)
+        with timer.stage("storage"):
+            storage_location = storage_service.save(pdf_bytes, filename)
 
         if not storage_service.exists(storage_location):
             raise Exception(
@@ -158,6 +179,7 @@ def generate_standard_report(report_id: str) -> None:
         report.status = "completed"  # type: ignore[assignment]
         report.completed_at = datetime.now(UTC)  # type: ignore[assignment]
         db.commit()
+        timer.save(db, report_id, "completed")
 
         logger.info(
             f"Report generation completed successfully for report_id: {report_id}"
@@ -167,8 +189,7 @@ def generate_standard_report(report_id: str) -> None:
         error_msg = f"Error generating standard report {report_id}: {str(e)}"
         logger.error(error_msg, exc_info=True)
         if report:
-            report.status = "failed"  # type: ignore[assignment]
-            db.commit()
+            mark_report_failed(db, report, e, timer)
     finally:
         db.close()
 
@@ -185,6 +206,7 @@ def generate_ai_report(report_id: str) -> None:
     db = SessionLocal()
     report = None
     key_manager = None
+    timer = StageTimer("ai_enhanced")
     try:
         logger.info(f"Starting AI report generation for report_id: {report_id}")
 
@@ -204,163 +226,340 @@ def generate_ai_report(report_id: str) -> None:
             db.commit()
             return
 
-        logger.info(f"Loading responses for assessment: {assessment.id}")
+        responses, structure = load_report_inputs(db, assessment, timer)
+
+        logger.info("Running AI report pipeline")
+        scores, ai_insights, synthesis_artifact, html_content = asyncio.run(
+            run_ai_report_pipeline(
+                db,
+                assessment,
+                responses,
+                structure,
+                key_manager,
+                str(report.id),
+                timer=timer,
+            )
+        )
+
+        publish_ai_report(db, report, synthesis_artifact, html_content, timer)
+
+    except Exception as e:
+        error_msg = f"Error generating AI report {report_id}: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        if report:
+            mark_report_failed(db, report, e, timer)
+    finally:
+        db.close()
+
+
+def mark_report_failed(
+    db: Any, report: Report, error: Exception, timer: StageTimer
+) -> None:
+    """Mark a report failed; a report too large to render says so"""
+    too_large = isinstance(error, ReportMemoryLimitExceeded)
+    report.status = "failed"  # type: ignore[assignment]
+    report.error_message = REPORT_TOO_LARGE_MESSAGE if too_large else None  # type: ignore[assignment]
+    db.commit()
+    timer.save(db, str(report.id), "failed")
+
+
+def render_pdf(html_content: str, timer: StageTimer | None = None) -> bytes:
+    """Render report HTML to PDF, in the dedicated PDF worker process when an
+    in-process render would cross the memory ceiling"""
+    html_bytes = len(html_content.encode("utf-8"))
+    if timer:
+        timer.html_bytes = html_bytes
+
+    try:
+        isolated = needs_isolated_render(html_bytes)
+    except ReportMemoryLimitExceeded:
+        if timer:
+            timer.over_memory_ceiling = True
+        raise
+
+    if isolated:
+        logger.info(f"Rendering {html_bytes} bytes of HTML in the PDF worker process")
+        with timed_stage(timer, "pdf_isolated"):
+            return render_pdf_isolated(html_content)
+
+    with timed_stage(timer, "pdf"):
+        pdf_bytes: bytes = HTML(string=html_content, url_fetcher=None).write_pdf()
+    return pdf_bytes
+
+
+def load_report_inputs(
+    db: Any, assessment: Assessment, timer: StageTimer | None = None
+) -> tuple[list[AssessmentResponse], Any]:
+    """Load an assessment's responses and its (section-filtered) structure"""
+    logger.info(f"Loading responses for assessment: {assessment.id}")
+    with timed_stage(timer, "responses"):
         responses = (
             db.query(AssessmentResponse)
             .filter(AssessmentResponse.assessment_id == assessment.id)
             .all()
         )
-        logger.info(f"Found {len(responses)} responses")
-
-        logger.info("Loading assessment structure")
-        structure = load_assessment_structure()
+    logger.info(f"Found {len(responses)} responses")
 
+    logger.info("Loading assessment structure")
+    with timed_stage(timer, "structure"):
         if assessment.selected_section_ids:
             logger.info(
                 f"Filtering structure to {len(assessment.selected_section_ids)} selected sections"
             )
-            structure = filter_structure_by_sections(
-                structure,
-                list(assessment.selected_section_ids),  # type: ignore[arg-type]
-            )
+        structure = filtered_structure(
+            assessment.selected_section_ids or []  # type: ignore[arg-type]
+        ).structure
 
-        logger.info("Generating AI insights with parallel processing")
-        ai_insights = asyncio.run(
-            generate_ai_insights_async(
-                responses, structure, key_manager, str(report.id)
-            )
+    return responses, structure
+
+
+def publish_ai_report(
+    db: Any,
+    report: Report,
+    synthesis_artifact: SynthesisArtifact,
+    html_content: str,
+    timer: StageTimer | None = None,
+) -> None:
+    """Store the synthesis artifact, render the PDF and mark the report completed"""
+    logger.info("Storing synthesis artifact")
+    try:
+        db_synthesis = AISynthesisArtifactModel(
+            report_id=report.id,
+            artifact_json=synthesis_artifact.model_dump(),
+            prompt_version=settings.AI_PROMPT_VERSION,
+            schema_version=settings.AI_SCHEMA_VERSION,
+            model=settings.OPENAI_MODEL,
         )
+        db.add(db_synthesis)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to persist synthesis artifact: {e}")
+        db.rollback()
 
-        logger.info("Calculating scores")
-        scores = calculate_assessment_scores(responses, structure)
+    filename = f"ai_report_{report.id}_{uuid.uuid4().hex[:8]}.pdf"
+    storage_service = get_storage_service()
 
-        logger.info("Generating cross-section synthesis")
-        try:
-            synthesis_artifact = asyncio.run(
-                generate_synthesis_artifact(
-                    ai_insights, structure, scores, key_manager, db
-                )
-            )
-        except Exception as e:
-            logger.error(
-                f"Cross-section synthesis failed; using minimal fallback: {e}",
-                exc_info=True,
-            )
-            try:
-                synthesis_artifact = create_minimal_synthesis(
-                    scores["overall"]["percentage"]
-                )
-            except ValidationError:
-                logger.warning(
-                    "create_minimal_synthesis did not meet schema; generating compliant placeholder"
-                )
-                overall_score = scores["overall"]["percentage"]
-                if overall_score >= 80:
-                    risk_level = "Low"
-                elif overall_score >= 60:
-                    risk_level = "Medium"
-                elif overall_score >= 40:
-                    risk_level = "Medium-High"
-                else:
-                    risk_level = "High"
-
-                synthesis_artifact = SynthesisArtifact(
-                    executive_summary=(
-                        f"Based on an overall security score of {overall_score:.1f}%, "
-                        "this automated fallback executive summary provides a conservative synthesis "
-                        "of the organization's security posture. The assessment highlights the need for "
-                        "targeted improvements across core security domains including identity and access "
-                        "management, data protection, incident response, and infrastructure security. "
-                        "Key recommendations prioritize foundational controls while planning for strategic "
-                        "enhancements in detection capabilities, response procedures, and governance frameworks. "
-                        "This placeholder text ensures report deliverability when AI synthesis services are "
-                        "temporarily unavailable and should be supplemented with detailed manual review."
-                    ),
-                    overall_risk_level=risk_level,  # type: ignore[arg-type]
-                    overall_risk_explanation=(
-                        "Automated fallback synthesis is being used due to temporary unavailability of AI services. "
-                        "While section-level analyses provide valuable insights into specific security domains, "
-                        "detailed cross-domain relationship analysis, initiative sequencing, and strategic roadmap "
-                        "development would benefit from full AI synthesis capabilities and expert security review."
-                    ),
-                    cross_cutting_themes=[],
-                    top_10_initiatives=[],
-                    quick_wins=[],
-                    long_term_strategy=(
-                        "Adopt a phased, risk-based security roadmap aligned with industry best practices. "
-                        "Phase 1 (0-3 months): Stabilize foundational controls including identity and access "
-                        "management, patch management, configuration baselines, and backup resilience. "
-                        "Phase 2 (3-6 months): Mature detection and response capabilities with improved visibility, "
-                        "alert triage automation, incident playbooks, and regular tabletop exercises. "
-                        "Phase 3 (6-12 months): Elevate data protection and cloud governance while integrating "
-                        "continuous improvement loops, security metrics tracking, and executive KPI dashboards "
-                        "for sustained security posture gains and regulatory compliance."
-                    ),
-                    confidence_score=0.5,
-                )
+    logger.info("Generating AI PDF bytes")
+    pdf_bytes = render_pdf(html_content, timer)
 
-        logger.info("Storing synthesis artifact")
-        try:
-            db_synthesis = AISynthesisArtifactModel(
-                report_id=report.id,
-                artifact_json=synthesis_artifact.model_dump(),
-                prompt_version=settings.AI_PROMPT_VERSION,
-                schema_version=settings.AI_SCHEMA_VERSION,
-                model=settings.OPENAI_MODEL,
-            )
-            db.add(db_synthesis)
-            db.commit()
-        except SQLAlchemyError as e:
-            logger.warning(f"Failed to persist synthesis artifact: {e}")
-            db.rollback()
+    logger.info("Saving AI report to configured storage backend")
+    with timed_stage(timer, "storage"):
+        storage_location = storage_service.save(pdf_bytes, filename)
 
-        logger.info("Generating AI report HTML with synthesis")
-        html_content = generate_ai_report_html(
-            assessment, responses, scores, structure, ai_insights, synthesis_artifact
+    if not storage_service.exists(storage_location):
+        raise Exception(
+            f"AI PDF file was not persisted at storage location {storage_location}"
         )
 
-        filename = f"ai_report_{report_id}_{uuid.uuid4().hex[:8]}.pdf"
-        storage_service = get_storage_service()
+    import os
 
-        logger.info("Generating AI PDF bytes")
-        pdf_bytes = HTML(string=html_content, url_fetcher=None).write_pdf()
+    fly_region = os.getenv("FLY_REGION", "unknown")
+    fly_primary = os.getenv("FLY_PRIMARY_REGION", "unknown")
+    storage_backend = getattr(settings, "STORAGE_BACKEND", "local")
 
-        logger.info("Saving AI report to configured storage backend")
-        storage_location = storage_service.save(pdf_bytes, filename)
+    logger.info(
+        f"AI PDF generated successfully: {storage_location} "
+        f"(region={fly_region}, primary={fly_primary}, backend={storage_backend})"
+    )
+    report.file_path = storage_location  # type: ignore[assignment]
+    report.status = "completed"  # type: ignore[assignment]
+    report.completed_at = datetime.now(UTC)  # type: ignore[assignment]
+    db.commit()
+
+    if timer:
+        timer.pdf_bytes = len(pdf_bytes)
+        timer.save(db, str(report.id), "completed")
+
+    logger.info(
+        f"AI report generation completed successfully for report_id: {report.id} "
+        f"with file_path: {storage_location}"
+    )
 
-        if not storage_service.exists(storage_location):
-            raise Exception(
-                f"AI PDF file was not persisted at storage location {storage_location}"
-            )
 
-        import os
+class SectionScheduler:
+    """Request concurrency and section de-duplication for one generation run
 
-        fly_region = os.getenv("FLY_REGION", "unknown")
-        fly_primary = os.getenv("FLY_PRIMARY_REGION", "unknown")
-        storage_backend = getattr(settings, "STORAGE_BACKEND", "local")
+    Reports generated together share one scheduler, so a single semaphore
+    bounds OpenAI requests across all of them. Identical sections (same
+    section ID and answers hash) are serialised on a lock: the first report
+    calls the model and stores the cache entry, later ones then hit the cache.
+    """
 
-        logger.info(
-            f"AI PDF generated successfully: {storage_location} "
-            f"(region={fly_region}, primary={fly_primary}, backend={storage_backend})"
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.section_locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self.generated: set[tuple[str, str]] = set()
+        self.shared_sections = 0
+
+    def section_lock(self, section_id: str, answers_hash: str) -> asyncio.Lock:
+        key = (section_id, answers_hash)
+        if key not in self.section_locks:
+            self.section_locks[key] = asyncio.Lock()
+        return self.section_locks[key]
+
+    def record_generated(self, section_id: str, answers_hash: str) -> None:
+        self.generated.add((section_id, answers_hash))
+
+    def record_cache_hit(self, section_id: str, answers_hash: str) -> None:
+        if (section_id, answers_hash) in self.generated:
+            self.shared_sections += 1
+
+
+def detach_responses(responses: list[AssessmentResponse]) -> list[AssessmentResponse]:
+    """Session-free copies of responses, safe to read from another thread"""
+    columns = [attr.key for attr in sa_inspect(AssessmentResponse).column_attrs]
+    return [
+        AssessmentResponse(**{key: getattr(response, key) for key in columns})
+        for response in responses
+    ]
+
+
+async def run_ai_report_pipeline(
+    db: Any,
+    assessment: Any,
+    responses: list[AssessmentResponse],
+    structure: Any,
+    key_manager: OpenAIKeyManager,
+    report_id: str,
+    scheduler: SectionScheduler | None = None,
+    timer: StageTimer | None = None,
+) -> tuple[dict[str, Any], dict[str, SectionAIArtifact], SynthesisArtifact, str]:
+    """Build an AI report on a single event loop
+
+    Scores and the static report context are computed in a worker thread
+    while the section requests are in flight. Each finished section is
+    rendered and summarised for synthesis as soon as it completes, so after
+    the slowest section only the synthesis call and the final template render
+    remain.
+
+    Returns (scores, ai_insights, synthesis, html).
+    """
+    timer = timer or StageTimer("ai_enhanced")
+    section_insight_html: dict[str, Markup] = {}
+    section_summaries: dict[str, dict[str, Any]] = {}
+
+    def on_section_complete(section: Any, artifact: SectionAIArtifact) -> None:
+        section_insight_html[section.id] = render_ai_section_insight(artifact)
+        section_summaries[section.id] = build_section_summary(section, artifact)
+
+    logger.info("Generating AI insights with parallel processing")
+    sections_start = time.perf_counter()
+    insights_task = asyncio.create_task(
+        generate_ai_insights_async(
+            responses,
+            structure,
+            key_manager,
+            report_id,
+            on_section_complete=on_section_complete,
+            scheduler=scheduler,
         )
-        report.file_path = storage_location  # type: ignore[assignment]
-        report.status = "completed"  # type: ignore[assignment]
-        report.completed_at = datetime.now(UTC)  # type: ignore[assignment]
-        db.commit()
+    )
+    # The loaded responses belong to the caller's session, which key usage
+    # bookkeeping commits (expiring them) while sections run; the scoring
+    # thread reads transient copies instead.
+    score_inputs = detach_responses(responses)
 
-        logger.info(
-            f"AI report generation completed successfully for report_id: {report_id} "
-            f"with file_path: {storage_location}"
+    def score_report() -> tuple[dict[str, Any], dict[str, Any]]:
+        with timer.stage("scores"):
+            scores = calculate_assessment_scores(score_inputs, structure)
+            return scores, build_ai_report_context(scores, structure)
+
+    logger.info("Calculating scores in a worker thread while sections run")
+    try:
+        scores, report_context = await asyncio.to_thread(score_report)
+    except Exception:
+        insights_task.cancel()
+        raise
+
+    ai_insights = await insights_task
+    timer.record("sections", time.perf_counter() - sections_start)
+
+    logger.info("Generating cross-section synthesis")
+    with timer.stage("synthesis"):
+        try:
+            async with scheduler.semaphore if scheduler else nullcontext():
+                synthesis_artifact = await generate_synthesis_artifact(
+                    ai_insights,
+                    structure,
+                    scores,
+                    key_manager,
+                    db,
+                    prebuilt_summaries=section_summaries,
+                )
+        except Exception as e:
+            logger.error(
+                f"Cross-section synthesis failed; using minimal fallback: {e}",
+                exc_info=True,
+            )
+            synthesis_artifact = build_fallback_synthesis(scores)
+
+    logger.info("Generating AI report HTML with synthesis")
+    with timer.stage("html"):
+        html_content = generate_ai_report_html(
+            assessment,
+            responses,
+            scores,
+            structure,
+            ai_insights,
+            synthesis_artifact,
+            section_insight_html=section_insight_html,
+            report_context=report_context,
         )
+    return scores, ai_insights, synthesis_artifact, html_content
 
-    except Exception as e:
-        error_msg = f"Error generating AI report {report_id}: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        if report:
-            report.status = "failed"  # type: ignore[assignment]
-            db.commit()
-    finally:
-        db.close()
+
+def build_fallback_synthesis(scores: dict[str, Any]) -> SynthesisArtifact:
+    """Synthesis used when the cross-section AI call fails"""
+    try:
+        return create_minimal_synthesis(scores["overall"]["percentage"])
+    except ValidationError:
+        logger.warning(
+            "create_minimal_synthesis did not meet schema; generating compliant placeholder"
+        )
+        overall_score = scores["overall"]["percentage"]
+        if overall_score >= 80:
+            risk_level = "Low"
+        elif overall_score >= 60:
+            risk_level = "Medium"
+        elif overall_score >= 40:
+            risk_level = "Medium-High"
+        else:
+            risk_level = "High"
+
+        return SynthesisArtifact(
+            executive_summary=(
+                f"Based on an overall security score of {overall_score:.1f}%, "
+                "this automated fallback executive summary provides a conservative synthesis "
+                "of the organization's security posture. The assessment highlights the need for "
+                "targeted improvements across core security domains including identity and access "
+                "management, data protection, incident response, and infrastructure security. "
+                "Key recommendations prioritize foundational controls while planning for strategic "
+                "enhancements in detection capabilities, response procedures, and governance frameworks. "
+                "This placeholder text ensures report deliverability when AI synthesis services are "
+                "temporarily unavailable and should be supplemented with detailed manual review."
+            ),
+            overall_risk_level=risk_level,  # type: ignore[arg-type]
+            overall_risk_explanation=(
+                "Automated fallback synthesis is being used due to temporary unavailability of AI services. "
+                "While section-level analyses provide valuable insights into specific security domains, "
+                "detailed cross-domain relationship analysis, initiative sequencing, and strategic roadmap "
+                "development would benefit from full AI synthesis capabilities and expert security review."
+            ),
+            cross_cutting_themes=[],
+            top_10_initiatives=[],
+            quick_wins=[],
+            long_term_strategy=(
+                "Adopt a phased, risk-based security roadmap aligned with industry best practices. "
+                "Phase 1 (0-3 months): Stabilize foundational controls including identity and access "
+                "management, patch management, configuration baselines, and backup resilience. "
+                "Phase 2 (3-6 months): Mature detection and response capabilities with improved visibility, "
+                "alert triage automation, incident playbooks, and regular tabletop exercises. "
+                "Phase 3 (6-12 months): Elevate data protection and cloud governance while integrating "
+                "continuous improvement loops, security metrics tracking, and executive KPI dashboards "
+                "for sustained security posture gains and regulatory compliance."
+            ),
+            confidence_score=0.5,
+        )
 
 
 def calculate_assessment_scores(
@@ -551,7 +750,11 @@ def generate_ai_insights(
 
     try:
         key_id, api_key = key_manager.get_next_key()
-        client = OpenAI(api_key=api_key, timeout=settings.OPENAI_TIMEOUT)
+        client = OpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT,
+            base_url=settings.OPENAI_BASE_URL,
+        )
         logger.info(f"Using API key {key_id} for AI report generation")
     except ValueError as e:
         logger.error(f"Failed to get OpenAI API key: {e}")
@@ -643,7 +846,9 @@ def generate_ai_insights(
                         db_artifact = AISectionArtifactModel(
                             report_id=report_id,
                             section_id=section.id,
-                            artifact_json=cached_artifact.model_dump(),
+                            blob_hash=ArtifactBlobService.get_or_create_blob(
+                                db, cached_artifact.model_dump()
+                            ),
                         )
                         db.add(db_artifact)
                         db.commit()
@@ -667,6 +872,13 @@ def generate_ai_insights(
                         temperature=settings.OPENAI_TEMPERATURE,
                     )
                     end_time = datetime.now()
+                    observe_openai_call(
+                        key_id,
+                        settings.OPENAI_MODEL,
+                        CALL_SITE_SECTION_ANALYSIS,
+                        (end_time - start_time).total_seconds(),
+                        response.usage if response else None,
+                    )
 
                     if not response or not response.choices:
                         raise ValueError("Empty response from OpenAI API")
@@ -677,7 +889,9 @@ def generate_ai_insights(
                     db_artifact = AISectionArtifactModel(
                         report_id=report_id,
                         section_id=section.id,
-                        artifact_json=artifact.model_dump(),
+                        blob_hash=ArtifactBlobService.get_or_create_blob(
+                            db, artifact.model_dump()
+                        ),
                     )
                     db.add(db_artifact)
 
@@ -759,7 +973,9 @@ def generate_ai_insights(
                         try:
                             key_id, api_key = key_manager.get_next_key()
                             client = OpenAI(
-                                api_key=api_key, timeout=settings.OPENAI_TIMEOUT
+                                api_key=api_key,
+                                timeout=settings.OPENAI_TIMEOUT,
+                                base_url=settings.OPENAI_BASE_URL,
                             )
                             logger.info(
                                 f"Retrying section {section.id} with next API key {key_id}"
@@ -784,7 +1000,9 @@ def generate_ai_insights(
                         try:
                             key_id, api_key = key_manager.get_next_key()
                             client = OpenAI(
-                                api_key=api_key, timeout=settings.OPENAI_TIMEOUT
+                                api_key=api_key,
+                                timeout=settings.OPENAI_TIMEOUT,
+                                base_url=settings.OPENAI_BASE_URL,
                             )
                             logger.info(
                                 f"Retrying section {section.id} with next API key {key_id} after rate limit"
@@ -809,7 +1027,9 @@ def generate_ai_insights(
                         try:
                             key_id, api_key = key_manager.get_next_key()
                             client = OpenAI(
-                                api_key=api_key, timeout=settings.OPENAI_TIMEOUT
+                                api_key=api_key,
+                                timeout=settings.OPENAI_TIMEOUT,
+                                base_url=settings.OPENAI_BASE_URL,
                             )
                             logger.info(
                                 f"Retrying section {section.id} with next API key {key_id} after API error"
@@ -896,99 +1116,208 @@ def safe_validate_section_artifact(json_str: str, section_id: str) -> SectionAIA
         raise
 
 
+def parse_section_batch_response(
+    json_str: str, section_ids: list[str]
+) -> dict[str, SectionAIArtifact]:
+    """Validate each section of a batched response; invalid or missing ones are omitted"""
+    import json
+
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in batched section response: {e}")
+        return {}
+
+    sections = data.get("sections", data) if isinstance(data, dict) else None
+    if not isinstance(sections, dict):
+        logger.error("Batched section response is not a section map")
+        return {}
+
+    artifacts = {}
+    for section_id in section_ids:
+        payload = sections.get(section_id)
+        if not isinstance(payload, dict):
+            logger.warning(f"Batched response is missing section {section_id}")
+            continue
+        try:
+            artifacts[section_id] = safe_validate_section_artifact(
+                json.dumps(payload), section_id
+            )
+        except ValidationError as e:
+            logger.warning(
+                f"Batched response failed validation for section {section_id}: {e}"
+            )
+    return artifacts
+
+
+def build_section_responses(
+    section: Any,
+    response_dict: dict[str, AssessmentResponse],
+    extractor: Any,
+    pii_redactor: PIIRedactor | None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Build the (redacted) per-question payload for one section
+
+    Returns (section_responses, redaction_count). The result feeds both the prompt
+    and the answers hash used as the section cache key.
+    """
+    section_redactions = 0
+    section_responses = []
+    for question in section.questions:
+        response = response_dict.get(question.id)
+        if response:
+            answer_value = response.answer_value
+            comment_value = response.comment if response.comment else None
+
+            if pii_redactor:
+                answer_str = str(answer_value) if answer_value else ""
+                redacted_answer_str, answer_redaction_count = pii_redactor.redact(
+                    answer_str
+                )
+                if answer_redaction_count > 0:
+                    section_redactions += answer_redaction_count
+                    logger.info(
+                        f"PII redacted in answer for question {question.id} ({answer_redaction_count} items)"
+                    )
+                answer_value = redacted_answer_str  # type: ignore[assignment]
+
+                if comment_value:
+                    redacted_comment, comment_redaction_count = pii_redactor.redact(
+                        str(comment_value)
+                    )
+                    if comment_redaction_count > 0:
+                        section_redactions += comment_redaction_count
+                        logger.info(
+                            f"PII redacted in comment for question {question.id} ({comment_redaction_count} items)"
+                        )
+                    comment_value = redacted_comment  # type: ignore[assignment]
+
+            resp_dict = {
+                "question": question.text,
+                "answer": answer_value,
+                "weight": question.weight,
+            }
+
+            if settings.INCLUDE_COMMENTS_IN_AI and comment_value:
+                resp_dict["comment"] = comment_value
+
+            if settings.INCLUDE_ENHANCED_CONTEXT_IN_AI:
+                context = extractor.get_compact_context(
+                    question.id,
+                    str(response.answer_value),
+                    max_chars=settings.MAX_CONTEXT_CHARS,
+                    question_options=question.options,
+                )
+                if context:
+                    if pii_redactor:
+                        redacted_context, context_redaction_count = pii_redactor.redact(
+                            context
+                        )
+                        if context_redaction_count > 0:
+                            section_redactions += context_redaction_count
+                            logger.info(
+                                f"PII redacted in context for question {question.id} ({context_redaction_count} items)"
+                            )
+                        context = redacted_context
+                    resp_dict["context"] = context
+
+            section_responses.append(resp_dict)
+
+    return section_responses, section_redactions
+
+
+def build_section_request_params(
+    section: Any, section_responses: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Build chat completion parameters for a section analysis request
+
+    The prompt is compacted (benchmark context first, then context/comment
+    text) until it fits the section's token budget, and max_tokens is sized
+    from the number of signals rather than OPENAI_MAX_TOKENS.
+    """
+    model = settings.OPENAI_MODEL
+    curated_context = benchmark_context_service.get_relevant_context(
+        section.title, section.description, max_controls=5
+    )
+    completion_tokens = estimate_completion_tokens(len(section_responses))
+    prompt_budget = section_prompt_budget(model, completion_tokens)
+
+    for keep_curated_context, char_fraction in SECTION_COMPACTION_LEVELS:
+        messages, _ = build_section_messages(
+            section,
+            section_responses,
+            curated_context if keep_curated_context else "",
+            max_context_chars=int(settings.MAX_CONTEXT_CHARS * char_fraction),
+            max_comment_chars=int(settings.MAX_COMMENT_CHARS * char_fraction),
+        )
+        prompt_tokens = count_message_tokens(messages, model)
+        if prompt_tokens <= prompt_budget:
+            break
+    else:
+        logger.warning(
+            f"Section {section.id} prompt is {prompt_tokens} tokens after compaction "
+            f"(budget {prompt_budget})"
+        )
+
+    return {
+        "model": model,
+        "messages": messages,
+        "response_format": {"type": "json_object"},
+        "max_tokens": fit_max_tokens(prompt_tokens, completion_tokens, model),
+        "temperature": settings.OPENAI_TEMPERATURE,
+    }
+
+
 async def generate_ai_insights_async(
     responses: list[AssessmentResponse],
     structure: Any,
     key_manager: OpenAIKeyManager,
     report_id: str,
     max_concurrent: int | None = None,
+    on_section_complete: Callable[[Any, SectionAIArtifact], None] | None = None,
+    scheduler: SectionScheduler | None = None,
 ) -> dict[str, SectionAIArtifact]:
-    """Generate AI insights for each section with parallel processing"""
+    """Generate AI insights for each section with parallel processing
 
-    if max_concurrent is None:
-        max_concurrent = settings.AI_MAX_CONCURRENT_SECTIONS
+    on_section_complete is called on the event loop as each section finishes,
+    so callers can start downstream work before the slowest section returns.
+    Pass a shared scheduler to bound and de-duplicate requests across reports.
+    """
+
+    if scheduler is None:
+        scheduler = SectionScheduler(
+            max_concurrent or settings.AI_MAX_CONCURRENT_SECTIONS
+        )
 
     insights = {}
-    response_dict = {r.question_id: r for r in responses}
+    response_dict = {str(r.question_id): r for r in responses}
     cache_service = AICacheService()
-    semaphore = asyncio.Semaphore(max_concurrent)
+    semaphore = scheduler.semaphore
 
     extractor = get_enhanced_context_extractor()
     pii_redactor = PIIRedactor() if settings.ENABLE_PII_REDACTION_BEFORE_AI else None
+    # Built (and redacted) once; batch planning and single requests share them
+    built_responses = {
+        section.id: build_section_responses(
+            section, response_dict, extractor, pii_redactor
+        )[0]
+        for section in structure.sections
+    }
 
     async def process_section(
         section: Any,
     ) -> tuple[Any, SectionAIArtifact, bool] | None:
         """Process a single section with rate limiting"""
-        db = SessionLocal()
-        section_redactions = 0
-        try:
-            async with semaphore:
-                section_responses = []
-                for question in section.questions:
-                    response = response_dict.get(question.id)
-                    if response:
-                        answer_value = response.answer_value
-                        comment_value = response.comment if response.comment else None
+        section_responses = built_responses[section.id]
 
-                        if pii_redactor:
-                            answer_str = str(answer_value) if answer_value else ""
-                            redacted_answer_str, answer_redaction_count = (
-                                pii_redactor.redact(answer_str)
-                            )
-                            if answer_redaction_count > 0:
-                                section_redactions += answer_redaction_count
-                                logger.info(
-                                    f"PII redacted in answer for question {question.id} (async, {answer_redaction_count} items)"
-                                )
-                            answer_value = redacted_answer_str  # type: ignore[assignment]
+        if not section_responses:
+            return None
 
-                            if comment_value:
-                                redacted_comment, comment_redaction_count = (
-                                    pii_redactor.redact(str(comment_value))
-                                )
-                                if comment_redaction_count > 0:
-                                    section_redactions += comment_redaction_count
-                                    logger.info(
-                                        f"PII redacted in comment for question {question.id} (async, {comment_redaction_count} items)"
-                                    )
-                                comment_value = redacted_comment  # type: ignore[assignment]
-
-                        resp_dict = {
-                            "question": question.text,
-                            "answer": answer_value,
-                            "weight": question.weight,
-                        }
-
-                        if settings.INCLUDE_COMMENTS_IN_AI and comment_value:
-                            resp_dict["comment"] = comment_value
-
-                        if settings.INCLUDE_ENHANCED_CONTEXT_IN_AI:
-                            context = extractor.get_compact_context(
-                                question.id,
-                                str(response.answer_value),
-                                max_chars=settings.MAX_CONTEXT_CHARS,
-                                question_options=question.options,
-                            )
-                            if context:
-                                if pii_redactor:
-                                    redacted_context, context_redaction_count = (
-                                        pii_redactor.redact(context)
-                                    )
-                                    if context_redaction_count > 0:
-                                        section_redactions += context_redaction_count
-                                        logger.info(
-                                            f"PII redacted in context for question {question.id} (async, {context_redaction_count} items)"
-                                        )
-                                    context = redacted_context
-                                resp_dict["context"] = context
-
-                        section_responses.append(resp_dict)
+        answers_hash = cache_service.compute_answers_hash(section_responses)
 
-                if not section_responses:
-                    return None
-
-                answers_hash = cache_service.compute_answers_hash(section_responses)
+        db = SessionLocal()
+        try:
+            async with scheduler.section_lock(section.id, answers_hash), semaphore:
                 cached_artifact = cache_service.get_cached_artifact(
                     db,
                     section.id,
@@ -999,16 +1328,26 @@ async def generate_ai_insights_async(
 
                 if cached_artifact:
                     logger.info(f"Cache HIT for section {section.id}")
+                    scheduler.record_cache_hit(section.id, answers_hash)
                     db_artifact = AISectionArtifactModel(
                         report_id=report_id,
                         section_id=section.id,
-                        artifact_json=cached_artifact.model_dump(),
+                        blob_hash=ArtifactBlobService.get_or_create_blob(
+                            db, cached_artifact.model_dump()
+                        ),
                     )
                     db.add(db_artifact)
                     db.commit()
                     return (section.id, cached_artifact, False)
 
                 logger.info(f"Cache MISS for section {section.id} - calling OpenAI")
+                try:
+                    request_params = build_section_request_params(
+                        section, section_responses
+                    )
+                except PromptTooLargeError as e:
+                    logger.error(f"Section {section.id} not sent to OpenAI: {e}")
+                    return (section.id, create_degraded_artifact(section.id), True)
 
                 await asyncio.sleep(random.uniform(0, 0.5))
 
@@ -1017,38 +1356,46 @@ async def generate_ai_insights_async(
                         key_id, api_key = key_manager.get_next_key()
 
                         client = AsyncOpenAI(
-                            api_key=api_key, timeout=settings.OPENAI_TIMEOUT
+                            api_key=api_key,
+                            timeout=settings.OPENAI_TIMEOUT,
+                            base_url=settings.OPENAI_BASE_URL,
                         )
 
-                        curated_context = (
-                            benchmark_context_service.get_relevant_context(
-                                section.title, section.description, max_controls=5
-                            )
-                        )
-                        prompt, redaction_count = build_section_prompt_v2(
-                            section, section_responses, curated_context
+                        tokens_prompt_predicted = count_message_tokens(
+                            request_params["messages"], settings.OPENAI_MODEL
                         )
 
                         start_time = time.time()
-                        response = await client.chat.completions.create(  # type: ignore[assignment]
-                            model=settings.OPENAI_MODEL,
-                            messages=[{"role": "user", "content": prompt}],
-                            response_format={"type": "json_object"},
-                            max_tokens=settings.OPENAI_MAX_TOKENS,
-                            temperature=settings.OPENAI_TEMPERATURE,
+                        response = llm_response_cache.get_cached_completion(
+                            CALL_SITE_SECTION_ANALYSIS, request_params, db
                         )
+                        if response is None:
+                            response = await client.chat.completions.create(  # type: ignore[assignment]
+                                **request_params
+                            )
+                            observe_openai_call(
+                                key_id,
+                                request_params["model"],
+                                CALL_SITE_SECTION_ANALYSIS,
+                                time.time() - start_time,
+                                response.usage,
+                            )
                         latency_ms = int((time.time() - start_time) * 1000)
 
                         if not response or not response.choices:
                             raise ValueError("Empty response from OpenAI")
 
                         json_str = response.choices[0].message.content
+                        if json_str is None:
+                            raise ValueError("Empty response from OpenAI")
                         artifact = safe_validate_section_artifact(json_str, section.id)
 
                         db_artifact = AISectionArtifactModel(
                             report_id=report_id,
                             section_id=section.id,
-                            artifact_json=artifact.model_dump(),
+                            blob_hash=ArtifactBlobService.get_or_create_blob(
+                                db, artifact.model_dump()
+                            ),
                         )
                         db.add(db_artifact)
 
@@ -1063,6 +1410,7 @@ async def generate_ai_insights_async(
                             if response.choices
                             else None
                         )
+                        tokens_prompt_cached = get_cached_prompt_tokens(response.usage)
                         cost_usd = (
                             (tokens_prompt * 0.00001 + tokens_completion * 0.00003)
                             if response.usage
@@ -1071,7 +1419,10 @@ async def generate_ai_insights_async(
 
                         logger.info(
                             f"Section {section.id}: finish_reason={finish_reason}, "
-                            f"tokens={tokens_prompt}+{tokens_completion}={tokens_prompt + tokens_completion}"
+                            f"tokens={tokens_prompt}+{tokens_completion}={tokens_prompt + tokens_completion} "
+                            f"(predicted prompt {tokens_prompt_predicted}, "
+                            f"cached prompt {tokens_prompt_cached}, "
+                            f"max_tokens {request_params['max_tokens']})"
                         )
 
                         metadata = AIGenerationMetadata(
@@ -1081,8 +1432,10 @@ async def generate_ai_insights_async(
                             schema_version=settings.AI_SCHEMA_VERSION,
                             model=settings.OPENAI_MODEL,
                             temperature=settings.OPENAI_TEMPERATURE,
-                            max_tokens=settings.OPENAI_MAX_TOKENS,
+                            max_tokens=request_params["max_tokens"],
                             tokens_prompt=tokens_prompt,
+                            tokens_prompt_predicted=tokens_prompt_predicted,
+                            tokens_prompt_cached=tokens_prompt_cached,
                             tokens_completion=tokens_completion,
                             finish_reason=finish_reason,
                             total_cost_usd=cost_usd,
@@ -1106,6 +1459,10 @@ async def generate_ai_insights_async(
                         db.commit()
 
                         key_manager.record_success(key_id)
+                        scheduler.record_generated(section.id, answers_hash)
+                        llm_response_cache.store_completion(
+                            CALL_SITE_SECTION_ANALYSIS, request_params, response, db
+                        )
 
                         logger.info(
                             f"Generated AI insight for section {section.id} ({latency_ms}ms)"
@@ -1131,18 +1488,35 @@ async def generate_ai_insights_async(
                                 logger.info(
                                     f"Falling back to {settings.AI_FALLBACK_MODEL} for section {section.id}"
                                 )
+                                fallback_params: dict[str, Any] = {
+                                    "model": settings.AI_FALLBACK_MODEL,
+                                    "messages": request_params["messages"],
+                                    "response_format": {"type": "json_object"},
+                                    "max_tokens": 800,  # Shorter for fallback
+                                    "temperature": 0.5,
+                                }
                                 try:
                                     fallback_response = (
-                                        await client.chat.completions.create(
-                                            model=settings.AI_FALLBACK_MODEL,
-                                            messages=[
-                                                {"role": "user", "content": prompt}
-                                            ],
-                                            response_format={"type": "json_object"},
-                                            max_tokens=800,  # Shorter for fallback
-                                            temperature=0.5,
+                                        llm_response_cache.get_cached_completion(
+                                            CALL_SITE_SECTION_FALLBACK,
+                                            fallback_params,
+                                            db,
                                         )
                                     )
+                                    if fallback_response is None:
+                                        fallback_start = time.time()
+                                        fallback_response = (
+                                            await client.chat.completions.create(
+                                                **fallback_params
+                                            )
+                                        )
+                                        observe_openai_call(
+                                            key_id,
+                                            fallback_params["model"],
+                                            CALL_SITE_SECTION_FALLBACK,
+                                            time.time() - fallback_start,
+                                            fallback_response.usage,
+                                        )
 
                                     json_str = fallback_response.choices[
                                         0
@@ -1157,10 +1531,18 @@ async def generate_ai_insights_async(
                                     db_artifact = AISectionArtifactModel(
                                         report_id=report_id,
                                         section_id=section.id,
-                                        artifact_json=artifact.model_dump(),
+                                        blob_hash=ArtifactBlobService.get_or_create_blob(
+                                            db, artifact.model_dump()
+                                        ),
                                     )
                                     db.add(db_artifact)
                                     db.commit()
+                                    llm_response_cache.store_completion(
+                                        CALL_SITE_SECTION_FALLBACK,
+                                        fallback_params,
+                                        fallback_response,
+                                        db,
+                                    )
 
                                     logger.info(
                                         f"Fallback successful for section {section.id}"
@@ -1199,8 +1581,240 @@ async def generate_ai_insights_async(
             db.close()
         return None
 
-    tasks = [process_section(section) for section in structure.sections]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    def notify(
+        section: Any, result: tuple[Any, SectionAIArtifact, bool] | None
+    ) -> None:
+        if result and on_section_complete:
+            try:
+                on_section_complete(section, result[1])
+            except Exception as e:
+                logger.warning(
+                    f"Section completion callback failed for {section.id}: {e}"
+                )
+
+    async def process_and_notify(
+        section: Any,
+    ) -> tuple[Any, SectionAIArtifact, bool] | None:
+        result = await process_section(section)
+        notify(section, result)
+        return result
+
+    async def request_batch(
+        batch: list[tuple[Any, list[dict[str, Any]], str]],
+    ) -> tuple[
+        list[tuple[Any, SectionAIArtifact, bool] | None],
+        dict[str, SectionAIArtifact],
+    ]:
+        """Send one multi-section request; returns (results, valid artifacts)"""
+        results: list[tuple[Any, SectionAIArtifact, bool] | None] = []
+        artifacts: dict[str, SectionAIArtifact] = {}
+        section_ids = [entry[0].id for entry in batch]
+        db = SessionLocal()
+        try:
+            async with semaphore:
+                key_id: str | None = None
+                try:
+                    key_id, api_key = key_manager.get_next_key()
+                    client = AsyncOpenAI(
+                        api_key=api_key,
+                        timeout=settings.OPENAI_TIMEOUT,
+                        base_url=settings.OPENAI_BASE_URL,
+                    )
+                    request_params = build_batch_request_params(batch)
+
+                    start_time = time.time()
+                    response = await client.chat.completions.create(**request_params)
+                    latency_ms = int((time.time() - start_time) * 1000)
+                    observe_openai_call(
+                        key_id,
+                        request_params["model"],
+                        "section_batch",
+                        latency_ms / 1000,
+                        response.usage,
+                    )
+                    artifacts = parse_section_batch_response(
+                        response.choices[0].message.content or "", section_ids
+                    )
+                    # A reply with no usable section is not a healthy key
+                    if artifacts:
+                        key_manager.record_success(key_id)
+
+                    tokens_prompt = (
+                        response.usage.prompt_tokens if response.usage else 0
+                    )
+                    tokens_completion = (
+                        response.usage.completion_tokens if response.usage else 0
+                    )
+                    cost_usd = tokens_prompt * 0.00001 + tokens_completion * 0.00003
+                    share = len(batch)
+
+                    for section, _, answers_hash in batch:
+                        artifact = artifacts.get(section.id)
+                        if artifact is None:
+                            continue
+
+                        db.add(
+                            AISectionArtifactModel(
+                                report_id=report_id,
+                                section_id=section.id,
+                                blob_hash=ArtifactBlobService.get_or_create_blob(
+                                    db, artifact.model_dump()
+                                ),
+                            )
+                        )
+                        # Usage is reported per request; split it evenly
+                        db.add(
+                            AIGenerationMetadata(
+                                report_id=report_id,
+                                section_id=section.id,
+                                prompt_version=settings.AI_PROMPT_VERSION,
+                                schema_version=settings.AI_SCHEMA_VERSION,
+                                model=settings.OPENAI_MODEL,
+                                temperature=settings.OPENAI_TEMPERATURE,
+                                max_tokens=request_params["max_tokens"],
+                                tokens_prompt=tokens_prompt // share,
+                                tokens_completion=tokens_completion // share,
+                                finish_reason=response.choices[0].finish_reason,
+                                total_cost_usd=cost_usd / share,
+                                latency_ms=latency_ms,
+                            )
+                        )
+                        cache_service.store_artifact(
+                            db,
+                            section.id,
+                            answers_hash,
+                            settings.AI_PROMPT_VERSION,
+                            settings.AI_SCHEMA_VERSION,
+                            settings.OPENAI_MODEL,
+                            artifact,
+                            tokens_prompt // share,
+                            tokens_completion // share,
+                            cost_usd / share,
+                        )
+                        scheduler.record_generated(section.id, answers_hash)
+                        results.append((section.id, artifact, False))
+                    db.commit()
+
+                    logger.info(
+                        f"Batched analysis returned {len(artifacts)}/{len(batch)} "
+                        f"sections ({latency_ms}ms)"
+                    )
+
+                except Exception as e:
+                    logger.warning(
+                        f"Batched analysis of sections {section_ids} failed: {e}"
+                    )
+                    db.rollback()
+                    if key_id and isinstance(e, OpenAIError):
+                        key_manager.record_failure(key_id, e)
+                    artifacts = {}
+                    results = []
+        finally:
+            db.close()
+        return results, artifacts
+
+    def is_cached(section_id: str, answers_hash: str) -> bool:
+        db = SessionLocal()
+        try:
+            return cache_service.has_cached_artifact(
+                db,
+                section_id,
+                answers_hash,
+                settings.AI_PROMPT_VERSION,
+                settings.OPENAI_MODEL,
+            )
+        finally:
+            db.close()
+
+    async def process_batch(
+        batch: list[tuple[Any, list[dict[str, Any]], str]],
+    ) -> list[tuple[Any, SectionAIArtifact, bool] | None]:
+        """Analyse several small sections in one request, splitting on failure"""
+        results: list[tuple[Any, SectionAIArtifact, bool] | None] = []
+        artifacts: dict[str, SectionAIArtifact] = {}
+        async with AsyncExitStack() as section_locks:
+            # Fixed lock order, so batches sharing sections cannot deadlock
+            for section, _, answers_hash in sorted(
+                batch, key=lambda entry: (entry[0].id, entry[2])
+            ):
+                await section_locks.enter_async_context(
+                    scheduler.section_lock(section.id, answers_hash)
+                )
+            # If another report analysed any of these meanwhile, the split
+            # below serves those sections from the cache
+            if not any(is_cached(entry[0].id, entry[2]) for entry in batch):
+                results, artifacts = await request_batch(batch)
+
+        for section, _, _ in batch:
+            if section.id in artifacts:
+                notify(section, (section.id, artifacts[section.id], False))
+
+        failed = [entry[0] for entry in batch if entry[0].id not in artifacts]
+        if failed:
+            logger.info(
+                f"Splitting sections {[s.id for s in failed]} into single requests"
+            )
+            split_results = await asyncio.gather(
+                *(process_and_notify(section) for section in failed),
+                return_exceptions=True,
+            )
+            for result in split_results:
+                if isinstance(result, BaseException):
+                    logger.error(f"Section processing raised exception: {result}")
+                else:
+                    results.append(result)
+        return results
+
+    def plan_batches() -> tuple[
+        list[list[tuple[Any, list[dict[str, Any]], str]]], list[Any]
+    ]:
+        """Split uncached small sections into batches; the rest run one by one"""
+        if not settings.AI_SECTION_BATCHING_ENABLED:
+            return [], list(structure.sections)
+
+        candidates = []
+        singles = []
+        db = SessionLocal()
+        try:
+            for section in structure.sections:
+                section_responses = built_responses[section.id]
+                if not section_responses:
+                    singles.append(section)
+                    continue
+                answers_hash = cache_service.compute_answers_hash(section_responses)
+                if cache_service.has_cached_artifact(
+                    db,
+                    section.id,
+                    answers_hash,
+                    settings.AI_PROMPT_VERSION,
+                    settings.OPENAI_MODEL,
+                ):
+                    singles.append(section)
+                else:
+                    candidates.append((section, section_responses, answers_hash))
+        finally:
+            db.close()
+
+        batches, unbatched = plan_section_batches(candidates, settings.OPENAI_MODEL)
+        return batches, singles + [entry[0] for entry in unbatched]
+
+    batches, single_sections = plan_batches()
+    tasks: list[Any] = [process_and_notify(section) for section in single_sections]
+    tasks.extend(process_batch(batch) for batch in batches)
+    gathered = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results: list[Any] = []
+    for item in gathered:
+        if isinstance(item, list):
+            results.extend(item)
+        else:
+            results.append(item)
+
+    flush_db = SessionLocal()
+    try:
+        cache_service.flush_hit_counts(flush_db)
+    finally:
+        flush_db.close()
 
     for result in results:
         if result and not isinstance(result, Exception):
@@ -1839,6 +2453,93 @@ def generate_report_html(
     )
 
 
+AI_SECTION_INSIGHT_TEMPLATE = jinja_env.from_string(
+    """
+    <div class="ai-insight">
+        <h4>🤖 AI Analysis</h4>
+
+        <p><strong>Risk Level: {{ artifact.risk_level }}</strong></p>
+        <p>{{ artifact.risk_explanation }}</p>
+
+        <h4>Key Strengths:</h4>
+        <ul>
+        {% for strength in artifact.strengths %}
+            <li>{{ strength }}</li>
+        {% endfor %}
+        </ul>
+
+        <h4>Critical Gaps:</h4>
+        <ul>
+        {% for gap in artifact.gaps %}
+            <li><strong>{{ gap.severity }}:</strong> {{ gap.gap }} <em>(Signals: {{ gap.linked_signals | join(', ') }})</em></li>
+        {% endfor %}
+        </ul>
+
+        <h4>Priority Recommendations:</h4>
+        <ol>
+        {% for rec in artifact.recommendations %}
+            <li>
+                <strong>{{ rec.action }}</strong> ({{ rec.timeline }})
+                <br><em>{{ rec.rationale }}</em>
+                <br>Effort: {{ rec.effort }} | Impact: {{ rec.impact }} | Signals: {{ rec.linked_signals | join(', ') }}
+                {% if rec.references %}
+                <br>References: {{ rec.references | join(', ') }}
+                {% endif %}
+            </li>
+        {% endfor %}
+        </ol>
+
+        <h4>Industry Benchmarks:</h4>
+        <ul>
+        {% for benchmark in artifact.benchmarks %}
+            <li><strong>{{ benchmark.control }}</strong> ({{ benchmark.framework }}): {{ benchmark.status }}
+            {% if benchmark.reference %} - {{ benchmark.reference }}{% endif %}
+            </li>
+        {% endfor %}
+        </ul>
+
+        <p><em>Confidence Score: {{ "%.0f"|format(artifact.confidence_score * 100) }}%</em></p>
+    </div>
+    """
+)
+
+
+def render_ai_section_insight(artifact: SectionAIArtifact) -> Markup:
+    """Render the AI analysis block for one section of the AI report"""
+    return Markup(AI_SECTION_INSIGHT_TEMPLATE.render(artifact=artifact))
+
+
+def build_ai_report_context(scores: dict[str, Any], structure: Any) -> dict[str, Any]:
+    """Score-derived template variables for the AI report (no AI output needed)"""
+    overall_percentage = scores["overall"]["percentage"]
+    if overall_percentage >= 80:
+        overall_score_class = "high-score"
+        overall_assessment = (
+            "Strong security posture with good coverage across most areas."
+        )
+    elif overall_percentage >= 60:
+        overall_score_class = "medium-score"
+        overall_assessment = (
+            "Moderate security posture with room for improvement in several areas."
+        )
+    else:
+        overall_score_class = "low-score"
+        overall_assessment = (
+            "Security posture needs significant improvement across multiple areas."
+        )
+
+    # Generate prioritized roadmap
+    roadmap = generate_prioritized_roadmap(scores, structure)
+
+    return {
+        "overall_score_class": overall_score_class,
+        "overall_assessment": overall_assessment,
+        "roadmap_30_day": roadmap["30_day"],
+        "roadmap_60_day": roadmap["60_day"],
+        "roadmap_90_day": roadmap["90_day"],
+    }
+
+
 def generate_ai_report_html(
     assessment: Any,
     responses: list[AssessmentResponse],
@@ -1846,8 +2547,14 @@ def generate_ai_report_html(
     structure: Any,
     ai_insights: dict[str, SectionAIArtifact],
     synthesis: SynthesisArtifact | None = None,
+    section_insight_html: dict[str, Markup] | None = None,
+    report_context: dict[str, Any] | None = None,
 ) -> str:
-    """Generate HTML content for AI-enhanced report with synthesis"""
+    """Generate HTML content for AI-enhanced report with synthesis
+
+    section_insight_html and report_context may be precomputed by
+    run_ai_report_pipeline; anything missing is built here.
+    """
 
     jinja_env.filters["markdown"] = markdown_filter
 
@@ -2114,53 +2821,8 @@ def generate_ai_report_html(
                     <strong>Score: {{ "%.1f"|format(scores[section.id].percentage) }}%</strong>
                     ({{ scores[section.id].responses_count }}/{{ scores[section.id].total_questions }} questions completed)
                 </div>
-                {% if ai_insights.get(section.id) %}
-                <div class="ai-insight">
-                    <h4>🤖 AI Analysis</h4>
-                    {% set artifact = ai_insights[section.id] %}
-                    
-                    <p><strong>Risk Level: {{ artifact.risk_level }}</strong></p>
-                    <p>{{ artifact.risk_explanation }}</p>
-                    
-                    <h4>Key Strengths:</h4>
-                    <ul>
-                    {% for strength in artifact.strengths %}
-                        <li>{{ strength }}</li>
-                    {% endfor %}
-                    </ul>
-                    
-                    <h4>Critical Gaps:</h4>
-                    <ul>
-                    {% for gap in artifact.gaps %}
-                        <li><strong>{{ gap.severity }}:</strong> {{ gap.gap }} <em>(Signals: {{ gap.linked_signals | join(', ') }})</em></li>
-                    {% endfor %}
-                    </ul>
-                    
-                    <h4>Priority Recommendations:</h4>
-                    <ol>
-                    {% for rec in artifact.recommendations %}
-                        <li>
-                            <strong>{{ rec.action }}</strong> ({{ rec.timeline }})
-                            <br><em>{{ rec.rationale }}</em>
-                            <br>Effort: {{ rec.effort }} | Impact: {{ rec.impact }} | Signals: {{ rec.linked_signals | join(', ') }}
-                            {% if rec.references %}
-                            <br>References: {{ rec.references | join(', ') }}
-                            {% endif %}
-                        </li>
-                    {% endfor %}
-                    </ol>
-                    
-                    <h4>Industry Benchmarks:</h4>
-                    <ul>
-                    {% for benchmark in artifact.benchmarks %}
-                        <li><strong>{{ benchmark.control }}</strong> ({{ benchmark.framework }}): {{ benchmark.status }}
-                        {% if benchmark.reference %} - {{ benchmark.reference }}{% endif %}
-                        </li>
-                    {% endfor %}
-                    </ul>
-                    
-                    <p><em>Confidence Score: {{ "%.0f"|format(artifact.confidence_score * 100) }}%</em></p>
-                </div>
+                {% if section_insight_html.get(section.id) %}
+                {{ section_insight_html[section.id] }}
                 {% endif %}
             </div>
             {% endfor %}
@@ -2276,40 +2938,25 @@ def generate_ai_report_html(
     """
     )
 
-    overall_percentage = scores["overall"]["percentage"]
-    if overall_percentage >= 80:
-        overall_score_class = "high-score"
-        overall_assessment = (
-            "Strong security posture with good coverage across most areas."
-        )
-    elif overall_percentage >= 60:
-        overall_score_class = "medium-score"
-        overall_assessment = (
-            "Moderate security posture with room for improvement in several areas."
-        )
-    else:
-        overall_score_class = "low-score"
-        overall_assessment = (
-            "Security posture needs significant improvement across multiple areas."
-        )
+    section_insight_html = dict(section_insight_html or {})
+    for section_id, artifact in ai_insights.items():
+        if section_id not in section_insight_html:
+            section_insight_html[section_id] = render_ai_section_insight(artifact)
 
-    # Generate prioritized roadmap
-    roadmap = generate_prioritized_roadmap(scores, structure)
+    if report_context is None:
+        report_context = build_ai_report_context(scores, structure)
 
     return template.render(
         assessment=assessment,
         scores=scores,
         structure=structure,
         ai_insights=ai_insights,
+        section_insight_html=section_insight_html,
         report_date=datetime.now().strftime("%Y-%m-%d %H:%M"),
         report_id=assessment.id,
-        overall_score_class=overall_score_class,
-        overall_assessment=overall_assessment,
-        roadmap_30_day=roadmap["30_day"],
-        roadmap_60_day=roadmap["60_day"],
-        roadmap_90_day=roadmap["90_day"],
         ai_model=settings.OPENAI_MODEL,
         get_maturity_level=get_maturity_level,
+        **report_context,
     )
 
 
@@ -0,0 +1,186 @@
+"""Memory accounting and limits for report rendering
+
+Every report stage samples the process RSS. With REPORT_MEMORY_PROFILING_ENABLED
+tracemalloc also runs while reports are being generated, and the heaviest
+stage of each report keeps its top allocation sites; only the worst
+REPORT_MEMORY_SNAPSHOTS_KEPT reports keep them in the database.
+
+WeasyPrint layout is by far the largest allocation. Before a PDF is rendered
+its memory is estimated from the HTML size; a render that would push the
+worker past REPORT_MEMORY_CEILING_MB runs in a dedicated single-slot process
+instead, so the memory is returned when the render finishes and an OOM kill
+takes that process rather than the API worker. A render too large for even a
+fresh process is rejected, and the report says so (REPORT_TOO_LARGE_MESSAGE).
+"""
+
+import logging
+import multiprocessing
+import os
+import resource
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from sqlalchemy import null
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.report_timing import ReportGenerationTiming
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+TOP_ALLOCATIONS = 10
+
+REPORT_TOO_LARGE_MESSAGE = (
+    "This report is too large to render as a PDF. Select fewer sections or "
+    "shorten long comments, then request it again."
+)
+
+_pdf_worker: ProcessPoolExecutor | None = None
+_pdf_worker_lock = threading.Lock()
+
+_tracing_lock = threading.Lock()
+_tracing_reports = 0
+_started_tracing = False
+
+
+class ReportMemoryLimitExceeded(Exception):
+    """The report is estimated to need more memory than the ceiling allows"""
+
+
+def current_rss_kb() -> int:
+    """Resident set size now, or the high-water mark where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE_KB
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def start_tracing() -> bool:
+    """Start tracemalloc if profiling is enabled; whether it is tracing
+
+    Each True must be paired with a stop_tracing() call.
+    """
+    global _tracing_reports, _started_tracing
+    with _tracing_lock:
+        if settings.REPORT_MEMORY_PROFILING_ENABLED and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        if not tracemalloc.is_tracing():
+            return False
+        _tracing_reports += 1
+        return True
+
+
+def stop_tracing() -> None:
+    """Release a start_tracing(); tracemalloc stops after the last report
+
+    Tracing started outside this module (PYTHONTRACEMALLOC) is left running.
+    """
+    global _tracing_reports, _started_tracing
+    with _tracing_lock:
+        _tracing_reports = max(_tracing_reports - 1, 0)
+        if _tracing_reports == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def top_allocations(limit: int = TOP_ALLOCATIONS) -> list[dict[str, Any]]:
+    """Largest live allocation sites, by source line"""
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": stat.size // 1024,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def estimated_render_kb(html_bytes: int) -> int:
+    return html_bytes * settings.REPORT_PDF_MEMORY_FACTOR // 1024
+
+
+def needs_isolated_render(html_bytes: int) -> bool:
+    """Whether rendering this HTML in-process would cross the memory ceiling
+
+    Raises ReportMemoryLimitExceeded when even a dedicated process could not
+    render it under the ceiling.
+    """
+    ceiling_kb = settings.REPORT_MEMORY_CEILING_MB * 1024
+    if ceiling_kb <= 0:
+        return False
+
+    render_kb = estimated_render_kb(html_bytes)
+    if render_kb > ceiling_kb:
+        raise ReportMemoryLimitExceeded(
+            f"PDF render needs ~{render_kb // 1024}MB for {html_bytes} bytes of "
+            f"HTML, over the {settings.REPORT_MEMORY_CEILING_MB}MB ceiling"
+        )
+    return current_rss_kb() + render_kb > ceiling_kb
+
+
+def write_pdf(html_content: str) -> bytes:
+    from weasyprint import HTML
+
+    pdf_bytes: bytes = HTML(string=html_content, url_fetcher=None).write_pdf()
+    return pdf_bytes
+
+
+def pdf_worker() -> ProcessPoolExecutor:
+    """The dedicated render process; a fresh one per render"""
+    global _pdf_worker
+    with _pdf_worker_lock:
+        if _pdf_worker is None:
+            _pdf_worker = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=1,
+            )
+        return _pdf_worker
+
+
+def render_pdf_isolated(html_content: str) -> bytes:
+    return pdf_worker().submit(write_pdf, html_content).result()
+
+
+def shutdown_pdf_worker() -> None:
+    global _pdf_worker
+    with _pdf_worker_lock:
+        if _pdf_worker is not None:
+            _pdf_worker.shutdown(cancel_futures=True)
+            _pdf_worker = None
+
+
+def prune_allocation_snapshots(db: Session, keep: int) -> None:
+    """Drop top-allocation snapshots outside the worst `keep` reports"""
+    try:
+        stale_ids = [
+            row.id
+            for row in db.query(ReportGenerationTiming.id)
+            .filter(ReportGenerationTiming.top_allocations.isnot(None))
+            .order_by(ReportGenerationTiming.traced_peak_kb.desc())
+            .offset(keep)
+            .all()
+        ]
+        if stale_ids:
+            db.query(ReportGenerationTiming).filter(
+                ReportGenerationTiming.id.in_(stale_ids)
+            ).update(
+                {ReportGenerationTiming.top_allocations: null()},
+                synchronize_session=False,
+            )
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to prune allocation snapshots: {e}")
+        db.rollback()
@@ -0,0 +1,212 @@
+"""Per-stage timing and memory of report generation"""
+
+import logging
+import time
+import tracemalloc
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.prometheus import report_stage_duration
+from app.models.report_timing import ReportGenerationTiming
+from app.services.report_memory import (
+    current_rss_kb,
+    prune_allocation_snapshots,
+    start_tracing,
+    stop_tracing,
+    top_allocations,
+)
+from app.utils.stats import latency_percentiles
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Wall-clock time and memory per stage of one report generation run
+
+    Stages that run concurrently (AI sections and scoring) are timed
+    separately, so stage times can add up to more than total_ms. RSS and
+    tracemalloc figures are process-wide: reports rendered concurrently in
+    the same worker inflate each other's numbers. A timer stops tracing when
+    it is saved, or when it is discarded unsaved.
+    """
+
+    def __init__(self, report_type: str):
+        self.report_type = report_type
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.stage_rss_kb: dict[str, int] = {}
+        self.traced_peak_kb: int | None = None
+        self.top_allocations: list[dict[str, Any]] | None = None
+        self.html_bytes: int | None = None
+        self.pdf_bytes: int | None = None
+        self.over_memory_ceiling = False
+        self.tracing = start_tracing()
+        self._release_tracing = (
+            weakref.finalize(self, stop_tracing) if self.tracing else None
+        )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+            self.sample_memory(name)
+
+    def sample_memory(self, name: str) -> None:
+        self.stage_rss_kb[name] = max(self.stage_rss_kb.get(name, 0), current_rss_kb())
+        if not self.tracing or not tracemalloc.is_tracing():
+            return
+        peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        if peak_kb > (self.traced_peak_kb or 0):
+            self.traced_peak_kb = peak_kb
+            self.top_allocations = top_allocations()
+
+    def stop_tracing(self) -> None:
+        if self._release_tracing is not None:
+            self._release_tracing()
+        self.tracing = False
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        report_stage_duration.observe(seconds, report_type=self.report_type, stage=name)
+
+    def save(self, db: Session, report_id: str, status: str) -> None:
+        """Persist the breakdown; never fails the report it describes"""
+        self.stop_tracing()
+        if status == "failed" and self.over_memory_ceiling:
+            status = "memory_limit"
+        timing = ReportGenerationTiming(
+            report_id=report_id,
+            report_type=self.report_type,
+            status=status,
+            release=settings.RELEASE_VERSION,
+            stage_ms={
+                name: round(seconds * 1000, 1) for name, seconds in self.stages.items()
+            },
+            total_ms=int((time.perf_counter() - self.started) * 1000),
+            stage_rss_kb=self.stage_rss_kb,
+            peak_rss_kb=max(self.stage_rss_kb.values(), default=current_rss_kb()),
+            traced_peak_kb=self.traced_peak_kb,
+            html_bytes=self.html_bytes,
+            pdf_bytes=self.pdf_bytes,
+        )
+        if self.top_allocations:
+            timing.top_allocations = self.top_allocations  # type: ignore[assignment]
+        try:
+            db.add(timing)
+            db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to record report timings for {report_id}: {e}")
+            db.rollback()
+            return
+
+        if self.top_allocations:
+            prune_allocation_snapshots(db, settings.REPORT_MEMORY_SNAPSHOTS_KEPT)
+
+
+@contextmanager
+def timed_stage(timer: StageTimer | None, name: str) -> Iterator[None]:
+    """timer.stage(name), or nothing when the caller is not timing"""
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+class ReportTimingService:
+    @staticmethod
+    def summarize(
+        db: Session,
+        days: int = 7,
+        report_type: str | None = None,
+        by_release: bool = False,
+    ) -> dict[str, Any]:
+        """Percentiles per stage for each report type (and release)"""
+        since = datetime.now(UTC) - timedelta(days=days)
+        query = db.query(ReportGenerationTiming).filter(
+            ReportGenerationTiming.created_at >= since,
+            ReportGenerationTiming.status == "completed",
+        )
+        if report_type:
+            query = query.filter(ReportGenerationTiming.report_type == report_type)
+
+        groups: dict[str, list[ReportGenerationTiming]] = {}
+        for timing in query.all():
+            key = str(timing.report_type)
+            if by_release:
+                key = f"{key}@{timing.release or 'unknown'}"
+            groups.setdefault(key, []).append(timing)
+
+        summary: dict[str, Any] = {}
+        for key, timings in sorted(groups.items()):
+            stage_samples: dict[str, list[float]] = {}
+            for timing in timings:
+                for stage, ms in (timing.stage_ms or {}).items():
+                    stage_samples.setdefault(stage, []).append(ms)
+
+            summary[key] = {
+                "count": len(timings),
+                "total_ms": latency_percentiles([float(t.total_ms) for t in timings]),
+                "stages_ms": {
+                    stage: latency_percentiles(samples)
+                    for stage, samples in sorted(stage_samples.items())
+                },
+                "html_bytes": latency_percentiles(
+                    [float(t.html_bytes) for t in timings if t.html_bytes is not None]
+                ),
+                "pdf_bytes": latency_percentiles(
+                    [float(t.pdf_bytes) for t in timings if t.pdf_bytes is not None]
+                ),
+                "peak_rss_kb": latency_percentiles(
+                    [float(t.peak_rss_kb) for t in timings if t.peak_rss_kb is not None]
+                ),
+            }
+
+        return {"days": days, "by_release": by_release, "groups": summary}
+
+    @staticmethod
+    def memory_outliers(
+        db: Session, days: int = 7, limit: int = 20, report_type: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Report runs with the highest peak RSS, worst first"""
+        since = datetime.now(UTC) - timedelta(days=days)
+        query = db.query(ReportGenerationTiming).filter(
+            ReportGenerationTiming.created_at >= since,
+            ReportGenerationTiming.peak_rss_kb.isnot(None),
+        )
+        if report_type:
+            query = query.filter(ReportGenerationTiming.report_type == report_type)
+
+        timings = (
+            query.order_by(ReportGenerationTiming.peak_rss_kb.desc()).limit(limit).all()
+        )
+        return [
+            {
+                "report_id": timing.report_id,
+                "report_type": timing.report_type,
+                "status": timing.status,
+                "release": timing.release,
+                "peak_rss_kb": timing.peak_rss_kb,
+                "traced_peak_kb": timing.traced_peak_kb,
+                "stage_rss_kb": timing.stage_rss_kb or {},
+                "html_bytes": timing.html_bytes,
+                "pdf_bytes": timing.pdf_bytes,
+                "top_allocations": timing.top_allocations,
+                "created_at": timing.created_at.isoformat()
+                if timing.created_at
+                else None,
+            }
+            for timing in timings
+        ]
@@ -0,0 +1,109 @@
+"""Packing small assessment sections into shared section-analysis requests
+
+Every section request repeats the same large instruction prefix, so sections
+with only a few answered questions are cheaper and faster analysed together.
+Entries are (section, section_responses, ...) tuples in structure order;
+anything past the first two items is carried through untouched.
+"""
+
+import logging
+from typing import Any
+
+from app.core.config import settings
+from app.services.benchmark_context import benchmark_context_service
+from app.services.prompt_builder import (
+    build_section_batch_messages,
+    build_section_user_content,
+)
+from app.services.token_budget import (
+    count_message_tokens,
+    estimate_completion_tokens,
+    fit_max_tokens,
+    get_context_window,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_batch_user_contents(batch: list[tuple[Any, ...]]) -> list[tuple[str, str]]:
+    user_contents = []
+    for entry in batch:
+        section, section_responses = entry[0], entry[1]
+        curated_context = benchmark_context_service.get_relevant_context(
+            section.title, section.description, max_controls=5
+        )
+        content, _ = build_section_user_content(
+            section, section_responses, curated_context
+        )
+        user_contents.append((section.id, content))
+    return user_contents
+
+
+def _batch_completion_tokens(batch: list[tuple[Any, ...]]) -> int:
+    return sum(estimate_completion_tokens(len(entry[1])) for entry in batch)
+
+
+def _batch_fits(batch: list[tuple[Any, ...]], model: str) -> bool:
+    messages = build_section_batch_messages(build_batch_user_contents(batch))
+    prompt_tokens = count_message_tokens(messages, model)
+    completion_tokens = _batch_completion_tokens(batch)
+    return (
+        prompt_tokens <= settings.AI_BATCH_PROMPT_TOKEN_BUDGET
+        and completion_tokens <= settings.OPENAI_MAX_TOKENS
+        and prompt_tokens + completion_tokens <= get_context_window(model)
+    )
+
+
+def plan_section_batches(
+    entries: list[tuple[Any, ...]], model: str
+) -> tuple[list[list[tuple[Any, ...]]], list[tuple[Any, ...]]]:
+    """Greedily pack small sections into batches under the token budget
+
+    Returns (batches, singles); every batch holds at least two sections.
+    """
+    batches: list[list[tuple[Any, ...]]] = []
+    singles: list[tuple[Any, ...]] = []
+    current: list[tuple[Any, ...]] = []
+
+    for entry in entries:
+        if len(entry[1]) > settings.AI_BATCH_MAX_SIGNALS_PER_SECTION:
+            singles.append(entry)
+            continue
+
+        candidate = current + [entry]
+        if len(candidate) <= settings.AI_BATCH_MAX_SECTIONS and _batch_fits(
+            candidate, model
+        ):
+            current = candidate
+            continue
+
+        batches.append(current)
+        current = [entry]
+
+    batches.append(current)
+
+    planned = [batch for batch in batches if len(batch) > 1]
+    singles.extend(batch[0] for batch in batches if len(batch) == 1)
+    if planned:
+        logger.info(
+            f"Planned {len(planned)} section batches covering "
+            f"{sum(len(batch) for batch in planned)} sections"
+        )
+    return planned, singles
+
+
+def build_batch_request_params(batch: list[tuple[Any, ...]]) -> dict[str, Any]:
+    """Build chat completion parameters for a multi-section request"""
+    model = settings.OPENAI_MODEL
+    messages = build_section_batch_messages(build_batch_user_contents(batch))
+    prompt_tokens = count_message_tokens(messages, model)
+
+    return {
+        "model": model,
+        "messages": messages,
+        "response_format": {"type": "json_object"},
+        "max_tokens": fit_max_tokens(
+            prompt_tokens, _batch_completion_tokens(batch), model
+        ),
+        "temperature": settings.OPENAI_TEMPERATURE,
+    }
@@ -0,0 +1,442 @@
+"""Speculative per-section AI analysis while an assessment is still in progress
+
+Sections whose answers have been complete and unchanged for
+AI_SPECULATIVE_STABLE_MINUTES are analysed in the background and written to
+AISectionCache, so the final AI report mostly hits the cache.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from openai import AsyncOpenAI
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.prometheus import observe_openai_call
+from app.models.ai_speculative_job import AISpeculativeJob
+from app.models.assessment import AssessmentResponse
+from app.services.ai_cache import AICacheService
+from app.services.enhanced_context_extractor import get_enhanced_context_extractor
+from app.services.openai_key_manager import OpenAIKeyManager
+from app.services.pii_redactor import PIIRedactor
+from app.services.question_parser import load_assessment_structure_cached
+
+logger = logging.getLogger(__name__)
+
+BUDGETED_STATUSES = ("running", "completed", "failed")
+REQUEUED_STATUSES = ("skipped", "failed")
+# A claim older than this belongs to a worker that died mid-request
+STALE_CLAIM_AFTER = timedelta(minutes=15)
+# Ready jobs a worker without SKIP LOCKED tries to claim per round
+CLAIM_CANDIDATES = 10
+
+
+@dataclass(frozen=True)
+class SpeculativeRequest:
+    """A claimed job's OpenAI request, built off the event loop"""
+
+    job_id: str
+    assessment_id: str
+    section_id: str
+    answers_hash: str
+    key_id: str
+    api_key: str
+    params: dict[str, Any]
+
+
+class SpeculativeGenerationService:
+    """Queues and runs low-priority section analysis ahead of report generation"""
+
+    @staticmethod
+    def compute_section_hash(
+        section: Any, responses: list[AssessmentResponse]
+    ) -> str | None:
+        """Return the cache key hash for a fully answered section, else None"""
+        from app.services.report_generator import build_section_responses
+
+        response_dict = {str(r.question_id): r for r in responses}
+        for question in section.questions:
+            response = response_dict.get(question.id)
+            if response is None or response.answer_value in (None, "", []):
+                return None
+
+        pii_redactor = (
+            PIIRedactor() if settings.ENABLE_PII_REDACTION_BEFORE_AI else None
+        )
+        section_responses, _ = build_section_responses(
+            section, response_dict, get_enhanced_context_extractor(), pii_redactor
+        )
+        if not section_responses:
+            return None
+        return AICacheService.compute_answers_hash(section_responses)
+
+    @staticmethod
+    def record_progress(db: Session, assessment_id: str, section_ids: set[str]) -> None:
+        """Re-hash the touched sections and (re)queue the fully answered ones"""
+        structure = load_assessment_structure_cached()
+        sections = [s for s in structure.sections if s.id in section_ids]
+        if not sections:
+            return
+
+        responses = (
+            db.query(AssessmentResponse)
+            .filter(
+                AssessmentResponse.assessment_id == assessment_id,
+                AssessmentResponse.section_id.in_([s.id for s in sections]),
+            )
+            .all()
+        )
+        jobs = {
+            str(job.section_id): job
+            for job in db.query(AISpeculativeJob).filter(
+                AISpeculativeJob.assessment_id == assessment_id,
+                AISpeculativeJob.section_id.in_([s.id for s in sections]),
+            )
+        }
+        now = datetime.now(UTC)
+
+        for section in sections:
+            section_responses = [r for r in responses if r.section_id == section.id]
+            answers_hash = SpeculativeGenerationService.compute_section_hash(
+                section, section_responses
+            )
+            job = jobs.get(section.id)
+
+            if answers_hash is None:
+                if job and job.status == "pending":
+                    job.status = "skipped"  # type: ignore[assignment]
+                continue
+
+            if job is None:
+                db.add(
+                    AISpeculativeJob(
+                        assessment_id=assessment_id,
+                        section_id=section.id,
+                        answers_hash=answers_hash,
+                        status="pending",
+                        stable_since=now,
+                    )
+                )
+            elif job.answers_hash != answers_hash or job.status in REQUEUED_STATUSES:
+                # Restored answers hash the same as before, so a skipped or
+                # failed job has to be re-queued on status alone
+                job.answers_hash = answers_hash  # type: ignore[assignment]
+                job.status = "pending"  # type: ignore[assignment]
+                job.stable_since = now  # type: ignore[assignment]
+                job.error_message = None  # type: ignore[assignment]
+
+        db.commit()
+
+    @staticmethod
+    def remaining_budget(db: Session, now: datetime | None = None) -> int:
+        now = now or datetime.now(UTC)
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        used = (
+            db.query(func.count(AISpeculativeJob.id))
+            .filter(
+                AISpeculativeJob.status.in_(BUDGETED_STATUSES),
+                AISpeculativeJob.attempted_at >= day_start,
+            )
+            .scalar()
+            or 0
+        )
+        return max(settings.AI_SPECULATIVE_DAILY_BUDGET - used, 0)
+
+    @staticmethod
+    def ready_criteria(now: datetime) -> list[Any]:
+        """Filter for jobs a worker may claim: stable pending jobs, or claims
+        left running by a worker that died mid-request"""
+        return [
+            or_(
+                and_(
+                    AISpeculativeJob.status == "pending",
+                    AISpeculativeJob.stable_since
+                    <= now - timedelta(minutes=settings.AI_SPECULATIVE_STABLE_MINUTES),
+                ),
+                and_(
+                    AISpeculativeJob.status == "running",
+                    AISpeculativeJob.attempted_at <= now - STALE_CLAIM_AFTER,
+                ),
+            )
+        ]
+
+    @staticmethod
+    def get_ready_jobs(
+        db: Session, limit: int, now: datetime | None = None
+    ) -> list[AISpeculativeJob]:
+        return (
+            db.query(AISpeculativeJob)
+            .filter(
+                *SpeculativeGenerationService.ready_criteria(now or datetime.now(UTC))
+            )
+            .order_by(AISpeculativeJob.stable_since.asc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def claim_next_job(db: Session, now: datetime | None = None) -> str | None:
+        """Move one ready job to running within today's budget. Returns its id.
+
+        The claim is atomic, so concurrent workers never analyse the same
+        section twice, and it counts against the budget as soon as it is made.
+        """
+        now = now or datetime.now(UTC)
+        if SpeculativeGenerationService.remaining_budget(db, now) <= 0:
+            return None
+
+        query = (
+            db.query(AISpeculativeJob.id)
+            .filter(*SpeculativeGenerationService.ready_criteria(now))
+            .order_by(AISpeculativeJob.stable_since.asc())
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            # The row lock is held until commit, so the UPDATE below cannot lose
+            candidates = query.limit(1).with_for_update(skip_locked=True).all()
+        else:
+            # No SKIP LOCKED: the UPDATE re-checks readiness and the first
+            # candidate no other worker got to first wins
+            candidates = query.limit(CLAIM_CANDIDATES).all()
+
+        for (job_id,) in candidates:
+            claimed = (
+                db.query(AISpeculativeJob)
+                .filter(
+                    AISpeculativeJob.id == job_id,
+                    *SpeculativeGenerationService.ready_criteria(now),
+                )
+                .update(
+                    {"status": "running", "attempted_at": now, "error_message": None},
+                    synchronize_session=False,
+                )
+            )
+            if claimed == 1:
+                db.commit()
+                return str(job_id)
+        db.rollback()
+        return None
+
+    @staticmethod
+    def finish_job(
+        db: Session, job_id: str, status: str, error_message: str | None = None
+    ) -> str:
+        """Record the outcome of a claimed job unless it was re-queued meanwhile"""
+        db.query(AISpeculativeJob).filter(
+            AISpeculativeJob.id == job_id, AISpeculativeJob.status == "running"
+        ).update(
+            {"status": status, "error_message": error_message},
+            synchronize_session=False,
+        )
+        db.commit()
+        return status
+
+    @staticmethod
+    def fail_job(db: Session, job_id: str, key_id: str | None, error: Exception) -> str:
+        db.rollback()
+        logger.warning(f"Speculative generation failed for job {job_id}: {error}")
+        if key_id:
+            OpenAIKeyManager(db).record_failure(key_id, error)
+        return SpeculativeGenerationService.finish_job(
+            db, job_id, "failed", str(error)[:500]
+        )
+
+    @staticmethod
+    def prepare_job(db: Session, job_id: str) -> SpeculativeRequest | str:
+        """Build the OpenAI request for a claimed job if its answers are
+        still unchanged and uncached; otherwise return the job's new status"""
+        from app.services.report_generator import (
+            build_section_request_params,
+            build_section_responses,
+        )
+
+        job = db.get(AISpeculativeJob, job_id)
+        if job is None:
+            return "skipped"
+        structure = load_assessment_structure_cached()
+        section = next((s for s in structure.sections if s.id == job.section_id), None)
+        if section is None:
+            return SpeculativeGenerationService.finish_job(db, job_id, "skipped")
+
+        responses = (
+            db.query(AssessmentResponse)
+            .filter(
+                AssessmentResponse.assessment_id == job.assessment_id,
+                AssessmentResponse.section_id == job.section_id,
+            )
+            .all()
+        )
+        answers_hash = SpeculativeGenerationService.compute_section_hash(
+            section, responses
+        )
+        if answers_hash is None or answers_hash != job.answers_hash:
+            logger.info(
+                f"Speculative job {job_id}: answers changed for section {section.id}, skipping"
+            )
+            return SpeculativeGenerationService.finish_job(db, job_id, "skipped")
+
+        if AICacheService.has_cached_artifact(
+            db,
+            section.id,
+            answers_hash,
+            settings.AI_PROMPT_VERSION,
+            settings.OPENAI_MODEL,
+        ):
+            return SpeculativeGenerationService.finish_job(db, job_id, "cached")
+
+        pii_redactor = (
+            PIIRedactor() if settings.ENABLE_PII_REDACTION_BEFORE_AI else None
+        )
+        section_responses, _ = build_section_responses(
+            section,
+            {str(r.question_id): r for r in responses},
+            get_enhanced_context_extractor(),
+            pii_redactor,
+        )
+        try:
+            params = build_section_request_params(section, section_responses)
+            key_id, api_key = OpenAIKeyManager(db).get_next_key()
+        except Exception as e:
+            return SpeculativeGenerationService.fail_job(db, job_id, None, e)
+
+        return SpeculativeRequest(
+            job_id=job_id,
+            assessment_id=str(job.assessment_id),
+            section_id=section.id,
+            answers_hash=answers_hash,
+            key_id=key_id,
+            api_key=api_key,
+            params=params,
+        )
+
+    @staticmethod
+    def store_result(db: Session, request: SpeculativeRequest, response: Any) -> str:
+        """Cache the section artifact from a completed request"""
+        from app.services.report_generator import safe_validate_section_artifact
+
+        try:
+            artifact = safe_validate_section_artifact(
+                response.choices[0].message.content or "", request.section_id
+            )
+            tokens_prompt = response.usage.prompt_tokens if response.usage else 0
+            tokens_completion = (
+                response.usage.completion_tokens if response.usage else 0
+            )
+            AICacheService.store_artifact(
+                db,
+                request.section_id,
+                request.answers_hash,
+                settings.AI_PROMPT_VERSION,
+                settings.AI_SCHEMA_VERSION,
+                settings.OPENAI_MODEL,
+                artifact,
+                tokens_prompt,
+                tokens_completion,
+                tokens_prompt * 0.00001 + tokens_completion * 0.00003,
+            )
+            OpenAIKeyManager(db).record_success(request.key_id)
+            status = SpeculativeGenerationService.finish_job(
+                db, request.job_id, "completed"
+            )
+        except Exception as e:
+            return SpeculativeGenerationService.fail_job(
+                db, request.job_id, request.key_id, e
+            )
+
+        logger.info(
+            f"Speculatively cached section {request.section_id} for assessment {request.assessment_id}"
+        )
+        return status
+
+    @staticmethod
+    async def process_job(job_id: str) -> str:
+        """Analyse one claimed section. Returns the job's new status.
+
+        Database work, PII redaction and prompt building run in worker
+        threads with their own sessions; only the OpenAI call is awaited on
+        the event loop.
+        """
+        request = await asyncio.to_thread(
+            run_in_session, SpeculativeGenerationService.prepare_job, job_id
+        )
+        if isinstance(request, str):
+            return request
+
+        try:
+            client = AsyncOpenAI(
+                api_key=request.api_key,
+                timeout=settings.OPENAI_TIMEOUT,
+                base_url=settings.OPENAI_BASE_URL,
+            )
+            start_time = time.perf_counter()
+            response = await client.chat.completions.create(**request.params)
+            observe_openai_call(
+                request.key_id,
+                request.params["model"],
+                "speculative_section",
+                time.perf_counter() - start_time,
+                response.usage,
+            )
+        except Exception as e:
+            return await asyncio.to_thread(
+                run_in_session,
+                SpeculativeGenerationService.fail_job,
+                job_id,
+                request.key_id,
+                e,
+            )
+
+        return await asyncio.to_thread(
+            run_in_session, SpeculativeGenerationService.store_result, request, response
+        )
+
+    @staticmethod
+    async def run_once() -> int:
+        """Claim and process ready jobs within today's budget. Returns jobs processed."""
+        processed = 0
+        while True:
+            job_id = await asyncio.to_thread(
+                run_in_session, SpeculativeGenerationService.claim_next_job
+            )
+            if job_id is None:
+                return processed
+            # One section at a time: this work must never compete with
+            # user-triggered report generation for API keys.
+            await SpeculativeGenerationService.process_job(job_id)
+            processed += 1
+
+
+def run_in_session[T](func: Callable[..., T], *args: Any) -> T:
+    """Call func(db, *args) with a fresh session; used from worker threads"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+
+def record_progress_in_background(assessment_id: str, section_ids: set[str]) -> None:
+    db = SessionLocal()
+    try:
+        SpeculativeGenerationService.record_progress(db, assessment_id, section_ids)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record speculative progress for {assessment_id}: {e}")
+    finally:
+        db.close()
+
+
+async def run_speculative_worker_loop(poll_seconds: int) -> None:
+    """Poll for stable sections until cancelled"""
+    while True:
+        await asyncio.sleep(poll_seconds)
+        try:
+            await SpeculativeGenerationService.run_once()
+        except Exception as e:
+            logger.error(f"Speculative generation worker error: {e}")
@@ -0,0 +1,203 @@
+"""Precompressed questionnaire payloads
+
+The full assessment structure, the per-tier structures, the tier list and the
+intake questionnaire only change with the questions file. Each is serialized
+and compressed once per questionnaire version (the file's mtime) and then
+served as raw bytes.
+
+Filtered structures live in a bounded LRU keyed by questionnaire version and
+the sorted section ids, so the handful of selections in use (the tiers plus
+intake-recommended combinations) are filtered and serialized once. Tier
+selections are warmed at startup and precompressed; other selections are left
+to the compression middleware.
+
+Sparse structures leave out the options' detailed explanations, which are most
+of the payload; clients fetch those per section when the section is opened.
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from app.core.assessment_tiers import ASSESSMENT_TIERS
+from app.core.config import settings
+from app.core.responses import PrecompressedPayload
+from app.schemas.assessment import AssessmentStructure
+from app.services.cache import cache_service
+from app.services.question_parser import (
+    filter_structure_by_sections,
+    load_assessment_structure_cached,
+)
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SPARSE_EXCLUDE = {
+    "sections": {
+        "__all__": {
+            "questions": {"__all__": {"options": {"__all__": {"detailed_explanation"}}}}
+        }
+    }
+}
+
+
+def questionnaire_version() -> float:
+    try:
+        return os.path.getmtime(cache_service.get_questions_file_path())
+    except OSError:
+        return 0.0
+
+
+class StaticPayloadCache:
+    """Values built once per questionnaire version"""
+
+    def __init__(self, version: Callable[[], float] = questionnaire_version):
+        self._version_of = version
+        self._lock = threading.Lock()
+        self._version: float | None = None
+        self._values: dict[str, Any] = {}
+
+    def get(self, name: str, build: Callable[[], T]) -> T:
+        version = self._version_of()
+        with self._lock:
+            if version != self._version:
+                self._values.clear()
+                self._version = version
+            if name in self._values:
+                value: T = self._values[name]
+                return value
+
+        value = build()
+        with self._lock:
+            if self._version == version:
+                self._values[name] = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._version = None
+
+
+static_payloads = StaticPayloadCache()
+
+
+def structure_content(structure: AssessmentStructure, sparse: bool = False) -> Any:
+    return structure.model_dump(mode="json", exclude=SPARSE_EXCLUDE if sparse else None)
+
+
+@dataclass(frozen=True)
+class FilteredStructure:
+    """One section selection's structure, question count and serialized JSON
+
+    Shared between requests: treat the structure as read-only.
+    """
+
+    structure: AssessmentStructure
+    total_questions: int
+    full_payload: PrecompressedPayload
+    sparse_payload: PrecompressedPayload
+
+    def payload(self, sparse: bool = False) -> PrecompressedPayload:
+        return self.sparse_payload if sparse else self.full_payload
+
+
+filtered_structures = TTLCache(max_size=settings.FILTERED_STRUCTURE_CACHE_SIZE)
+
+
+def selection_key(section_ids: Iterable[str]) -> tuple[str, ...]:
+    """Sorted, de-duplicated section ids; no selection means every section"""
+    return tuple(sorted(set(section_ids) or section_ids_in_questionnaire()))
+
+
+def filtered_structure(section_ids: Iterable[str] = ()) -> FilteredStructure:
+    key = selection_key(section_ids)
+    cache_key = (questionnaire_version(), key)
+    entry: FilteredStructure | None = filtered_structures.get(cache_key)
+    if entry is None:
+        entry = build_filtered_structure(key)
+        filtered_structures.set(cache_key, entry)
+    return entry
+
+
+def build_filtered_structure(key: tuple[str, ...]) -> FilteredStructure:
+    structure = filter_structure_by_sections(
+        load_assessment_structure_cached(), list(key)
+    )
+    # Tiers are few and hot enough to be worth maximum compression
+    compressed = frozenset(key) in tiers_by_sections()
+    return FilteredStructure(
+        structure=structure,
+        total_questions=structure.total_questions,
+        full_payload=PrecompressedPayload.from_content(
+            structure_content(structure), compressed
+        ),
+        sparse_payload=PrecompressedPayload.from_content(
+            structure_content(structure, sparse=True), compressed
+        ),
+    )
+
+
+def structure_payload(sparse: bool = False) -> PrecompressedPayload:
+    return filtered_structure().payload(sparse)
+
+
+def tier_sections(tier: str) -> list[str]:
+    sections = ASSESSMENT_TIERS[tier]["sections"]
+    return list(section_ids_in_questionnaire() if sections == "all" else sections)
+
+
+def warm_filtered_structures() -> None:
+    """Build every tier's filtered structure ahead of the first request"""
+    for tier in ASSESSMENT_TIERS:
+        try:
+            filtered_structure(tier_sections(tier))
+        except Exception as e:
+            logger.error(f"Failed to warm the {tier} structure: {e}")
+
+
+def tiers_by_sections() -> dict[frozenset[str], str]:
+    return static_payloads.get(
+        "tiers_by_sections",
+        lambda: {frozenset(tier_sections(tier)): tier for tier in ASSESSMENT_TIERS},
+    )
+
+
+def section_ids_in_questionnaire() -> frozenset[str]:
+    return static_payloads.get(
+        "section_ids",
+        lambda: frozenset(
+            section.id for section in load_assessment_structure_cached().sections
+        ),
+    )
+
+
+def section_explanations_payload(section_id: str) -> PrecompressedPayload | None:
+    """Detailed option explanations for one section, keyed by question and option
+
+    None when the questionnaire has no such section.
+    """
+    if section_id not in section_ids_in_questionnaire():
+        return None
+
+    def build() -> PrecompressedPayload:
+        structure = load_assessment_structure_cached()
+        section = next(s for s in structure.sections if s.id == section_id)
+        questions = {
+            question.id: {
+                option.value: option.detailed_explanation.model_dump(mode="json")
+                for option in question.options
+                if option.detailed_explanation is not None
+            }
+            for question in section.questions
+        }
+        return PrecompressedPayload.from_content(
+            {"section_id": section_id, "questions": questions}
+        )
+
+    return static_payloads.get(f"explanations:{section_id}", build)
@@ -6,7 +6,6 @@ Configure via STORAGE_BACKEND environment variable: 'local' or 's3'.
 
 import os
 from abc import ABC, abstractmethod
-from io import BytesIO
 from typing import BinaryIO
 
 from app.core.config import settings
@@ -128,7 +127,8 @@ class S3Storage(StorageService):
         key = parts[1] if len(parts) > 1 else ""
 
         response = self.s3_client.get_object(Bucket=bucket, Key=key)
-        return BytesIO(response["Body"].read())
+        body: BinaryIO = response["Body"]  # Streamed; not buffered in memory
+        return body
 
     def exists(self, location: str) -> bool:
         """Check if an S3 object exists."""
@@ -0,0 +1,160 @@
+"""Local token accounting for OpenAI prompts
+
+Counts are computed before a request is sent so prompts can be compacted to a
+budget and max_tokens sized to the section. tiktoken is used when its encoding
+is in TIKTOKEN_CACHE_DIR (seeded when the image is built); otherwise a
+character-based estimate is used. Nothing here touches the network.
+"""
+
+import hashlib
+import logging
+import math
+import os
+from functools import lru_cache
+from typing import Any
+
+import tiktoken
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # Average for English prose
+# JSON keys and punctuation run nearer 3 characters per token, so the
+# estimate errs high rather than overfilling the context window
+ESTIMATE_SAFETY_MARGIN = 1.3
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators per chat message
+REPLY_PRIMING_TOKENS = 3
+# A completion clamped below this share of its estimate would truncate the JSON
+MIN_COMPLETION_FRACTION = 0.5
+
+# Encodings seeded by scripts/seed_tiktoken_cache.py; tiktoken names cache
+# files by the SHA-1 of the URL it would otherwise download from
+ENCODING_URLS = {
+    "cl100k_base": "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+    "o200k_base": "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+}
+FALLBACK_ENCODING = "cl100k_base"
+
+# Longest prefix wins, so "gpt-4o" is matched before "gpt-4"
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# (keep curated benchmark context, fraction of the context/comment char limits)
+SECTION_COMPACTION_LEVELS = (
+    (True, 1.0),
+    (False, 1.0),
+    (False, 0.5),
+    (False, 0.25),
+    (False, 0.0),
+)
+
+
+class PromptTooLargeError(ValueError):
+    """The prompt leaves too little of the context window for the completion"""
+
+
+def encoding_is_cached(name: str) -> bool:
+    url = ENCODING_URLS.get(name)
+    if url is None:
+        return False
+    cache_key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.exists(os.path.join(settings.TIKTOKEN_CACHE_DIR, cache_key))
+
+
+@lru_cache(maxsize=16)
+def get_encoder(model: str) -> Any:
+    """Return a tiktoken encoding for the model, or None to use the estimate"""
+    try:
+        try:
+            name = tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            name = FALLBACK_ENCODING
+        if not encoding_is_cached(name):
+            logger.warning(
+                f"tiktoken encoding {name} is not in {settings.TIKTOKEN_CACHE_DIR}; "
+                f"estimating tokens for {model}"
+            )
+            return None
+        os.environ["TIKTOKEN_CACHE_DIR"] = settings.TIKTOKEN_CACHE_DIR
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    if not text:
+        return 0
+    encoder = get_encoder(model or settings.OPENAI_MODEL)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN * ESTIMATE_SAFETY_MARGIN)
+
+
+def count_message_tokens(
+    messages: list[dict[str, Any]], model: str | None = None
+) -> int:
+    """Predict the prompt_tokens OpenAI will report for a chat request"""
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + count_tokens(
+            str(message.get("content") or ""), model
+        )
+    return total
+
+
+def get_context_window(model: str) -> int:
+    for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_WINDOWS[prefix]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def estimate_completion_tokens(signal_count: int) -> int:
+    """Completion allowance for a section analysis with this many signals"""
+    estimate = (
+        settings.AI_COMPLETION_BASE_TOKENS
+        + settings.AI_COMPLETION_TOKENS_PER_SIGNAL * signal_count
+    )
+    return min(estimate, settings.OPENAI_MAX_TOKENS)
+
+
+def section_prompt_budget(model: str, completion_tokens: int) -> int:
+    """Largest section prompt that still leaves room for the completion"""
+    return min(
+        settings.AI_SECTION_PROMPT_TOKEN_BUDGET,
+        get_context_window(model) - completion_tokens,
+    )
+
+
+def fit_max_tokens(prompt_tokens: int, completion_tokens: int, model: str) -> int:
+    """Clamp the requested completion size to what the context window allows
+
+    Raises PromptTooLargeError rather than sending a request whose completion
+    could not hold the analysis.
+    """
+    available = get_context_window(model) - prompt_tokens
+    if available < completion_tokens * MIN_COMPLETION_FRACTION:
+        raise PromptTooLargeError(
+            f"{prompt_tokens}-token prompt leaves {max(available, 0)} of the "
+            f"{completion_tokens} completion tokens needed in {model}'s context window"
+        )
+    return min(completion_tokens, available)
+
+
+def get_cached_prompt_tokens(usage: Any) -> int | None:
+    """Prompt tokens served from the provider's prefix cache, if reported"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    return cached if isinstance(cached, int) else None
@@ -0,0 +1,22 @@
+"""Summary statistics for latency samples"""
+
+import math
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def latency_percentiles(values: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max of unsorted latency samples"""
+    ordered = sorted(values)
+    return {
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0,
+    }
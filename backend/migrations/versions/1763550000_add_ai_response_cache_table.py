@@ -0,0 +1,57 @@
+"""add ai_response_cache table
+
+Revision ID: 1763550000
+Revises: 1763463955
+Create Date: 2025-11-19 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1763550000"
+down_revision = "1763463955"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("request_hash", sa.String(64), nullable=False),
+        sa.Column("call_site", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(50), nullable=False),
+        sa.Column("response_json", json_type, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    op.create_index(
+        "idx_response_cache_hash", "ai_response_cache", ["request_hash"], unique=True
+    )
+    op.create_index("idx_response_cache_expires", "ai_response_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_response_cache_expires", table_name="ai_response_cache")
+    op.drop_index("idx_response_cache_hash", table_name="ai_response_cache")
+    op.drop_table("ai_response_cache")
@@ -0,0 +1,135 @@
+"""add ai_artifact_blobs table and dedupe artifact payloads
+
+Revision ID: 1763636400
+Revises: 1763550000
+Create Date: 2025-11-20 11:00:00.000000
+
+"""
+
+import hashlib
+import json
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1763636400"
+down_revision = "1763550000"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+DEDUPED_TABLES = ("ai_section_artifacts", "ai_section_cache")
+
+
+def compute_content_hash(payload: dict) -> str:
+    # Must match ArtifactBlobService.compute_content_hash
+    canonical_json = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "ai_artifact_blobs",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("artifact_json", json_type, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+
+    for table_name, index_name in (
+        ("ai_section_artifacts", "idx_artifacts_blob_hash"),
+        ("ai_section_cache", "idx_cache_blob_hash"),
+    ):
+        op.add_column(table_name, sa.Column("blob_hash", sa.String(64), nullable=True))
+        op.create_foreign_key(
+            f"fk_{table_name}_blob_hash",
+            table_name,
+            "ai_artifact_blobs",
+            ["blob_hash"],
+            ["content_hash"],
+        )
+        op.create_index(index_name, table_name, ["blob_hash"])
+        op.alter_column(table_name, "artifact_json", nullable=True)
+
+    blobs = sa.table(
+        "ai_artifact_blobs",
+        sa.column("content_hash", sa.String),
+        sa.column("artifact_json", json_type),
+    )
+    known_hashes = {
+        row[0]
+        for row in bind.execute(sa.text("SELECT content_hash FROM ai_artifact_blobs"))
+    }
+
+    for table_name in DEDUPED_TABLES:
+        rows_migrated = 0
+        while True:
+            rows = bind.execute(
+                sa.text(
+                    f"SELECT id, artifact_json FROM {table_name} "
+                    "WHERE blob_hash IS NULL AND artifact_json IS NOT NULL "
+                    f"LIMIT {BATCH_SIZE}"
+                )
+            ).fetchall()
+            if not rows:
+                break
+
+            new_blobs = []
+            updates = []
+            for row_id, artifact_json in rows:
+                payload = (
+                    json.loads(artifact_json)
+                    if isinstance(artifact_json, str)
+                    else artifact_json
+                )
+                content_hash = compute_content_hash(payload)
+                if content_hash not in known_hashes:
+                    known_hashes.add(content_hash)
+                    new_blobs.append(
+                        {"content_hash": content_hash, "artifact_json": payload}
+                    )
+                updates.append({"blob_hash": content_hash, "row_id": row_id})
+
+            if new_blobs:
+                bind.execute(blobs.insert(), new_blobs)
+            bind.execute(
+                sa.text(
+                    f"UPDATE {table_name} SET blob_hash = :blob_hash, "
+                    "artifact_json = NULL WHERE id = :row_id"
+                ),
+                updates,
+            )
+            rows_migrated += len(rows)
+
+        print(f"Deduplicated {rows_migrated} rows in {table_name}")
+
+    print(f"Stored {len(known_hashes)} distinct artifact blobs")
+
+
+def downgrade() -> None:
+    for table_name, index_name in (
+        ("ai_section_artifacts", "idx_artifacts_blob_hash"),
+        ("ai_section_cache", "idx_cache_blob_hash"),
+    ):
+        op.execute(
+            f"UPDATE {table_name} SET artifact_json = ("
+            "SELECT b.artifact_json FROM ai_artifact_blobs b "
+            f"WHERE b.content_hash = {table_name}.blob_hash"
+            ") WHERE artifact_json IS NULL"
+        )
+        op.alter_column(table_name, "artifact_json", nullable=False)
+        op.drop_index(index_name, table_name=table_name)
+        op.drop_constraint(f"fk_{table_name}_blob_hash", table_name, type_="foreignkey")
+        op.drop_column(table_name, "blob_hash")
+
+    op.drop_table("ai_artifact_blobs")
@@ -0,0 +1,65 @@
+"""add ai_speculative_jobs table
+
+Revision ID: 1763722800
+Revises: 1763636400
+Create Date: 2025-11-21 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1763722800"
+down_revision = "1763636400"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_speculative_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "assessment_id",
+            sa.String(36),
+            sa.ForeignKey("assessments.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("section_id", sa.String(100), nullable=False),
+        sa.Column("answers_hash", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("stable_since", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+
+    op.create_index(
+        "idx_speculative_assessment_section",
+        "ai_speculative_jobs",
+        ["assessment_id", "section_id"],
+        unique=True,
+    )
+    op.create_index(
+        "idx_speculative_status_stable",
+        "ai_speculative_jobs",
+        ["status", "stable_since"],
+    )
+    op.create_index(
+        "idx_speculative_attempted", "ai_speculative_jobs", ["attempted_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_speculative_attempted", table_name="ai_speculative_jobs")
+    op.drop_index("idx_speculative_status_stable", table_name="ai_speculative_jobs")
+    op.drop_index(
+        "idx_speculative_assessment_section", table_name="ai_speculative_jobs"
+    )
+    op.drop_table("ai_speculative_jobs")
@@ -0,0 +1,27 @@
+"""add tokens_prompt_cached to ai_generation_metadata table
+
+Revision ID: 1763895600
+Revises: 1763809200
+Create Date: 2025-11-23 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1763895600"
+down_revision = "1763809200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ai_generation_metadata",
+        sa.Column("tokens_prompt_cached", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_generation_metadata", "tokens_prompt_cached")
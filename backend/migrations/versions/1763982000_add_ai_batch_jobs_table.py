@@ -0,0 +1,53 @@
+"""add ai_batch_jobs table
+
+Revision ID: 1763982000
+Revises: 1763895600
+Create Date: 2025-11-24 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1763982000"
+down_revision = "1763895600"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "ai_batch_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("backend", sa.String(20), nullable=False),
+        sa.Column("phase", sa.String(20), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="submitted"),
+        sa.Column("external_batch_id", sa.String(255), nullable=True),
+        sa.Column("api_key_id", sa.String(36), nullable=True),
+        sa.Column("report_ids", json_type, nullable=False),
+        sa.Column("requests_json", json_type, nullable=False),
+        sa.Column("request_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+
+    op.create_index(
+        "idx_batch_jobs_status", "ai_batch_jobs", ["status", "submitted_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_batch_jobs_status", table_name="ai_batch_jobs")
+    op.drop_table("ai_batch_jobs")
@@ -0,0 +1,46 @@
+"""add ai_bulk_generation_runs table
+
+Revision ID: 1764068400
+Revises: 1763982000
+Create Date: 2025-11-25 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1764068400"
+down_revision = "1763982000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "ai_bulk_generation_runs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("report_ids", json_type, nullable=False),
+        sa.Column("filters", json_type, nullable=True),
+        sa.Column("requested_by", sa.String(36), nullable=True),
+        sa.Column("max_concurrent", sa.Integer(), nullable=True),
+        sa.Column("shared_sections", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ai_bulk_generation_runs")
@@ -0,0 +1,63 @@
+"""add report_generation_timings table
+
+Revision ID: 1764154800
+Revises: 1764068400
+Create Date: 2025-11-26 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1764154800"
+down_revision = "1764068400"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.create_table(
+        "report_generation_timings",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "report_id",
+            sa.String(36),
+            sa.ForeignKey("reports.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("report_type", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("release", sa.String(100), nullable=True),
+        sa.Column("stage_ms", json_type, nullable=False),
+        sa.Column("total_ms", sa.Integer(), nullable=False),
+        sa.Column("peak_rss_kb", sa.Integer(), nullable=True),
+        sa.Column("html_bytes", sa.Integer(), nullable=True),
+        sa.Column("pdf_bytes", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_report_timings_type_created",
+        "report_generation_timings",
+        ["report_type", "created_at"],
+    )
+    op.create_index(
+        "idx_report_timings_report", "report_generation_timings", ["report_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_report_timings_report", table_name="report_generation_timings")
+    op.drop_index(
+        "idx_report_timings_type_created", table_name="report_generation_timings"
+    )
+    op.drop_table("report_generation_timings")
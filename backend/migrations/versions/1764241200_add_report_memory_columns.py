@@ -0,0 +1,45 @@
+"""add memory columns to report_generation_timings
+
+Revision ID: 1764241200
+Revises: 1764154800
+Create Date: 2025-11-27 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1764241200"
+down_revision = "1764154800"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    json_type = postgresql.JSONB() if dialect_name == "postgresql" else sa.JSON()
+
+    op.add_column(
+        "report_generation_timings",
+        sa.Column("stage_rss_kb", json_type, nullable=True),
+    )
+    op.add_column(
+        "report_generation_timings",
+        sa.Column("traced_peak_kb", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "report_generation_timings",
+        sa.Column("top_allocations", json_type, nullable=True),
+    )
+    op.create_index(
+        "idx_report_timings_peak_rss", "report_generation_timings", ["peak_rss_kb"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_report_timings_peak_rss", table_name="report_generation_timings")
+    op.drop_column("report_generation_timings", "top_allocations")
+    op.drop_column("report_generation_timings", "traced_peak_kb")
+    op.drop_column("report_generation_timings", "stage_rss_kb")
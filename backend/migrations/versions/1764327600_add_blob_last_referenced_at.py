@@ -0,0 +1,42 @@
+"""add last_referenced_at to ai_artifact_blobs
+
+Revision ID: 1764327600
+Revises: 1764241200
+Create Date: 2025-11-28 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1764327600"
+down_revision = "1764241200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ai_artifact_blobs",
+        sa.Column(
+            "last_referenced_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.execute(
+        "UPDATE ai_artifact_blobs SET last_referenced_at = COALESCE(created_at, now())"
+    )
+    op.alter_column("ai_artifact_blobs", "last_referenced_at", nullable=False)
+    op.create_index(
+        "idx_artifact_blobs_last_referenced",
+        "ai_artifact_blobs",
+        ["last_referenced_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_artifact_blobs_last_referenced", table_name="ai_artifact_blobs")
+    op.drop_column("ai_artifact_blobs", "last_referenced_at")
@@ -0,0 +1,24 @@
+"""add error_message to reports
+
+Revision ID: 1764414000
+Revises: 1764327600
+Create Date: 2025-11-29 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1764414000"
+down_revision = "1764327600"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("reports", sa.Column("error_message", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("reports", "error_message")
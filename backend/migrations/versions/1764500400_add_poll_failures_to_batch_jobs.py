@@ -0,0 +1,27 @@
+"""add poll_failures to ai_batch_jobs
+
+Revision ID: 1764500400
+Revises: 1764414000
+Create Date: 2025-11-30 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1764500400"
+down_revision = "1764414000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ai_batch_jobs",
+        sa.Column("poll_failures", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_batch_jobs", "poll_failures")
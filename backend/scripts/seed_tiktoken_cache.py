@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Seed TIKTOKEN_CACHE_DIR with the encodings token_budget uses
+
+Run when the image is built so token counting never downloads at runtime.
+The names must match ENCODING_URLS in app/services/token_budget.py.
+
+Exit codes:
+- 0: Encodings cached
+- 1: TIKTOKEN_CACHE_DIR is not set
+"""
+
+import os
+import sys
+
+import tiktoken
+
+ENCODINGS = ("cl100k_base", "o200k_base")
+
+
+def main() -> int:
+    cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+    if not cache_dir:
+        print("TIKTOKEN_CACHE_DIR must be set", file=sys.stderr)
+        return 1
+
+    for name in ENCODINGS:
+        tiktoken.get_encoding(name)
+        print(f"Cached {name} in {cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
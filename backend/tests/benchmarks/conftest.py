@@ -0,0 +1,364 @@
+"""Micro-benchmark harness for the report core paths
+
+Benchmarks are skipped unless pytest runs with --benchmark. Each sample is a
+benchmark's best per-call time divided by a fixed calibration workload timed
+just before it, so baselines recorded on one machine stay roughly comparable
+on another; the median of several samples is compared with the baseline.
+
+Calibration does not remove the difference between machines (cache sizes,
+CPU frequency, other tenants), so comparisons are reported, not enforced.
+Slowdowns beyond a benchmark's tolerance (baselines.json "tolerances", else
+"threshold", overridable with --benchmark-threshold) only fail the run with
+--benchmark-fail, for hardware the baselines were recorded on.
+
+    poetry run pytest tests/benchmarks --benchmark --no-cov
+    poetry run pytest tests/benchmarks --benchmark-update --no-cov  # re-record
+"""
+
+import json
+import random
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.models.assessment import Assessment, AssessmentResponse
+from app.services.cache import cache_service
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.5
+MIN_ROUND_SECONDS = 0.05
+DEFAULT_ROUNDS = 7
+DEFAULT_SAMPLES = 5
+
+COMMENT_SENTENCES = [
+    "We rotate credentials quarterly and review access every six months.",
+    "Escalations go to the on-call engineer at ops@acme-corp.io or 555-201-3344.",
+    "Backups are replicated to 10.20.30.40 and tested before each release.",
+    "The runbook lives at https://wiki.acme-corp.io/runbook?team=sec&rev=12.",
+    "Legacy systems are scheduled for decommissioning next fiscal year.",
+    "Vendor contacts: jane.doe@vendor.example.org, +1 415-555-0199.",
+    "Firewall rules are reviewed by the network team after every change.",
+]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run core-path benchmarks and report them against baselines",
+    )
+    group.addoption(
+        "--benchmark-fail",
+        action="store_true",
+        default=False,
+        help="Fail benchmarks that are slower than their baseline's tolerance",
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        default=False,
+        help="Run benchmarks and rewrite tests/benchmarks/baselines.json",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=None,
+        help="Allowed slowdown over baseline as a fraction (default from baselines)",
+    )
+    group.addoption(
+        "--benchmark-samples",
+        type=int,
+        default=DEFAULT_SAMPLES,
+        help="Calibrated samples per benchmark; the median is reported",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "benchmark: core-path micro-benchmark")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if (
+        config.getoption("--benchmark")
+        or config.getoption("--benchmark-update")
+        or config.getoption("--benchmark-fail")
+    ):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
+def calibration_workload() -> None:
+    """Fixed mix of dict, string and json work the benchmarks normalise against"""
+    rows = [
+        {"id": i, "value": f"answer-{i % 7}", "weight": i * 0.5} for i in range(500)
+    ]
+    encoded = json.dumps(rows, sort_keys=True)
+    decoded = json.loads(encoded)
+    sorted(decoded, key=lambda row: (row["value"], -row["weight"]))
+
+
+def time_per_call(func: Callable[[], Any], rounds: int = DEFAULT_ROUNDS) -> float:
+    """Best seconds per call over the rounds, batching fast calls per round
+
+    The minimum is the least noisy estimate on a shared machine; slower rounds
+    only measure interference from other processes.
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    iterations = max(1, int(MIN_ROUND_SECONDS / first)) if first > 0 else 1000
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations)
+    return min(samples)
+
+
+class BenchmarkRecorder:
+    """Holds the session's results, stored baselines and tolerances"""
+
+    def __init__(
+        self,
+        threshold: float | None,
+        update: bool,
+        enforce: bool = False,
+        samples: int = DEFAULT_SAMPLES,
+    ) -> None:
+        stored = (
+            json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+        )
+        self.baselines: dict[str, float] = stored.get("benchmarks", {})
+        self.tolerances: dict[str, float] = stored.get("tolerances", {})
+        self.default_threshold: float = stored.get("threshold", DEFAULT_THRESHOLD)
+        self.threshold_override = threshold
+        self.update = update
+        self.enforce = enforce and not update
+        self.samples = max(1, samples)
+        self.results: dict[str, dict[str, float]] = {}
+
+    def tolerance(self, name: str) -> float:
+        if self.threshold_override is not None:
+            return self.threshold_override
+        return self.tolerances.get(name, self.default_threshold)
+
+    def measure(self, func: Callable[[], Any], rounds: int) -> tuple[float, float]:
+        """Median (seconds per call, normalised time) over calibrated samples
+
+        Each sample is normalised by a calibration timed right before it, so a
+        change in machine load mid-session shifts both alike.
+        """
+        seconds = []
+        normalised = []
+        for _ in range(self.samples):
+            calibration = time_per_call(calibration_workload, rounds=3)
+            elapsed = time_per_call(func, rounds=rounds)
+            seconds.append(elapsed)
+            normalised.append(elapsed / calibration)
+        return statistics.median(seconds), statistics.median(normalised)
+
+    def record(self, name: str, seconds: float, normalised: float) -> dict[str, float]:
+        result = {"seconds": seconds, "normalised": normalised}
+        baseline = self.baselines.get(name)
+        if baseline:
+            result["ratio"] = normalised / baseline
+        self.results[name] = result
+        return result
+
+    def regression(self, name: str) -> str | None:
+        ratio = self.results[name].get("ratio")
+        allowed = 1 + self.tolerance(name)
+        if self.update or ratio is None or ratio <= allowed:
+            return None
+        return (
+            f"{name} regressed: {ratio:.2f}x its baseline "
+            f"(allowed {allowed:.2f}x, "
+            f"{self.results[name]['seconds'] * 1000:.3f} ms per call)"
+        )
+
+    def save(self) -> None:
+        baselines = {
+            **self.baselines,
+            **{
+                name: round(result["normalised"], 4)
+                for name, result in self.results.items()
+            },
+        }
+        BASELINES_PATH.write_text(
+            json.dumps(
+                {
+                    "threshold": self.default_threshold,
+                    "tolerances": dict(sorted(self.tolerances.items())),
+                    "recorded_at": datetime.now(UTC).date().isoformat(),
+                    "benchmarks": dict(sorted(baselines.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+
+_recorder: BenchmarkRecorder | None = None
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request: pytest.FixtureRequest) -> BenchmarkRecorder:
+    global _recorder
+    _recorder = BenchmarkRecorder(
+        threshold=request.config.getoption("--benchmark-threshold"),
+        update=request.config.getoption("--benchmark-update"),
+        enforce=request.config.getoption("--benchmark-fail"),
+        samples=request.config.getoption("--benchmark-samples"),
+    )
+    return _recorder
+
+
+@pytest.fixture
+def benchmark(
+    benchmark_recorder: BenchmarkRecorder,
+) -> Callable[..., Any]:
+    """Time func(*args) and record it under name
+
+    Regressions fail the benchmark only with --benchmark-fail.
+    """
+
+    def run(
+        name: str, func: Callable[..., Any], *args: Any, rounds: int = DEFAULT_ROUNDS
+    ) -> Any:
+        result = func(*args)
+        seconds, normalised = benchmark_recorder.measure(
+            lambda: func(*args), rounds=rounds
+        )
+        benchmark_recorder.record(name, seconds, normalised)
+        failure = benchmark_recorder.regression(name)
+        if failure and benchmark_recorder.enforce:
+            pytest.fail(failure)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if _recorder is None or not _recorder.results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(_recorder.results.items()):
+        ratio = result.get("ratio")
+        over = _recorder.regression(name) is not None
+        terminalreporter.line(
+            f"{name:<40} {result['seconds'] * 1000:>10.3f} ms"
+            + (f"  {ratio:5.2f}x baseline" if ratio else "  (no baseline)")
+            + (f"  over {1 + _recorder.tolerance(name):.2f}x" if over else "")
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if _recorder is not None and _recorder.update and _recorder.results:
+        _recorder.save()
+
+
+def synthetic_responses(
+    structure: Any,
+    seed: int = 0,
+    unknown_rate: float = 0.1,
+    comment_rate: float = 0.2,
+) -> list[AssessmentResponse]:
+    """Answer every question of the structure with seeded random options"""
+    rng = random.Random(seed)
+    responses = []
+    for section in structure.sections:
+        for question in section.questions:
+            if question.options and rng.random() >= unknown_rate:
+                answer = rng.choice(question.options).value
+            else:
+                answer = "unknown"
+            comment = (
+                " ".join(rng.sample(COMMENT_SENTENCES, 3))
+                if rng.random() < comment_rate
+                else None
+            )
+            responses.append(
+                AssessmentResponse(
+                    assessment_id="benchmark-assessment",
+                    section_id=section.id,
+                    question_id=question.id,
+                    answer_value=answer,
+                    comment=comment,
+                )
+            )
+    return responses
+
+
+def long_comment(sentences: int = 400, seed: int = 0) -> str:
+    """A long free-text comment with PII scattered through it"""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(COMMENT_SENTENCES) for _ in range(sentences))
+
+
+def synthetic_assessment(structure: Any) -> Assessment:
+    completed_at = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+    return Assessment(
+        id="benchmark-assessment",
+        user_id="benchmark-user",
+        status="completed",
+        started_at=completed_at - timedelta(hours=2),
+        completed_at=completed_at,
+        progress_percentage=100.0,
+        selected_section_ids=[section.id for section in structure.sections],
+        consultation_interest=False,
+    )
+
+
+@pytest.fixture
+def memory_cache(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """Stand in for Redis with a dict, keeping the JSON round trip"""
+    store: dict[str, str] = {}
+
+    def get(key: str) -> Any | None:
+        return json.loads(store[key]) if key in store else None
+
+    def set_(key: str, value: Any, ttl: int | None = None) -> bool:
+        store[key] = json.dumps(value)
+        return True
+
+    monkeypatch.setattr(cache_service, "get", get)
+    monkeypatch.setattr(cache_service, "set", set_)
+    monkeypatch.setattr(cache_service, "delete", lambda key: bool(store.pop(key, 1)))
+    monkeypatch.setattr(cache_service, "has_questions_file_changed", lambda: False)
+    return store
+
+
+@pytest.fixture(scope="session")
+def full_structure() -> Any:
+    from app.services.question_parser import load_assessment_structure
+
+    return load_assessment_structure()
+
+
+@pytest.fixture(scope="session")
+def full_responses(full_structure: Any) -> list[AssessmentResponse]:
+    return synthetic_responses(full_structure)
+
+
+@pytest.fixture(scope="session")
+def full_assessment(full_structure: Any) -> Assessment:
+    return synthetic_assessment(full_structure)
+
+
+@pytest.fixture(scope="session")
+def pii_comment() -> str:
+    return long_comment()
@@ -0,0 +1,222 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from weasyprint import HTML
+
+from app.core.config import settings
+from app.models.assessment import Assessment, AssessmentResponse
+from app.services.ai_cache import AICacheService
+from app.services.pii_redactor import PIIRedactor
+from app.services.question_parser import (
+    load_assessment_structure_cached,
+    parse_assessment_questions,
+)
+from app.services.report_generator import (
+    build_fallback_synthesis,
+    calculate_assessment_scores,
+    compute_blind_spots,
+    create_degraded_artifact,
+    generate_ai_report_html,
+    generate_report_html,
+)
+from app.services.static_payloads import filtered_structure
+
+pytestmark = pytest.mark.benchmark
+
+QUESTIONS_FILE = (
+    Path(__file__).resolve().parents[2] / "data" / "security_assessment_questions.md"
+)
+
+
+class TestQuestionLoading:
+    """Benchmarks for parsing and caching the question library"""
+
+    def test_parse_assessment_questions(self, benchmark: Any) -> None:
+        md_content = QUESTIONS_FILE.read_text(encoding="utf-8")
+
+        structure = benchmark(
+            "parse_assessment_questions", parse_assessment_questions, md_content
+        )
+
+        assert structure.total_questions > 0
+
+    def test_load_structure_cold(self, benchmark: Any, memory_cache: dict) -> None:
+        def load_cold() -> Any:
+            memory_cache.clear()
+            return load_assessment_structure_cached()
+
+        structure = benchmark("load_assessment_structure_cold", load_cold)
+
+        assert structure.total_questions > 0
+
+    def test_load_structure_warm(self, benchmark: Any, memory_cache: dict) -> None:
+        load_assessment_structure_cached()
+
+        structure = benchmark(
+            "load_assessment_structure_warm", load_assessment_structure_cached
+        )
+
+        assert structure.total_questions > 0
+
+    def test_filtered_structure_warm(self, benchmark: Any, memory_cache: dict) -> None:
+        sections = ["section_1", "section_4", "section_10"]
+        filtered_structure(sections)
+
+        entry = benchmark("filtered_structure_warm", filtered_structure, sections)
+
+        assert entry.total_questions > 0
+
+
+class TestScoring:
+    """Benchmarks for scoring a fully answered assessment"""
+
+    @pytest.mark.parametrize("scoring_v2", [False, True], ids=["v1", "v2"])
+    def test_calculate_assessment_scores(
+        self,
+        benchmark: Any,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+        scoring_v2: bool,
+    ) -> None:
+        with patch.object(settings, "SCORING_V2_ENABLED", scoring_v2):
+            scores = benchmark(
+                f"calculate_assessment_scores_{'v2' if scoring_v2 else 'v1'}",
+                calculate_assessment_scores,
+                full_responses,
+                full_structure,
+            )
+
+        assert scores["overall"]["percentage"] > 0
+
+    def test_compute_blind_spots(
+        self,
+        benchmark: Any,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+    ) -> None:
+        blind_spots = benchmark(
+            "compute_blind_spots", compute_blind_spots, full_structure, full_responses
+        )
+
+        assert blind_spots["total_count"] > 0
+
+
+class TestPromptInputs:
+    """Benchmarks for the per-section work done before each AI call"""
+
+    def test_pii_redact_long_comment(self, benchmark: Any, pii_comment: str) -> None:
+        redacted, count = benchmark(
+            "pii_redactor_redact", PIIRedactor().redact, pii_comment
+        )
+
+        assert count > 0
+        assert "ops@acme-corp.io" not in redacted
+
+    def test_compute_answers_hash(
+        self,
+        benchmark: Any,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+    ) -> None:
+        section = max(full_structure.sections, key=lambda s: len(s.questions))
+        response_dict = {r.question_id: r for r in full_responses}
+        section_responses = [
+            {
+                "question": question.text,
+                "answer": response_dict[question.id].answer_value,
+                "weight": question.weight,
+                "comment": response_dict[question.id].comment,
+            }
+            for question in section.questions
+        ]
+
+        answers_hash = benchmark(
+            "compute_answers_hash",
+            AICacheService.compute_answers_hash,
+            section_responses,
+        )
+
+        assert len(answers_hash) == 64
+
+
+class TestReportRendering:
+    """Benchmarks for building report HTML and rendering it to PDF"""
+
+    @pytest.fixture(scope="class")
+    def full_scores(
+        self, full_structure: Any, full_responses: list[AssessmentResponse]
+    ) -> dict[str, Any]:
+        return calculate_assessment_scores(full_responses, full_structure)
+
+    @pytest.fixture(scope="class")
+    def ai_report_html(
+        self,
+        full_assessment: Assessment,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+        full_scores: dict[str, Any],
+    ) -> str:
+        return generate_ai_report_html(
+            full_assessment,
+            full_responses,
+            full_scores,
+            full_structure,
+            {s.id: create_degraded_artifact(s.id) for s in full_structure.sections},
+            build_fallback_synthesis(full_scores),
+        )
+
+    def test_generate_report_html(
+        self,
+        benchmark: Any,
+        full_assessment: Assessment,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+        full_scores: dict[str, Any],
+    ) -> None:
+        html = benchmark(
+            "generate_report_html",
+            generate_report_html,
+            full_assessment,
+            full_responses,
+            full_scores,
+            full_structure,
+        )
+
+        assert "<html" in html
+
+    def test_generate_ai_report_html(
+        self,
+        benchmark: Any,
+        full_assessment: Assessment,
+        full_structure: Any,
+        full_responses: list[AssessmentResponse],
+        full_scores: dict[str, Any],
+    ) -> None:
+        ai_insights = {
+            s.id: create_degraded_artifact(s.id) for s in full_structure.sections
+        }
+        synthesis = build_fallback_synthesis(full_scores)
+
+        html = benchmark(
+            "generate_ai_report_html",
+            generate_ai_report_html,
+            full_assessment,
+            full_responses,
+            full_scores,
+            full_structure,
+            ai_insights,
+            synthesis,
+        )
+
+        assert "<html" in html
+
+    def test_render_ai_report_pdf(self, benchmark: Any, ai_report_html: str) -> None:
+        pdf_bytes = benchmark(
+            "weasyprint_ai_report_pdf",
+            lambda: HTML(string=ai_report_html, url_fetcher=None).write_pdf(),
+            rounds=3,
+        )
+
+        assert pdf_bytes.startswith(b"%PDF")
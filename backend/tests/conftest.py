@@ -1,6 +1,7 @@
 import os
 import sys
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -8,7 +9,8 @@ from typing import Any
 import pytest
 from cryptography.fernet import Fernet
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -18,12 +20,19 @@ TEST_DATABASE_URL = "sqlite:///./test.db"
 os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL)
 os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-testing-only-not-secure")
 
-from app.core.database import Base, get_db
+from app.core.database import (
+    Base,
+    after_cursor_execute,
+    before_cursor_execute,
+    get_db,
+)
+from app.core.query_stats import QueryStats
 from app.core.security import create_access_token, get_password_hash
 from app.main import app
 from app.models.assessment import Assessment, Report
 from app.models.assessment import AssessmentResponse as AssessmentResponseModel
 from app.models.user import User
+from app.services.identity_cache import identity_cache
 
 engine = create_engine(
     TEST_DATABASE_URL,
@@ -31,6 +40,9 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Same query timing and accounting hooks as the application engine
+event.listen(engine, "before_cursor_execute", before_cursor_execute)
+event.listen(engine, "after_cursor_execute", after_cursor_execute)
 
 
 @pytest.fixture
@@ -43,6 +55,52 @@ def encryption_key(monkeypatch: Any) -> str:
     return key
 
 
+@pytest.fixture
+def openai_stub(monkeypatch: Any) -> Generator[Any, None, None]:
+    """Local OpenAI stand-in with no latency; OPENAI_BASE_URL points at it."""
+    from app.core.config import settings
+    from app.devtools.openai_stub import OpenAIStubServer, StubConfig
+
+    server = OpenAIStubServer(StubConfig(profile="instant", seed=0))
+    server.start()
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", server.base_url)
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], Any]:
+    """Fail when the block runs more than max_queries SQL statements.
+
+    Counts statements on every engine from any thread, so requests made with
+    the TestClient are included:
+
+        with query_budget(5):
+            client.get("/api/auth/me", headers=headers)
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        stats = QueryStats()
+
+        def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            stats.record(statement, 0.0)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            yield stats
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert stats.count <= max_queries, (
+            f"Query budget of {max_queries} exceeded: {stats.describe()}"
+        )
+
+    return budget
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     Base.metadata.create_all(bind=engine)
@@ -52,6 +110,7 @@ def db_session() -> Generator[Session, None, None]:
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+        identity_cache.clear()
 
 
 @pytest.fixture
@@ -195,6 +254,49 @@ def admin_completed_assessment(
     return assessment
 
 
+@pytest.fixture
+def create_ai_report(db_session: Session, test_user: User) -> Callable[..., Report]:
+    """Factory for AI reports on completed assessments answering one section"""
+    from app.services.question_parser import load_assessment_structure
+
+    def create(status: str = "pending", section_id: str = "section_6") -> Report:
+        assessment = Assessment(
+            user_id=test_user.id,
+            status="completed",
+            started_at=datetime.now(UTC) - timedelta(days=1),
+            completed_at=datetime.now(UTC),
+            expires_at=datetime.now(UTC) + timedelta(days=14),
+            progress_percentage=100.0,
+            selected_section_ids=[section_id],
+        )
+        db_session.add(assessment)
+        db_session.commit()
+
+        section = next(
+            s for s in load_assessment_structure().sections if s.id == section_id
+        )
+        for question in section.questions:
+            db_session.add(
+                AssessmentResponseModel(
+                    assessment_id=assessment.id,
+                    section_id=section_id,
+                    question_id=question.id,
+                    answer_value=(
+                        question.options[0].value if question.options else "yes"
+                    ),
+                )
+            )
+        report = Report(
+            assessment_id=assessment.id, report_type="ai_enhanced", status=status
+        )
+        db_session.add(report)
+        db_session.commit()
+        db_session.refresh(report)
+        return report
+
+    return create
+
+
 @pytest.fixture
 def test_assessment_response(
     db_session: Session, test_assessment: Assessment
@@ -0,0 +1,168 @@
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ai_cache import AIResponseCache, AISectionCache
+from app.services.ai_cache import AICacheService, cache_usage
+from app.services.ai_cache_maintenance import AICacheMaintenanceService
+from app.services.report_generator import create_degraded_artifact
+
+
+def add_entry(
+    db: Session,
+    section_id: str,
+    last_used_days_ago: int = 0,
+    prompt_version: str | None = None,
+) -> AISectionCache:
+    entry = AISectionCache(
+        section_id=section_id,
+        answers_hash=f"hash-{section_id}",
+        prompt_version=prompt_version or settings.AI_PROMPT_VERSION,
+        schema_version=settings.AI_SCHEMA_VERSION,
+        model=settings.OPENAI_MODEL,
+        artifact_json=create_degraded_artifact(section_id).model_dump(),
+        tokens_prompt=10,
+        tokens_completion=10,
+        total_cost_usd=0.0,
+        last_used_at=datetime.now(UTC) - timedelta(days=last_used_days_ago),
+    )
+    db.add(entry)
+    db.commit()
+    return entry
+
+
+@pytest.fixture(autouse=True)
+def reset_usage() -> Generator[None, None, None]:
+    cache_usage.reset()
+    yield
+    cache_usage.reset()
+
+
+class TestBufferedHitCounts:
+    """Cache hits are buffered and flushed in one write"""
+
+    def test_hit_does_not_write_until_flush(self, db_session: Session) -> None:
+        entry = add_entry(db_session, "section_1")
+
+        for _ in range(3):
+            artifact = AICacheService.get_cached_artifact(
+                db_session,
+                "section_1",
+                "hash-section_1",
+                settings.AI_PROMPT_VERSION,
+                settings.OPENAI_MODEL,
+            )
+            assert artifact is not None
+
+        db_session.refresh(entry)
+        assert entry.hit_count == 1
+        assert cache_usage.get_stats()["hits"] == 3
+
+        assert AICacheService.flush_hit_counts(db_session) == 1
+        db_session.refresh(entry)
+        assert entry.hit_count == 4
+
+    def test_miss_is_counted(self, db_session: Session) -> None:
+        AICacheService.get_cached_artifact(
+            db_session, "missing", "nope", settings.AI_PROMPT_VERSION, "gpt-4"
+        )
+
+        stats = cache_usage.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.0
+
+
+class TestEvictionPolicies:
+    """Tests for AICacheMaintenanceService policies"""
+
+    def test_retired_prompt_versions_are_evicted(self, db_session: Session) -> None:
+        add_entry(db_session, "current")
+        add_entry(db_session, "old", prompt_version="v0.1")
+
+        assert AICacheMaintenanceService.evict_retired_versions(db_session) == 1
+        db_session.commit()
+        remaining = [e.section_id for e in db_session.query(AISectionCache).all()]
+        assert remaining == ["current"]
+
+    def test_stale_entries_are_evicted(self, db_session: Session) -> None:
+        add_entry(db_session, "fresh", last_used_days_ago=1)
+        add_entry(
+            db_session, "stale", last_used_days_ago=settings.AI_CACHE_MAX_AGE_DAYS + 1
+        )
+
+        assert AICacheMaintenanceService.evict_stale(db_session) == 1
+
+    def test_lru_overflow_keeps_most_recent(self, db_session: Session) -> None:
+        for days in range(4):
+            add_entry(db_session, f"s{days}", last_used_days_ago=days)
+
+        with patch.object(settings, "AI_CACHE_MAX_ROWS", 2):
+            assert AICacheMaintenanceService.evict_lru_overflow(db_session) == 2
+        db_session.commit()
+
+        remaining = sorted(e.section_id for e in db_session.query(AISectionCache))
+        assert remaining == ["s0", "s1"]
+
+    def test_compact_purges_expired_responses(self, db_session: Session) -> None:
+        db_session.add(
+            AIResponseCache(
+                request_hash="a" * 64,
+                call_site="synthesis",
+                model="gpt-4",
+                response_json={},
+                expires_at=datetime.now(UTC) - timedelta(hours=1),
+            )
+        )
+        db_session.commit()
+
+        result = AICacheMaintenanceService.compact(db_session)
+
+        assert result["expired_response"] == 1
+        assert cache_usage.get_stats()["evictions"] == {"expired_response": 1}
+
+
+class TestAICacheAdminEndpoints:
+    """Tests for /api/admin/ai-cache endpoints"""
+
+    def test_stats(
+        self, client: TestClient, admin_token: str, db_session: Session
+    ) -> None:
+        add_entry(db_session, "section_1")
+
+        response = client.get(
+            "/api/admin/ai-cache/stats",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["section_cache"]["rows"] == 1
+        assert data["section_cache"]["by_version"][0]["current"] is True
+        assert "hit_ratio" in data["process"]
+
+    def test_compact(
+        self, client: TestClient, admin_token: str, db_session: Session
+    ) -> None:
+        add_entry(db_session, "old", prompt_version="v0.1")
+
+        response = client.post(
+            "/api/admin/ai-cache/compact",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["retired_version"] == 1
+        assert db_session.query(AISectionCache).count() == 0
+
+    def test_requires_admin(self, client: TestClient, auth_token: str) -> None:
+        response = client.get(
+            "/api/admin/ai-cache/stats",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == 403
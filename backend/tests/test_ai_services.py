@@ -12,8 +12,9 @@ from app.schemas.ai_artifacts import (
     SectionAIArtifact,
 )
 from app.services.ai_cache import AICacheService
+from app.services.ai_synthesis import build_synthesis_messages
 from app.services.benchmark_context import BenchmarkContextService
-from app.services.prompt_builder import build_section_prompt_v2
+from app.services.prompt_builder import build_section_messages, build_section_prompt_v2
 
 
 class MockSection:
@@ -81,6 +82,42 @@ class TestPromptBuilder:
         assert "risk_level" in prompt
         assert redaction_count == 0
 
+    def test_static_prefix_identical_across_sections(self) -> None:
+        """Test the system message does not vary with section or answers"""
+        first, _ = build_section_messages(
+            MockSection(title="Access Control", description="IAM"),
+            [{"answer": "Yes", "weight": 1.0, "question": "MFA?"}],
+            curated_context="NIST CSF PR.AC-7",
+        )
+        second, _ = build_section_messages(
+            MockSection(title="Data Protection", description="Encryption", id="dp"),
+            [
+                {"answer": "No", "weight": 0.5, "question": "Encrypted?"},
+                {"answer": "Partial", "weight": 0.8, "question": "Backups?"},
+            ],
+        )
+
+        assert [m["role"] for m in first] == ["system", "user"]
+        assert first[0]["content"] == second[0]["content"]
+        assert "Access Control" not in first[0]["content"]
+        assert "Q2: Partial (weight:0.8)" in second[1]["content"]
+
+    def test_synthesis_static_prefix_identical_across_reports(self) -> None:
+        """Test the synthesis system message does not vary with report data"""
+        summary = {
+            "title": "Access Control",
+            "score": 70.0,
+            "risk_level": "Medium",
+            "top_gaps": ["No MFA"],
+            "top_recommendations": ["Enable MFA"],
+        }
+        first = build_synthesis_messages([summary], 70.0)
+        second = build_synthesis_messages([], 42.0, "RELEVANT INDUSTRY CONTROLS")
+
+        assert first[0] == second[0]
+        assert "70.0%" in first[1]["content"]
+        assert "No MFA" not in first[0]["content"]
+
 
 class TestBenchmarkContextService:
     """Tests for benchmark_context service"""
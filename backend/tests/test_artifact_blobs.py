@@ -0,0 +1,122 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ai_artifacts import AIArtifactBlob, AISectionArtifact
+from app.models.ai_cache import AISectionCache
+from app.models.assessment import Report
+from app.services.ai_cache import AICacheService
+from app.services.artifact_blobs import ArtifactBlobService
+from app.services.report_generator import create_degraded_artifact
+
+
+class TestArtifactBlobService:
+    """Tests for content-addressed artifact storage"""
+
+    def test_identical_payloads_stored_once(
+        self, db_session: Session, test_report: Report
+    ) -> None:
+        payload = create_degraded_artifact("section_1").model_dump()
+
+        first = ArtifactBlobService.get_or_create_blob(db_session, payload)
+        second = ArtifactBlobService.get_or_create_blob(db_session, dict(payload))
+        for section_id in ("section_1", "section_2"):
+            db_session.add(
+                AISectionArtifact(
+                    report_id=test_report.id, section_id=section_id, blob_hash=first
+                )
+            )
+        db_session.commit()
+
+        assert first == second
+        assert db_session.query(AIArtifactBlob).count() == 1
+        artifact = db_session.query(AISectionArtifact).first()
+        assert artifact is not None
+        assert ArtifactBlobService.resolve_payload(artifact) == payload
+
+    def test_resolve_legacy_inline_payload(
+        self, db_session: Session, test_report: Report
+    ) -> None:
+        payload = create_degraded_artifact("section_1").model_dump()
+        db_session.add(
+            AISectionArtifact(
+                report_id=test_report.id, section_id="section_1", artifact_json=payload
+            )
+        )
+        db_session.commit()
+
+        artifact = db_session.query(AISectionArtifact).first()
+        assert artifact is not None
+        assert ArtifactBlobService.resolve_payload(artifact) == payload
+
+    def test_cache_round_trip_through_blob(self, db_session: Session) -> None:
+        artifact = create_degraded_artifact("section_1")
+        AICacheService.store_artifact(
+            db_session,
+            "section_1",
+            "hash-1",
+            settings.AI_PROMPT_VERSION,
+            settings.AI_SCHEMA_VERSION,
+            settings.OPENAI_MODEL,
+            artifact,
+            10,
+            10,
+            0.0,
+        )
+
+        entry = db_session.query(AISectionCache).first()
+        assert entry is not None
+        assert entry.artifact_json is None
+        assert entry.blob_hash is not None
+
+        cached = AICacheService.get_cached_artifact(
+            db_session,
+            "section_1",
+            "hash-1",
+            settings.AI_PROMPT_VERSION,
+            settings.OPENAI_MODEL,
+        )
+        assert cached == artifact
+
+    def test_collect_garbage_keeps_referenced_blobs(
+        self, db_session: Session, test_report: Report
+    ) -> None:
+        kept = ArtifactBlobService.get_or_create_blob(
+            db_session, create_degraded_artifact("kept").model_dump()
+        )
+        orphan_payload = create_degraded_artifact("orphan").model_dump()
+        orphan_payload["risk_level"] = "High"
+        ArtifactBlobService.get_or_create_blob(db_session, orphan_payload)
+        db_session.add(
+            AISectionArtifact(
+                report_id=test_report.id, section_id="kept", blob_hash=kept
+            )
+        )
+        db_session.commit()
+
+        later = datetime.now(UTC) + timedelta(days=1)
+        assert ArtifactBlobService.collect_garbage(db_session, now=later) == 1
+        db_session.commit()
+
+        remaining = [b.content_hash for b in db_session.query(AIArtifactBlob).all()]
+        assert remaining == [kept]
+
+    def test_collect_garbage_spares_rereferenced_blobs(
+        self, db_session: Session
+    ) -> None:
+        payload = create_degraded_artifact("reused").model_dump()
+        content_hash = ArtifactBlobService.get_or_create_blob(db_session, payload)
+        blob = db_session.get(AIArtifactBlob, content_hash)
+        assert blob is not None
+        long_ago = datetime.now(UTC) - timedelta(days=30)
+        blob.created_at = long_ago  # type: ignore[assignment]
+        blob.last_referenced_at = long_ago  # type: ignore[assignment]
+        db_session.commit()
+
+        # A new artifact is about to reference the old, unreferenced blob
+        assert ArtifactBlobService.get_or_create_blob(db_session, payload) == (
+            content_hash
+        )
+
+        assert ArtifactBlobService.collect_garbage(db_session) == 0
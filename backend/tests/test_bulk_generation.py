@@ -0,0 +1,167 @@
+import asyncio
+import json
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.ai_bulk_run import AIBulkGenerationRun
+from app.models.ai_cache import AISectionCache
+from app.models.assessment import Report
+from app.services.bulk_generation import BulkGenerationService
+from app.services.report_generator import (
+    build_fallback_synthesis,
+    create_degraded_artifact,
+)
+
+SECTION_ID = "section_6"
+
+
+def make_completion(content: str) -> MagicMock:
+    completion = MagicMock()
+    completion.choices[0].message.content = content
+    completion.choices[0].finish_reason = "stop"
+    completion.usage.prompt_tokens = 300
+    completion.usage.completion_tokens = 150
+    return completion
+
+
+class TestSelectPendingReports:
+    """Tests for choosing which reports a bulk run covers"""
+
+    def test_filters_by_ids_and_status(
+        self, db_session: Session, create_ai_report: Callable[..., Report]
+    ) -> None:
+        first = create_ai_report()
+        second = create_ai_report()
+        create_ai_report(status="completed")
+
+        selected = BulkGenerationService.select_pending_reports(
+            db_session, report_ids=[str(first.id)]
+        )
+        assert [r.id for r in selected] == [first.id]
+
+        selected = BulkGenerationService.select_pending_reports(db_session)
+        assert {r.id for r in selected} == {first.id, second.id}
+
+        selected = BulkGenerationService.select_pending_reports(db_session, limit=1)
+        assert len(selected) == 1
+
+    def test_request_budget_scales_with_keys(self) -> None:
+        key_manager = MagicMock()
+
+        key_manager.count_available_keys.return_value = 0
+        assert BulkGenerationService.request_budget(key_manager) == 1
+
+        key_manager.count_available_keys.return_value = 100
+        assert BulkGenerationService.request_budget(key_manager) == 12
+
+
+class TestBulkRun:
+    """Tests for generating a run through the shared scheduler"""
+
+    @patch("app.services.ai_synthesis.AsyncOpenAI")
+    @patch("app.services.report_generator.AsyncOpenAI")
+    def test_identical_sections_analysed_once(
+        self,
+        mock_section_openai: Any,
+        mock_synthesis_openai: Any,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+    ) -> None:
+        reports = [create_ai_report() for _ in range(3)]
+        run = BulkGenerationService.create_run(db_session, reports)
+
+        section_create = AsyncMock(
+            return_value=make_completion(
+                json.dumps(create_degraded_artifact(SECTION_ID).model_dump())
+            )
+        )
+        mock_section_openai.return_value.chat.completions.create = section_create
+        mock_synthesis_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=make_completion(
+                build_fallback_synthesis(
+                    {"overall": {"percentage": 70.0}}
+                ).model_dump_json()
+            )
+        )
+        key_manager = MagicMock()
+        key_manager.count_available_keys.return_value = 2
+        key_manager.get_next_key.return_value = ("key1", "sk-test")
+
+        storage = MagicMock()
+        storage.save.return_value = "/tmp/ai-report.pdf"
+        storage.exists.return_value = True
+        with (
+            patch(
+                "app.services.bulk_generation.OpenAIKeyManager",
+                return_value=key_manager,
+            ),
+            patch("app.services.report_generator.random.uniform", return_value=0),
+            patch("app.services.report_generator.HTML") as mock_html,
+            patch(
+                "app.services.report_generator.get_storage_service",
+                return_value=storage,
+            ),
+        ):
+            mock_html.return_value.write_pdf.return_value = b"pdf-bytes"
+            asyncio.run(BulkGenerationService.run(str(run.id)))
+
+        assert section_create.await_count == 1
+        assert db_session.query(AISectionCache).count() == 1
+        assert storage.save.call_count == 3
+
+        db_session.refresh(run)
+        assert run.status == "completed"
+        assert run.shared_sections == 2
+        assert run.max_concurrent == 8
+        progress = BulkGenerationService.get_progress(db_session, run)
+        assert progress["report_status_counts"] == {"completed": 3}
+
+
+def test_admin_generate_ai_bulk(
+    client: TestClient,
+    admin_token: str,
+    db_session: Session,
+    create_ai_report: Callable[..., Report],
+) -> None:
+    report = create_ai_report()
+    create_ai_report(status="completed")
+
+    with patch("app.api.reports.BackgroundTasks.add_task") as mock_task:
+        response = client.post(
+            "/api/reports/admin/generate-ai-bulk",
+            json={"requested_before": datetime.now(UTC).isoformat()},
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["report_count"] == 1
+    assert data["report_status_counts"] == {"generating": 1}
+    mock_task.assert_called_once()
+    db_session.refresh(report)
+    assert report.status == "generating"
+
+    response = client.get(
+        f"/api/reports/admin/generate-ai-bulk/{data['id']}",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    assert db_session.query(AIBulkGenerationRun).count() == 1
+
+
+def test_admin_generate_ai_bulk_nothing_pending(
+    client: TestClient, admin_token: str, db_session: Session
+) -> None:
+    response = client.post(
+        "/api/reports/admin/generate-ai-bulk",
+        json={"report_ids": ["missing-report"]},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == 404
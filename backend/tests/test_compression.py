@@ -0,0 +1,174 @@
+import gzip
+import json
+from typing import Any
+
+import brotli
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.responses import (
+    PrecompressedPayload,
+    accepted_encoding,
+    json_dumps,
+)
+from app.middleware.compression import CompressionMiddleware
+from app.models.assessment import Assessment
+from app.services.static_payloads import StaticPayloadCache, filtered_structure
+
+LARGE = {"items": ["x" * 40 for _ in range(100)]}
+
+
+async def large(request: Request) -> Response:
+    return JSONResponse(LARGE)
+
+
+async def tagged(request: Request) -> Response:
+    return JSONResponse(LARGE, headers={"ETag": '"abc"'})
+
+
+async def small(request: Request) -> Response:
+    return JSONResponse({"ok": True})
+
+
+async def stream(request: Request) -> Response:
+    return StreamingResponse(
+        iter([b"a" * 2048, b"b" * 2048]), media_type="application/json"
+    )
+
+
+compressed_app = Starlette(
+    routes=[
+        Route("/large", large),
+        Route("/tagged", tagged),
+        Route("/small", small),
+        Route("/stream", stream),
+    ]
+)
+compressed_app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+class TestAcceptedEncoding:
+    def test_prefers_brotli(self) -> None:
+        assert accepted_encoding("gzip, deflate, br") == "br"
+
+    def test_falls_back_to_gzip(self) -> None:
+        assert accepted_encoding("gzip;q=0.8, br;q=0") == "gzip"
+
+    def test_identity_only(self) -> None:
+        assert accepted_encoding("") is None
+        assert accepted_encoding("deflate, gzip;q=0") is None
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_json(self) -> None:
+        response = TestClient(compressed_app).get(
+            "/large", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == LARGE
+
+    def test_compressed_responses_get_their_own_etag(self) -> None:
+        response = TestClient(compressed_app).get(
+            "/tagged", headers={"Accept-Encoding": "br"}
+        )
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["etag"] == '"abc-br"'
+
+    def test_small_responses_pass_through(self) -> None:
+        response = TestClient(compressed_app).get(
+            "/small", headers={"Accept-Encoding": "br"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_streamed_responses_pass_through(self) -> None:
+        response = TestClient(compressed_app).get(
+            "/stream", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.content == b"a" * 2048 + b"b" * 2048
+
+
+class TestPrecompressedPayloads:
+    def test_payload_encodings_round_trip(self) -> None:
+        payload = PrecompressedPayload.from_content(LARGE)
+
+        assert json.loads(payload.identity) == LARGE
+        assert gzip.decompress(payload.encodings["gzip"]) == payload.identity
+        assert brotli.decompress(payload.encodings["br"]) == payload.identity
+
+    def test_cache_rebuilds_on_new_version(self) -> None:
+        version = [1.0]
+        builds: list[int] = []
+        cache = StaticPayloadCache(version=lambda: version[0])
+
+        def build() -> int:
+            builds.append(1)
+            return len(builds)
+
+        assert cache.get("value", build) == 1
+        assert cache.get("value", build) == 1
+        version[0] = 2.0
+        assert cache.get("value", build) == 2
+
+    def test_structure_served_precompressed(self, client: TestClient) -> None:
+        plain = client.get(
+            "/api/assessment/structure", headers={"Accept-Encoding": "identity"}
+        )
+        compressed = client.get(
+            "/api/assessment/structure", headers={"Accept-Encoding": "br"}
+        )
+
+        assert "content-encoding" not in plain.headers
+        assert compressed.headers["content-encoding"] == "br"
+        assert compressed.json() == plain.json()
+        assert len(compressed.content) == len(plain.content)
+
+    def test_tier_selection_served_precompressed(
+        self,
+        client: TestClient,
+        db_session: Session,
+        test_assessment: Assessment,
+        auth_token: str,
+    ) -> None:
+        test_assessment.selected_section_ids = [  # type: ignore[assignment]
+            "section_1",
+            "section_4",
+            "section_10",
+        ]
+        db_session.commit()
+
+        response = client.get(
+            f"/api/assessment/{test_assessment.id}/filtered-structure",
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "Accept-Encoding": "gzip",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert [section["id"] for section in response.json()["sections"]] == [
+            "section_1",
+            "section_4",
+            "section_10",
+        ]
+
+    def test_custom_selection_left_to_middleware(self) -> None:
+        entry = filtered_structure(["section_1", "section_2"])
+
+        assert entry.payload().encodings == {}
+
+    def test_json_dumps_is_compact(self) -> None:
+        content: dict[str, Any] = {"a": [1, 2], "b": "é"}
+
+        assert json_dumps(content) == '{"a":[1,2],"b":"é"}'.encode()
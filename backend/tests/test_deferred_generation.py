@@ -0,0 +1,329 @@
+import json
+from collections.abc import Callable, Generator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.ai_artifacts import AISectionArtifact
+from app.models.ai_batch_job import AIBatchJob
+from app.models.ai_cache import AISectionCache
+from app.models.assessment import Report
+from app.services.artifact_blobs import ArtifactBlobService
+from app.services.batch_backend import LocalFileBatchBackend
+from app.services.deferred_generation import (
+    BATCH_FAILED_MESSAGE,
+    DeferredGenerationService,
+)
+from app.services.report_generator import (
+    build_fallback_synthesis,
+    create_degraded_artifact,
+)
+
+SECTION_ID = "section_6"
+
+
+@pytest.fixture
+def local_backend(tmp_path: Any) -> Generator[LocalFileBatchBackend, None, None]:
+    with (
+        patch.object(settings, "AI_BATCH_BACKEND", "local"),
+        patch.object(settings, "AI_BATCH_LOCAL_DIR", str(tmp_path)),
+    ):
+        yield LocalFileBatchBackend(str(tmp_path))
+
+
+def respond_with_section(custom_id: str, body: dict[str, Any]) -> str:
+    return json.dumps(create_degraded_artifact(SECTION_ID).model_dump())
+
+
+def respond_with_synthesis(custom_id: str, body: dict[str, Any]) -> str:
+    return build_fallback_synthesis({"overall": {"percentage": 70.0}}).model_dump_json()
+
+
+class TestDeferredGeneration:
+    """Tests for the two-phase batch flow against the local backend"""
+
+    def test_sections_deduplicated_and_reports_published(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        reports = [create_ai_report() for _ in range(2)]
+        report_ids = [str(r.id) for r in reports]
+
+        section_job = DeferredGenerationService.submit_section_batch(
+            db_session, report_ids
+        )
+
+        assert section_job is not None
+        assert section_job.phase == "sections"
+        assert section_job.request_count == 1
+        assert all(r.status == "generating" for r in reports)
+        assert DeferredGenerationService.poll_job(db_session, section_job) == (
+            "submitted"
+        )
+
+        local_backend.complete(str(section_job.external_batch_id), respond_with_section)
+        assert DeferredGenerationService.poll_job(db_session, section_job) == (
+            "ingested"
+        )
+        assert db_session.query(AISectionCache).count() == 1
+        assert db_session.query(AISectionArtifact).count() == 2
+
+        synthesis_job = (
+            db_session.query(AIBatchJob).filter(AIBatchJob.phase == "synthesis").one()
+        )
+        assert synthesis_job.request_count == 2
+        local_backend.complete(
+            str(synthesis_job.external_batch_id), respond_with_synthesis
+        )
+
+        storage = MagicMock()
+        storage.save.return_value = "/tmp/ai-report.pdf"
+        storage.exists.return_value = True
+        with (
+            patch("app.services.report_generator.HTML") as mock_html,
+            patch(
+                "app.services.report_generator.get_storage_service",
+                return_value=storage,
+            ),
+        ):
+            mock_html.return_value.write_pdf.return_value = b"pdf-bytes"
+            assert DeferredGenerationService.poll_job(db_session, synthesis_job) == (
+                "ingested"
+            )
+
+        for report in reports:
+            db_session.refresh(report)
+            assert report.status == "completed"
+        assert storage.save.call_count == 2
+
+    def test_cached_sections_skip_to_synthesis(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        first = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(first.id)]
+        )
+        assert job is not None
+        local_backend.complete(str(job.external_batch_id), respond_with_section)
+        DeferredGenerationService.poll_job(db_session, job)
+
+        second = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(second.id)]
+        )
+
+        assert job is not None
+        assert job.phase == "synthesis"
+        assert list(local_backend.read_requests(str(job.external_batch_id))) == [
+            f"synthesis:{second.id}"
+        ]
+
+    def test_failed_batch_fails_reports(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        report = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(report.id)]
+        )
+        assert job is not None
+        job.external_batch_id = "local_missing"  # type: ignore[assignment]
+        db_session.commit()
+
+        assert DeferredGenerationService.poll_job(db_session, job) == "failed"
+
+        db_session.refresh(report)
+        assert report.status == "failed"
+        assert report.error_message == BATCH_FAILED_MESSAGE
+        assert job.status == "failed"
+
+    def test_repeated_poll_errors_fail_job_and_reports(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        report = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(report.id)]
+        )
+        assert job is not None
+        local_backend.complete(str(job.external_batch_id), respond_with_section)
+
+        with (
+            patch(
+                "app.services.deferred_generation.SessionLocal",
+                sessionmaker(bind=db_session.get_bind()),
+            ),
+            patch.object(settings, "AI_BATCH_MAX_POLL_FAILURES", 2),
+            patch.object(LocalFileBatchBackend, "get_results", side_effect=OSError),
+        ):
+            assert DeferredGenerationService.run_once() == 0
+            db_session.refresh(job)
+            assert job.status == "submitted"
+            assert job.poll_failures == 1
+
+            assert DeferredGenerationService.run_once() == 0
+
+        db_session.refresh(job)
+        db_session.refresh(report)
+        assert job.status == "failed"
+        assert job.error_message is not None
+        assert report.status == "failed"
+        assert report.error_message == BATCH_FAILED_MESSAGE
+
+    def test_ingest_keeps_existing_artifact(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        report = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(report.id)]
+        )
+        assert job is not None
+        # Generated synchronously while the batch was running
+        blob_hash = ArtifactBlobService.get_or_create_blob(
+            db_session, create_degraded_artifact(SECTION_ID).model_dump()
+        )
+        db_session.add(
+            AISectionArtifact(
+                report_id=report.id, section_id=SECTION_ID, blob_hash=blob_hash
+            )
+        )
+        db_session.commit()
+        local_backend.complete(str(job.external_batch_id), respond_with_section)
+
+        assert DeferredGenerationService.poll_job(db_session, job) == "ingested"
+
+        artifacts = (
+            db_session.query(AISectionArtifact)
+            .filter(AISectionArtifact.report_id == report.id)
+            .all()
+        )
+        assert [a.blob_hash for a in artifacts] == [blob_hash]
+
+    def test_invalid_results_use_degraded_artifacts(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        report = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(report.id)]
+        )
+        assert job is not None
+        local_backend.complete(str(job.external_batch_id), lambda cid, body: None)
+
+        assert DeferredGenerationService.poll_job(db_session, job) == "ingested"
+        assert db_session.query(AISectionCache).count() == 0
+        assert db_session.query(AISectionArtifact).count() == 1
+
+    def test_failed_synthesis_submission_is_retried(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        report = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(report.id)]
+        )
+        assert job is not None
+        local_backend.complete(str(job.external_batch_id), respond_with_section)
+
+        with (
+            patch.object(LocalFileBatchBackend, "submit", side_effect=OSError),
+            pytest.raises(OSError),
+        ):
+            DeferredGenerationService.poll_job(db_session, job)
+        db_session.rollback()
+        assert job.status == "synthesis_pending"
+
+        assert DeferredGenerationService.poll_job(db_session, job) == "ingested"
+        synthesis_job = (
+            db_session.query(AIBatchJob).filter(AIBatchJob.phase == "synthesis").one()
+        )
+        assert synthesis_job.report_ids == [str(report.id)]
+
+    def test_failed_submission_keeps_no_cached_artifacts(
+        self,
+        db_session: Session,
+        create_ai_report: Callable[..., Report],
+        local_backend: LocalFileBatchBackend,
+    ) -> None:
+        first = create_ai_report()
+        job = DeferredGenerationService.submit_section_batch(
+            db_session, [str(first.id)]
+        )
+        assert job is not None
+        local_backend.complete(str(job.external_batch_id), respond_with_section)
+        DeferredGenerationService.poll_job(db_session, job)
+
+        second = create_ai_report()
+        with (
+            patch.object(LocalFileBatchBackend, "submit", side_effect=OSError),
+            pytest.raises(OSError),
+        ):
+            DeferredGenerationService.submit_section_batch(db_session, [str(second.id)])
+        db_session.rollback()
+
+        assert (
+            db_session.query(AISectionArtifact)
+            .filter(AISectionArtifact.report_id == second.id)
+            .count()
+            == 0
+        )
+
+
+def test_admin_generate_ai_deferred(
+    client: TestClient,
+    admin_token: str,
+    db_session: Session,
+    create_ai_report: Callable[..., Report],
+) -> None:
+    report = create_ai_report()
+
+    with patch("app.api.reports.BackgroundTasks.add_task") as mock_task:
+        response = client.post(
+            "/api/reports/admin/generate-ai-deferred",
+            json=[str(report.id), "missing-report"],
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["queued_ids"] == [str(report.id)]
+    assert data["skipped_ids"] == ["missing-report"]
+    mock_task.assert_called_once()
+    db_session.refresh(report)
+    assert report.status == "generating"
+
+
+def test_admin_generate_ai_deferred_replays_to_primary(
+    client: TestClient, admin_token: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FLY_REGION", "lhr")
+    monkeypatch.setenv("FLY_PRIMARY_REGION", "iad")
+
+    response = client.post(
+        "/api/reports/admin/generate-ai-deferred",
+        json=["any-report"],
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == 409
+    assert response.headers["fly-replay"] == "region=iad"
@@ -0,0 +1,139 @@
+import time
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from app.api import auth
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import CurrentUserResponse
+from app.services.identity_cache import IdentityCache
+
+
+def counting(calls: list[str], result: Any) -> Any:
+    def call(*args: Any) -> Any:
+        calls.append("call")
+        return result
+
+    return call
+
+
+class TestIdentityCache:
+    def test_claims_verified_once(self) -> None:
+        calls: list[str] = []
+        verify = counting(calls, {"sub": "a@example.com", "exp": time.time() + 3600})
+        cache = IdentityCache()
+
+        first = cache.verified_claims("token", verify)
+        second = cache.verified_claims("token", verify)
+
+        assert first == second
+        assert len(calls) == 1
+
+    def test_expired_claims_not_memoized(self) -> None:
+        calls: list[str] = []
+        verify = counting(calls, {"sub": "a@example.com", "exp": time.time() - 1})
+        cache = IdentityCache()
+
+        cache.verified_claims("token", verify)
+        cache.verified_claims("token", verify)
+
+        assert len(calls) == 2
+
+    def test_missing_users_not_cached(self) -> None:
+        calls: list[str] = []
+        cache = IdentityCache()
+
+        assert cache.get_user("email", "a@example.com", counting(calls, None)) is None
+        assert cache.get_user("email", "a@example.com", counting(calls, None)) is None
+        assert len(calls) == 2
+
+    def test_invalidate_drops_both_keys(self) -> None:
+        calls: list[str] = []
+        user = CurrentUserResponse(id="u1", email="a@example.com", is_admin=False)
+        cache = IdentityCache()
+        cache.get_user("id", "u1", counting(calls, user))
+        cache.get_user("email", "a@example.com", counting(calls, user))
+
+        cache.invalidate_users([("u1", "a@example.com")])
+        cache.get_user("id", "u1", counting(calls, user))
+        cache.get_user("email", "a@example.com", counting(calls, user))
+
+        assert len(calls) == 4
+
+    def test_disabled_by_zero_ttl(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(settings, "IDENTITY_CACHE_TTL_SECONDS", 0)
+        calls: list[str] = []
+        verify = counting(calls, {"sub": "a@example.com", "exp": time.time() + 3600})
+        cache = IdentityCache()
+
+        cache.verified_claims("token", verify)
+        cache.verified_claims("token", verify)
+
+        assert len(calls) == 2
+
+
+class TestAuthenticatedRequests:
+    def test_user_loaded_once(
+        self, client: TestClient, auth_token: str, monkeypatch: Any
+    ) -> None:
+        calls: list[str] = []
+        load = auth.load_current_user
+
+        def load_counted(*args: Any) -> CurrentUserResponse | None:
+            calls.append("load")
+            return load(*args)
+
+        monkeypatch.setattr(auth, "load_current_user", load_counted)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        assert client.get("/api/assessment/history", headers=headers).status_code == 200
+        assert client.get("/api/assessment/history", headers=headers).status_code == 200
+        assert calls == ["load"]
+
+    def test_deleted_user_rejected(
+        self,
+        client: TestClient,
+        auth_token: str,
+        admin_token: str,
+        test_user: User,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        assert client.get("/api/assessment/history", headers=headers).status_code == 200
+
+        client.delete(
+            f"/api/admin/users/{test_user.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        response = client.get("/api/assessment/history", headers=headers)
+        assert response.status_code == 401
+
+    def test_status_change_reloads_user(
+        self,
+        client: TestClient,
+        auth_token: str,
+        admin_token: str,
+        test_user: User,
+        monkeypatch: Any,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        client.get("/api/assessment/history", headers=headers)
+
+        client.post(
+            "/api/admin/users/bulk-update-status",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"user_ids": [str(test_user.id)], "is_active": False},
+        )
+        calls: list[str] = []
+        load = auth.load_current_user
+
+        def load_counted(*args: Any) -> CurrentUserResponse | None:
+            user = load(*args)
+            calls.append(str(user.is_active if user else None))
+            return user
+
+        monkeypatch.setattr(auth, "load_current_user", load_counted)
+        client.get("/api/assessment/history", headers=headers)
+
+        assert calls == ["False"]
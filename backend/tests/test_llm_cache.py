@@ -0,0 +1,203 @@
+import asyncio
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from openai.types.chat import ChatCompletion
+from sqlalchemy.orm import Session
+
+from app.models.ai_cache import AIResponseCache
+from app.services.llm_cache import (
+    CALL_SITE_SECTION_ANALYSIS,
+    CALL_SITE_SYNTHESIS,
+    LLMResponseCache,
+    response_cache_usage,
+)
+from app.utils.ttl_cache import TTLCache
+
+
+def make_completion(content: str, finish_reason: str = "stop") -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 1700000000,
+            "model": "gpt-4",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": finish_reason,
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }
+    )
+
+
+def make_params(prompt: str = "hello") -> dict[str, Any]:
+    return {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+        "max_tokens": 2000,
+        "temperature": 0.5,
+    }
+
+
+@pytest.fixture
+def llm_cache() -> Generator[LLMResponseCache, None, None]:
+    response_cache_usage.reset()
+    with patch("app.services.llm_cache.cache_service") as mock_redis:
+        mock_redis.get.return_value = None
+        yield LLMResponseCache()
+    response_cache_usage.reset()
+
+
+class TestTTLCache:
+    """Tests for the in-process LRU/TTL cache"""
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_entries_expire(self) -> None:
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache"""
+
+    def test_request_hash_ignores_non_semantic_params(self) -> None:
+        params = make_params()
+        other = dict(params, max_tokens=800, timeout=30)
+
+        assert LLMResponseCache.compute_request_hash(
+            params
+        ) == LLMResponseCache.compute_request_hash(other)
+
+    def test_request_hash_changes_with_messages(self) -> None:
+        assert LLMResponseCache.compute_request_hash(
+            make_params("a")
+        ) != LLMResponseCache.compute_request_hash(make_params("b"))
+
+    def test_call_site_opt_in(self, llm_cache: LLMResponseCache) -> None:
+        params = make_params()
+        llm_cache.store_completion(
+            CALL_SITE_SECTION_ANALYSIS, params, make_completion("{}")
+        )
+
+        assert (
+            llm_cache.get_cached_completion(CALL_SITE_SECTION_ANALYSIS, params) is None
+        )
+
+    def test_store_and_hit_from_memory(
+        self, llm_cache: LLMResponseCache, db_session: Session
+    ) -> None:
+        params = make_params()
+        llm_cache.store_completion(
+            CALL_SITE_SYNTHESIS, params, make_completion('{"ok": true}'), db_session
+        )
+
+        cached = llm_cache.get_cached_completion(CALL_SITE_SYNTHESIS, params)
+
+        assert cached is not None
+        assert cached.choices[0].message.content == '{"ok": true}'
+        assert db_session.query(AIResponseCache).count() == 1
+
+    def test_hit_from_database_after_memory_cleared(
+        self, llm_cache: LLMResponseCache, db_session: Session
+    ) -> None:
+        params = make_params()
+        llm_cache.store_completion(
+            CALL_SITE_SYNTHESIS, params, make_completion('{"ok": 1}'), db_session
+        )
+        llm_cache.clear_memory()
+
+        cached = llm_cache.get_cached_completion(
+            CALL_SITE_SYNTHESIS, params, db_session
+        )
+
+        assert cached is not None
+        entry = db_session.query(AIResponseCache).first()
+        assert entry is not None
+        assert entry.hit_count == 0
+
+        assert LLMResponseCache.flush_hit_counts(db_session) == 1
+        db_session.refresh(entry)
+        assert entry.hit_count == 1
+
+    def test_truncated_and_mock_responses_not_stored(
+        self, llm_cache: LLMResponseCache
+    ) -> None:
+        params = make_params()
+        llm_cache.store_completion(
+            CALL_SITE_SYNTHESIS, params, make_completion("{", finish_reason="length")
+        )
+        llm_cache.store_completion(CALL_SITE_SYNTHESIS, params, MagicMock())
+
+        assert len(llm_cache._memory) == 0
+
+
+class TestSynthesisCaching:
+    """Synthesis round trip is skipped for identical inputs"""
+
+    def test_second_synthesis_served_from_cache(self, db_session: Session) -> None:
+        import json
+
+        from app.schemas.ai_artifacts import SynthesisArtifact
+        from app.services import ai_synthesis
+
+        synthesis_json = json.dumps(
+            {
+                "executive_summary": "Overall posture is moderate. " * 10,
+                "overall_risk_level": "Medium",
+                "overall_risk_explanation": "Several controls are partial. " * 5,
+                "cross_cutting_themes": [],
+                "top_10_initiatives": [],
+                "quick_wins": [],
+                "long_term_strategy": "Mature the security program over time. " * 6,
+                "confidence_score": 0.8,
+            }
+        )
+        structure = MagicMock()
+        structure.sections = []
+        scores = {"overall": {"percentage": 75.0}}
+        key_manager = MagicMock()
+        key_manager.get_next_key.return_value = ("key-1", "sk-test")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=make_completion(synthesis_json)
+        )
+
+        cache = LLMResponseCache()
+        with (
+            patch.object(ai_synthesis, "llm_response_cache", cache),
+            patch("app.services.llm_cache.cache_service") as mock_redis,
+            patch.object(ai_synthesis, "AsyncOpenAI", return_value=mock_client),
+        ):
+            mock_redis.get.return_value = None
+            for _ in range(2):
+                result = asyncio.run(
+                    ai_synthesis.generate_synthesis_artifact(
+                        {}, structure, scores, key_manager, db_session
+                    )
+                )
+                assert isinstance(result, SynthesisArtifact)
+
+        assert mock_client.chat.completions.create.await_count == 1
+        key_manager.get_next_key.assert_called_once()
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.devtools.loadgen import (
+    EndpointRecorder,
+    LoadgenConfig,
+    run_load,
+)
+from app.main import app
+
+
+def test_endpoint_recorder_summary() -> None:
+    recorder = EndpointRecorder()
+    recorder.record("login", 10.0, 200, 1)
+    recorder.record("login", 30.0, 401, 1)
+    recorder.record("login", 20.0, 0, None)
+
+    summary = recorder.summary()["login"]
+
+    assert summary["requests"] == 3
+    assert summary["errors"] == 2
+    assert summary["status_counts"] == {"200": 1, "401": 1, "0": 1}
+    assert summary["latency_ms"]["p50"] == 20.0
+    assert summary["db_queries"] == {"mean": 1.0, "max": 1, "total": 2}
+
+
+def test_run_load_drives_full_lifecycle(
+    db_session: Session, tmp_path: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path))
+    transport = httpx.ASGITransport(app=app)
+    config = LoadgenConfig(users=2, concurrency=2, sections=1, poll_interval=0)
+
+    with patch("app.services.report_generator.HTML") as mock_html:
+        mock_html.return_value.write_pdf.return_value = b"%PDF-1.4 loadgen"
+        summary = asyncio.run(run_load(config, transport=transport))
+
+    assert summary["users"]["completed"] == 2
+    assert summary["users"]["failures"] == {}
+    endpoints = summary["endpoints"]
+    for endpoint in ["register", "login", "structure", "save_progress", "download"]:
+        assert endpoints[endpoint]["errors"] == 0
+    assert endpoints["download"]["requests"] == 2
+    assert endpoints["save_progress"]["db_queries"]["max"] > 0
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import loop_watchdog
+from app.core.config import settings
+from app.core.loop_watchdog import LoopWatchdog
+from app.core.prometheus import event_loop_blocked
+
+
+def build_blocking_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/blocking/{item_id}")
+    async def blocking(item_id: str) -> dict[str, str]:
+        time.sleep(0.3)
+        return {"item_id": item_id}
+
+    return app
+
+
+async def request_with_watchdog(watchdog: LoopWatchdog, path: str) -> int:
+    watchdog_task = asyncio.create_task(watchdog.run())
+    await asyncio.sleep(0.05)
+    transport = httpx.ASGITransport(app=build_blocking_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        response = await c.get(path)
+    await asyncio.sleep(0.05)
+    watchdog_task.cancel()
+    return response.status_code
+
+
+def test_reports_blocking_route_with_stack(caplog: Any) -> None:
+    watchdog = LoopWatchdog(threshold_ms=100, interval_ms=10)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_watchdog"):
+        status = asyncio.run(request_with_watchdog(watchdog, "/blocking/1"))
+
+    assert status == 200
+    assert "Event loop blocked for" in caplog.text
+    assert "in GET /blocking/{item_id}" in caplog.text
+    assert "time.sleep(0.3)" in caplog.text
+    samples = event_loop_blocked.snapshot()
+    assert any(route == "GET /blocking/{item_id}" for route, _ in samples)
+
+
+def test_sentry_event_tagged_with_route(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[dict[str, Any]] = []
+    monkeypatch.setattr(settings, "SENTRY_DSN", "https://key@sentry.example/1")
+    monkeypatch.setattr(
+        loop_watchdog.sentry_sdk,
+        "capture_message",
+        lambda message, **kwargs: events.append({"message": message, **kwargs}),
+    )
+
+    asyncio.run(request_with_watchdog(LoopWatchdog(100, 10), "/blocking/2"))
+
+    assert events
+    assert events[0]["message"].startswith("Event loop blocked for")
+    assert events[0]["tags"]["route"] == "GET /blocking/{item_id}"
+    assert "test_loop_watchdog.py" in events[0]["tags"]["location"]
+
+
+def test_quiet_when_loop_is_responsive(caplog: Any) -> None:
+    async def idle() -> None:
+        task = asyncio.create_task(LoopWatchdog(100, 10).run())
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_watchdog"):
+        asyncio.run(idle())
+
+    assert "Event loop blocked" not in caplog.text
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.metrics import is_allowed_network
+from app.core.database import statement_fingerprint
+from app.core.prometheus import Counter, Gauge, Histogram, MetricsRegistry
+from app.models.assessment import Report
+
+
+def build_registry() -> tuple[MetricsRegistry, Counter, Gauge, Histogram]:
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("jobs_total", "Jobs", ["kind"]))
+    gauge = registry.register(Gauge("workers_busy", "Busy workers"))
+    histogram = registry.register(
+        Histogram("job_seconds", "Job time", ["kind"], buckets=[0.1, 1.0])
+    )
+    return registry, counter, gauge, histogram
+
+
+class TestRegistry:
+    """Tests for the in-process metrics registry"""
+
+    def test_render_text_format(self) -> None:
+        registry, counter, gauge, histogram = build_registry()
+        counter.inc(kind='say "hi"')
+        gauge.set(3)
+        histogram.observe(0.05, kind="a")
+        histogram.observe(0.5, kind="a")
+        histogram.observe(5, kind="a")
+
+        output = registry.render()
+
+        assert "# TYPE jobs_total counter" in output
+        assert 'jobs_total{kind="say \\"hi\\""} 1' in output
+        assert "workers_busy 3" in output
+        assert 'job_seconds_bucket{kind="a",le="0.1"} 1' in output
+        assert 'job_seconds_bucket{kind="a",le="1"} 2' in output
+        assert 'job_seconds_bucket{kind="a",le="+Inf"} 3' in output
+        assert 'job_seconds_count{kind="a"} 3' in output
+        assert 'job_seconds_sum{kind="a"} 5.55' in output
+
+    def test_labels_must_match(self) -> None:
+        _, counter, _, _ = build_registry()
+
+        with pytest.raises(ValueError):
+            counter.inc(other="x")
+
+    def test_multiprocess_merge(self, tmp_path: Path) -> None:
+        registry, counter, gauge, histogram = build_registry()
+        counter.inc(2, kind="a")
+        gauge.set(1)
+        histogram.observe(0.5, kind="a")
+
+        # Another worker's snapshot: a pid that cannot be running
+        other = registry.snapshot()
+        other["pid"] = 2**22 + 1
+        (tmp_path / f"metrics_{other['pid']}.json").write_text(json.dumps(other))
+        registry.write_snapshot(str(tmp_path))
+
+        merged = registry.collect(str(tmp_path))
+
+        assert merged["jobs_total"][("a",)] == 4
+        assert merged["job_seconds"][("a",)]["buckets"] == [0, 2, 0]
+        # Gauges of exited workers are dropped; own snapshot file is not double counted
+        assert merged["workers_busy"][()] == 1
+
+    def test_local_gauges_not_written(self, tmp_path: Path) -> None:
+        registry = MetricsRegistry()
+        depth = registry.register(
+            Gauge("depth", "Queue depth", multiprocess_mode="local")
+        )
+        registry.add_collector(lambda: depth.set(7))
+        registry.run_collectors()
+
+        path = registry.write_snapshot(str(tmp_path))
+
+        assert "depth" not in json.loads(path.read_text())["metrics"]
+        assert "depth 7" in registry.render(str(tmp_path))
+
+
+def test_statement_fingerprint() -> None:
+    assert (
+        statement_fingerprint("SELECT reports.id FROM reports WHERE reports.id = ?")
+        == "select reports"
+    )
+    assert (
+        statement_fingerprint('INSERT INTO "assessment_responses" (id) VALUES (?)')
+        == "insert assessment_responses"
+    )
+    assert statement_fingerprint("UPDATE users SET x = 1") == "update users"
+    assert statement_fingerprint("COMMIT") == "commit"
+
+
+@pytest.mark.parametrize(
+    ("host", "allowed"),
+    [("127.0.0.1", True), ("::1", True), ("10.0.0.5", False), ("testclient", False)],
+)
+def test_is_allowed_network(host: str, allowed: bool) -> None:
+    assert is_allowed_network(host) is allowed
+
+
+class TestMetricsEndpoint:
+    """Tests for the /metrics scrape endpoint"""
+
+    def test_requires_admin_outside_allowed_networks(
+        self, client: TestClient, auth_token: str
+    ) -> None:
+        assert client.get("/metrics").status_code == 403
+
+        response = client.get(
+            "/metrics", headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.status_code == 403
+
+    def test_admin_scrape(
+        self,
+        client: TestClient,
+        admin_token: str,
+        test_report: Report,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.get("/health/live")
+
+        response = client.get("/metrics", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/health/live",status="200"}'
+            in body
+        )
+        assert 'db_query_duration_seconds_count{fingerprint="select reports"}' in body
+        assert 'queue_depth{queue="reports_standard",status="pending"} 1' in body
+
+    def test_allowed_network_skips_auth(
+        self, client: TestClient, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setattr("app.api.metrics.is_allowed_network", lambda host: True)
+
+        assert client.get("/metrics").status_code == 200
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.devtools.middleware_bench import benchmark
+from app.middleware import performance
+from app.middleware.performance import PerformanceMiddleware
+
+
+def slow_stream() -> Iterator[bytes]:
+    for _ in range(3):
+        time.sleep(0.03)
+        yield b"chunk"
+
+
+async def download(request: Request) -> Response:
+    return StreamingResponse(slow_stream(), media_type="application/octet-stream")
+
+
+async def with_background(request: Request) -> Response:
+    return PlainTextResponse("ok", background=BackgroundTask(time.sleep, 0.2))
+
+
+timed_app = Starlette(
+    routes=[Route("/download", download), Route("/background", with_background)]
+)
+timed_app.add_middleware(PerformanceMiddleware)
+
+
+class TestPerformanceMiddleware:
+    """Tests for streaming-safe request timing"""
+
+    def test_times_streamed_body(self, monkeypatch: Any, caplog: Any) -> None:
+        monkeypatch.setattr(performance, "SLOW_REQUEST_THRESHOLD", 50)
+
+        with caplog.at_level(logging.INFO, logger="app.middleware.performance"):
+            response = TestClient(timed_app).get("/download")
+
+        assert response.content == b"chunk" * 3
+        assert "X-Response-Time" in response.headers
+        assert "Slow request: GET /download" in caplog.text
+
+    def test_excludes_background_tasks(self, monkeypatch: Any, caplog: Any) -> None:
+        monkeypatch.setattr(performance, "SLOW_REQUEST_THRESHOLD", 100)
+
+        with caplog.at_level(logging.INFO, logger="app.middleware.performance"):
+            TestClient(timed_app).get("/background")
+
+        assert "Slow request" not in caplog.text
+
+    def test_no_sentry_transaction_without_dsn(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(settings, "SENTRY_DSN", None)
+
+        with patch("app.middleware.performance.sentry_sdk") as mock_sentry:
+            TestClient(timed_app).get("/background")
+
+        mock_sentry.start_transaction.assert_not_called()
+
+
+def test_security_headers(client: TestClient) -> None:
+    response = client.get("/health/live")
+
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy"]
+
+
+def test_csrf_rejection_returns_json(client: TestClient, monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "ENABLE_CSRF", True)
+    monkeypatch.setattr(settings, "ENABLE_COOKIE_AUTH", True)
+
+    response = client.post("/api/assessment/start")
+
+    assert response.status_code == 403
+    assert response.json() == {"detail": "CSRF token missing"}
+    assert response.headers["X-Frame-Options"] == "DENY"
+
+
+def test_middleware_benchmark() -> None:
+    results = asyncio.run(benchmark(["/health/live"], 20))
+
+    result = results["paths"]["/health/live"]
+    assert result["stack_us"]["p50"] > 0
+    assert result["bare_us"]["p50"] > 0
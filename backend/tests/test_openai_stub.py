@@ -0,0 +1,182 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from openai import OpenAI, RateLimitError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.assessment import AssessmentResponse, Report
+from app.schemas.ai_artifacts import SectionAIArtifact, SynthesisArtifact
+from app.services.ai_synthesis import generate_synthesis_artifact
+from app.services.prompt_builder import SECTION_ANALYSIS_INSTRUCTIONS
+from app.services.report_generator import generate_ai_insights_async
+from app.services.token_budget import count_message_tokens
+
+
+def make_section(section_id: str, question_count: int) -> Any:
+    return SimpleNamespace(
+        id=section_id,
+        title=section_id.title(),
+        description=f"{section_id} controls",
+        questions=[
+            SimpleNamespace(
+                id=f"{section_id}-{i}", text=f"Question {i}?", weight=1.0, options=[]
+            )
+            for i in range(question_count)
+        ],
+    )
+
+
+def stub_client(openai_stub: Any) -> OpenAI:
+    return OpenAI(api_key="sk-test", base_url=openai_stub.base_url, max_retries=0)
+
+
+class TestStubResponses:
+    """Tests for the content the stand-in serves"""
+
+    def test_section_analysis_round_trip(
+        self, openai_stub: Any, db_session: Session, test_report: Report
+    ) -> None:
+        sections = [make_section("identity", 12), make_section("network", 3)]
+        sections.append(make_section("data", 3))
+        responses = [
+            AssessmentResponse(
+                assessment_id=test_report.assessment_id,
+                section_id=section.id,
+                question_id=question.id,
+                answer_value="yes",
+            )
+            for section in sections
+            for question in section.questions
+        ]
+        key_manager = MagicMock()
+        key_manager.get_next_key.return_value = ("key1", "sk-test")
+
+        with (
+            patch.object(settings, "OPENAI_MODEL", "gpt-4o"),
+            patch("app.services.report_generator.random.uniform", return_value=0),
+        ):
+            insights = asyncio.run(
+                generate_ai_insights_async(
+                    responses,
+                    SimpleNamespace(sections=sections),
+                    key_manager,
+                    str(test_report.id),
+                )
+            )
+
+        assert sorted(insights) == ["data", "identity", "network"]
+        summary = openai_stub.stats.summary()
+        assert summary["by_call_type"] == {"section": 1, "section_batch": 1}
+        assert summary["by_outcome"] == {"ok": 2}
+        assert summary["prompt_tokens"] > 0
+
+    def test_synthesis_is_schema_valid(
+        self, openai_stub: Any, db_session: Session
+    ) -> None:
+        key_manager = MagicMock()
+        key_manager.get_next_key.return_value = ("key1", "sk-test")
+        section = make_section("identity", 3)
+        artifact = SectionAIArtifact.model_validate(
+            json.loads(
+                stub_client(openai_stub)
+                .chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": SECTION_ANALYSIS_INSTRUCTIONS,
+                        },
+                        {"role": "user", "content": "Section: Identity"},
+                    ],
+                )
+                .choices[0]
+                .message.content
+                or ""
+            )
+        )
+
+        synthesis = asyncio.run(
+            generate_synthesis_artifact(
+                {"identity": artifact},
+                SimpleNamespace(sections=[section]),
+                {"overall": {"percentage": 70.0}, "identity": {"percentage": 70.0}},
+                key_manager,
+                db_session,
+            )
+        )
+
+        assert isinstance(synthesis, SynthesisArtifact)
+        assert openai_stub.stats.summary()["by_call_type"]["synthesis"] == 1
+
+    def test_usage_reports_local_token_counts(self, openai_stub: Any) -> None:
+        messages = [{"role": "user", "content": "hello there"}]
+
+        response = stub_client(openai_stub).chat.completions.create(
+            model="gpt-4o", messages=messages
+        )
+
+        assert response.usage is not None
+        assert response.usage.prompt_tokens == count_message_tokens(messages, "gpt-4o")
+
+    def test_recordings_replayed_in_order(self, openai_stub: Any) -> None:
+        openai_stub.configure(recordings={"other": ["first", "second"]})
+        client = stub_client(openai_stub)
+        messages = [{"role": "user", "content": "hi"}]
+
+        contents = [
+            client.chat.completions.create(model="gpt-4o", messages=messages)
+            .choices[0]
+            .message.content
+            for _ in range(3)
+        ]
+
+        assert contents == ["first", "second", "first"]
+        assert openai_stub.stats.summary()["by_outcome"] == {"replayed": 3}
+
+
+class TestStubFaults:
+    """Tests for injected failures"""
+
+    def test_rate_limit(self, openai_stub: Any) -> None:
+        openai_stub.configure(rate_limit_rate=1.0)
+
+        with pytest.raises(RateLimitError):
+            stub_client(openai_stub).chat.completions.create(
+                model="gpt-4o", messages=[{"role": "user", "content": "hi"}]
+            )
+
+        assert openai_stub.stats.summary()["by_outcome"] == {"rate_limited": 1}
+
+    def test_malformed_json(self, openai_stub: Any) -> None:
+        openai_stub.configure(malformed_rate=1.0)
+
+        content = (
+            stub_client(openai_stub)
+            .chat.completions.create(
+                model="gpt-4o", messages=[{"role": "user", "content": "hi"}]
+            )
+            .choices[0]
+            .message.content
+        )
+
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(content or "")
+
+    def test_stats_and_config_endpoints(self, openai_stub: Any) -> None:
+        stub_root = openai_stub.base_url.removesuffix("/v1")
+        stub_client(openai_stub).chat.completions.create(
+            model="gpt-4o", messages=[{"role": "user", "content": "hi"}]
+        )
+
+        assert httpx.get(f"{stub_root}/_stub/stats").json()["requests"] == 1
+        httpx.post(f"{stub_root}/_stub/reset")
+        assert httpx.get(f"{stub_root}/_stub/stats").json()["requests"] == 0
+
+        response = httpx.put(f"{stub_root}/_stub/config", json={"profile": "unknown"})
+        assert response.status_code == 400
@@ -0,0 +1,96 @@
+import logging
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.query_stats import QueryStats, record_query, track_queries
+from app.models.assessment import Assessment
+from app.models.user import User
+
+
+class TestQueryStats:
+    """Tests for request-scoped query accounting"""
+
+    def test_record_only_inside_scope(self) -> None:
+        record_query("SELECT 1", 0.5)
+
+        with track_queries() as stats:
+            record_query("SELECT * FROM users WHERE id = ?", 0.002)
+            record_query("SELECT * FROM users WHERE id = ?", 0.003)
+            record_query("SELECT * FROM reports", 0.001)
+
+        record_query("SELECT 2", 0.5)
+
+        assert stats.count == 3
+        assert stats.total_seconds == pytest.approx(0.006)
+        assert stats.repeated(2) == [("SELECT * FROM users WHERE id = ?", 2)]
+
+    def test_describe_lists_most_repeated(self) -> None:
+        stats = QueryStats()
+        for _ in range(3):
+            stats.record("SELECT *\n  FROM reports", 0.001)
+
+        assert stats.describe() == "3 queries in 3.0ms\n  3x SELECT * FROM reports"
+
+
+class TestQueryTrackingMiddleware:
+    """Tests for the X-DB-Queries / Server-Timing headers and N+1 warnings"""
+
+    def test_headers_report_request_queries(
+        self, client: TestClient, auth_token: str
+    ) -> None:
+        response = client.get(
+            "/api/auth/me", headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Queries"]) >= 1
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    def test_no_headers_in_production(
+        self, client: TestClient, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setattr(settings, "SENTRY_ENVIRONMENT", "production")
+
+        response = client.get("/health")
+
+        assert "X-DB-Queries" not in response.headers
+        assert "Server-Timing" not in response.headers
+
+    def test_warns_on_repeated_statement(
+        self,
+        client: TestClient,
+        admin_token: str,
+        test_user: User,
+        db_session: Session,
+        monkeypatch: Any,
+        caplog: Any,
+    ) -> None:
+        monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+        for attempt in range(1, 4):
+            db_session.add(Assessment(user_id=test_user.id, attempt_number=attempt))
+        db_session.commit()
+
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_tracking"):
+            response = client.delete(
+                f"/api/admin/users/{test_user.id}",
+                headers={"Authorization": f"Bearer {admin_token}"},
+            )
+
+        assert response.status_code == 200
+        assert "Possible N+1 in DELETE /api/admin/users/{user_id}" in caplog.text
+
+
+def test_query_budget(client: TestClient, auth_token: str, query_budget: Any) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    with query_budget(2) as stats:
+        client.get("/api/auth/me", headers=headers)
+    assert stats.count >= 1
+
+    with pytest.raises(AssertionError, match="Query budget of 0 exceeded"):
+        with query_budget(0):
+            client.get("/api/auth/me", headers=headers)
@@ -1136,3 +1136,181 @@ def test_create_degraded_artifact() -> None:
     assert len(artifact.benchmarks) == 1
     assert artifact.benchmarks[0].status == "Implemented"
     assert artifact.confidence_score == 0.0
+
+
+def test_run_ai_report_pipeline_overlaps_scoring_with_sections(
+    db_session: Any, completed_assessment: Any, test_assessment_response: Any
+) -> None:
+    import asyncio
+
+    from app.services.question_parser import create_sample_assessment_structure
+    from app.services.report_generator import (
+        create_degraded_artifact,
+        run_ai_report_pipeline,
+    )
+
+    structure = create_sample_assessment_structure()
+    events: list[str] = []
+
+    async def fake_insights(*args: Any, on_section_complete: Any, **kwargs: Any) -> Any:
+        insights = {}
+        for section in structure.sections:
+            await asyncio.sleep(0)
+            events.append(f"section:{section.id}")
+            insights[section.id] = create_degraded_artifact(section.id)
+            on_section_complete(section, insights[section.id])
+        return insights
+
+    def fake_scores(*args: Any) -> Any:
+        events.append("scores")
+        return calculate_assessment_scores(*args)
+
+    with (
+        patch(
+            "app.services.report_generator.generate_ai_insights_async",
+            side_effect=fake_insights,
+        ),
+        patch(
+            "app.services.report_generator.calculate_assessment_scores",
+            side_effect=fake_scores,
+        ),
+        patch(
+            "app.services.report_generator.generate_synthesis_artifact",
+            side_effect=RuntimeError("synthesis down"),
+        ) as mock_synthesis,
+    ):
+        scores, insights, synthesis, html = asyncio.run(
+            run_ai_report_pipeline(
+                db_session,
+                completed_assessment,
+                [test_assessment_response],
+                structure,
+                MagicMock(),
+                "report-id",
+            )
+        )
+
+    assert events.count("scores") == 1
+    prebuilt = mock_synthesis.call_args.kwargs["prebuilt_summaries"]
+    assert set(prebuilt) == {section.id for section in structure.sections}
+    assert set(insights) == set(prebuilt)
+    assert synthesis.overall_risk_level in ("Medium", "High", "Medium-High", "Low")
+    assert "AI analysis temporarily unavailable" in html
+    assert f"{scores['overall']['percentage']:.1f}%" in html
+
+
+def test_run_ai_report_pipeline_scores_while_requests_are_in_flight(
+    db_session: Any, completed_assessment: Any
+) -> None:
+    import asyncio
+    import json
+    import time
+
+    from app.models.assessment import AssessmentResponse
+    from app.services.question_parser import create_sample_assessment_structure
+    from app.services.report_generator import (
+        create_degraded_artifact,
+        run_ai_report_pipeline,
+    )
+
+    structure = create_sample_assessment_structure()
+    section = structure.sections[0]
+    structure.sections = [section]
+    responses = [
+        AssessmentResponse(
+            assessment_id=completed_assessment.id,
+            section_id=section.id,
+            question_id=question.id,
+            answer_value="yes",
+        )
+        for question in section.questions
+    ]
+    timeline: dict[str, float] = {}
+
+    async def slow_completion(**params: Any) -> Any:
+        timeline.setdefault("request_sent", time.perf_counter())
+        await asyncio.sleep(0.3)
+        timeline.setdefault("completion_returned", time.perf_counter())
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps(
+            create_degraded_artifact(section.id).model_dump()
+        )
+        response.choices[0].finish_reason = "stop"
+        response.usage.prompt_tokens = 100
+        response.usage.completion_tokens = 50
+        response.usage.prompt_tokens_details = None
+        return response
+
+    def slow_scores(*args: Any) -> Any:
+        timeline["scores_started"] = time.perf_counter()
+        time.sleep(0.2)
+        timeline["scores_finished"] = time.perf_counter()
+        return calculate_assessment_scores(*args)
+
+    with (
+        patch("app.services.report_generator.AsyncOpenAI") as mock_openai,
+        patch("app.services.report_generator.random.uniform", return_value=0),
+        patch(
+            "app.services.report_generator.calculate_assessment_scores",
+            side_effect=slow_scores,
+        ),
+        patch(
+            "app.services.report_generator.generate_synthesis_artifact",
+            side_effect=RuntimeError("synthesis down"),
+        ),
+    ):
+        mock_openai.return_value.chat.completions.create = slow_completion
+        asyncio.run(
+            run_ai_report_pipeline(
+                db_session,
+                completed_assessment,
+                responses,
+                structure,
+                MagicMock(get_next_key=MagicMock(return_value=("k", "sk"))),
+                "report-id",
+            )
+        )
+
+    assert timeline["scores_started"] < timeline["completion_returned"]
+    assert timeline["request_sent"] < timeline["scores_finished"]
+
+
+def test_generate_ai_insights_async_notifies_each_section(
+    db_session: Any, test_assessment: Any
+) -> None:
+    import asyncio
+
+    from app.models.assessment import AssessmentResponse
+    from app.services.question_parser import create_sample_assessment_structure
+    from app.services.report_generator import generate_ai_insights_async
+
+    structure = create_sample_assessment_structure()
+    responses = [
+        AssessmentResponse(
+            assessment_id=test_assessment.id,
+            section_id=section.id,
+            question_id=question.id,
+            answer_value="yes",
+        )
+        for section in structure.sections
+        for question in section.questions
+    ]
+    completed: list[str] = []
+
+    with patch(
+        "app.services.report_generator.AsyncOpenAI", side_effect=ValueError("boom")
+    ):
+        insights = asyncio.run(
+            generate_ai_insights_async(
+                responses,
+                structure,
+                MagicMock(get_next_key=MagicMock(return_value=("k", "sk"))),
+                "report-id",
+                on_section_complete=lambda section, artifact: completed.append(
+                    section.id
+                ),
+            )
+        )
+
+    assert sorted(completed) == sorted(insights)
+    assert set(completed) == {section.id for section in structure.sections}
@@ -0,0 +1,179 @@
+import tracemalloc
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.assessment import Report
+from app.models.report_timing import ReportGenerationTiming
+from app.services import report_memory
+from app.services.report_memory import (
+    REPORT_TOO_LARGE_MESSAGE,
+    ReportMemoryLimitExceeded,
+    needs_isolated_render,
+    prune_allocation_snapshots,
+    render_pdf_isolated,
+    shutdown_pdf_worker,
+)
+from app.services.report_timing import StageTimer
+
+
+@pytest.fixture
+def memory_profiling(monkeypatch: Any) -> Any:
+    monkeypatch.setattr(settings, "REPORT_MEMORY_PROFILING_ENABLED", True)
+    yield
+    tracemalloc.stop()
+
+
+def test_stage_rss_samples(db_session: Session, test_report: Report) -> None:
+    timer = StageTimer("standard")
+    with timer.stage("html"):
+        pass
+    with timer.stage("pdf"):
+        pass
+
+    timer.save(db_session, str(test_report.id), "completed")
+
+    timing = db_session.query(ReportGenerationTiming).one()
+    assert set(timing.stage_rss_kb) == {"html", "pdf"}
+    assert timing.peak_rss_kb == max(timing.stage_rss_kb.values())
+    assert timing.traced_peak_kb is None
+    assert timing.top_allocations is None
+
+
+def test_profiling_keeps_worst_snapshots(
+    db_session: Session, test_report: Report, memory_profiling: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(settings, "REPORT_MEMORY_SNAPSHOTS_KEPT", 1)
+
+    for size in (1, 4):
+        timer = StageTimer("standard")
+        with timer.stage("html"):
+            html = "x" * size * 1024 * 1024
+        del html
+        timer.save(db_session, str(test_report.id), "completed")
+
+    timings = (
+        db_session.query(ReportGenerationTiming)
+        .order_by(ReportGenerationTiming.traced_peak_kb)
+        .all()
+    )
+    assert timings[0].traced_peak_kb >= 1024
+    assert timings[1].traced_peak_kb >= 4096
+    assert timings[0].top_allocations is None
+    assert "test_report_memory.py" in timings[1].top_allocations[0]["location"]
+
+    prune_allocation_snapshots(db_session, 0)
+    db_session.expire_all()
+    assert (
+        db_session.query(ReportGenerationTiming)
+        .filter(ReportGenerationTiming.top_allocations.isnot(None))
+        .count()
+        == 0
+    )
+
+
+def test_tracing_stops_with_last_timer(
+    db_session: Session, test_report: Report, memory_profiling: Any
+) -> None:
+    first = StageTimer("standard")
+    second = StageTimer("standard")
+    assert tracemalloc.is_tracing()
+
+    first.save(db_session, str(test_report.id), "completed")
+    assert tracemalloc.is_tracing()
+    del second
+    assert not tracemalloc.is_tracing()
+
+    StageTimer("standard").save(db_session, str(test_report.id), "completed")
+    assert not tracemalloc.is_tracing()
+
+
+class TestMemoryCeiling:
+    """Tests for routing oversized PDF renders"""
+
+    def test_disabled_by_default(self) -> None:
+        assert needs_isolated_render(10**9) is False
+
+    def test_isolates_when_worker_would_cross_ceiling(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(settings, "REPORT_MEMORY_CEILING_MB", 100)
+        monkeypatch.setattr(settings, "REPORT_PDF_MEMORY_FACTOR", 10)
+        monkeypatch.setattr(report_memory, "current_rss_kb", lambda: 90 * 1024)
+
+        assert needs_isolated_render(512 * 1024) is False
+        assert needs_isolated_render(2 * 1024 * 1024) is True
+
+    def test_rejects_render_larger_than_ceiling(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(settings, "REPORT_MEMORY_CEILING_MB", 100)
+        monkeypatch.setattr(settings, "REPORT_PDF_MEMORY_FACTOR", 10)
+
+        with pytest.raises(ReportMemoryLimitExceeded, match="100MB ceiling"):
+            needs_isolated_render(20 * 1024 * 1024)
+
+    def test_render_in_worker_process(self) -> None:
+        try:
+            pdf_bytes = render_pdf_isolated("<p>isolated</p>")
+        finally:
+            shutdown_pdf_worker()
+
+        assert pdf_bytes.startswith(b"%PDF")
+
+    def test_rejected_report_records_memory_limit(
+        self,
+        db_session: Session,
+        test_report: Report,
+        completed_assessment: Any,
+        test_assessment_response: Any,
+        monkeypatch: Any,
+    ) -> None:
+        from app.services.report_generator import generate_standard_report
+
+        monkeypatch.setattr(settings, "REPORT_MEMORY_CEILING_MB", 1)
+        monkeypatch.setattr(settings, "REPORT_PDF_MEMORY_FACTOR", 10**6)
+
+        generate_standard_report(str(test_report.id))
+
+        db_session.refresh(test_report)
+        assert test_report.status == "failed"
+        assert test_report.error_message == REPORT_TOO_LARGE_MESSAGE
+        timing = db_session.query(ReportGenerationTiming).one()
+        assert timing.status == "memory_limit"
+        assert "pdf" not in timing.stage_ms
+
+
+def test_report_memory_endpoint(
+    client: TestClient,
+    admin_token: str,
+    auth_token: str,
+    db_session: Session,
+    test_report: Report,
+) -> None:
+    for peak_rss_kb in (1000, 3000, 2000):
+        db_session.add(
+            ReportGenerationTiming(
+                report_id=test_report.id,
+                report_type="standard",
+                status="completed",
+                stage_ms={},
+                total_ms=10,
+                peak_rss_kb=peak_rss_kb,
+            )
+        )
+    db_session.commit()
+
+    response = client.get(
+        "/api/admin/report-memory?limit=2",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+    outliers = response.json()["outliers"]
+    assert [o["peak_rss_kb"] for o in outliers] == [3000, 2000]
+    assert outliers[0]["report_id"] == test_report.id
+
+    response = client.get(
+        "/api/admin/report-memory",
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 403
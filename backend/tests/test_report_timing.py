@@ -0,0 +1,141 @@
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.assessment import Report
+from app.models.report_timing import ReportGenerationTiming
+from app.services.report_timing import ReportTimingService, StageTimer
+
+
+def add_timing(
+    db_session: Session,
+    report: Report,
+    total_ms: int,
+    release: str = "v1",
+    status: str = "completed",
+) -> None:
+    db_session.add(
+        ReportGenerationTiming(
+            report_id=report.id,
+            report_type="standard",
+            status=status,
+            release=release,
+            stage_ms={"html": total_ms / 4, "pdf": total_ms / 2},
+            total_ms=total_ms,
+            peak_rss_kb=1024,
+            html_bytes=2000,
+            pdf_bytes=8000,
+        )
+    )
+    db_session.commit()
+
+
+def test_stage_timer_accumulates_and_saves(
+    db_session: Session, test_report: Report
+) -> None:
+    timer = StageTimer("standard")
+    with timer.stage("html"):
+        pass
+    timer.record("sections", 0.25)
+    timer.record("sections", 0.25)
+    timer.html_bytes = 123
+
+    timer.save(db_session, str(test_report.id), "completed")
+
+    timing = db_session.query(ReportGenerationTiming).one()
+    assert timing.report_id == test_report.id
+    assert timing.release == settings.RELEASE_VERSION
+    assert timing.stage_ms["sections"] == 500.0
+    assert set(timing.stage_ms) == {"html", "sections"}
+    assert timing.html_bytes == 123
+    assert timing.pdf_bytes is None
+    assert timing.peak_rss_kb > 0
+
+
+def test_standard_report_records_stages(
+    db_session: Session,
+    test_report: Report,
+    completed_assessment: Any,
+    test_assessment_response: Any,
+) -> None:
+    from app.services.report_generator import generate_standard_report
+
+    with (
+        patch("app.services.report_generator.HTML") as mock_html_class,
+        patch(
+            "app.services.report_generator.get_storage_service"
+        ) as mock_storage_factory,
+    ):
+        mock_html_class.return_value.write_pdf = MagicMock(return_value=b"pdf-bytes")
+        mock_storage_factory.return_value.save.return_value = "/tmp/report.pdf"
+
+        generate_standard_report(str(test_report.id))
+
+    timing = (
+        db_session.query(ReportGenerationTiming)
+        .filter(ReportGenerationTiming.report_id == test_report.id)
+        .one()
+    )
+    assert timing.status == "completed"
+    assert timing.report_type == "standard"
+    assert set(timing.stage_ms) == {
+        "responses",
+        "structure",
+        "scores",
+        "html",
+        "pdf",
+        "storage",
+    }
+    assert timing.pdf_bytes == len(b"pdf-bytes")
+    assert timing.html_bytes > 0
+
+
+def test_summarize_percentiles(db_session: Session, test_report: Report) -> None:
+    for total_ms in (100, 200, 300, 400):
+        add_timing(db_session, test_report, total_ms)
+    add_timing(db_session, test_report, 5000, status="failed")
+
+    summary = ReportTimingService.summarize(db_session)
+
+    group = summary["groups"]["standard"]
+    assert group["count"] == 4
+    assert group["total_ms"] == {"p50": 200, "p95": 400, "p99": 400, "max": 400}
+    assert group["stages_ms"]["pdf"]["max"] == 200
+    assert group["pdf_bytes"]["p50"] == 8000
+
+
+def test_summarize_by_release(db_session: Session, test_report: Report) -> None:
+    add_timing(db_session, test_report, 100, release="v1")
+    add_timing(db_session, test_report, 300, release="v2")
+
+    summary = ReportTimingService.summarize(db_session, by_release=True)
+
+    assert summary["by_release"] is True
+    assert summary["groups"]["standard@v1"]["total_ms"]["max"] == 100
+    assert summary["groups"]["standard@v2"]["total_ms"]["max"] == 300
+
+
+def test_report_timings_endpoint(
+    client: TestClient,
+    admin_token: str,
+    auth_token: str,
+    db_session: Session,
+    test_report: Report,
+) -> None:
+    add_timing(db_session, test_report, 250)
+
+    response = client.get(
+        "/api/admin/report-timings?report_type=standard",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["groups"]["standard"]["count"] == 1
+
+    response = client.get(
+        "/api/admin/report-timings",
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 403
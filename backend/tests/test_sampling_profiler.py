@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import sampling_profiler
+from app.core.sampling_profiler import (
+    ProfilerBusy,
+    SampleFilter,
+    SamplingProfiler,
+    endpoint_routes,
+)
+from app.main import app
+from app.models.assessment import AdminAuditLog
+
+
+def busy_report(report_id: str, stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_threads() -> Any:
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=busy_report, args=("report-1", stop), name="busy-1"),
+        threading.Thread(target=busy_report, args=("report-2", stop), name="busy-2"),
+        threading.Thread(target=stop.wait, name="idle"),
+    ]
+    for thread in threads:
+        thread.start()
+    yield
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+class TestSamplingProfiler:
+    """Tests for stack sampling and profile output"""
+
+    def test_samples_only_the_requested_report(
+        self, busy_threads: Any, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setattr(
+            sampling_profiler, "APP_ROOT", os.path.dirname(os.path.abspath(__file__))
+        )
+        profiler = SamplingProfiler(SampleFilter({}, report_id="report-1"), 5)
+
+        profiler.run(0.2)
+
+        assert profiler.sample_count > 0
+        assert set(profiler.thread_names.values()) == {"busy-1"}
+
+    def test_skips_idle_threads(self, busy_threads: Any) -> None:
+        profiler = SamplingProfiler(SampleFilter({}), 5)
+
+        profiler.run(0.1)
+
+        assert "idle" not in profiler.thread_names.values()
+        assert {"busy-1", "busy-2"} <= set(profiler.thread_names.values())
+
+    def test_output_formats(self, busy_threads: Any) -> None:
+        profiler = SamplingProfiler(SampleFilter({}), 5)
+        profiler.run(0.1)
+
+        speedscope = profiler.speedscope("test")
+        frames = speedscope["shared"]["frames"]
+        profile = next(p for p in speedscope["profiles"] if p["name"] == "busy-1")
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert frames[profile["samples"][0][-1]]["name"] == "busy_report"
+
+        collapsed = profiler.collapsed()
+        assert "busy-1;" in collapsed
+        assert "busy_report (test_sampling_profiler.py) " in collapsed
+
+    def test_one_profile_at_a_time(self) -> None:
+        with sampling_profiler._profile_lock:
+            with pytest.raises(ProfilerBusy):
+                SamplingProfiler(SampleFilter({}), 5).run(0.1)
+
+    def test_endpoint_routes_unwrap_decorators(self) -> None:
+        from app.api.auth import login
+
+        routes = endpoint_routes(app.routes)
+
+        assert routes[login.__wrapped__.__code__] == "POST /api/auth/login"
+
+
+class TestProfilerEndpoint:
+    """Tests for POST /api/admin/profile"""
+
+    def test_returns_speedscope_and_audits(
+        self, client: TestClient, admin_token: str, db_session: Session
+    ) -> None:
+        response = client.post(
+            "/api/admin/profile?seconds=1&interval_ms=50&route=/api/admin/*",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["$schema"].startswith("https://www.speedscope.app")
+        assert "speedscope.json" in response.headers["Content-Disposition"]
+        audit = db_session.query(AdminAuditLog).filter_by(action="run_profiler").one()
+        assert audit.details["route"] == "/api/admin/*"
+
+    def test_collapsed_output(self, client: TestClient, admin_token: str) -> None:
+        response = client.post(
+            "/api/admin/profile?seconds=1&interval_ms=50&output=collapsed",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_duration_is_bounded(self, client: TestClient, admin_token: str) -> None:
+        response = client.post(
+            "/api/admin/profile?seconds=3600",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 400
+
+    def test_requires_admin(self, client: TestClient, auth_token: str) -> None:
+        response = client.post(
+            "/api/admin/profile?seconds=1",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == 403
+
+
+def test_overhead_is_bounded_by_interval(busy_threads: Any) -> None:
+    profiler = SamplingProfiler(SampleFilter({}), 20)
+    started = time.perf_counter()
+
+    profiler.run(0.2)
+
+    assert time.perf_counter() - started < 1
+    assert profiler.sample_count <= 2 * 11
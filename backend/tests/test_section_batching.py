@@ -0,0 +1,220 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ai_cache import AISectionCache
+from app.models.assessment import AssessmentResponse, Report
+from app.services.report_generator import (
+    create_degraded_artifact,
+    generate_ai_insights_async,
+    parse_section_batch_response,
+)
+from app.services.section_batching import (
+    build_batch_request_params,
+    plan_section_batches,
+)
+
+
+def make_section(section_id: str, question_count: int) -> Any:
+    return SimpleNamespace(
+        id=section_id,
+        title=section_id.replace("-", " ").title(),
+        description=f"{section_id} controls",
+        questions=[
+            SimpleNamespace(
+                id=f"{section_id}-{i}", text=f"Question {i}?", weight=1.0, options=[]
+            )
+            for i in range(question_count)
+        ],
+    )
+
+
+def make_entry(section_id: str, signal_count: int) -> tuple[Any, list[dict], str]:
+    responses = [
+        {"question": f"Question {i}?", "answer": "yes", "weight": 1.0}
+        for i in range(signal_count)
+    ]
+    return (make_section(section_id, signal_count), responses, f"hash-{section_id}")
+
+
+def artifact_payload(risk_level: str = "Medium") -> dict[str, Any]:
+    payload = create_degraded_artifact("any").model_dump()
+    payload["risk_level"] = risk_level
+    return payload
+
+
+class TestPlanSectionBatches:
+    """Tests for the batching planner"""
+
+    def test_small_sections_share_one_request(self) -> None:
+        entries = [make_entry(s, 3) for s in ("identity", "network", "data")]
+
+        batches, singles = plan_section_batches(entries, "gpt-4o")
+
+        assert [[e[0].id for e in batch] for batch in batches] == [
+            ["identity", "network", "data"]
+        ]
+        assert singles == []
+
+    def test_large_sections_and_leftovers_run_alone(self) -> None:
+        entries = [
+            make_entry("identity", 3),
+            make_entry("large", settings.AI_BATCH_MAX_SIGNALS_PER_SECTION + 1),
+            make_entry("network", 3),
+        ]
+
+        with patch.object(settings, "AI_BATCH_MAX_SECTIONS", 1):
+            batches, singles = plan_section_batches(entries, "gpt-4o")
+
+        assert batches == []
+        assert sorted(e[0].id for e in singles) == ["identity", "large", "network"]
+
+    def test_respects_context_window(self) -> None:
+        entries = [make_entry(s, 3) for s in ("identity", "network", "data")]
+
+        batches, singles = plan_section_batches(entries, "gpt-4")
+
+        for batch in batches:
+            params = build_batch_request_params(batch)
+            assert params["max_tokens"] >= sum(
+                settings.AI_COMPLETION_BASE_TOKENS for _ in batch
+            )
+        assert sum(len(b) for b in batches) + len(singles) == 3
+
+
+class TestParseSectionBatchResponse:
+    """Tests for validating batched responses"""
+
+    def test_valid_sections_returned_and_invalid_dropped(self) -> None:
+        content = json.dumps(
+            {
+                "sections": {
+                    "identity": artifact_payload(),
+                    "network": {"risk_level": "Medium"},
+                }
+            }
+        )
+
+        artifacts = parse_section_batch_response(
+            content, ["identity", "network", "data"]
+        )
+
+        assert list(artifacts) == ["identity"]
+
+    def test_invalid_json_returns_nothing(self) -> None:
+        assert parse_section_batch_response("not json", ["identity"]) == {}
+
+
+class TestBatchedInsights:
+    """Tests for batching inside generate_ai_insights_async"""
+
+    def run_insights(
+        self,
+        db: Session,
+        report: Report,
+        mock_openai: Any,
+        contents: list[str],
+        key_manager: Any = None,
+    ) -> dict[str, Any]:
+        sections = [make_section(s, 2) for s in ("identity", "network", "data")]
+        responses = [
+            AssessmentResponse(
+                assessment_id=report.assessment_id,
+                section_id=section.id,
+                question_id=question.id,
+                answer_value="yes",
+            )
+            for section in sections
+            for question in section.questions
+        ]
+
+        completions = []
+        for content in contents:
+            completion = MagicMock()
+            completion.choices[0].message.content = content
+            completion.choices[0].finish_reason = "stop"
+            completion.usage.prompt_tokens = 300
+            completion.usage.completion_tokens = 150
+            completions.append(completion)
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            side_effect=completions
+        )
+        key_manager = key_manager or MagicMock()
+        key_manager.get_next_key.return_value = ("key1", "sk-test")
+
+        with (
+            patch.object(settings, "OPENAI_MODEL", "gpt-4o"),
+            patch("app.services.report_generator.random.uniform", return_value=0),
+        ):
+            return asyncio.run(
+                generate_ai_insights_async(
+                    responses,
+                    SimpleNamespace(sections=sections),
+                    key_manager,
+                    str(report.id),
+                )
+            )
+
+    @patch("app.services.report_generator.AsyncOpenAI")
+    def test_quick_tier_uses_one_request(
+        self, mock_openai: Any, db_session: Session, test_report: Report
+    ) -> None:
+        batch = {
+            "sections": {
+                "identity": artifact_payload("Low"),
+                "network": artifact_payload("High"),
+                "data": artifact_payload("Medium"),
+            }
+        }
+
+        insights = self.run_insights(
+            db_session, test_report, mock_openai, [json.dumps(batch)]
+        )
+
+        assert mock_openai.return_value.chat.completions.create.await_count == 1
+        assert insights["network"].risk_level == "High"
+        assert db_session.query(AISectionCache).count() == 3
+
+    @patch("app.services.report_generator.AsyncOpenAI")
+    def test_invalid_sections_split_into_single_requests(
+        self, mock_openai: Any, db_session: Session, test_report: Report
+    ) -> None:
+        batch = {
+            "sections": {
+                "identity": artifact_payload("Low"),
+                "network": {"risk_level": "High"},
+            }
+        }
+        single = json.dumps(artifact_payload("Critical"))
+
+        insights = self.run_insights(
+            db_session, test_report, mock_openai, [json.dumps(batch), single, single]
+        )
+
+        assert mock_openai.return_value.chat.completions.create.await_count == 3
+        assert insights["identity"].risk_level == "Low"
+        assert insights["network"].risk_level == "Critical"
+        assert insights["data"].risk_level == "Critical"
+
+    @patch("app.services.report_generator.AsyncOpenAI")
+    def test_unparseable_batch_not_recorded_as_key_success(
+        self, mock_openai: Any, db_session: Session, test_report: Report
+    ) -> None:
+        key_manager = MagicMock()
+        single = json.dumps(artifact_payload("Low"))
+
+        self.run_insights(
+            db_session,
+            test_report,
+            mock_openai,
+            ["not json", single, single, single],
+            key_manager,
+        )
+
+        assert mock_openai.return_value.chat.completions.create.await_count == 4
+        assert key_manager.record_success.call_count == 3
@@ -0,0 +1,97 @@
+import csv
+import os
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.devtools.seed import (
+    BulkWriter,
+    SeedConfig,
+    SyntheticDataGenerator,
+    copy_csv,
+    seed_database,
+)
+from app.models.ai_artifacts import AISectionArtifact
+from app.models.assessment import Assessment, AssessmentResponse, Report
+from app.models.user import User
+from app.services.question_parser import load_assessment_structure
+
+ANCHOR = datetime(2025, 6, 1, tzinfo=UTC)
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+copy_table = Table(
+    "seed_copy_check",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("note", String(50), nullable=True),
+)
+COPY_ROWS = [
+    {"id": 1, "note": ""},
+    {"id": 2, "note": None},
+    {"id": 3, "note": "text"},
+]
+
+
+def test_generator_is_deterministic() -> None:
+    structure = load_assessment_structure()
+
+    def batch(seed: int) -> dict[str, list[dict]]:
+        config = SeedConfig(seed=seed, anchor=ANCHOR)
+        return SyntheticDataGenerator(config, structure, "hash").generate_batch(0, 25)
+
+    assert batch(7) == batch(7)
+    assert batch(7)["users"] != batch(8)["users"]
+
+
+def test_seed_database_covers_every_status(
+    client: TestClient, admin_token: str, db_session: Session
+) -> None:
+    counts = seed_database(
+        engine, SeedConfig(users=120, seed=3, batch_size=50, anchor=ANCHOR)
+    )
+
+    seeded_users = db_session.query(User).filter(User.email.like("seed3-%"))
+    assert seeded_users.count() == counts["users"] == 120
+    assert db_session.query(Assessment).count() == counts["assessments"]
+    assert (
+        db_session.query(AssessmentResponse).count() == counts["assessment_responses"]
+    )
+    assert db_session.query(AISectionArtifact).count() == counts["ai_section_artifacts"]
+    statuses = {s for (s,) in db_session.query(Assessment.status).distinct()}
+    assert statuses == {"completed", "in_progress", "expired"}
+    attempts = {a for (a,) in db_session.query(Assessment.attempt_number).distinct()}
+    assert attempts == {1, 2, 3}
+    report_types = {t for (t,) in db_session.query(Report.report_type).distinct()}
+    assert report_types == {"standard", "ai_enhanced"}
+
+    response = client.get(
+        "/api/admin/users-progress-summary",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+
+
+def test_copy_csv_keeps_empty_strings_apart_from_null() -> None:
+    buffer = copy_csv(copy_table, ["id", "note"], COPY_ROWS)
+
+    assert buffer.getvalue().splitlines() == ['"1",""', '"2",', '"3","text"']
+    assert list(csv.reader(buffer))[0] == ["1", ""]
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+def test_copy_round_trips_empty_strings_and_null() -> None:
+    pg_engine = create_engine(str(POSTGRES_URL))
+    copy_table.create(pg_engine, checkfirst=True)
+    try:
+        with pg_engine.begin() as conn:
+            BulkWriter._copy(conn, copy_table, COPY_ROWS)
+        with pg_engine.connect() as conn:
+            notes = dict(conn.execute(select(copy_table.c.id, copy_table.c.note)).all())
+        assert notes == {1: "", 2: None, 3: "text"}
+    finally:
+        copy_table.drop(pg_engine)
+        pg_engine.dispose()
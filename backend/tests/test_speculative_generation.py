@@ -0,0 +1,376 @@
+import asyncio
+import json
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.ai_cache import AISectionCache
+from app.models.ai_speculative_job import AISpeculativeJob
+from app.models.assessment import Assessment, AssessmentResponse
+from app.services.report_generator import create_degraded_artifact
+from app.services.speculative_generation import (
+    STALE_CLAIM_AFTER,
+    SpeculativeGenerationService,
+)
+
+SECTION = SimpleNamespace(
+    id="access-control",
+    title="Access Control",
+    description="Identity and access management",
+    questions=[
+        SimpleNamespace(id="ac-1", text="Is MFA enforced?", weight=1.0, options=[]),
+        SimpleNamespace(id="ac-2", text="Are reviews done?", weight=1.0, options=[]),
+    ],
+)
+
+
+@pytest.fixture
+def structure() -> Generator[Any, None, None]:
+    with patch(
+        "app.services.speculative_generation.load_assessment_structure_cached",
+        return_value=SimpleNamespace(sections=[SECTION]),
+    ) as mock_loader:
+        yield mock_loader
+
+
+def answer(db: Session, assessment: Assessment, question_id: str, value: str) -> None:
+    existing = (
+        db.query(AssessmentResponse)
+        .filter(
+            AssessmentResponse.assessment_id == assessment.id,
+            AssessmentResponse.question_id == question_id,
+        )
+        .first()
+    )
+    if existing:
+        existing.answer_value = value  # type: ignore[assignment]
+    else:
+        db.add(
+            AssessmentResponse(
+                assessment_id=assessment.id,
+                section_id=SECTION.id,
+                question_id=question_id,
+                answer_value=value,
+            )
+        )
+    db.commit()
+
+
+def get_job(db: Session) -> AISpeculativeJob | None:
+    return db.query(AISpeculativeJob).first()
+
+
+class TestRecordProgress:
+    """Tests for queueing sections as answers are saved"""
+
+    def test_partial_section_not_queued(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+
+        assert get_job(db_session) is None
+
+    def test_complete_section_queued_and_reset_on_change(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+        job = get_job(db_session)
+        assert job is not None
+        assert job.status == "pending"
+        first_hash = job.answers_hash
+
+        job.stable_since = datetime.now(UTC) - timedelta(hours=1)  # type: ignore[assignment]
+        db_session.commit()
+        answer(db_session, test_assessment, "ac-2", "no")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+
+        db_session.refresh(job)
+        assert job.answers_hash != first_hash
+        assert SpeculativeGenerationService.get_ready_jobs(db_session, limit=10) == []
+
+    def test_skipped_job_requeued_when_answers_restored(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+        job = get_job(db_session)
+        assert job is not None
+        job.status = "skipped"  # type: ignore[assignment]
+        db_session.commit()
+
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+
+        db_session.refresh(job)
+        assert job.status == "pending"
+
+    def test_ready_after_stability_window(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+
+        later = datetime.now(UTC) + timedelta(
+            minutes=settings.AI_SPECULATIVE_STABLE_MINUTES + 1
+        )
+        ready = SpeculativeGenerationService.get_ready_jobs(
+            db_session, limit=10, now=later
+        )
+
+        assert len(ready) == 1
+
+
+@pytest.fixture
+def worker_sessions(db_session: Session) -> Generator[None, None, None]:
+    """Point the worker's own sessions at the test database"""
+    with patch(
+        "app.services.speculative_generation.SessionLocal",
+        sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind()),
+    ):
+        yield
+
+
+def after_stability_window() -> datetime:
+    return datetime.now(UTC) + timedelta(
+        minutes=settings.AI_SPECULATIVE_STABLE_MINUTES + 1
+    )
+
+
+class TestClaimJob:
+    """Tests for claiming ready jobs"""
+
+    def test_claim_is_exclusive_and_reserves_budget(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+        later = after_stability_window()
+
+        job_id = SpeculativeGenerationService.claim_next_job(db_session, now=later)
+
+        assert job_id is not None
+        assert (
+            SpeculativeGenerationService.claim_next_job(db_session, now=later) is None
+        )
+        job = get_job(db_session)
+        assert job is not None
+        db_session.refresh(job)
+        assert job.status == "running"
+        assert SpeculativeGenerationService.remaining_budget(db_session, later) == (
+            settings.AI_SPECULATIVE_DAILY_BUDGET - 1
+        )
+
+    def test_no_claim_without_budget(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+
+        with patch.object(settings, "AI_SPECULATIVE_DAILY_BUDGET", 0):
+            job_id = SpeculativeGenerationService.claim_next_job(
+                db_session, now=after_stability_window()
+            )
+
+        assert job_id is None
+
+    def test_stale_claim_is_reclaimed(
+        self, db_session: Session, test_assessment: Assessment, structure: Any
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+        later = after_stability_window()
+        job_id = SpeculativeGenerationService.claim_next_job(db_session, now=later)
+
+        reclaimed = SpeculativeGenerationService.claim_next_job(
+            db_session, now=later + STALE_CLAIM_AFTER + timedelta(seconds=1)
+        )
+
+        assert reclaimed == job_id
+
+
+@pytest.mark.usefixtures("worker_sessions")
+class TestProcessJob:
+    """Tests for running a speculative job"""
+
+    def claim_job(self, db: Session, assessment: Assessment) -> AISpeculativeJob:
+        answer(db, assessment, "ac-1", "yes")
+        answer(db, assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db, str(assessment.id), {SECTION.id}
+        )
+        assert SpeculativeGenerationService.claim_next_job(
+            db, now=after_stability_window()
+        )
+        job = get_job(db)
+        assert job is not None
+        return job
+
+    @patch("app.services.speculative_generation.OpenAIKeyManager")
+    @patch("app.services.speculative_generation.AsyncOpenAI")
+    def test_stores_artifact_in_section_cache(
+        self,
+        mock_openai: Any,
+        mock_key_manager: Any,
+        db_session: Session,
+        test_assessment: Assessment,
+        structure: Any,
+    ) -> None:
+        job = self.claim_job(db_session, test_assessment)
+        mock_key_manager.return_value.get_next_key.return_value = ("key1", "sk-test")
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = json.dumps(
+            create_degraded_artifact(SECTION.id).model_dump()
+        )
+        mock_response.usage.prompt_tokens = 100
+        mock_response.usage.completion_tokens = 50
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+
+        status = asyncio.run(SpeculativeGenerationService.process_job(str(job.id)))
+
+        assert status == "completed"
+        db_session.refresh(job)
+        assert job.status == "completed"
+        entry = db_session.query(AISectionCache).first()
+        assert entry is not None
+        assert entry.answers_hash == job.answers_hash
+        assert SpeculativeGenerationService.remaining_budget(db_session) == (
+            settings.AI_SPECULATIVE_DAILY_BUDGET - 1
+        )
+
+    @patch("app.services.speculative_generation.OpenAIKeyManager")
+    @patch("app.services.speculative_generation.AsyncOpenAI")
+    def test_failed_request_marks_job_failed(
+        self,
+        mock_openai: Any,
+        mock_key_manager: Any,
+        db_session: Session,
+        test_assessment: Assessment,
+        structure: Any,
+    ) -> None:
+        job = self.claim_job(db_session, test_assessment)
+        mock_key_manager.return_value.get_next_key.return_value = ("key1", "sk-test")
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            side_effect=RuntimeError("upstream down")
+        )
+
+        status = asyncio.run(SpeculativeGenerationService.process_job(str(job.id)))
+
+        assert status == "failed"
+        db_session.refresh(job)
+        assert job.status == "failed"
+        assert job.error_message == "upstream down"
+        mock_key_manager.return_value.record_failure.assert_called_once()
+
+    @patch("app.services.speculative_generation.AsyncOpenAI")
+    def test_skips_when_answers_changed(
+        self,
+        mock_openai: Any,
+        db_session: Session,
+        test_assessment: Assessment,
+        structure: Any,
+    ) -> None:
+        job = self.claim_job(db_session, test_assessment)
+        answer(db_session, test_assessment, "ac-1", "no")
+
+        status = asyncio.run(SpeculativeGenerationService.process_job(str(job.id)))
+
+        assert status == "skipped"
+        mock_openai.assert_not_called()
+
+    @patch("app.services.speculative_generation.OpenAIKeyManager")
+    @patch("app.services.speculative_generation.AsyncOpenAI")
+    def test_run_once_processes_each_claim_once(
+        self,
+        mock_openai: Any,
+        mock_key_manager: Any,
+        db_session: Session,
+        test_assessment: Assessment,
+        structure: Any,
+    ) -> None:
+        answer(db_session, test_assessment, "ac-1", "yes")
+        answer(db_session, test_assessment, "ac-2", "yes")
+        SpeculativeGenerationService.record_progress(
+            db_session, str(test_assessment.id), {SECTION.id}
+        )
+        job = get_job(db_session)
+        assert job is not None
+        job.stable_since = datetime.now(UTC) - timedelta(  # type: ignore[assignment]
+            minutes=settings.AI_SPECULATIVE_STABLE_MINUTES + 1
+        )
+        db_session.commit()
+        mock_key_manager.return_value.get_next_key.return_value = ("key1", "sk-test")
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = json.dumps(
+            create_degraded_artifact(SECTION.id).model_dump()
+        )
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+
+        assert asyncio.run(SpeculativeGenerationService.run_once()) == 1
+        assert asyncio.run(SpeculativeGenerationService.run_once()) == 0
+        mock_openai.return_value.chat.completions.create.assert_awaited_once()
+
+
+def test_save_progress_queues_speculative_job(
+    client: TestClient,
+    auth_token: str,
+    db_session: Session,
+    test_assessment: Assessment,
+    structure: Any,
+) -> None:
+    with (
+        patch.object(settings, "AI_SPECULATIVE_GENERATION_ENABLED", True),
+        patch("app.api.assessment.record_progress_in_background") as mock_record,
+    ):
+        response = client.post(
+            f"/api/assessment/{test_assessment.id}/save-progress",
+            headers={"Authorization": f"Bearer {auth_token}"},
+            json={
+                "responses": [
+                    {
+                        "section_id": SECTION.id,
+                        "question_id": "ac-1",
+                        "answer_value": "yes",
+                    }
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    mock_record.assert_called_once_with(str(test_assessment.id), {SECTION.id})
@@ -0,0 +1,240 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.responses import encoded_etag, etag_matches
+from app.models.assessment import Assessment
+from app.services import static_payloads
+from app.services.question_parser import load_assessment_structure_cached
+from app.services.static_payloads import (
+    filtered_structure,
+    filtered_structures,
+    tier_sections,
+    warm_filtered_structures,
+)
+
+
+def section_with_explanations() -> str:
+    structure = load_assessment_structure_cached()
+    return next(
+        section.id
+        for section in structure.sections
+        for question in section.questions
+        for option in question.options
+        if option.detailed_explanation is not None
+    )
+
+
+class TestEtagMatching:
+    def test_exact_and_weak_tags_match(self) -> None:
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"old", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+
+    def test_encoded_tags_match_their_content(self) -> None:
+        assert encoded_etag('"abc"', "br") == '"abc-br"'
+        assert encoded_etag('"abc"', None) == '"abc"'
+        assert etag_matches('"abc-br"', '"abc"')
+        assert etag_matches('W/"abc-gzip"', '"abc"')
+
+    def test_other_tags_do_not_match(self) -> None:
+        assert not etag_matches("", '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+        assert not etag_matches('"abd-br"', '"abc"')
+
+
+class TestConditionalStructure:
+    def test_structure_not_modified(self, client: TestClient) -> None:
+        first = client.get("/api/assessment/structure")
+        etag = first.headers["etag"]
+
+        second = client.get(
+            "/api/assessment/structure", headers={"If-None-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"].startswith("public, max-age=")
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_each_encoding_has_its_own_etag(self, client: TestClient) -> None:
+        etags = {}
+        for encoding in ("gzip", "br", "identity"):
+            response = client.get(
+                "/api/assessment/structure", headers={"Accept-Encoding": encoding}
+            )
+            etags[encoding] = response.headers["etag"]
+
+            revalidated = client.get(
+                "/api/assessment/structure",
+                headers={"Accept-Encoding": encoding, "If-None-Match": etags[encoding]},
+            )
+            assert revalidated.status_code == 304
+            assert revalidated.headers["etag"] == etags[encoding]
+
+        assert len(set(etags.values())) == 3
+        # A cached gzip copy revalidates even once the client also takes br
+        switched = client.get(
+            "/api/assessment/structure",
+            headers={"Accept-Encoding": "br", "If-None-Match": etags["gzip"]},
+        )
+        assert switched.status_code == 304
+        assert switched.headers["etag"] == etags["br"]
+
+    def test_stale_etag_gets_full_body(self, client: TestClient) -> None:
+        response = client.get(
+            "/api/assessment/structure", headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total_questions"] > 0
+
+    def test_selections_have_distinct_etags(
+        self,
+        client: TestClient,
+        db_session: Session,
+        test_assessment: Assessment,
+        auth_token: str,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        url = f"/api/assessment/{test_assessment.id}/filtered-structure"
+        full = client.get(url, headers=headers)
+
+        test_assessment.selected_section_ids = ["section_1", "section_2"]  # type: ignore[assignment]
+        db_session.commit()
+        custom = client.get(url, headers=headers)
+        revalidated = client.get(
+            url, headers={**headers, "If-None-Match": custom.headers["etag"]}
+        )
+
+        assert full.headers["etag"] != custom.headers["etag"]
+        assert custom.headers["cache-control"] == "private, no-cache"
+        assert len(custom.json()["sections"]) == 2
+        assert revalidated.status_code == 304
+
+
+class TestSparseStructure:
+    def test_sparse_omits_detailed_explanations(self, client: TestClient) -> None:
+        full = client.get("/api/assessment/structure").json()
+        sparse = client.get("/api/assessment/structure?sparse=true").json()
+
+        def explanations(structure: dict) -> int:
+            return sum(
+                "detailed_explanation" in option
+                and option["detailed_explanation"] is not None
+                for section in structure["sections"]
+                for question in section["questions"]
+                for option in question["options"]
+            )
+
+        assert explanations(full) > 0
+        assert explanations(sparse) == 0
+        assert sparse["total_questions"] == full["total_questions"]
+
+    def test_sparse_filtered_structure(
+        self, client: TestClient, test_assessment: Assessment, auth_token: str
+    ) -> None:
+        url = f"/api/assessment/{test_assessment.id}/filtered-structure"
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        full = client.get(url, headers=headers)
+        sparse = client.get(f"{url}?sparse=true", headers=headers)
+
+        assert sparse.status_code == 200
+        assert sparse.headers["etag"] != full.headers["etag"]
+        assert len(sparse.content) < len(full.content)
+
+    def test_section_explanations(self, client: TestClient) -> None:
+        section_id = section_with_explanations()
+
+        response = client.get(f"/api/assessment/sections/{section_id}/explanations")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["section_id"] == section_id
+        options = [
+            explanation
+            for question in data["questions"].values()
+            for explanation in question.values()
+        ]
+        assert options
+        assert "etag" in response.headers
+
+    def test_unknown_section_explanations(self, client: TestClient) -> None:
+        response = client.get("/api/assessment/sections/section_999/explanations")
+
+        assert response.status_code == 404
+
+
+class TestFilteredStructures:
+    def test_selection_order_and_duplicates_share_an_entry(self) -> None:
+        first = filtered_structure(["section_4", "section_1", "section_4"])
+        second = filtered_structure(["section_1", "section_4"])
+
+        assert first is second
+        assert [section.id for section in first.structure.sections] == [
+            "section_1",
+            "section_4",
+        ]
+        assert first.total_questions == sum(
+            len(section.questions) for section in first.structure.sections
+        )
+
+    def test_no_selection_is_the_full_structure(self) -> None:
+        full = filtered_structure()
+
+        assert full is filtered_structure(tier_sections("deep"))
+        assert (
+            full.total_questions == load_assessment_structure_cached().total_questions
+        )
+
+    def test_new_questionnaire_version_rebuilds(self, monkeypatch: Any) -> None:
+        before = filtered_structure(["section_2"])
+        monkeypatch.setattr(static_payloads, "questionnaire_version", lambda: -1.0)
+
+        assert filtered_structure(["section_2"]) is not before
+
+    def test_warm_builds_precompressed_tiers(self) -> None:
+        filtered_structures.clear()
+
+        warm_filtered_structures()
+
+        assert len(filtered_structures) == 3
+        quick = filtered_structure(tier_sections("quick"))
+        assert set(quick.payload().encodings) >= {"gzip"}
+        assert set(quick.payload(sparse=True).encodings) >= {"gzip"}
+
+    def test_autosave_is_a_lookup_once_warm(
+        self,
+        client: TestClient,
+        db_session: Session,
+        test_assessment: Assessment,
+        auth_token: str,
+        monkeypatch: Any,
+    ) -> None:
+        test_assessment.selected_section_ids = ["section_1"]  # type: ignore[assignment]
+        db_session.commit()
+        question = filtered_structure(["section_1"]).structure.sections[0].questions[0]
+
+        def reload() -> None:
+            raise AssertionError("structure reloaded on autosave")
+
+        monkeypatch.setattr(static_payloads, "load_assessment_structure_cached", reload)
+        response = client.post(
+            f"/api/assessment/{test_assessment.id}/save-progress",
+            headers={"Authorization": f"Bearer {auth_token}"},
+            json={
+                "responses": [
+                    {
+                        "section_id": "section_1",
+                        "question_id": question.id,
+                        "answer_value": question.options[0].value,
+                    }
+                ]
+            },
+        )
+
+        assert response.status_code == 200
@@ -0,0 +1,141 @@
+"""Tests for local token accounting and section prompt compaction"""
+
+import hashlib
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services import token_budget
+from app.services.report_generator import build_section_request_params
+
+
+class MockSection:
+    def __init__(self) -> None:
+        self.id = "access-control"
+        self.title = "Access Control"
+        self.description = "Identity and access management"
+
+
+def make_responses(count: int, comment: str = "") -> list[dict[str, Any]]:
+    return [
+        {"answer": "Yes", "weight": 1.0, "question": f"Q{i}?", "comment": comment}
+        for i in range(count)
+    ]
+
+
+class TestTokenCounting:
+    """Tests for the tokenizer-independent helpers"""
+
+    def test_estimate_without_tiktoken(self) -> None:
+        with patch.object(token_budget, "get_encoder", return_value=None):
+            assert token_budget.count_tokens("") == 0
+            assert token_budget.count_tokens("abcd" * 10) == 13
+            assert token_budget.count_message_tokens(
+                [{"role": "user", "content": "abcd" * 10}]
+            ) == (
+                13
+                + token_budget.MESSAGE_OVERHEAD_TOKENS
+                + token_budget.REPLY_PRIMING_TOKENS
+            )
+
+    def test_uncached_encoding_is_never_downloaded(self, tmp_path: Any) -> None:
+        token_budget.get_encoder.cache_clear()
+        with (
+            patch.object(settings, "TIKTOKEN_CACHE_DIR", str(tmp_path)),
+            patch.object(token_budget.tiktoken, "get_encoding") as mock_get,
+        ):
+            assert token_budget.get_encoder("gpt-4o") is None
+        token_budget.get_encoder.cache_clear()
+
+        mock_get.assert_not_called()
+
+    def test_encoding_found_in_seeded_cache(self, tmp_path: Any) -> None:
+        url = token_budget.ENCODING_URLS["o200k_base"]
+        (tmp_path / hashlib.sha1(url.encode()).hexdigest()).write_bytes(b"")
+
+        with patch.object(settings, "TIKTOKEN_CACHE_DIR", str(tmp_path)):
+            assert token_budget.encoding_is_cached("o200k_base")
+            assert not token_budget.encoding_is_cached("cl100k_base")
+
+    def test_encoder_errors_fall_back_to_estimate(self) -> None:
+        token_budget.get_encoder.cache_clear()
+        with (
+            patch.object(token_budget, "encoding_is_cached", return_value=True),
+            patch.object(
+                token_budget.tiktoken, "get_encoding", side_effect=ValueError("bad")
+            ),
+        ):
+            assert token_budget.get_encoder("unknown-model") is None
+        token_budget.get_encoder.cache_clear()
+
+    def test_context_window_prefers_longest_prefix(self) -> None:
+        assert token_budget.get_context_window("gpt-4") == 8192
+        assert token_budget.get_context_window("gpt-4o-mini") == 128000
+        assert token_budget.get_context_window("unknown-model") == (
+            token_budget.DEFAULT_CONTEXT_WINDOW
+        )
+
+    def test_completion_tokens_scale_with_section_size(self) -> None:
+        small = token_budget.estimate_completion_tokens(3)
+        large = token_budget.estimate_completion_tokens(30)
+
+        assert small < large <= settings.OPENAI_MAX_TOKENS
+
+    def test_cached_prompt_tokens_from_usage(self) -> None:
+        usage = SimpleNamespace(
+            prompt_tokens=2000,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+        )
+
+        assert token_budget.get_cached_prompt_tokens(usage) == 1536
+        assert token_budget.get_cached_prompt_tokens(None) is None
+        assert token_budget.get_cached_prompt_tokens(MagicMock()) is None
+
+    def test_fit_max_tokens_respects_context_window(self) -> None:
+        assert token_budget.fit_max_tokens(7000, 2000, "gpt-4") == 1192
+        assert token_budget.fit_max_tokens(1000, 2000, "gpt-4") == 2000
+
+    def test_fit_max_tokens_refuses_a_full_context_window(self) -> None:
+        with pytest.raises(token_budget.PromptTooLargeError):
+            token_budget.fit_max_tokens(8000, 2000, "gpt-4")
+
+
+class TestSectionRequestParams:
+    """Tests for budgeted section requests"""
+
+    def test_max_tokens_sized_from_section(self) -> None:
+        params = build_section_request_params(MockSection(), make_responses(5))
+
+        assert params["max_tokens"] == token_budget.estimate_completion_tokens(5)
+        assert params["max_tokens"] < settings.OPENAI_MAX_TOKENS
+
+    def test_compacts_comments_to_fit_budget(self) -> None:
+        section = MockSection()
+        responses = make_responses(5, comment="detail " * 100)
+
+        with patch.object(settings, "INCLUDE_COMMENTS_IN_AI", True):
+            full = build_section_request_params(section, responses)
+            full_prompt = full["messages"][-1]["content"]
+            full_tokens = token_budget.count_message_tokens(full["messages"])
+
+            with patch.object(
+                settings, "AI_SECTION_PROMPT_TOKEN_BUDGET", full_tokens - 1
+            ):
+                compact = build_section_request_params(section, responses)
+
+        compact_prompt = compact["messages"][-1]["content"]
+        assert "User comment:" in full_prompt
+        assert len(compact_prompt) < len(full_prompt)
+        assert "Q5: Yes (weight:1.0)" in compact_prompt
+
+    def test_prompt_that_cannot_be_compacted_is_refused(self) -> None:
+        responses = make_responses(1500)
+
+        with (
+            patch.object(settings, "OPENAI_MODEL", "gpt-4"),
+            pytest.raises(token_budget.PromptTooLargeError),
+        ):
+            build_section_request_params(MockSection(), responses)
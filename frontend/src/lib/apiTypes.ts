@@ -71,6 +71,7 @@ export interface Report {
   assessment_id: string;
   report_type: 'standard' | 'ai_enhanced';
   status: 'pending' | 'generating' | 'completed' | 'failed' | 'released';
+  error_message?: string | null;
   requested_at: string;
   completed_at?: string;
   file_path?: string;
@@ -300,6 +300,10 @@ export default function Reports() {
                               </button>
                             )}
 
+                            {report.status === 'failed' && report.error_message && (
+                              <span className="text-red-600 text-sm">{report.error_message}</span>
+                            )}
+
                             {report.status === 'generating' && (
                               <div className="flex items-center text-sm text-blue-600">
                                 <ClockIcon className="h-4 w-4 mr-1" />